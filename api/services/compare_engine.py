@@ -28,7 +28,7 @@ def _snap(project_id: str, commit_sha: str) -> Optional[Path]:
     return d if d.is_dir() else None
 
 
-def _load_json(p: Path) -> Any:
+def _load_json(p: Optional[Path]) -> Any:
     try:
         return json.loads(p.read_text(encoding="utf-8"))
     except Exception:
@@ -36,15 +36,21 @@ def _load_json(p: Path) -> Any:
 
 
 def _groups(snap: Path) -> set[str]:
+    """Output groups of a snapshot: its output/ tree plus any its artifact manifest lists."""
     output = snap / "output"
-    if not output.is_dir():
-        return set()
-    return {d.name for d in output.iterdir() if d.is_dir()}
+    groups = {d.name for d in output.iterdir() if d.is_dir()} if output.is_dir() else set()
+    manifest = _load_json(snap / "artifacts.json") or {}
+    for rel in manifest.get("files") or {}:
+        parts = rel.split("/")
+        if len(parts) > 2 and parts[0] == "output":
+            groups.add(parts[1])
+    return groups
 
 
 def _itf(snap: Path, group: str) -> dict:
-    """Load interface_tables.json for a group, or empty dict."""
-    return _load_json(snap / "output" / group / "interface_tables.json") or {}
+    """Load interface_tables.json for a group (resolved through the snapshot's artifact
+    manifest), or empty dict."""
+    return _load_json(doc_render.captured_file(snap, f"output/{group}/interface_tables.json")) or {}
 
 
 def _itf_fingerprint(data: dict) -> str:
@@ -47,14 +47,16 @@ def resolve_snapshot_asset(project_id: str, version_id: str, group: str,
 
     ``version_id`` here is the snapshot dir key (commit[:16]); snapshots live under
     ``workspaces/<pid>/<commit[:16]>/output/<group>`` (there is no ``versions/`` tree)."""
-    base = (_REPO_ROOT / "workspaces" / project_id / version_id
-            / "output" / group).resolve()
-    if not base.is_dir():
+    output_root = _REPO_ROOT / "workspaces" / project_id / version_id / "output"
+    base = (output_root / group).resolve()
+    if base.is_dir():
+        target = (base / asset_path).resolve()
+        if target.is_file() and base in target.parents:
+            return target
+    if ".." in Path(project_id, version_id, group, asset_path).parts:
         return None
-    target = (base / asset_path).resolve()
-    if target.is_file() and base in target.parents:
-        return target
-    return None
+    # Not in the commit dir's tree: the blob its artifact manifest records, if any.
+    return doc_render.captured_file(output_root.parent, f"output/{group}/{Path(asset_path).as_posix()}")
 
 
 # ---------------------------------------------------------------------------
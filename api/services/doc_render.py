@@ -23,6 +23,7 @@ falls back to a synthesised payload built from stored section bodies.
 from __future__ import annotations
 import json
 import re as _re
+import sys
 from pathlib import Path
 from typing import Any, Optional
 
@@ -36,15 +37,27 @@ _INCLUDE_GUARD_RE = _re.compile(r"^_*[A-Z][A-Z0-9_]*(?:_H|_HPP)_*$")
 
 # ── output dir lookup (path-traversal safe) ──────────────────────────────────
 
+def captured_file(version_dir: Path, relpath: str) -> Optional[Path]:
+    """A file captured into a version (``relpath`` like ``output/<group>/x.png``): the
+    commit dir's copy, else the content-addressed blob its ``artifacts.json`` names
+    (``src/incremental/artifacts.resolve``). None when the version has no such file."""
+    src_dir = str(_REPO_ROOT / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from incremental.artifacts import resolve  # type: ignore[import]
+    path = resolve(str(version_dir), relpath)
+    return Path(path) if path else None
+
+
 def commit_output_root(project_id: Optional[str], commit_sha: Optional[str]) -> Optional[Path]:
     """A specific version's output dir: ``workspaces/<pid>/<commit[:16]>/output`` (the
-    commit-addressed layout). None when project/commit is missing or the dir is absent. Pass
-    the result to output_group_dir/resolve_asset/find_docx so a VERSION renders, not the
-    latest shared run."""
+    commit-addressed layout). None when project/commit is missing or the version has no
+    captured output. Pass the result to output_group_dir/resolve_asset/find_docx so a
+    VERSION renders, not the latest shared run."""
     if not (project_id and commit_sha):
         return None
     d = _REPO_ROOT / "workspaces" / project_id / commit_sha[:16] / "output"
-    return d if d.is_dir() else None
+    return d if d.is_dir() or (d.parent / "artifacts.json").is_file() else None
 
 
 def output_group_dir(group: Optional[str], output_root: Optional[Path] = None) -> Optional[Path]:
@@ -61,27 +74,34 @@ def output_group_dir(group: Optional[str], output_root: Optional[Path] = None) -
     return None
 
 
+def _version_output_file(group: str, rel: str, output_root: Optional[Path]) -> Optional[Path]:
+    """``<group>/<rel>`` of a version's output through its artifact manifest (exact,
+    normalised keys only — so no traversal). None for the shared output."""
+    if output_root is None or ".." in Path(group, rel).parts:
+        return None
+    return captured_file(output_root.parent, f"output/{group}/{Path(rel).as_posix()}")
+
+
 def resolve_asset(group: Optional[str], asset_path: str,
                   output_root: Optional[Path] = None) -> Optional[Path]:
     """Resolve ``<group>/<asset_path>`` inside the (version's) output, or None if unsafe/absent."""
     base = output_group_dir(group, output_root)
-    if not base:
-        return None
-    target = (base / asset_path).resolve()
-    if target.is_file() and base in target.parents:
-        return target
-    return None
+    if base:
+        target = (base / asset_path).resolve()
+        if target.is_file() and base in target.parents:
+            return target
+    return _version_output_file(group, asset_path, output_root) if group else None
 
 
 def find_docx(group: Optional[str], output_root: Optional[Path] = None) -> Optional[Path]:
     """Return the real DOCX path for ``group`` in the (version's) output if it exists."""
     if not group:
         return None
+    name = f"software_detailed_design_{group}.docx"
     base = output_group_dir(group, output_root)
-    if not base:
-        return None
-    p = base / f"software_detailed_design_{group}.docx"
-    return p if p.is_file() else None
+    if base and (base / name).is_file():
+        return base / name
+    return _version_output_file(group, name, output_root)
 
 
 # ── small utilities ───────────────────────────────────────────────────────────
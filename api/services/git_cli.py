@@ -143,6 +143,25 @@ def shallow_clone(
         raise GitError(str(exc))
 
 
+def commit_checkout(
+    clone_url: str, token: str, mirror_dir: str, dest_dir: str, commit: str,
+) -> None:
+    """Check ``commit`` out at ``dest_dir`` as a worktree of the project's bare mirror
+    ``mirror_dir`` (created / fetched on demand; files unchanged since the nearest existing
+    checkout are hardlinked). Delegates to ``src/incremental/clone`` like
+    :func:`shallow_clone`, so the job checkout and the standalone engine share it."""
+    src_dir = str(get_settings().repo_root / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from incremental.clone import ensure_commit_checkout  # type: ignore[import]
+    from incremental.git_ops import GitError as _EngineGitError  # type: ignore[import]
+    try:
+        ensure_commit_checkout(dest_dir, clone_url, "", commit, token=token,
+                               mirror_dir=mirror_dir)
+    except _EngineGitError as exc:
+        raise GitError(str(exc))
+
+
 def fetch(
     repo_dir: str, clone_url: str, username: str, token: str,
     ref: str, depth: int = 50,
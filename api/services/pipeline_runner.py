@@ -297,35 +297,20 @@ def _inner_run_locked(db: Any, job_id: str, project: Any) -> None:
 # ---------------------------------------------------------------------------
 
 def _checkout(project: Any, commit_sha: str, checkout_dir: Path, job_id: str) -> None:
-    """Clone (or reuse) the project repo and check out commit_sha."""
-    if checkout_dir.is_dir() and (checkout_dir / ".git").is_dir():
+    """Check commit_sha out (or reuse the checkout) as a worktree of the project's bare
+    mirror, workspaces/<pid>/mirror.git, fetched only when it lacks the commit."""
+    if checkout_dir.is_dir() and (checkout_dir / ".git").exists():
         _append_log(job_id, "Reusing existing checkout.")
         return
 
     bc = project.build_config or {}
     token = bc.get("repo_access_token") or bc.get("access_token") or ""
-    token = (token or "").strip()
-    username = token  # PAT goes in username position for GitHub/GitLab
-    password = ""
+    token = (token or "").strip()  # PAT goes in username position for GitHub/GitLab
 
-    checkout_dir.mkdir(parents=True, exist_ok=True)
-
-    # Shallow clone — enough depth to reach the target commit
-    git_cli.shallow_clone(
-        project.repo_url, username, password, str(checkout_dir),
-        ref=project.default_branch or "main",
-        depth=50,
-    )
-
-    # Check out the specific commit
-    git_exe = shutil.which("git") or "git"
-    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
-    r = subprocess.run(
-        [git_exe, "-C", str(checkout_dir), "checkout", commit_sha],
-        capture_output=True, text=True, env=env, shell=False,
+    git_cli.commit_checkout(
+        project.repo_url, token, str(checkout_dir.parent / "mirror.git"),
+        str(checkout_dir), commit_sha,
     )
-    if r.returncode != 0:
-        raise RuntimeError(f"git checkout {commit_sha[:8]} failed: {r.stderr.strip()}")
 
 
 # ---------------------------------------------------------------------------
@@ -640,7 +625,7 @@ def _find_project_repo(project_id: str) -> Optional[Path]:
     base = get_settings().repo_root / "workspaces" / project_id
     if not base.is_dir():
         return None
-    repos = [d for d in base.iterdir() if d.is_dir() and (d / ".git").is_dir()]
+    repos = [d for d in base.iterdir() if d.is_dir() and (d / ".git").exists()]
     return max(repos, key=lambda d: d.stat().st_mtime) if repos else None
 
 
@@ -1219,6 +1204,13 @@ def _do_reexport(db: Any, job_id: str) -> None:
     arch_layers = project.architecture_layers or []
     cmd = _build_cmd(job, cdir, config_path, from_phase=4, use_model=True, arch_layers=arch_layers)
     if _execute_subprocess(db, job_id, cmd, phase_start=4):
-        out = root / "output"
-        if out.is_dir():
-            shutil.copytree(out, cdir / "output", dirs_exist_ok=True)
+        # Capture through the version's content-addressed store: the commit dir's files
+        # are hardlinks to shared blobs, so copying over them would rewrite the blobs
+        # other versions link to.
+        src_dir = str(root / "src")
+        if src_dir not in sys.path:
+            sys.path.insert(0, src_dir)
+        from incremental.stores import VersionStore, Workspace  # type: ignore[import]
+        vstore = VersionStore(Workspace(job.project_id, str(root / "workspaces")))
+        vstore.capture_artifacts(cdir.name, model_dir=str(root / "model"),
+                                 output_dir=str(root / "output"))
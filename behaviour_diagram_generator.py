@@ -5,10 +5,13 @@ Two ways to use this module:
 
 1) As a small library from `src/views/behaviour_diagram.py`:
 
-   gen = FakeBehaviourGenerator(components_path, units_path, functions_path)
+   gen = FakeBehaviourGenerator(components_path, units_path, functions_path,
+                                functions_data=model["functions"])
    mermaid_paths = gen.generate_all_diagrams(function_key, output_dir)
 
-   Takes paths to model JSON files (components, units, functions).
+   Takes paths to model JSON files (components, units, functions). Pass the
+   already-loaded functions dict as `functions_data` to skip reading
+   functions.json; otherwise it is read once, on first use.
    Output: one .mmd file per external caller, named
    current_function_key__caller_function_key.mmd (current gets called by external unit)
    e.g. app_main_calculate___math_utils_add_int_int.mmd
@@ -25,7 +28,7 @@ import argparse
 import json
 import os
 import sys
-from typing import List
+from typing import Dict, List, Optional
 
 _proj = os.path.dirname(os.path.abspath(__file__))
 if _proj not in sys.path:
@@ -48,12 +51,47 @@ class SequenceDiagramGenerator:
     Takes paths to components.json, units.json, functions.json.
     Output naming: current_key__caller_key.mmd (sanitized)
     No output when the function has no external callers.
+
+    The functions model is loaded once per generator (or taken from
+    `functions_data`), and every function's external-caller list is computed
+    in one pass on first use, so generating for all N functions is O(N + E).
     """
 
-    def __init__(self, components_path: str, units_path: str, functions_path: str) -> None:
+    def __init__(self, components_path: str, units_path: str, functions_path: str,
+                 functions_data: Optional[Dict] = None) -> None:
         self.components_path = components_path
         self.units_path = units_path
         self.functions_path = functions_path
+        self._functions_data = functions_data
+        self._external_callers: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def functions_data(self) -> Dict:
+        """functions.json content: the dict given to __init__, else read once."""
+        if self._functions_data is None:
+            self._functions_data = {}
+            if os.path.isfile(self.functions_path):
+                try:
+                    with open(self.functions_path, "r", encoding="utf-8") as f:
+                        self._functions_data = json.load(f)
+                except (json.JSONDecodeError, OSError):
+                    pass
+        return self._functions_data
+
+    def external_callers(self, function_key: str) -> List[str]:
+        """calledByIds of function_key that belong to a different component."""
+        if self._external_callers is None:
+            table: Dict[str, List[str]] = {}
+            for fid, f in self.functions_data.items():
+                own = fid.split("|")[0] if "|" in fid else ""
+                callers = [
+                    c for c in (f.get("calledByIds") or [])
+                    if ((c or "").split("|")[0] if "|" in (c or "") else "") != own
+                ]
+                if callers:
+                    table[fid] = callers
+            self._external_callers = table
+        return self._external_callers.get(function_key, [])
 
     def generate_all_diagrams(self, function_key: str, output_dir: str) -> List[str]:
         """Create one .mmd per external caller, named current_key__caller_key.mmd.
@@ -64,23 +102,9 @@ class SequenceDiagramGenerator:
 
         os.makedirs(output_dir, exist_ok=True)
 
-        functions_data = {}
-        if os.path.isfile(self.functions_path):
-            try:
-                with open(self.functions_path, "r", encoding="utf-8") as f:
-                    functions_data = json.load(f)
-            except (json.JSONDecodeError, OSError):
-                pass
-
-        self_component = (function_key or "").split("|")[0] if "|" in (function_key or "") else ""
-        called_by_ids = functions_data.get(function_key, {}).get("calledByIds", []) or []
         paths = []
-
-        for caller_key in called_by_ids:
-            caller_component = (caller_key or "").split("|")[0] if "|" in (caller_key or "") else ""
-            if caller_component == self_component:
-                continue
-            safe_c = safe_filename((function_key or "").replace("|", "_"))
+        safe_c = safe_filename((function_key or "").replace("|", "_"))
+        for caller_key in self.external_callers(function_key):
             safe_k = safe_filename((caller_key or "").replace("|", "_"))
             name = f"{safe_c}__{safe_k}.mmd"
             mmd_path = os.path.join(output_dir, name)
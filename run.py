@@ -31,6 +31,14 @@ Options:
                        Phase 1, so layer-scoping in Phase 1 and Phase 3 is
                        automatic. Example:
                          --include-path Layer1 C:/ThirdParty/boost/include
+  --parallel-groups N  Run up to N per-group Phase 3+4 plans concurrently once the
+                       model is built (default 1 = one group after another).
+                       Output lines are prefixed with the group label; the first
+                       failing group stops the others.
+  --in-process         Run every phase inside this interpreter instead of a
+                       subprocess per phase: libclang/python-docx are imported
+                       and each model file is parsed once for the whole run.
+                       Groups then run sequentially (no --parallel-groups).
   --verbose            Enable DEBUG logs (cache hits, budgets, few-shot picks)
   --quiet              Only log WARNINGs and above
   --trace-prompts      Print full LLM prompts (system + user) to stdout.
@@ -110,6 +118,8 @@ use_model               = False
 no_llm_summarize        = False
 from_phase              = 1
 to_phase                = None   # stop after this phase (1-4); None = run through phase 4
+parallel_groups         = 1      # per-group plans run concurrently (--parallel-groups N)
+in_process              = False  # run phases in this interpreter (--in-process)
 selected_group_arg      = None
 selected_layer_arg      = None
 selected_components_arg = []
@@ -223,6 +233,20 @@ while i < len(sys.argv):
         except ValueError:
             log(f"--to-phase must be 1, 2, 3, or 4 (got: {sys.argv[i]})", component="run", err=True)
             sys.exit(1)
+    elif a == "--in-process":
+        in_process = True
+    elif a == "--parallel-groups":
+        i += 1
+        if i >= len(sys.argv):
+            log("--parallel-groups requires an integer argument", component="run", err=True)
+            sys.exit(1)
+        try:
+            parallel_groups = int(sys.argv[i])
+            if parallel_groups < 1:
+                raise ValueError
+        except ValueError:
+            log(f"--parallel-groups must be a positive integer (got: {sys.argv[i]})", component="run", err=True)
+            sys.exit(1)
     else:
         raw_args.append(a)
     i += 1
@@ -252,7 +276,8 @@ if len(raw_args) < 1:
     print("Usage: python run.py [--clean] [--use-model|--skip-model] [--selected-group <name>]")
     print("                     [--selected-layer <name>] [--no-llm-summarize] [--from-phase N]")
     print("                     [--selected-component <name> [--selected-component <name> ...]]")
-    print("                     [--quiet|--verbose] [--trace-prompts] [--filter-mode MODE]")
+    print("                     [--parallel-groups N] [--in-process] [--quiet|--verbose] [--trace-prompts]")
+    print("                     [--filter-mode MODE]")
     print("                     <project_path>")
     print("Example: python run.py test_cpp_project")
     print("Example: python run.py --selected-component Gpio SampleCppProject")
@@ -317,8 +342,9 @@ if macros_path:
 # ---------------------------------------------------------------------------
 import json as _json
 from core.config import (get_flat_groups as _get_flat_groups,
-                         get_group_layer_name as _get_group_layer_name,
-                         get_component_layer_name as _get_component_layer_name)
+                         get_component_layer_name as _get_component_layer_name,
+                         layer_include_dirs as _layer_include_dirs)
+from core.group_planner import selected_layer_name as _selected_layer_name
 _model_dir = os.path.join(SCRIPT_DIR, "model")
 os.makedirs(_model_dir, exist_ok=True)
 _all_groups = _get_flat_groups(cfg)
@@ -342,33 +368,11 @@ if selected_components_arg:
         _detail = ", ".join(f"{c!r}->{l}" for c, l in _comp_layers.items())
         log(f"All --selected-component names must be in the same layer ({_detail})", component="run", err=True)
         sys.exit(1)
-    _derived_layer_for_components = next(iter(_unique_layers))
-else:
-    _derived_layer_for_components = None
 
-if selected_layer_arg:
-    _selected_layer = selected_layer_arg
-elif _resolved_group:
-    _selected_layer = _get_group_layer_name(cfg, _resolved_group)
-elif _derived_layer_for_components:
-    _selected_layer = _derived_layer_for_components
-else:
-    _selected_layer = None
-_layer_inc: dict = {}
-for _lname, _layer in (cfg.get("layers") or {}).items():
-    if _selected_layer and _lname != _selected_layer:
-        continue
-    if not isinstance(_layer, dict):
-        continue
-    _layer_rel = _layer.get("path") or _lname
-    _layer_abs = os.path.join(resolved, _layer_rel)
-    if not os.path.isdir(_layer_abs):
-        continue
-    _dirs: list = []
-    for _dirpath, _dirnames, _ in os.walk(_layer_abs):
-        _dirnames[:] = [d for d in _dirnames if not d.startswith(".")]
-        _dirs.append(_dirpath)
-    _layer_inc[_lname] = _dirs
+_selected_layer = _selected_layer_name(cfg, selected_group=_resolved_group,
+                                      selected_layer=selected_layer_arg,
+                                      selected_components=selected_components_arg)
+_layer_inc = _layer_include_dirs(cfg, resolved, _selected_layer)
 
 # Validate and merge --include-path <layer> <dir> entries.
 _known_layers = set((cfg.get("layers") or {}).keys())
@@ -437,15 +441,21 @@ if to_phase is not None:
                  if _SCRIPT_PHASE.get(os.path.basename(ph.script), 99) <= to_phase]
         if _kept and _plan.runner_from_phase <= len(_kept):
             _filtered.append(_RunPlan(label=_plan.label, phases=_kept,
-                                      runner_from_phase=_plan.runner_from_phase))
+                                      runner_from_phase=_plan.runner_from_phase,
+                                      depends_on=_plan.depends_on))
     plans = _filtered
     log(f"--to-phase {to_phase}: running {len(plans)} plan(s) up to phase {to_phase}.", component="run")
 
-runner = PhaseRunner(project_root=SCRIPT_DIR)
-total_time = 0.0
-for plan in plans:
-    log(plan.label, component="run")
-    total_time += runner.run(plan.phases, from_phase=plan.runner_from_phase)
+if in_process:
+    from core.model_io import enable_model_cache
+    enable_model_cache()
+    if parallel_groups > 1:
+        log("--in-process runs groups sequentially; ignoring --parallel-groups.", component="run")
+        parallel_groups = 1
+runner = PhaseRunner(project_root=SCRIPT_DIR, in_process=in_process)
+if parallel_groups > 1 and len(plans) > 1:
+    log(f"--parallel-groups {parallel_groups}: {len(plans)} plan(s), groups run concurrently.", component="run")
+total_time = runner.run_plans(plans, parallel=parallel_groups)
 
 print(flush=True)
 log(f"Done. Total: {total_time:.2f}s", component="run")
@@ -35,6 +35,7 @@ from .model_io import (
     write_model_file,
     load_model,
     ensure_model_dir,
+    enable_model_cache,
 )
 from .orchestration import Phase, PhaseRunner
 from .group_planner import (
@@ -76,6 +77,7 @@ __all__ = [
     "write_model_file",
     "load_model",
     "ensure_model_dir",
+    "enable_model_cache",
     "Phase",
     "PhaseRunner",
     "RunPlan",
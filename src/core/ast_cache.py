@@ -0,0 +1,224 @@
+"""Content-addressed store of serialized libclang ASTs (Phase 1 -> flowchart engine).
+
+Phase 1 (`src/parser.py`) already parses every TU with function bodies. The flowchart
+engine used to parse each of them again (`TranslationUnitParser.get_tu_full`). With
+`clang.astCache` enabled, Phase 1 writes each TU's AST (`TranslationUnit.save`) into
+`<project_root>/.ast_cache/` and the engine loads it back via
+`TranslationUnit.from_ast_file` instead of re-parsing.
+
+Both sides parse with ONE argument list and option set: Phase 1's. It records them in
+`model/ast_parse_args.json` (write_parse_args); the engine reads them back
+(read_parse_args) and, with the cache on, parses every TU it does not find with exactly
+those — so a TU Phase 1 parsed is a hit, and one it did not (a narrowed parse) is
+parsed once by the engine and saved under the same key.
+
+The file name is the *AST key*:
+
+    sha256( parseFingerprint, basePath, parse args, parse options, tuRelPath,
+            sha256(tu source),
+            sorted (relPath, sha256(content)) over the TU's in-repo include closure )
+
+  * parseFingerprint (metadata.json, M4.6) covers Phase 1's clang args / std /
+    toolchain; basePath keeps an AST from being loaded for a different checkout (AST
+    files embed absolute paths) — so each incremental version's worktree has its own
+    entries.
+  * The parse args and options are the shared ones above.
+  * The TU + closure content hashes make a stale AST impossible: the engine recomputes
+    the key from the files on disk *now* and only loads an exact match.
+
+Being content-addressed, the store is shared across runs and groups of a checkout.
+`prune()` keeps it under a size budget, evicting least-recently-used files first (a
+hit touches the file's mtime).
+
+libclang-free: the TU object is duck-typed (`.save(path)`), so this is unit-testable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+AST_CACHE_DIRNAME = ".ast_cache"
+AST_SUFFIX = ".ast"
+DEFAULT_MAX_MB = 2048
+PARSE_ARGS_FILENAME = "ast_parse_args.json"
+
+_SEP = "\x1f"
+
+
+def default_cache_dir(project_root: str) -> str:
+    """Return `<project_root>/.ast_cache` (sibling of `.mmdc_cache`)."""
+    return os.path.join(project_root, AST_CACHE_DIRNAME)
+
+
+def write_parse_args(model_dir: str, parse_args: Sequence[str], parse_options: int) -> None:
+    """Record the args / options Phase 1 parses (and keys its ASTs) with."""
+    os.makedirs(model_dir, exist_ok=True)
+    with open(os.path.join(model_dir, PARSE_ARGS_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({"args": list(parse_args), "options": int(parse_options)}, f, indent=2)
+
+
+def read_parse_args(model_dir: str) -> Optional[Tuple[List[str], int]]:
+    """(args, options) recorded by write_parse_args, or None when absent/unreadable."""
+    try:
+        with open(os.path.join(model_dir, PARSE_ARGS_FILENAME), "r", encoding="utf-8") as f:
+            rec = json.load(f)
+        return [str(a) for a in rec["args"]], int(rec["options"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+class AstCache:
+    """Key, save and look up serialized TUs for one parse configuration.
+
+    Args:
+        cache_dir:         directory holding `<key>.ast` files (created on save)
+        parse_fingerprint: metadata.json `parseFingerprint` of the parse that owns
+                           the ASTs; empty disables the cache (no safe key)
+        base_path:         project base path (TU paths are keyed repo-relative)
+        tu_includes:       {tuRelPath -> [in-repo included rel paths]} (tu_includes.json);
+                           read lazily, so Phase 1 can pass its live dict
+        parse_args:        the clang args every stored AST is parsed with (Phase 1's)
+        parse_options:     the libclang parse options, likewise
+    """
+
+    def __init__(self, cache_dir: str, parse_fingerprint: str, base_path: str,
+                 tu_includes: Optional[Dict[str, List[str]]] = None,
+                 parse_args: Sequence[str] = (), parse_options: int = 0) -> None:
+        self.cache_dir = cache_dir
+        self.parse_fingerprint = parse_fingerprint or ""
+        self.base_path = os.path.abspath(base_path)
+        self.tu_includes = tu_includes if tu_includes is not None else {}
+        self.parse_args = list(parse_args)
+        self.parse_options = int(parse_options)
+        self._file_hashes: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.parse_fingerprint and self.cache_dir)
+
+    # -- keying -------------------------------------------------------------
+
+    def _rel(self, abs_path: str) -> Optional[str]:
+        """Repo-relative forward-slash path (same rule as incremental.parse_includes,
+        which keys tu_includes.json), or None outside the base path."""
+        a = os.path.abspath(abs_path)
+        a_nc, b_nc = os.path.normcase(a), os.path.normcase(self.base_path)
+        if a_nc != b_nc and not a_nc.startswith(b_nc + os.sep):
+            return None
+        return os.path.relpath(a, self.base_path).replace("\\", "/")
+
+    def _hash_file(self, rel: str) -> str:
+        """sha256 of a repo-relative file's bytes (memoized; "" when unreadable)."""
+        h = self._file_hashes.get(rel)
+        if h is None:
+            try:
+                with open(os.path.join(self.base_path, rel), "rb") as f:
+                    h = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                h = ""
+            self._file_hashes[rel] = h
+        return h
+
+    def key_for(self, abs_path: str) -> Optional[str]:
+        """Return the AST key for a TU (parsed with parse_args / parse_options), from
+        the files on disk, or None if the TU is outside the repo, has no recorded
+        include closure, or a file is unreadable."""
+        if not self.enabled:
+            return None
+        tu_rel = self._rel(abs_path)
+        if tu_rel is None or tu_rel not in self.tu_includes:
+            return None
+        src_hash = self._hash_file(tu_rel)
+        if not src_hash:
+            return None
+        parts = [self.parse_fingerprint, self.base_path, "\x1e".join(self.parse_args),
+                 str(self.parse_options), tu_rel, src_hash]
+        for rel in sorted(self.tu_includes.get(tu_rel) or []):
+            fh = self._hash_file(rel)
+            if not fh:
+                return None
+            parts.append(f"{rel}={fh}")
+        return hashlib.sha256(_SEP.join(parts).encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + AST_SUFFIX)
+
+    # -- read / write -------------------------------------------------------
+
+    def lookup(self, abs_path: str) -> Optional[str]:
+        """Return the path of a valid cached AST for this TU, or None."""
+        key = self.key_for(abs_path)
+        path = self.path_for(key) if key else None
+        if not path or not os.path.isfile(path):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path, None)  # LRU marker for prune()
+        except OSError:
+            pass
+        self.hits += 1
+        return path
+
+    def save(self, tu, abs_path: str) -> bool:
+        """Serialize `tu` (parsed with parse_args / parse_options) under its key.
+        Content-addressed, so an existing file is left as-is. Best-effort: any failure
+        returns False and never breaks a parse."""
+        key = self.key_for(abs_path)
+        if not key:
+            return False
+        path = self.path_for(key)
+        if os.path.isfile(path):
+            return True
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tu.save(tmp)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return False
+        self.saved += 1
+        return True
+
+
+def prune(cache_dir: str, max_bytes: int, *, keep: Iterable[str] = ()) -> int:
+    """Evict least-recently-used `.ast` files until the store is <= max_bytes.
+    Paths in `keep` (just written / just used) are never evicted. Returns the number
+    of files removed."""
+    try:
+        names = [n for n in os.listdir(cache_dir) if n.endswith(AST_SUFFIX)]
+    except OSError:
+        return 0
+    keep_set = {os.path.abspath(p) for p in keep}
+    entries = []
+    total = 0
+    for n in names:
+        p = os.path.join(cache_dir, n)
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        total += st.st_size
+        entries.append((st.st_mtime, st.st_size, p))
+    removed = 0
+    for _mtime, size, p in sorted(entries):
+        if total <= max_bytes:
+            break
+        if os.path.abspath(p) in keep_set:
+            continue
+        try:
+            os.unlink(p)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
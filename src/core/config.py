@@ -19,7 +19,7 @@ from __future__ import annotations
 import json
 import os
 import threading
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from .paths import paths
 
@@ -573,6 +573,28 @@ def get_component_layer_name(cfg: Dict[str, Any], component_name: str) -> Option
     return None
 
 
+def layer_include_dirs(cfg: Dict[str, Any], project_path: str,
+                       selected_layer: Optional[str] = None) -> Dict[str, List[str]]:
+    """Return {layerName: [dirs]} — every non-hidden directory under each layer's path in
+    project_path (only `selected_layer`'s when given). This is what run.py writes to
+    model/clang_include_paths.json for the parser and the flowchart engine."""
+    result: Dict[str, List[str]] = {}
+    for layer_name, layer in (cfg.get("layers") or {}).items():
+        if selected_layer and layer_name != selected_layer:
+            continue
+        if not isinstance(layer, dict):
+            continue
+        layer_abs = os.path.join(project_path, layer.get("path") or layer_name)
+        if not os.path.isdir(layer_abs):
+            continue
+        dirs: List[str] = []
+        for dirpath, dirnames, _ in os.walk(layer_abs):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            dirs.append(dirpath)
+        result[layer_name] = dirs
+    return result
+
+
 def get_layer_flat_groups(cfg: Dict[str, Any], layer_name: str) -> Dict[str, Any]:
     """Return flat groups for a single named layer, with layer paths resolved."""
     layer_cfg = (cfg.get("layers") or {}).get(layer_name)
@@ -39,10 +39,14 @@ class RunPlan:
 
     `runner_from_phase` is the 1-based index inside `phases` to start at; the
     planner has already translated the user's `--from-phase` flag.
+    `depends_on` lists the labels of plans that must finish first (the
+    per-group view/export plans depend on the build-model plan); plans with
+    no pending dependency may run concurrently (run.py --parallel-groups).
     """
     label: str
     phases: List[Phase] = field(default_factory=list)
     runner_from_phase: int = 1
+    depends_on: List[str] = field(default_factory=list)
 
 
 def _resolve_group_name(groups: Dict[str, Any], requested: Optional[str]) -> Optional[str]:
@@ -59,6 +63,22 @@ def _resolve_group_name(groups: Dict[str, Any], requested: Optional[str]) -> Opt
     return None
 
 
+def selected_layer_name(cfg: Dict[str, Any], *, selected_group: Optional[str] = None,
+                        selected_layer: Optional[str] = None,
+                        selected_components: Optional[List[str]] = None) -> Optional[str]:
+    """The one layer a selection confines the parse to (None = every layer): the
+    selected layer, the selected group's layer, or the selected components' layer."""
+    from .config import get_component_layer_name, get_flat_groups, get_group_layer_name
+    if selected_layer:
+        return selected_layer
+    resolved = _resolve_group_name(get_flat_groups(cfg), selected_group)
+    if resolved:
+        return get_group_layer_name(cfg, resolved)
+    if selected_components:
+        return get_component_layer_name(cfg, selected_components[0])
+    return None
+
+
 def _build_model_phases(project_path: str, *, no_llm_summarize: bool,
                         data_dictionary_path: Optional[str] = None,
                         macros_path: Optional[str] = None,
@@ -128,7 +148,8 @@ def plan_runs(
 
     Each RunPlan maps to one PhaseRunner.run(...) call. Returning a *list*
     (not a single plan) lets us emit one plan per group while keeping the
-    runner itself dead-simple.
+    runner itself dead-simple. The list is in a valid execution order; the
+    `depends_on` edges let PhaseRunner.run_plans() run groups concurrently.
 
     Raises ValueError if selected_group/selected_layer doesn't exist in config.
     """
@@ -204,6 +225,7 @@ def plan_runs(
             label=f"Components: {', '.join(selected_components)}",
             phases=view_phases,
             runner_from_phase=local_from,
+            depends_on=[pl.label for pl in plans],
         ))
         return plans
 
@@ -261,6 +283,7 @@ def plan_runs(
                                  runner_from_phase=from_phase))
 
     local_from = max(1, from_phase - 2) if from_phase >= PHASE_VIEWS else 1
+    build_labels = [pl.label for pl in plans]
     for g in target_groups:
         if component_per_docx:
             grp = groups_cfg.get(g, {})
@@ -281,7 +304,8 @@ def plan_runs(
                 )
                 plans.append(RunPlan(label=f"Component: {comp}",
                                      phases=view_phases,
-                                     runner_from_phase=local_from))
+                                     runner_from_phase=local_from,
+                                     depends_on=list(build_labels)))
         else:
             g_safe = g.replace(" ", "-")
             out_key = output_name.replace(" ", "-") if output_name else g_safe
@@ -298,6 +322,7 @@ def plan_runs(
             )
             plans.append(RunPlan(label=f"Group: {g}",
                                  phases=view_phases,
-                                 runner_from_phase=local_from))
+                                 runner_from_phase=local_from,
+                                 depends_on=list(build_labels)))
 
     return plans
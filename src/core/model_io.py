@@ -14,6 +14,13 @@ and produced inconsistent error messages. This module collapses it into:
 All paths resolve via core.paths.paths().model_dir, so model location is
 controlled in one place too.
 
+In-process runs (run.py --in-process) call enable_model_cache(): every phase
+then shares one parsed copy of each model file for as long as the file is
+unchanged on disk (same mtime + size), instead of re-parsing functions.json
+in every phase and every group. write_model_file() drops the cached copy.
+Cached objects are shared, so phases must treat what they read as read-only
+unless they write it back (model_deriver does).
+
 Atomic writes are opt-in: pass `atomic=True` to write_model_file. The default
 matches today's behaviour (open + json.dump in place).
 """
@@ -50,6 +57,10 @@ EDGES = "edges"
 # transitive include closure (M4.0). Captured every parse; the narrowed-parse engine
 # (M4) intersects it with the git diff to find affected TUs. Not in ALL_MODEL_NAMES.
 TU_INCLUDES = "tu_includes"
+# TU_INCLUDE_INDEX = {"caseFolded", "files": {normalized file -> [TUs whose closure holds
+# it]}} — TU_INCLUDES inverted once at parse time, so the affected-TU lookup costs the
+# diff size (incremental.affected.build_include_index). Not in ALL_MODEL_NAMES.
+TU_INCLUDE_INDEX = "tu_include_index"
 # ENTITY_FILES = {entityKey -> repo-relative defining file} for every hashed entity
 # (function/global/type/macro) — lets the narrowed-parse merge (M4.3) resolve each
 # entity's file (types/hashes have no inline location). Not in ALL_MODEL_NAMES.
@@ -61,6 +72,20 @@ FUNC_KEYS = "func_keys"
 # OVERRIDE_PAIRS = [[override_fid, base_fid|base_key], …] virtual override->base relations,
 # for the narrowed-parse virtual-dispatch re-spread (M4.6). Not in ALL_MODEL_NAMES.
 OVERRIDE_PAIRS = "override_pairs"
+# GRAPH_INDEX = the model's dependency graph over integer node ids (CSR calls / uses /
+# calledBy), written beside EDGES by every writer of the call / usage edges, so impact
+# and fingerprints don't re-invert the model dicts (incremental.graph_index). Not in
+# ALL_MODEL_NAMES.
+GRAPH_INDEX = "graph_index"
+# INCLUDE_RESOLUTION = {"tus": {tuRelPath -> [in-repo paths probed before an #include's
+# hit]}, "external": [same, for #includes inside out-of-repo headers], "index": "tus"
+# inverted} — which TUs a newly added header could shadow, so a header addition needn't
+# force a full re-parse (incremental.affected.shadowed_tus). Not in ALL_MODEL_NAMES.
+INCLUDE_RESOLUTION = "include_resolution"
+# DERIVE_INPUTS = the configuration Phase 2's derivations depend on (defined macros,
+# component / layer mapping, project name), written by every derive. An incremental
+# derive (M5) only reuses a baseline derived under the same inputs. Not in ALL_MODEL_NAMES.
+DERIVE_INPUTS = "derive_inputs"
 
 ALL_MODEL_NAMES = (
     METADATA,
@@ -95,6 +120,25 @@ def ensure_model_dir() -> str:
     return md
 
 
+# ---------------------------------------------------------------------------
+# In-process read cache
+# ---------------------------------------------------------------------------
+
+# path -> ((st_mtime_ns, st_size), data); None = disabled (subprocess phases).
+_READ_CACHE: Optional[Dict[str, tuple]] = None
+
+
+def enable_model_cache(enabled: bool = True) -> None:
+    """Share parsed model files between phases run in this process."""
+    global _READ_CACHE
+    _READ_CACHE = {} if enabled else None
+
+
+def _file_signature(path: str) -> tuple:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
 # ---------------------------------------------------------------------------
 # Read
 # ---------------------------------------------------------------------------
@@ -122,8 +166,16 @@ def read_model_file(name: str, *, required: bool = True, default: Any = None) ->
                 f"{path} not found. Run the upstream phase first."
             )
         return default
+    if _READ_CACHE is not None:
+        sig = _file_signature(path)
+        hit = _READ_CACHE.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
     with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        data = json.load(f)
+    if _READ_CACHE is not None:
+        _READ_CACHE[path] = (sig, data)
+    return data
 
 
 def load_model(
@@ -163,6 +215,8 @@ def write_model_file(
     """
     ensure_model_dir()
     path = model_file_path(name)
+    if _READ_CACHE is not None:
+        _READ_CACHE.pop(path, None)
     if not atomic:
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
@@ -7,6 +7,11 @@ codes. This module collapses that into:
 
   - Phase  : a frozen dataclass describing one phase invocation
   - PhaseRunner.run(phases, from_phase=1) : sequential subprocess execution
+  - PhaseRunner.run_plans(plans, parallel=N) : RunPlans as a DAG (plan.depends_on);
+    independent plans (one per group) run concurrently, N at a time
+  - PhaseRunner(in_process=True) : opt-in; each phase script runs as __main__
+    inside this interpreter (runpy) instead of a fresh subprocess, so libclang,
+    python-docx and the parsed model files (core.model_io cache) are loaded once
 
 Crash-recovery semantics are preserved: pass `from_phase=N` (1-based against
 the phases list you supply) and any phase whose 1-based index is < N is
@@ -23,9 +28,11 @@ import os
 import platform
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 from .logging_setup import get_logger
 from .paths import paths
@@ -59,40 +66,171 @@ class PhaseRunner:
     code, matching the previous behaviour of run.py.
     """
 
-    def __init__(self, *, project_root: str | None = None) -> None:
+    def __init__(self, *, project_root: str | None = None, in_process: bool = False) -> None:
         p = paths()
         self.project_root = project_root or p.project_root
         self.src_dir = p.src_dir
+        self.in_process = in_process
+        self._out_lock = threading.Lock()
+        self._procs: set = set()
+        self._stop = threading.Event()
 
-    def run(self, phases: Sequence[Phase], *, from_phase: int = 1) -> float:
+    def run(self, phases: Sequence[Phase], *, from_phase: int = 1,
+            prefix: Optional[str] = None) -> float:
         """Run a list of phases. Returns total elapsed seconds.
 
         Phases with 1-based index < from_phase are skipped (crash recovery).
+        With `prefix`, the phases' output is captured and re-emitted line by line
+        as "[prefix] ..." so concurrent plans stay readable.
         """
         total = 0.0
+        tag = f"[{prefix}] " if prefix else ""
         for idx, phase in enumerate(phases, start=1):
             if idx < from_phase:
-                _log.info(f"[{idx}/{len(phases)}] {phase.name} — skipped (--from-phase {from_phase})")
+                _log.info(f"{tag}[{idx}/{len(phases)}] {phase.name} — skipped (--from-phase {from_phase})")
                 continue
-            _log.info(f"[{idx}/{len(phases)}] === {phase.name} ===")
+            if self._stop.is_set():
+                raise SystemExit(1)
+            _log.info(f"{tag}[{idx}/{len(phases)}] === {phase.name} ===")
             t0 = time.perf_counter()
-            if os_type == "Windows":
-                r = subprocess.run(
+            if self.in_process:
+                returncode = self._run_in_process(phase)
+            elif prefix:
+                returncode = self._run_prefixed(phase, tag)
+            elif os_type == "Windows":
+                returncode = subprocess.run(
                     phase.command(self.src_dir),
                     cwd=self.project_root, shell=True
-                )
+                ).returncode
             else:
-                r = subprocess.run(
+                returncode = subprocess.run(
                     phase.command(self.src_dir),
                     cwd=self.project_root,
-                )
+                ).returncode
             elapsed = time.perf_counter() - t0
             total += elapsed
-            _log.info(f"[{idx}/{len(phases)}] {phase.name} — {elapsed:.2f}s")
-            if r.returncode != 0:
-                _log.error(
-                    f"{phase.name} failed with exit code {r.returncode}; "
-                    f"resume with: --from-phase {idx}"
-                )
-                raise SystemExit(r.returncode)
+            _log.info(f"{tag}[{idx}/{len(phases)}] {phase.name} — {elapsed:.2f}s")
+            if returncode != 0:
+                if not self._stop.is_set():
+                    _log.error(
+                        f"{tag}{phase.name} failed with exit code {returncode}; "
+                        f"resume with: --from-phase {idx}"
+                    )
+                raise SystemExit(returncode)
         return total
+
+    def _run_in_process(self, phase: Phase) -> int:
+        """Run the phase script as __main__ in this interpreter; returns its exit code.
+
+        The script sees the same argv and cwd as in a subprocess. Modules it
+        imports stay loaded for the next phase, and model files are shared
+        through core.model_io's read cache.
+        """
+        import runpy
+        script = os.path.join(self.src_dir, phase.script)
+        saved_argv, saved_cwd = sys.argv, os.getcwd()
+        sys.argv = [script, *phase.args]
+        os.chdir(self.project_root)
+        try:
+            runpy.run_path(script, run_name="__main__")
+            return 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            print(e.code, file=sys.stderr)
+            return 1
+        except Exception:
+            _log.exception(f"{phase.name} raised")
+            return 1
+        finally:
+            sys.argv = saved_argv
+            os.chdir(saved_cwd)
+
+    def _run_prefixed(self, phase: Phase, tag: str) -> int:
+        proc = subprocess.Popen(
+            phase.command(self.src_dir), cwd=self.project_root,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace", bufsize=1,
+            shell=(os_type == "Windows"),
+        )
+        with self._out_lock:
+            self._procs.add(proc)
+        try:
+            for line in proc.stdout:
+                with self._out_lock:
+                    sys.stdout.write(tag + line)
+                    sys.stdout.flush()
+            return proc.wait()
+        finally:
+            with self._out_lock:
+                self._procs.discard(proc)
+
+    def run_plans(self, plans: Sequence, *, parallel: int = 1) -> float:
+        """Run RunPlans, each after the plans named in its `depends_on` finished.
+
+        parallel=1 runs them one after another in list order (the previous
+        run.py loop) and returns the summed phase time. With parallel > 1, up to
+        that many ready plans run at once, their output prefixed with the plan
+        label; the first failure stops new plans, terminates running ones and
+        raises SystemExit. Returns wall-clock seconds in that mode.
+        """
+        if parallel > 1 and self.in_process:
+            _log.warning("in-process phases share one interpreter; running plans sequentially")
+            parallel = 1
+        if parallel <= 1 or len(plans) <= 1:
+            total = 0.0
+            for plan in plans:
+                _log.info(plan.label)
+                total += self.run(plan.phases, from_phase=plan.runner_from_phase)
+            return total
+
+        labels = {plan.label for plan in plans}
+        deps = {plan.label: [d for d in (getattr(plan, "depends_on", None) or []) if d in labels]
+                for plan in plans}
+        pending = list(plans)
+        done, running = set(), {}
+        failure: Optional[tuple] = None
+        t0 = time.perf_counter()
+        self._stop.clear()
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="plan") as pool:
+            while pending or running:
+                if failure is None:
+                    for plan in [pl for pl in pending if all(d in done for d in deps[pl.label])]:
+                        pending.remove(plan)
+                        _log.info(f"{plan.label} — started")
+                        running[pool.submit(self.run, plan.phases,
+                                            from_phase=plan.runner_from_phase,
+                                            prefix=plan.label)] = plan
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    plan = running.pop(fut)
+                    exc = fut.exception()
+                    if exc is None:
+                        done.add(plan.label)
+                        _log.info(f"{plan.label} — done")
+                    elif failure is None:
+                        code = exc.code if isinstance(exc, SystemExit) else 1
+                        if not isinstance(exc, SystemExit):
+                            _log.error(f"{plan.label} failed: {exc}")
+                        failure = (plan, code)
+                        self._terminate_running()
+        if failure is not None:
+            plan, code = failure
+            unfinished = [pl.label for pl in plans if pl.label not in done]
+            _log.error(f"{plan.label} failed; not completed: {', '.join(unfinished)}")
+            if plan.phases and plan.phases[0].script == "run_views.py":
+                _log.error("model/ is intact; resume the groups with: --from-phase 3")
+            raise SystemExit(code or 1)
+        return time.perf_counter() - t0
+
+    def _terminate_running(self) -> None:
+        self._stop.set()
+        with self._out_lock:
+            procs = list(self._procs)
+        for proc in procs:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
@@ -0,0 +1,156 @@
+"""Content-addressed store of spooled DOCX component sections (Phase 4).
+
+A streamed export (`docx.streamSections`) builds every component section in its own
+Document and spools its body XML to disk (`docx_stream.spool_section`). A section is
+a pure function of its inputs, so with `docx.sectionCache` enabled the spooled XML and
+its picture references are kept in `<project_root>/.docx_cache/` and a re-export (e.g.
+the API's `reexport` job, which only re-runs Phase 4) rebuilds only the sections whose
+inputs changed.
+
+The key is computed by the exporter (`docx_exporter._section_keys`):
+
+    sha256( FORMAT_VERSION, exporter source digest, python-docx version, config,
+            abbreviations, section number, component name,
+            the component's interface rows, unit header rows and model entries
+            (own functions and private callees), flowchart texts,
+            sha1 of every PNG the section may embed, behaviour rows )
+
+Each entry is `<key>.xml` (the section body, pictures as section-local tokens) plus
+`<key>.json` (the picture references: source path, extension, content type, sha1),
+written last so a reader never sees half an entry. Pictures are not copied: they stay
+references to the PNGs under the group's output directory, whose content is part of
+the key, and an entry whose PNG has since disappeared is treated as a miss.
+
+The downsampled PNGs of `docx_images.ImageStage` (`<key>.png`) share the directory.
+`prune()` keeps the store under a size budget, evicting least-recently-used entries
+first (a hit touches the `.json` file's mtime and that of every `.png` it references).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+SECTION_CACHE_DIRNAME = ".docx_cache"
+DEFAULT_MAX_MB = 512
+
+# Bump when the entry layout changes — every existing entry then misses.
+FORMAT_VERSION = "1"
+
+Image = Tuple[str, str, str, str]
+
+# Entry files in deletion order: the metadata goes first, so a reader never finds a
+# section without it. ImageStage PNGs are entries of their own.
+_SUFFIXES = (".json", ".xml", ".png")
+
+
+def default_cache_dir(project_root: str) -> str:
+    """Return `<project_root>/.docx_cache` (sibling of `.mmdc_cache`)."""
+    return os.path.join(project_root, SECTION_CACHE_DIRNAME)
+
+
+class SectionCache:
+    """Look up and store spooled sections by key.
+
+    Args:
+        cache_dir: directory holding `<key>.xml` / `<key>.json` entries (created on save)
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return base + ".xml", base + ".json"
+
+    def lookup(self, key: str) -> Optional[Tuple[str, List[Image]]]:
+        """Return (xml_path, images) of a cached section, or None.
+
+        The XML is read in place by the caller; every referenced picture must still
+        exist on disk."""
+        xml_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            images = [tuple(img) for img in meta["images"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        if not os.path.isfile(xml_path) or not all(os.path.isfile(img[0]) for img in images):
+            self.misses += 1
+            return None
+        cache_dir = os.path.abspath(self.cache_dir)
+        for path in [meta_path] + [img[0] for img in images if os.path.dirname(img[0]) == cache_dir]:
+            try:
+                os.utime(path, None)  # LRU marker for prune()
+            except OSError:
+                pass
+        self.hits += 1
+        return xml_path, images
+
+    def save(self, key: str, xml_path: str, images: Iterable[Image]) -> bool:
+        """Store a spooled section under *key*. Best-effort: any failure returns False
+        and never breaks an export."""
+        cache_xml, cache_meta = self._paths(key)
+        tag = f"{os.getpid()}.{threading.get_ident()}"
+        tmp_xml = f"{cache_xml}.{tag}.tmp"
+        tmp_meta = f"{cache_meta}.{tag}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            shutil.copyfile(xml_path, tmp_xml)
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({"images": [list(img) for img in images]}, f)
+            os.replace(tmp_xml, cache_xml)
+            os.replace(tmp_meta, cache_meta)
+        except Exception:
+            for tmp in (tmp_xml, tmp_meta):
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            return False
+        self.saved += 1
+        return True
+
+
+def prune(cache_dir: str, max_bytes: int, *, keep: Iterable[str] = ()) -> int:
+    """Evict least-recently-used entries (sections and PNGs) until the store is
+    <= max_bytes. Keys in `keep` (just written / just used) are never evicted.
+    Returns the number of entries removed."""
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    keep_set = set(keep)
+    sizes = {}
+    for n in names:
+        key, ext = os.path.splitext(n)
+        if ext not in _SUFFIXES:
+            continue
+        try:
+            st = os.stat(os.path.join(cache_dir, n))
+        except OSError:
+            continue
+        size, mtime = sizes.get(key, (0, 0.0))
+        sizes[key] = (size + st.st_size, max(mtime, st.st_mtime) if ext != ".xml" else mtime)
+    total = sum(size for size, _ in sizes.values())
+    removed = 0
+    for key, (size, _mtime) in sorted(sizes.items(), key=lambda kv: kv[1][1]):
+        if total <= max_bytes:
+            break
+        if key in keep_set:
+            continue
+        for ext in _SUFFIXES:
+            try:
+                os.unlink(os.path.join(cache_dir, key + ext))
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+    return removed
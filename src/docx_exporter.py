@@ -1,18 +1,24 @@
 """Export interface_tables.json -> Software Detailed Design DOCX. Unit header table built from model."""
+import gc
 import os
 import re
 import sys
 import json
+import shutil
 import subprocess
+import tempfile
+from dataclasses import dataclass
 from typing import Optional, Tuple, List, Dict, Any
 from utils import os_type
 from core.paths import paths as _paths
+from core.section_cache import default_cache_dir as _section_cache_dir
 
 _p = _paths()
 PROJECT_ROOT = _p.project_root
 OUTPUT_DIR = _p.output_dir
 
 MODEL_DIR = _p.model_dir
+SECTION_CACHE_DIR = _section_cache_dir(PROJECT_ROOT)
 COLS = ("Interface ID", "Interface Name", "Information", "Data Type", "Data Range", "Direction(In/Out)", "Source/Destination", "Interface Type")
 # Placeholder when no value (no column may be empty)
 NA = "N/A"
@@ -157,12 +163,9 @@ def _read_decl_snippet(abs_file: str, start_line: int, *, kind: str) -> str:
     return out if out else "-"
 
 def _load_model_json(name: str) -> dict:
-    path = os.path.join(MODEL_DIR, f"{name}.json")
-    if not os.path.isfile(path):
-        return {}
+    from core.model_io import read_model_file
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_model_file(name, required=False, default={})
     except (json.JSONDecodeError, OSError):
         return {}
 
@@ -587,8 +590,13 @@ def _render_mermaid_to_png(project_root: str, mermaid: str, png_path: str) -> bo
         print(f"[docx_exporter] warning: mmdc render failed for {os.path.basename(png_path)}")
     return ok
 
+def _embed_path(images, png_path: str, width_in: float) -> str:
+    """PNG to embed for *png_path* at *width_in* inches (docx_images.ImageStage, if any)."""
+    return images.prepare(png_path, width_in) if images is not None else png_path
+
+
 def _add_flowchart_table(doc, func_name: str, description: str, input_name: str,
-                         output_name: str, flowcharts: list, font_small):
+                         output_name: str, flowcharts: list, font_small, images=None):
     """Render a flowchart table matching the behaviour diagram table layout.
 
     Rows: Requirements (description + all flowcharts stacked), Capacity, Risk,
@@ -597,6 +605,7 @@ def _add_flowchart_table(doc, func_name: str, description: str, input_name: str,
     flowcharts: list of (png_path_or_None, mermaid_str, label_str) tuples.
                 First entry is the function's own flowchart; subsequent entries
                 are private callee flowcharts.
+    images:     ImageStage the PNGs are downsampled through (None = embed as rendered).
     """
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     from docx.enum.table import WD_ALIGN_VERTICAL, WD_ROW_HEIGHT_RULE
@@ -641,7 +650,7 @@ def _add_flowchart_table(doc, func_name: str, description: str, input_name: str,
             ip = row0[1].add_paragraph()
             _tight(ip)
             try:
-                ip.add_run().add_picture(png_path, width=Inches(4.0))
+                ip.add_run().add_picture(_embed_path(images, png_path, 4.0), width=Inches(4.0))
             except Exception:
                 if mermaid:
                     fb = ip.add_run(mermaid.strip())
@@ -1203,8 +1212,463 @@ def _build_cover_page(doc, project_name: str, group_name: str, version: str = "1
     doc.add_page_break()
 
 
-def export_docx(json_path: str = None, docx_path: str = None, selected_group: str | None = None, selected_components: list | None = None) -> Tuple[bool, Optional[str]]:
+@dataclass
+class _ExportContext:
+    """Everything export_docx loads once and every component section reads."""
+    config: dict
+    abbreviations: dict
+    artifacts_dir: str
+    font_small: Any
+    by_component: dict
+    units_data: dict
+    data_dictionary: dict
+    components_data: dict
+    global_variables_data: dict
+    functions_data: dict
+    base_path: str
+    msd_enabled: bool
+    msd_render_png: bool
+    flowcharts_enabled: bool
+    flowcharts_dir: str
+    flowcharts_map: dict
+    hidden_fids: set
+    hidden_by_mod_unit: dict
+    docx_rows: dict
+    images: Any = None
+
+
+def _add_component_section(doc, ctx: "_ExportContext", sec_num: int, component_name: str) -> bool:
+    """Add section <sec_num> (Static Design, Dynamic Behaviour) for one component to *doc*.
+
+    Returns False when a diagram this section renders itself could not be rendered
+    (a rebuild may do better, so such a section is not cached)."""
+    from utils import safe_filename, KEY_SEP
+    from docx.shared import Inches
+    config = ctx.config
+    abbreviations = ctx.abbreviations
+    artifacts_dir = ctx.artifacts_dir
+    font_small = ctx.font_small
+    by_component = ctx.by_component
+    units_data, data_dictionary = ctx.units_data, ctx.data_dictionary
+    components_data = ctx.components_data
+    global_variables_data = ctx.global_variables_data
+    functions_data = ctx.functions_data
+    base_path = ctx.base_path
+    msd_enabled, msd_render_png = ctx.msd_enabled, ctx.msd_render_png
+    flowcharts_enabled, flowcharts_dir, flowcharts_map = ctx.flowcharts_enabled, ctx.flowcharts_dir, ctx.flowcharts_map
+    _hidden_fids, _hidden_by_mod_unit = ctx.hidden_fids, ctx.hidden_by_mod_unit
+    component_display = component_name.replace("-", " ")
+    complete = True
+    doc.add_heading(f"{sec_num} {component_display}", level=1)
+
+    # 2.1 Static Design
+    doc.add_heading(f"{sec_num}.1 Static Design", level=2)
+
+    unit_rows_component = sorted(by_component[component_name])
+    if msd_enabled and unit_rows_component:
+        # Container diagram: blue component subgraph with all units inside
+        container_mmd = _build_component_container_mermaid(component_display, unit_rows_component)
+        container_png = os.path.join(
+            artifacts_dir, "component_container_diagrams", f"{safe_filename(component_name)}.png"
+        )
+        if msd_render_png:
+            complete &= _render_mermaid_to_png(PROJECT_ROOT, container_mmd, container_png)
+        if os.path.isfile(container_png):
+            try:
+                doc.add_picture(_embed_path(ctx.images, container_png, 6), width=Inches(6))
+            except Exception:
+                _add_mermaid_as_text(doc, container_mmd, font_small)
+        else:
+            _add_mermaid_as_text(doc, container_mmd, font_small)
+        _add_horizontal_rule(doc)
+
+        # File dependency diagram: .cpp → .h include edges inside component
+        dep_mmd = _build_component_header_dependency_mermaid(component_name, unit_rows_component, units_data, components_data)
+        dep_png = os.path.join(
+            artifacts_dir, "component_header_dependency_diagrams", f"{safe_filename(component_name)}.png"
+        )
+        if msd_render_png:
+            complete &= _render_mermaid_to_png(PROJECT_ROOT, dep_mmd, dep_png)
+        if os.path.isfile(dep_png):
+            try:
+                doc.add_picture(_embed_path(ctx.images, dep_png, 6), width=Inches(6))
+            except Exception:
+                _add_mermaid_as_text(doc, dep_mmd, font_small)
+        else:
+            _add_mermaid_as_text(doc, dep_mmd, font_small)
+
+    # Module-level index table (Component/Unit/Description/Note)
+    _add_component_unit_table(
+        doc,
+        component_display,
+        unit_rows_component,
+        font_small,
+        config=config,
+        abbreviations=abbreviations,
+    )
+
+    unit_diag_dir = os.path.join(artifacts_dir, "unit_diagrams")
+    for unit_idx, (unit_key, unit_name_display, interfaces) in enumerate(unit_rows_component, start=1):
+        # 2.1.1 unit1
+        doc.add_heading(f"{sec_num}.1.{unit_idx} {unit_name_display}", level=3)
+
+        # Unit diagram (before unit header)
+        unit_png = os.path.join(unit_diag_dir, f"{safe_filename(unit_key)}.png")
+        if os.path.isfile(unit_png):
+            try:
+                doc.add_picture(_embed_path(ctx.images, unit_png, 6), width=Inches(6))
+            except Exception:
+                _add_para(doc, f"[Unit diagram: {unit_png}]")
+
+        # 2.1.1.1 unit header
+        doc.add_heading(f"{sec_num}.1.{unit_idx}.1 unit header", level=4)
+        unit_info = units_data.get(unit_key, {})
+        unit_header_rows = _build_unit_header_table(
+            unit_info,
+            interfaces,
+            data_dictionary,
+            global_variables_data,
+            base_path,
+            config,
+            abbreviations,
+        )
+        _add_unit_header_table(doc, unit_header_rows, font_small)
+
+        # 2.1.1.2 unit interface (table)
+        doc.add_heading(f"{sec_num}.1.{unit_idx}.2 unit interface", level=4)
+        _add_interface_table(doc, interfaces, font_small)
+
+        # 2.1.1.3, 2.1.1.4, ... per interface (functions only — globals have no flowchart section)
+        unit_name_flowchart = unit_key.split(KEY_SEP)[-1] if KEY_SEP in unit_key else unit_name_display
+        rendered_private_fids = set()  # track private flowcharts already shown in this unit
+        for iface_idx, iface in enumerate(
+            (i for i in interfaces if i.get("type") != "Global Variable"), start=3
+        ):
+            func_name = iface.get("name", "")
+            doc.add_heading(f"{sec_num}.1.{unit_idx}.{iface_idx} {unit_name_display}-{func_name}", level=4)
+            unit_prefix = unit_key.replace(KEY_SEP, "_").replace(" ", "_")
+            flowchart = (
+                flowcharts_map.get(unit_prefix, {}).get(func_name)
+                or flowcharts_map.get(unit_name_flowchart, {}).get(func_name)
+            ) if flowcharts_enabled and func_name else None
+            # Build flowcharts list: own flowchart + private callee flowcharts
+            flowcharts_list = []
+            if flowchart:
+                iface_params = ", ".join(
+                    f"{p.get('type', '')} {p.get('name', '')}".strip()
+                    for p in (iface.get("parameters") or [])
+                )
+                iface_return = iface.get("returnType", "") or ""
+                iface_signature = f"{iface_return} {func_name}({iface_params})".strip()
+                # Slice-aware: prefer {stem}_part_K_of_N.png (a tall flowchart split by
+                # views/flowcharts.py), else the single {stem}.png, else mermaid text.
+                base_stems = [
+                    f"{unit_prefix}_{safe_filename(func_name)}",
+                    f"{unit_name_flowchart}_{safe_filename(func_name)}",
+                ]
+                _append_flowchart_entries(
+                    flowcharts_list, flowcharts_dir, base_stems, flowchart, iface_signature
+                )
+
+            if flowcharts_enabled:
+                callee_fids = (functions_data.get(iface.get("functionId")) or {}).get("callsIds") or []
+                for callee_fid in callee_fids:
+                    if callee_fid in _hidden_fids:
+                        continue
+                    callee = functions_data.get(callee_fid) or {}
+                    if (callee.get("visibility") or "").lower() != "private":
+                        continue
+                    callee_parts = callee_fid.split(KEY_SEP)
+                    callee_unit_key = KEY_SEP.join(callee_parts[:2]) if len(callee_parts) >= 2 else ""
+                    callee_unit_prefix = callee_unit_key.replace(KEY_SEP, "_").replace(" ", "_")
+                    callee_unit_name = callee_parts[1] if len(callee_parts) > 1 else ""
+                    callee_qn = callee.get("qualifiedName", "")
+                    callee_func_name = callee_qn.split("::")[-1] if callee_qn else ""
+                    if not callee_func_name:
+                        continue
+                    callee_flowchart = (
+                        flowcharts_map.get(callee_unit_prefix, {}).get(callee_func_name)
+                        or flowcharts_map.get(callee_unit_name, {}).get(callee_func_name)
+                    )
+                    if not callee_flowchart:
+                        continue
+                    if callee_fid in rendered_private_fids:
+                        continue
+                    rendered_private_fids.add(callee_fid)
+                    callee_params = ", ".join(
+                        f"{p.get('type', '')} {p.get('name', '')}".strip()
+                        for p in (callee.get("params") or callee.get("parameters") or [])
+                    )
+                    callee_return = callee.get("returnType", "")
+                    callee_signature = f"{callee_return} {callee_func_name}({callee_params})".strip()
+                    callee_stems = [
+                        f"{callee_unit_prefix}_{safe_filename(callee_func_name)}",
+                        f"{callee_unit_name}_{safe_filename(callee_func_name)}",
+                    ]
+                    _append_flowchart_entries(
+                        flowcharts_list, flowcharts_dir, callee_stems, callee_flowchart, callee_signature
+                    )
+
+            if flowcharts_list:
+                input_label = (functions_data.get(iface.get("functionId")) or {}).get("behaviourInputName") or \
+                    (_readable_label(func_name) + " input").strip() if func_name else ""
+                output_label = (functions_data.get(iface.get("functionId")) or {}).get("behaviourOutputName") or \
+                    (_readable_label(func_name) + " result").strip() if func_name else ""
+                _add_flowchart_table(doc, func_name, iface.get("description", ""),
+                    input_label, output_label, flowcharts_list, font_small, images=ctx.images)
+            else:
+                _add_para(doc, iface.get("description", "") or "-")
+
+    # 2.2 Dynamic Behaviour: one sub-header per external call (from view output)
+    doc.add_heading(f"{sec_num}.2 Dynamic Behaviour", level=2)
+    docx_rows = ctx.docx_rows
+    beh_idx = 0
+    for unit_name, entries in sorted((docx_rows.get(component_name) or {}).items()):
+        for row in entries:
+            current_fn = row.get("currentFunctionName", "") or ""
+            if current_fn in _hidden_by_mod_unit.get((component_name, unit_name), set()):
+                continue
+            beh_idx += 1
+            ext = row.get("externalUnitFunction", "")
+            subheader = f"{unit_name} - {current_fn}"
+            if ext:
+                subheader += f" ({ext})"
+            doc.add_heading(f"{sec_num}.2.{beh_idx} {subheader}", level=3)
+            # Prefer precomputed behaviourInputName / behaviourOutputName from model_deriver
+            input_label = ""
+            output_label = ""
+            try:
+                for fid, f in (functions_data or {}).items():
+                    parts = fid.split("|")
+                    if len(parts) < 3:
+                        continue
+                    mod, unit, _ = parts[0], parts[1], parts[2]
+                    if mod != component_name or unit != unit_name:
+                        continue
+                    qn = f.get("qualifiedName", "") or ""
+                    base_name = qn.split("::")[-1] if qn else ""
+                    if base_name != current_fn:
+                        continue
+                    input_label = (f.get("behaviourInputName") or "").strip()
+                    output_label = (f.get("behaviourOutputName") or "").strip()
+                    break
+            except Exception:
+                input_label = input_label or ""
+                output_label = output_label or ""
+
+            # Fallback if model is old/missing fields
+            if not input_label:
+                base_fn_label = _readable_label(current_fn)
+                input_label = (base_fn_label + " input").strip() if base_fn_label else "Behaviour input"
+            if not output_label:
+                base_fn_label = _readable_label(current_fn)
+                output_label = (base_fn_label + " result").strip() if base_fn_label else "Behaviour result"
+
+            _add_behavior_description_table(doc, row.get("behaviorDescription", None), input_label, output_label)
+            p = doc.add_paragraph()
+            r = p.add_run("Behaviour")
+            r.bold = True
+            png_path = row.get("pngPath")
+            if png_path and os.path.isfile(png_path):
+                try:
+                    doc.add_picture(_embed_path(ctx.images, png_path, 6), width=Inches(6))
+                except Exception:
+                    _add_para(doc, f"[Behaviour diagram: {png_path}]")
+            elif png_path:
+                _add_para(doc, f"[Behaviour diagram: {png_path}]")
+    return complete
+
+
+def _spool_component_section(ctx: _ExportContext, sec_num: int, component_name: str,
+                             spool_dir: str) -> Tuple[Any, bool, bool]:
+    """Build one component section in its own Document and spool it to *spool_dir*.
+
+    Returns (SectionFragment, failed, complete). A section that raises is replaced by
+    its heading and a note; only that section is lost. Only complete sections are cached.
+    """
+    from docx import Document
+    from docx_stream import spool_section, track_image_sources
+    sec_doc = Document()
+    sources = track_image_sources(sec_doc)
+    failed = False
+    try:
+        complete = _add_component_section(sec_doc, ctx, sec_num, component_name)
+    except Exception as exc:
+        from core.logging_setup import get_logger
+        get_logger("docx_exporter").exception("component %s: section could not be generated", component_name)
+        sec_doc = Document()
+        sources = {}
+        sec_doc.add_heading(f"{sec_num} {component_name.replace('-', ' ')}", level=1)
+        _add_para(sec_doc, f"[Section could not be generated: {exc}]")
+        failed, complete = True, False
+    fragment = spool_section(sec_doc, sources, os.path.join(spool_dir, f"{sec_num}.xml"))
+    # A python-docx package and its parts reference each other, so the section's
+    # lxml tree and image blobs are only released by the cycle collector.
+    del sec_doc, sources
+    gc.collect()
+    return fragment, failed, complete
+
+
+def _file_sha1(path: str, memo: Dict[str, str]) -> str:
+    """sha1 of a file's bytes (memoized per export; "" when missing or unreadable)."""
+    h = memo.get(path)
+    if h is None:
+        import hashlib
+        try:
+            with open(path, "rb") as f:
+                h = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            h = ""
+        memo[path] = h
+    return h
+
+
+def _pil_version() -> str:
+    """Pillow version ("" when not installed): it decides how pictures are downsampled."""
+    try:
+        import PIL
+    except ImportError:
+        return ""
+    return getattr(PIL, "__version__", "")
+
+
+def _section_keys(ctx: _ExportContext, jobs: List[Tuple[int, str]]) -> List[str]:
+    """Section cache key of each (sec_num, component) job (see core/section_cache.py).
+
+    Digests everything _add_component_section reads for the component: its rows and
+    unit header rows, its functions and their private callees, the flowchart texts and
+    the bytes of every PNG it may embed, the mermaid of the diagrams it renders itself,
+    its behaviour rows, the config and the exporter's own source.
+    """
+    import hashlib
+    import docx
     from utils import safe_filename, KEY_SEP
+    from core.section_cache import FORMAT_VERSION
+    file_hashes: Dict[str, str] = {}
+    common = json.dumps([
+        FORMAT_VERSION, _file_sha1(os.path.abspath(__file__), file_hashes),
+        getattr(docx, "__version__", ""), ctx.config, ctx.abbreviations, ctx.font_small,
+        ctx.artifacts_dir, ctx.base_path, ctx.msd_enabled, ctx.msd_render_png,
+        ctx.flowcharts_enabled, ctx.images, _pil_version(),
+    ], sort_keys=True, default=str)
+    try:
+        flowchart_pngs = sorted(n for n in os.listdir(ctx.flowcharts_dir) if n.lower().endswith(".png")) \
+            if ctx.flowcharts_enabled else []
+    except OSError:
+        flowchart_pngs = []
+    funcs_by_component: Dict[str, dict] = {}
+    for fid, f in ctx.functions_data.items():
+        funcs_by_component.setdefault(fid.split(KEY_SEP, 1)[0], {})[fid] = f
+    unit_diag_dir = os.path.join(ctx.artifacts_dir, "unit_diagrams")
+
+    keys = []
+    for sec_num, component_name in jobs:
+        unit_rows = sorted(ctx.by_component[component_name])
+        funcs = dict(funcs_by_component.get(component_name) or {})
+        for _, _, interfaces in unit_rows:
+            for iface in interfaces:
+                fid = iface.get("functionId")
+                if fid in ctx.functions_data:
+                    funcs[fid] = ctx.functions_data[fid]
+        for f in list(funcs.values()):
+            for callee_fid in f.get("callsIds") or []:
+                if callee_fid in ctx.functions_data:
+                    funcs[callee_fid] = ctx.functions_data[callee_fid]
+        # Flowcharts are looked up as <unit prefix>_<function> and <unit name>_<function>.
+        flowchart_units = set()
+        for unit_key, unit_name_display, _ in unit_rows:
+            flowchart_units.add(unit_key.replace(KEY_SEP, "_").replace(" ", "_"))
+            flowchart_units.add(unit_key.split(KEY_SEP)[-1] if KEY_SEP in unit_key else unit_name_display)
+        for fid in funcs:
+            parts = fid.split(KEY_SEP)
+            if len(parts) >= 2:
+                flowchart_units.add(KEY_SEP.join(parts[:2]).replace(KEY_SEP, "_").replace(" ", "_"))
+                flowchart_units.add(parts[1])
+        prefixes = tuple(f"{u}_" for u in flowchart_units)
+        units = []
+        for unit_key, _, interfaces in unit_rows:
+            unit_info = ctx.units_data.get(unit_key, {})
+            units.append([
+                unit_info,
+                _build_unit_header_table(unit_info, interfaces, ctx.data_dictionary,
+                                         ctx.global_variables_data, ctx.base_path,
+                                         ctx.config, ctx.abbreviations),
+                _file_sha1(os.path.join(unit_diag_dir, f"{safe_filename(unit_key)}.png"), file_hashes),
+            ])
+        diagrams = []
+        if ctx.msd_enabled and unit_rows:
+            diagrams = [
+                _build_component_container_mermaid(component_name.replace("-", " "), unit_rows),
+                _build_component_header_dependency_mermaid(component_name, unit_rows, ctx.units_data,
+                                                           ctx.components_data),
+            ]
+        behaviour = ctx.docx_rows.get(component_name) or {}
+        payload = json.dumps([
+            sec_num, component_name, unit_rows, units, funcs, diagrams,
+            {u: ctx.flowcharts_map.get(u) for u in sorted(flowchart_units)},
+            [(n, _file_sha1(os.path.join(ctx.flowcharts_dir, n), file_hashes))
+             for n in flowchart_pngs if n.startswith(prefixes)],
+            behaviour,
+            [_file_sha1(row.get("pngPath"), file_hashes) for entries in behaviour.values()
+             for row in entries if row.get("pngPath")],
+        ], sort_keys=True, default=str)
+        keys.append(hashlib.sha256(f"{common}\x1f{payload}".encode("utf-8")).hexdigest())
+    return keys
+
+
+def _section_workers(config: dict, n_components: int) -> int:
+    """Worker processes for section generation (docx.sectionWorkers, default: all cores)."""
+    raw = (config.get("docx") or {}).get("sectionWorkers")
+    try:
+        workers = int(raw) if raw is not None else (os.cpu_count() or 1)
+    except (TypeError, ValueError):
+        workers = 1
+    return max(1, min(workers, n_components))
+
+
+# Export context of a section worker process, set once by _init_section_worker.
+_WORKER_CTX: Optional[_ExportContext] = None
+
+
+def _init_section_worker(ctx_fields: dict) -> None:
+    global _WORKER_CTX
+    _WORKER_CTX = _ExportContext(**ctx_fields)
+
+
+def _section_worker(sec_num: int, component_name: str, spool_dir: str) -> Tuple[Any, bool, bool]:
+    return _spool_component_section(_WORKER_CTX, sec_num, component_name, spool_dir)
+
+
+def _spool_sections_parallel(ctx: _ExportContext, jobs: List[Tuple[int, str]], spool_dir: str,
+                             workers: int, progress) -> List[Tuple[Any, bool, bool]]:
+    """Build and spool sections in *workers* processes; results come back in *jobs* order.
+
+    Sections only share read-only inputs and each is spooled to its own file, so they
+    can be built in any order; assemble() merges them in section order afterwards.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    # Go through the importable module: when this file runs as __main__ (the Phase 4
+    # subprocess), worker processes could not resolve pickled references to __main__.
+    import docx_exporter as mod
+    results: List[Optional[Tuple[Any, bool, bool]]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=mod._init_section_worker,
+                             initargs=(vars(ctx),)) as pool:
+        futures = {pool.submit(mod._section_worker, sec_num, name, spool_dir): i
+                   for i, (sec_num, name) in enumerate(jobs)}
+        try:
+            for fut in as_completed(futures):
+                i = futures[fut]
+                progress.step(label=jobs[i][1].replace("-", " "))
+                results[i] = fut.result()
+        except BaseException:
+            for fut in futures:
+                fut.cancel()
+            raise
+    return results
+
+
+def export_docx(json_path: str = None, docx_path: str = None, selected_group: str | None = None, selected_components: list | None = None) -> Tuple[bool, Optional[str]]:
+    from utils import KEY_SEP
     from core.config import app_config
     config = app_config()
     json_path = json_path or os.path.join(OUTPUT_DIR, "interface_tables.json")
@@ -1230,7 +1694,7 @@ def export_docx(json_path: str = None, docx_path: str = None, selected_group: st
 
     try:
         from docx import Document
-        from docx.shared import Pt, Inches
+        from docx.shared import Pt
         font_small = Pt(font_size)
     except ImportError:
         print("Error: python-docx not installed. pip install python-docx")
@@ -1364,239 +1828,81 @@ def export_docx(json_path: str = None, docx_path: str = None, selected_group: st
     # 2, 3, ... Modules
     from core.progress import ProgressReporter
     from core.logging_setup import get_logger
+    _log = get_logger("docx_exporter")
+    docx_rows = {}
+    pngs_path = os.path.join(artifacts_dir, "behaviour_diagrams", "_behaviour_pngs.json")
+    if os.path.isfile(pngs_path):
+        try:
+            with open(pngs_path, "r", encoding="utf-8") as f:
+                docx_rows = json.load(f).get("_docxRows", {})
+        except (json.JSONDecodeError, IOError):
+            pass
+    from docx_images import ImageStage, size_report
+    ctx = _ExportContext(
+        config=config, abbreviations=abbreviations, artifacts_dir=artifacts_dir,
+        font_small=font_small, by_component=by_component,
+        units_data=units_data, data_dictionary=data_dictionary,
+        components_data=components_data, global_variables_data=global_variables_data,
+        functions_data=functions_data, base_path=base_path,
+        msd_enabled=msd_enabled, msd_render_png=msd_render_png,
+        flowcharts_enabled=flowcharts_enabled, flowcharts_dir=flowcharts_dir,
+        flowcharts_map=flowcharts_map, hidden_fids=_hidden_fids,
+        hidden_by_mod_unit=_hidden_by_mod_unit, docx_rows=docx_rows,
+        images=ImageStage.from_config(config, SECTION_CACHE_DIR),
+    )
+    # Streamed: each section is built in its own Document and spooled to disk (docx_stream.py);
+    # the base document gets a marker paragraph where the sections are merged in on save.
+    stream = bool(config.get("docx", {}).get("streamSections", True))
+    fragments, failed = [], []
+    os.makedirs(os.path.dirname(docx_path) or ".", exist_ok=True)
+    if stream:
+        from docx_stream import SECTION_MARKER, assemble
+        spool_dir = tempfile.mkdtemp(prefix=".sections_", dir=os.path.dirname(docx_path) or ".")
+        _add_para(doc, SECTION_MARKER)
     n_components = len(sorted_components)
-    _docx_progress = ProgressReporter("docx_exporter", total=n_components, logger=get_logger("docx_exporter"))
+    _docx_progress = ProgressReporter("docx_exporter", total=n_components, logger=_log)
     _docx_progress.start()
-    for sec_idx, component_name in enumerate(sorted_components, start=0):
-        sec_num = sec_idx + 2
-        component_display = component_name.replace("-", " ")
-        _docx_progress.step(label=component_display)
-        doc.add_heading(f"{sec_num} {component_display}", level=1)
-
-        # 2.1 Static Design
-        doc.add_heading(f"{sec_num}.1 Static Design", level=2)
-
-        unit_rows_component = sorted(by_component[component_name])
-        if msd_enabled and unit_rows_component:
-            # Container diagram: blue component subgraph with all units inside
-            container_mmd = _build_component_container_mermaid(component_display, unit_rows_component)
-            container_png = os.path.join(
-                artifacts_dir, "component_container_diagrams", f"{safe_filename(component_name)}.png"
-            )
-            if msd_render_png:
-                _render_mermaid_to_png(PROJECT_ROOT, container_mmd, container_png)
-            if os.path.isfile(container_png):
-                try:
-                    doc.add_picture(container_png, width=Inches(6))
-                except Exception:
-                    _add_mermaid_as_text(doc, container_mmd, font_small)
-            else:
-                _add_mermaid_as_text(doc, container_mmd, font_small)
-            _add_horizontal_rule(doc)
-
-            # File dependency diagram: .cpp → .h include edges inside component
-            dep_mmd = _build_component_header_dependency_mermaid(component_name, unit_rows_component, units_data, components_data)
-            dep_png = os.path.join(
-                artifacts_dir, "component_header_dependency_diagrams", f"{safe_filename(component_name)}.png"
-            )
-            if msd_render_png:
-                _render_mermaid_to_png(PROJECT_ROOT, dep_mmd, dep_png)
-            if os.path.isfile(dep_png):
-                try:
-                    doc.add_picture(dep_png, width=Inches(6))
-                except Exception:
-                    _add_mermaid_as_text(doc, dep_mmd, font_small)
-            else:
-                _add_mermaid_as_text(doc, dep_mmd, font_small)
-
-        # Module-level index table (Component/Unit/Description/Note)
-        _add_component_unit_table(
-            doc,
-            component_display,
-            unit_rows_component,
-            font_small,
-            config=config,
-            abbreviations=abbreviations,
-        )
-
-        unit_diag_dir = os.path.join(artifacts_dir, "unit_diagrams")
-        for unit_idx, (unit_key, unit_name_display, interfaces) in enumerate(unit_rows_component, start=1):
-            # 2.1.1 unit1
-            doc.add_heading(f"{sec_num}.1.{unit_idx} {unit_name_display}", level=3)
-
-            # Unit diagram (before unit header)
-            unit_png = os.path.join(unit_diag_dir, f"{safe_filename(unit_key)}.png")
-            if os.path.isfile(unit_png):
-                try:
-                    doc.add_picture(unit_png, width=Inches(6))
-                except Exception:
-                    _add_para(doc, f"[Unit diagram: {unit_png}]")
-
-            # 2.1.1.1 unit header
-            doc.add_heading(f"{sec_num}.1.{unit_idx}.1 unit header", level=4)
-            unit_info = units_data.get(unit_key, {})
-            unit_header_rows = _build_unit_header_table(
-                unit_info,
-                interfaces,
-                data_dictionary,
-                global_variables_data,
-                base_path,
-                config,
-                abbreviations,
-            )
-            _add_unit_header_table(doc, unit_header_rows, font_small)
-
-            # 2.1.1.2 unit interface (table)
-            doc.add_heading(f"{sec_num}.1.{unit_idx}.2 unit interface", level=4)
-            _add_interface_table(doc, interfaces, font_small)
-
-            # 2.1.1.3, 2.1.1.4, ... per interface (functions only — globals have no flowchart section)
-            unit_name_flowchart = unit_key.split(KEY_SEP)[-1] if KEY_SEP in unit_key else unit_name_display
-            rendered_private_fids = set()  # track private flowcharts already shown in this unit
-            for iface_idx, iface in enumerate(
-                (i for i in interfaces if i.get("type") != "Global Variable"), start=3
-            ):
-                func_name = iface.get("name", "")
-                doc.add_heading(f"{sec_num}.1.{unit_idx}.{iface_idx} {unit_name_display}-{func_name}", level=4)
-                unit_prefix = unit_key.replace(KEY_SEP, "_").replace(" ", "_")
-                flowchart = (
-                    flowcharts_map.get(unit_prefix, {}).get(func_name)
-                    or flowcharts_map.get(unit_name_flowchart, {}).get(func_name)
-                ) if flowcharts_enabled and func_name else None
-                # Build flowcharts list: own flowchart + private callee flowcharts
-                flowcharts_list = []
-                if flowchart:
-                    iface_params = ", ".join(
-                        f"{p.get('type', '')} {p.get('name', '')}".strip()
-                        for p in (iface.get("parameters") or [])
-                    )
-                    iface_return = iface.get("returnType", "") or ""
-                    iface_signature = f"{iface_return} {func_name}({iface_params})".strip()
-                    # Slice-aware: prefer {stem}_part_K_of_N.png (a tall flowchart split by
-                    # views/flowcharts.py), else the single {stem}.png, else mermaid text.
-                    base_stems = [
-                        f"{unit_prefix}_{safe_filename(func_name)}",
-                        f"{unit_name_flowchart}_{safe_filename(func_name)}",
-                    ]
-                    _append_flowchart_entries(
-                        flowcharts_list, flowcharts_dir, base_stems, flowchart, iface_signature
-                    )
-
-                if flowcharts_enabled:
-                    callee_fids = (functions_data.get(iface.get("functionId")) or {}).get("callsIds") or []
-                    for callee_fid in callee_fids:
-                        if callee_fid in _hidden_fids:
-                            continue
-                        callee = functions_data.get(callee_fid) or {}
-                        if (callee.get("visibility") or "").lower() != "private":
-                            continue
-                        callee_parts = callee_fid.split(KEY_SEP)
-                        callee_unit_key = KEY_SEP.join(callee_parts[:2]) if len(callee_parts) >= 2 else ""
-                        callee_unit_prefix = callee_unit_key.replace(KEY_SEP, "_").replace(" ", "_")
-                        callee_unit_name = callee_parts[1] if len(callee_parts) > 1 else ""
-                        callee_qn = callee.get("qualifiedName", "")
-                        callee_func_name = callee_qn.split("::")[-1] if callee_qn else ""
-                        if not callee_func_name:
-                            continue
-                        callee_flowchart = (
-                            flowcharts_map.get(callee_unit_prefix, {}).get(callee_func_name)
-                            or flowcharts_map.get(callee_unit_name, {}).get(callee_func_name)
-                        )
-                        if not callee_flowchart:
-                            continue
-                        if callee_fid in rendered_private_fids:
-                            continue
-                        rendered_private_fids.add(callee_fid)
-                        callee_params = ", ".join(
-                            f"{p.get('type', '')} {p.get('name', '')}".strip()
-                            for p in (callee.get("params") or callee.get("parameters") or [])
-                        )
-                        callee_return = callee.get("returnType", "")
-                        callee_signature = f"{callee_return} {callee_func_name}({callee_params})".strip()
-                        callee_stems = [
-                            f"{callee_unit_prefix}_{safe_filename(callee_func_name)}",
-                            f"{callee_unit_name}_{safe_filename(callee_func_name)}",
-                        ]
-                        _append_flowchart_entries(
-                            flowcharts_list, flowcharts_dir, callee_stems, callee_flowchart, callee_signature
-                        )
-
-                if flowcharts_list:
-                    input_label = (functions_data.get(iface.get("functionId")) or {}).get("behaviourInputName") or \
-                        (_readable_label(func_name) + " input").strip() if func_name else ""
-                    output_label = (functions_data.get(iface.get("functionId")) or {}).get("behaviourOutputName") or \
-                        (_readable_label(func_name) + " result").strip() if func_name else ""
-                    _add_flowchart_table(doc, func_name, iface.get("description", ""),
-                        input_label, output_label, flowcharts_list, font_small)
-                else:
-                    _add_para(doc, iface.get("description", "") or "-")
-
-        # 2.2 Dynamic Behaviour: one sub-header per external call (from view output)
-        doc.add_heading(f"{sec_num}.2 Dynamic Behaviour", level=2)
-        docx_rows = {}
-        pngs_path = os.path.join(artifacts_dir, "behaviour_diagrams", "_behaviour_pngs.json")
-        if os.path.isfile(pngs_path):
-            try:
-                with open(pngs_path, "r", encoding="utf-8") as f:
-                    docx_rows = json.load(f).get("_docxRows", {})
-            except (json.JSONDecodeError, IOError):
-                pass
-        beh_idx = 0
-        for unit_name, entries in sorted((docx_rows.get(component_name) or {}).items()):
-            for row in entries:
-                current_fn = row.get("currentFunctionName", "") or ""
-                if current_fn in _hidden_by_mod_unit.get((component_name, unit_name), set()):
-                    continue
-                beh_idx += 1
-                ext = row.get("externalUnitFunction", "")
-                subheader = f"{unit_name} - {current_fn}"
-                if ext:
-                    subheader += f" ({ext})"
-                doc.add_heading(f"{sec_num}.2.{beh_idx} {subheader}", level=3)
-                # Prefer precomputed behaviourInputName / behaviourOutputName from model_deriver
-                input_label = ""
-                output_label = ""
-                try:
-                    for fid, f in (functions_data or {}).items():
-                        parts = fid.split("|")
-                        if len(parts) < 3:
-                            continue
-                        mod, unit, _ = parts[0], parts[1], parts[2]
-                        if mod != component_name or unit != unit_name:
-                            continue
-                        qn = f.get("qualifiedName", "") or ""
-                        base_name = qn.split("::")[-1] if qn else ""
-                        if base_name != current_fn:
-                            continue
-                        input_label = (f.get("behaviourInputName") or "").strip()
-                        output_label = (f.get("behaviourOutputName") or "").strip()
-                        break
-                except Exception:
-                    input_label = input_label or ""
-                    output_label = output_label or ""
-
-                # Fallback if model is old/missing fields
-                if not input_label:
-                    base_fn_label = _readable_label(current_fn)
-                    input_label = (base_fn_label + " input").strip() if base_fn_label else "Behaviour input"
-                if not output_label:
-                    base_fn_label = _readable_label(current_fn)
-                    output_label = (base_fn_label + " result").strip() if base_fn_label else "Behaviour result"
-
-                _add_behavior_description_table(doc, row.get("behaviorDescription", None), input_label, output_label)
-                p = doc.add_paragraph()
-                r = p.add_run("Behaviour")
-                r.bold = True
-                png_path = row.get("pngPath")
-                if png_path and os.path.isfile(png_path):
-                    try:
-                        doc.add_picture(png_path, width=Inches(6))
-                    except Exception:
-                        _add_para(doc, f"[Behaviour diagram: {png_path}]")
-                elif png_path:
-                    _add_para(doc, f"[Behaviour diagram: {png_path}]")
-
-    _docx_progress.done(summary=f"{n_components} components written")
+    jobs = [(sec_idx + 2, component_name) for sec_idx, component_name in enumerate(sorted_components)]
+    # Section cache (core/section_cache.py): sections whose inputs are unchanged since an
+    # earlier export are merged from .docx_cache/ instead of being rebuilt.
+    section_cache, cache_keys = None, []
+    if stream and config.get("docx", {}).get("sectionCache", True):
+        from core.section_cache import SectionCache
+        from docx_stream import SectionFragment
+        section_cache = SectionCache(SECTION_CACHE_DIR)
+        cache_keys = _section_keys(ctx, jobs)
+    results: List[Optional[Tuple[Any, bool, bool]]] = [None] * n_components
+    if section_cache is not None:
+        for i, (_, component_name) in enumerate(jobs):
+            hit = section_cache.lookup(cache_keys[i])
+            if hit:
+                _docx_progress.step(label=component_name.replace("-", " "))
+                results[i] = (SectionFragment(xml_path=hit[0], images=hit[1]), False, True)
+    todo = [i for i, r in enumerate(results) if r is None]
+    todo_jobs = [jobs[i] for i in todo]
+    workers = _section_workers(config, len(todo_jobs)) if stream else 1
+    if not stream:
+        for sec_num, component_name in jobs:
+            _docx_progress.step(label=component_name.replace("-", " "))
+            _add_component_section(doc, ctx, sec_num, component_name)
+    elif workers > 1:
+        built = _spool_sections_parallel(ctx, todo_jobs, spool_dir, workers, _docx_progress)
+    else:
+        built = []
+        for sec_num, component_name in todo_jobs:
+            _docx_progress.step(label=component_name.replace("-", " "))
+            built.append(_spool_component_section(ctx, sec_num, component_name, spool_dir))
+    if stream:
+        for i, result in zip(todo, built):
+            results[i] = result
+            fragment, _, complete = result
+            if section_cache is not None and complete:
+                section_cache.save(cache_keys[i], fragment.xml_path, fragment.images)
+        fragments = [fragment for fragment, _, _ in results]
+        failed = [name for (_, name), (_, sec_failed, _) in zip(jobs, results) if sec_failed]
+
+    _docx_progress.done(summary=f"{n_components} components written"
+                        + (f", {len(failed)} failed" if failed else ""))
     # N Code Metrics, Coding rule, test coverage
     metrics_sec = len(sorted_components) + 2
     doc.add_heading(f"{metrics_sec} Code Metrics, Coding Rule, Test Coverage", level=1)
@@ -1606,8 +1912,33 @@ def export_docx(json_path: str = None, docx_path: str = None, selected_group: st
     doc.add_heading("Appendix A. Design Guideline", level=1)
     _add_para(doc, "[Design guidelines.]")
 
-    os.makedirs(os.path.dirname(docx_path) or ".", exist_ok=True)
-    doc.save(docx_path)
+    if not stream:
+        doc.save(docx_path)
+    else:
+        try:
+            n_media = assemble(doc, fragments, docx_path)
+        finally:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+        _log.info("docx_exporter: %d sections merged, %d images", len(fragments), n_media)
+    _size = size_report(docx_path)
+    _log.info("docx_exporter: %s: %d KiB (document.xml %d KiB, %d media parts %d KiB; images %s)",
+              os.path.basename(docx_path), _size["total"] // 1024, _size["document"] // 1024,
+              _size["media"], _size["media_bytes"] // 1024,
+              f"at {ctx.images.dpi} DPI" + (", palette" if ctx.images.palette else "")
+              if ctx.images.dpi else "as rendered")
+    # .docx_cache/ holds the cached sections and the downsampled PNGs; keep this export's.
+    from core.section_cache import DEFAULT_MAX_MB, prune
+    _max_mb = int(config.get("docx", {}).get("sectionCacheMaxMB") or DEFAULT_MAX_MB)
+    _keep = set(cache_keys) | {
+        os.path.splitext(os.path.basename(img[0]))[0]
+        for fragment in fragments for img in fragment.images
+        if os.path.dirname(img[0]) == os.path.abspath(SECTION_CACHE_DIR)
+    }
+    _evicted = prune(SECTION_CACHE_DIR, _max_mb * 1024 * 1024, keep=_keep)
+    if section_cache is not None:
+        _log.info("docx_exporter: section cache: %d reused, %d built, %d stored%s",
+                  section_cache.hits, len(todo_jobs), section_cache.saved,
+                  f", {_evicted} evicted" if _evicted else "")
     return (True, docx_path)
 
 
@@ -0,0 +1,122 @@
+"""Embed-size PNGs for docx_exporter.
+
+Diagrams are rendered by mmdc at `scale=2` and embedded at a fixed width (4" for
+flowcharts, 6" for component, unit and behaviour diagrams), so most of them carry
+far more pixels than Word can show at print resolution. Before a
+picture is added, ImageStage.prepare() downsamples it to `docx.imageDpi` for its
+embed width and, with `docx.imagePalette`, converts it to an 8-bit palette PNG
+(diagrams use a handful of flat colours). The result is written once per distinct
+(source bytes, width, settings) to `<project_root>/.docx_cache/<key>.png` and reused
+by every later export; byte-identical results share one media part in the package
+(python-docx and docx_stream.assemble() both dedupe by content).
+
+Pillow is optional (as for the flowchart slicer): without it, or for a picture that
+is already small enough, the source PNG is embedded unchanged.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from dataclasses import dataclass
+from typing import Dict
+
+# Bump when the resampling / encoding below changes — every derived PNG is rebuilt.
+STAGE_VERSION = "1"
+DEFAULT_DPI = 200
+
+
+@dataclass
+class ImageStage:
+    """Downsample pictures to *dpi* at their embed width (0 = embed as rendered).
+
+    Derived PNGs go to *cache_dir* (the section cache directory, so its size budget
+    and LRU eviction cover them).
+    """
+    cache_dir: str
+    dpi: int = DEFAULT_DPI
+    palette: bool = False
+
+    @classmethod
+    def from_config(cls, config: dict, cache_dir: str) -> "ImageStage":
+        docx_cfg = config.get("docx", {})
+        try:
+            dpi = int(docx_cfg.get("imageDpi", DEFAULT_DPI) or 0)
+        except (TypeError, ValueError):
+            dpi = DEFAULT_DPI
+        return cls(cache_dir=cache_dir, dpi=max(0, dpi), palette=bool(docx_cfg.get("imagePalette", False)))
+
+    def prepare(self, png_path: str, width_in: float) -> str:
+        """Return the path to embed for *png_path* shown *width_in* inches wide.
+
+        Best-effort: any failure returns *png_path* unchanged."""
+        if self.dpi <= 0:
+            return png_path
+        try:
+            from PIL import Image
+        except ImportError:
+            return png_path
+        target_w = max(1, int(round(width_in * self.dpi)))
+        try:
+            with open(png_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return png_path
+        key = hashlib.sha1(
+            f"{STAGE_VERSION}\x1f{hashlib.sha1(data).hexdigest()}\x1f{target_w}\x1f{self.dpi}"
+            f"\x1f{int(self.palette)}".encode("utf-8")
+        ).hexdigest()
+        out_path = os.path.join(self.cache_dir, f"{key}.png")
+        if os.path.isfile(out_path):
+            try:
+                os.utime(out_path, None)  # LRU marker for section_cache.prune()
+            except OSError:
+                pass
+            return out_path
+        tmp = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                resized = img.width > target_w
+                if not resized and not self.palette:
+                    return png_path
+                img.load()
+                if resized:
+                    height = max(1, int(round(img.height * target_w / img.width)))
+                    # Whole factors (scale=2 renders) by box averaging: exact for them and
+                    # several times faster than a Lanczos pass over the full image.
+                    factor = img.width // target_w
+                    if factor >= 2:
+                        img = img.reduce(factor)
+                    if img.size != (target_w, height):
+                        img = img.resize((target_w, height), Image.LANCZOS)
+                if self.palette and img.mode != "P":
+                    img = img.convert("RGBA").quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+                buf = io.BytesIO()
+                img.save(buf, format="PNG", dpi=(self.dpi, self.dpi))
+            if not resized and buf.tell() >= len(data):
+                return png_path  # palette conversion alone did not pay off
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(buf.getvalue())
+            os.replace(tmp, out_path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return png_path
+        return out_path
+
+
+def size_report(docx_path: str) -> Dict[str, int]:
+    """Sizes of a written DOCX: {total, document, media, media_bytes} (bytes / part count)."""
+    report = {"total": os.path.getsize(docx_path), "document": 0, "media": 0, "media_bytes": 0}
+    with zipfile.ZipFile(docx_path) as z:
+        for info in z.infolist():
+            if info.filename == "word/document.xml":
+                report["document"] = info.file_size
+            elif info.filename.startswith("word/media/"):
+                report["media"] += 1
+                report["media_bytes"] += info.compress_size
+    return report
@@ -0,0 +1,195 @@
+"""Section-at-a-time DOCX assembly for docx_exporter.
+
+python-docx keeps a whole Document in memory until save(): every table, and the
+bytes of every embedded PNG. For a group with thousands of flowcharts that is
+the Phase 4 memory peak, and one exception anywhere loses the whole file.
+
+Here each component section is built in its own Document. spool_section() writes
+the section body to an XML file on disk and records its pictures as (source path,
+extension, content type) references, so the Document and its image blobs can be
+dropped before the next section is built. assemble() streams the base document
+(cover, TOC, introduction, trailer), the spooled sections in order and the image
+files (copied from disk, one media part per distinct image) into the final ZIP.
+
+Every section Document comes from the same default template as the base, so
+style ids, numbering and the TOC field resolve against the base's parts.
+"""
+
+import io
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# Text of the placeholder paragraph the component sections replace in the base document.
+SECTION_MARKER = "[[docx-sections]]"
+
+# Section-local picture references are rewritten to <token><n> when spooled and to a
+# package-wide relationship id when assembled; base documents never use this prefix.
+_RID_TOKEN = "rIdSdd"
+_EMBED_RE = re.compile(rb'(:embed=")' + _RID_TOKEN.encode() + rb'(\d+)(")')
+_DOCPR_RE = re.compile(rb'(<wp:docPr id=")(\d+)(")')
+
+_RT_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+_NS_PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_NS_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+
+@dataclass
+class SectionFragment:
+    """One spooled section: body XML on disk plus the pictures it references.
+
+    images[n] is (source_path, ext, content_type, sha1) for the <token>n reference.
+    """
+    xml_path: str
+    images: List[Tuple[str, str, str, str]] = field(default_factory=list)
+
+
+def track_image_sources(doc) -> Dict[str, str]:
+    """Record the file each picture of *doc* was added from.
+
+    Returns a dict {image part name -> source path} that fills in as
+    add_picture() is called with a path, so spool_section() can reference the
+    file instead of the blob python-docx read from it.
+    """
+    sources: Dict[str, str] = {}
+    package = doc.part.package
+    get_or_add = package.get_or_add_image_part
+
+    def _get_or_add_image_part(image_descriptor):
+        part = get_or_add(image_descriptor)
+        if isinstance(image_descriptor, str):
+            sources.setdefault(str(part.partname), os.path.abspath(image_descriptor))
+        return part
+
+    package.get_or_add_image_part = _get_or_add_image_part
+    return sources
+
+
+def spool_section(doc, sources: Dict[str, str], xml_path: str) -> SectionFragment:
+    """Write the body of *doc* (without its sectPr) to *xml_path*.
+
+    Picture relationship ids are replaced by section-local tokens. A picture not
+    added from a path (a stream) is written next to *xml_path* so it can still be
+    copied from disk by assemble().
+    """
+    from lxml import etree
+    from docx.oxml.ns import qn
+
+    embed_attr = qn("r:embed")
+    sect_pr = qn("w:sectPr")
+    rels = doc.part.rels
+    fragment = SectionFragment(xml_path=xml_path)
+    tokens: Dict[str, str] = {}
+    with open(xml_path, "wb") as f:
+        for el in doc.element.body.iterchildren():
+            if el.tag == sect_pr:
+                continue
+            for node in el.iter():
+                rId = node.get(embed_attr)
+                if rId is None:
+                    continue
+                if rId not in tokens:
+                    part = rels[rId].target_part
+                    ext = part.partname.ext
+                    src = sources.get(str(part.partname))
+                    if src is None:
+                        src = f"{xml_path}.{len(fragment.images)}.{ext}"
+                        with open(src, "wb") as img:
+                            img.write(part.blob)
+                    tokens[rId] = f"{_RID_TOKEN}{len(fragment.images)}"
+                    fragment.images.append((src, ext, part.content_type, part.sha1))
+                node.set(embed_attr, tokens[rId])
+            f.write(etree.tostring(el, encoding="utf-8"))
+    return fragment
+
+
+def _split_at_marker(document_xml: bytes) -> Tuple[bytes, bytes]:
+    """Split the base document.xml around the SECTION_MARKER paragraph."""
+    from lxml import etree
+    from docx.oxml.ns import nsmap
+
+    root = etree.fromstring(document_xml)
+    hits = root.xpath("//w:body/w:p[normalize-space(.) = $m]",
+                      namespaces={"w": nsmap["w"]}, m=SECTION_MARKER)
+    if not hits:
+        raise ValueError(f"base document has no {SECTION_MARKER!r} paragraph")
+    cut = etree.Comment(SECTION_MARKER)
+    hits[0].getparent().replace(hits[0], cut)
+    xml = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+    head, tail = xml.split(b"<!--" + SECTION_MARKER.encode() + b"-->", 1)
+    return head, tail
+
+
+def assemble(base_doc, fragments: List[SectionFragment], out_path: str) -> int:
+    """Write *base_doc* with *fragments* in place of its marker paragraph to *out_path*.
+
+    The package is streamed entry by entry into <out_path>.part, which replaces
+    *out_path* only once complete. Returns the number of media parts written.
+    """
+    from lxml import etree
+
+    buf = io.BytesIO()
+    base_doc.save(buf)
+    doc_name = base_doc.part.partname.lstrip("/")
+    rels_name = base_doc.part.partname.rels_uri.lstrip("/")
+    media_dir = os.path.dirname(doc_name)
+
+    # One media part per distinct image (by content, as python-docx does within one
+    # Document), shared by every section that shows it; copied from its first source.
+    media: Dict[str, Tuple[str, str, str]] = {}
+    content_types: Dict[str, str] = {}
+    for frag in fragments:
+        for src, ext, content_type, sha1 in frag.images:
+            if sha1 not in media:
+                n = len(media) + 1
+                media[sha1] = (f"{_RID_TOKEN}{n}", f"media/sdd{n}.{ext}", src)
+            content_types.setdefault(ext.lower(), content_type)
+
+    tmp_path = out_path + ".part"
+    with zipfile.ZipFile(buf) as base, \
+            zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+        head, tail = _split_at_marker(base.read(doc_name))
+        next_pic_id = max((int(m.group(2)) for m in _DOCPR_RE.finditer(head + tail)), default=0) + 1
+
+        ct_root = etree.fromstring(base.read("[Content_Types].xml"))
+        known = {(d.get("Extension") or "").lower() for d in ct_root}
+        for ext, content_type in sorted(content_types.items()):
+            if ext not in known:
+                etree.SubElement(ct_root, f"{{{_NS_CONTENT_TYPES}}}Default",
+                                 Extension=ext, ContentType=content_type)
+        out.writestr("[Content_Types].xml", etree.tostring(
+            ct_root, xml_declaration=True, encoding="UTF-8", standalone=True))
+
+        for info in base.infolist():
+            if info.filename not in ("[Content_Types].xml", doc_name, rels_name):
+                out.writestr(info, base.read(info.filename))
+
+        rels_root = etree.fromstring(base.read(rels_name))
+        for rId, target, _ in media.values():
+            etree.SubElement(rels_root, f"{{{_NS_PKG_RELS}}}Relationship",
+                             Id=rId, Type=_RT_IMAGE, Target=target)
+        out.writestr(rels_name, etree.tostring(
+            rels_root, xml_declaration=True, encoding="UTF-8", standalone=True))
+
+        with out.open(doc_name, "w", force_zip64=True) as f:
+            f.write(head)
+            for frag in fragments:
+                with open(frag.xml_path, "rb") as sf:
+                    xml = sf.read()
+                rids = [media[img[3]][0] for img in frag.images]
+                xml = _EMBED_RE.sub(lambda m: m.group(1) + rids[int(m.group(2))].encode() + m.group(3), xml)
+
+                def _renumber(m):
+                    nonlocal next_pic_id
+                    next_pic_id += 1
+                    return m.group(1) + str(next_pic_id - 1).encode() + m.group(3)
+
+                f.write(_DOCPR_RE.sub(_renumber, xml))
+            f.write(tail)
+
+        for _, target, src in media.values():
+            out.write(src, f"{media_dir}/{target}", compress_type=zipfile.ZIP_STORED)
+    os.replace(tmp_path, out_path)
+    return len(media)
@@ -4,18 +4,58 @@ Source extraction and libclang TranslationUnit management.
 - SourceExtractor: reads and caches source files, extracts line ranges and
   cursor extents as raw text.
 - TranslationUnitParser: creates and caches libclang TUs with the correct
-  std and include args.
+  std and include args. With an AstCache (core.ast_cache) full TUs are parsed
+  with Phase 1's args and options instead (recorded beside the model), so the
+  AST Phase 1 saved for a TU is loaded rather than re-parsed; the ones it
+  parses itself are saved under the same key. TUs are cached by their path
+  relative to base_path, so a long-lived parser (the flowchart daemon) can
+  move to the next checkout with refresh(): a cached TU whose file and
+  included headers are the same files there (hardlinked unchanged, same
+  inode/mtime/size) stays warm, the others are dropped.
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import clang.cindex as ci
 
 logger = logging.getLogger(__name__)
 
 
+def _stat_signature(deps: Tuple, base_path: Optional[str]) -> Tuple:
+    """((path, (ino, dev, mtime_ns, size) | None), ...) for the paths of *deps*,
+    now. Relative paths are resolved against *base_path*."""
+    out = []
+    for path, _sig in deps:
+        try:
+            st = os.stat(os.path.join(base_path, path) if base_path else path)
+            out.append((path, (st.st_ino, st.st_dev, st.st_mtime_ns, st.st_size)))
+        except OSError:
+            out.append((path, None))
+    return tuple(out)
+
+
+def parse_args_for(std: str, extra_clang_args: List[str]) -> List[str]:
+    """The clang argument list TranslationUnitParser parses with."""
+    # Pull the shared default macro defines from core.config so this
+    # re-parser inherits the same `-DPUBLIC=`, `-DPROTECTED=`, etc. that
+    # Phase 1's parser uses. Without these, libclang reports
+    # "unknown type name 'PUBLIC'" warnings on every project that hides
+    # visibility behind macros, and the resulting AST is incomplete.
+    try:
+        from core.config import default_clang_macro_defs
+        macro_defs = default_clang_macro_defs()
+    except Exception:
+        macro_defs = []
+    args = [f"-std={std}", "-x", "c++"] + macro_defs
+    for extra in extra_clang_args:
+        if extra not in args:
+            args.append(extra)
+    return args
+
+
 # ---------------------------------------------------------------------------
 # Source extraction
 # ---------------------------------------------------------------------------
@@ -85,33 +125,94 @@ class TranslationUnitParser:
         | ci.TranslationUnit.PARSE_INCOMPLETE
         | ci.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
     )
+    # get_tu_full: the same without skipping bodies (what the CFG builder walks).
+    _FULL_PARSE_OPTIONS = (
+        ci.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+        | ci.TranslationUnit.PARSE_INCOMPLETE
+    )
 
-    def __init__(self, std: str, extra_clang_args: List[str]) -> None:
+    def __init__(self, std: str, extra_clang_args: List[str],
+                 ast_cache=None, base_path: Optional[str] = None,
+                 max_tus: int = 256) -> None:
         self._std = std
         self._extra_args = extra_clang_args
         self._index = ci.Index.create()
+        # cache key (path relative to base_path) -> TU, least recently used first
         self._tu_cache: Dict[str, ci.TranslationUnit] = {}
+        # cache key -> stat signature of the TU's file + its includes (see refresh)
+        self._tu_deps: Dict[str, Tuple] = {}
+        self._ast_cache = ast_cache
+        self._base_path = os.path.abspath(base_path) if base_path else None
+        self._max_tus = max_tus
 
-    def _build_args(self) -> List[str]:
-        # Pull the shared default macro defines from core.config so this
-        # re-parser inherits the same `-DPUBLIC=`, `-DPROTECTED=`, etc. that
-        # Phase 1's parser uses. Without these, libclang reports
-        # "unknown type name 'PUBLIC'" warnings on every project that hides
-        # visibility behind macros, and the resulting AST is incomplete.
+    def refresh(self, ast_cache=None, max_tus: int = 256,
+                base_path: Optional[str] = None,
+                extra_clang_args: Optional[List[str]] = None) -> int:
+        """Start a new run on a parser kept from an earlier one: use *ast_cache*,
+        *base_path* (the next checkout) and *extra_clang_args* (its include dirs),
+        drop every cached TU whose file or included headers are not the same
+        files under the new base, and keep at most *max_tus* (the most recently
+        used). Returns the number of TUs dropped."""
+        self._ast_cache = ast_cache
+        if base_path:
+            self._base_path = os.path.abspath(base_path)
+        if extra_clang_args is not None:
+            self._extra_args = extra_clang_args
+        self._max_tus = max_tus
+        stale = [k for k, deps in self._tu_deps.items()
+                 if _stat_signature(deps, self._base_path) != deps]
+        for key in stale:
+            self._tu_cache.pop(key, None)
+            self._tu_deps.pop(key, None)
+        return len(stale) + self._trim()
+
+    @property
+    def cached_tus(self) -> int:
+        return len(self._tu_cache)
+
+    def _trim(self) -> int:
+        """Evict least recently used TUs beyond max_tus; returns how many."""
+        dropped = 0
+        while len(self._tu_cache) > max(0, self._max_tus):
+            key = next(iter(self._tu_cache))
+            self._tu_cache.pop(key)
+            self._tu_deps.pop(key, None)
+            dropped += 1
+        return dropped
+
+    def _rel(self, path: str) -> str:
+        """*path* relative to base_path when it lies under it, else as given."""
+        if self._base_path:
+            rel = os.path.relpath(os.path.abspath(path), self._base_path)
+            if not rel.startswith(os.pardir) and not os.path.isabs(rel):
+                return rel
+        return path
+
+    def _remember(self, cache_key: str, tu: ci.TranslationUnit, abs_path: str) -> None:
+        self._tu_cache[cache_key] = tu
+        files = [abs_path]
         try:
-            from core.config import default_clang_macro_defs
-            macro_defs = default_clang_macro_defs()
+            files += sorted({inc.include.name for inc in tu.get_includes()})
         except Exception:
-            macro_defs = []
-        args = [f"-std={self._std}", "-x", "c++"] + macro_defs
-        for extra in self._extra_args:
-            if extra not in args:
-                args.append(extra)
-        return args
+            pass
+        self._tu_deps[cache_key] = _stat_signature(
+            tuple((self._rel(f), None) for f in files), self._base_path)
+        self._trim()
+
+    def _cached(self, cache_key: str) -> Optional[ci.TranslationUnit]:
+        tu = self._tu_cache.pop(cache_key, None)
+        if tu is not None:
+            self._tu_cache[cache_key] = tu   # most recently used last
+        return tu
+
+    def _build_args(self) -> List[str]:
+        return parse_args_for(self._std, self._extra_args)
 
     def get_tu(self, abs_path: str) -> ci.TranslationUnit:
         """Return (cached) TranslationUnit for a source file."""
-        if abs_path not in self._tu_cache:
+        cache_key = self._rel(abs_path)
+        tu = self._cached(cache_key)
+        if tu is None:
             args = self._build_args()
             logger.debug("Parsing TU: %s", abs_path)
             tu = self._index.parse(abs_path, args=args,
@@ -119,28 +220,54 @@ class TranslationUnitParser:
             if tu is None:
                 raise RuntimeError(f"libclang failed to parse: {abs_path}")
             self._log_diagnostics(tu, abs_path)
-            self._tu_cache[abs_path] = tu
-        return self._tu_cache[abs_path]
+            self._remember(cache_key, tu, abs_path)
+        return tu
 
     def get_tu_full(self, abs_path: str) -> ci.TranslationUnit:
         """
         Return a TranslationUnit parsed WITHOUT skipping function bodies.
         Used when we need to traverse the actual function body for CFG building.
+        A TU kept from an earlier checkout keeps that checkout's file names
+        (tu.spelling); locate cursors in it through those.
         """
-        cache_key = abs_path + "__full"
-        if cache_key not in self._tu_cache:
-            args = self._build_args()
-            logger.debug("Parsing full TU (with bodies): %s", abs_path)
-            options = (
-                ci.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
-                | ci.TranslationUnit.PARSE_INCOMPLETE
-            )
-            tu = self._index.parse(abs_path, args=args, options=options)
-            if tu is None:
-                raise RuntimeError(f"libclang failed to parse: {abs_path}")
-            self._log_diagnostics(tu, abs_path)
-            self._tu_cache[cache_key] = tu
-        return self._tu_cache[cache_key]
+        cache_key = self._rel(abs_path) + "__full"
+        tu = self._cached(cache_key)
+        if tu is not None:
+            return tu
+        if self._ast_cache is not None:
+            args, options = self._ast_cache.parse_args, self._ast_cache.parse_options
+        else:
+            args, options = self._build_args(), self._FULL_PARSE_OPTIONS
+        tu = self._load_saved_ast(abs_path)
+        if tu is not None:
+            self._remember(cache_key, tu, abs_path)
+            return tu
+        logger.debug("Parsing full TU (with bodies): %s", abs_path)
+        tu = self._index.parse(abs_path, args=args, options=options)
+        if tu is None:
+            raise RuntimeError(f"libclang failed to parse: {abs_path}")
+        self._log_diagnostics(tu, abs_path)
+        if self._ast_cache is not None:
+            self._ast_cache.save(tu, abs_path)
+        self._remember(cache_key, tu, abs_path)
+        return tu
+
+    def _load_saved_ast(self, abs_path: str) -> Optional[ci.TranslationUnit]:
+        """Return the AST saved for abs_path with the cache's (Phase 1's) args and
+        options — by Phase 1 or an earlier engine run — or None when there is no
+        valid entry; the caller then parses as usual."""
+        if self._ast_cache is None:
+            return None
+        ast_path = self._ast_cache.lookup(abs_path)
+        if ast_path is None:
+            return None
+        try:
+            tu = ci.TranslationUnit.from_ast_file(ast_path, self._index)
+        except ci.TranslationUnitLoadError as exc:
+            logger.debug("Saved AST unusable for %s (%s); re-parsing", abs_path, exc)
+            return None
+        logger.debug("Loaded saved AST for %s: %s", abs_path, ast_path)
+        return tu
 
     @staticmethod
     def _log_diagnostics(tu: ci.TranslationUnit, path: str) -> None:
@@ -0,0 +1,228 @@
+"""
+Content-addressed store of labeled ControlFlowGraphs.
+
+Building a flowchart means parsing the TU, walking the cursor (CFGBuilder),
+enriching, optionally simplifying, and labeling every node with the LLM. For a
+function whose source has not changed all of that produces the same graph, so
+the labeled CFG (node + edge arrays with their labels) is persisted and the
+Mermaid script is rebuilt from it with `build_mermaid` — no TU parse, no LLM call.
+
+Key (one JSON file per key, `<cache_dir>/<key>.json`):
+
+    sha256( ENGINE_VERSION, settings digest, functionKey,
+            dependency fingerprint of the function )
+
+  * The fingerprint is incremental.fingerprint.compute_fingerprints' reuse key:
+    the function's token hash (model/hashes.json — code tokens and doc comment,
+    so a reformat still hits and any real edit misses) folded with the hashes of
+    its direct callees, the globals it reads / writes and the types and macros
+    it uses (edges.json). A macro can expand to control flow (the CFG changes)
+    and labels name callees, globals and types, so editing any of them in a
+    header rebuilds the function's flowchart.
+  * The settings digest covers everything that shapes the graph or its labels:
+    segment thresholds, LLM model, batch size, the enrichment flags and
+    `--no-llm`. Bump ENGINE_VERSION whenever the builder, labeler or the
+    serialized layout changes.
+
+Graphs still carrying fallback labels after an LLM run are not stored (the next
+run gets another chance at real labels); `--no-llm` graphs are, under their own
+settings digest. `prune()` keeps the store under a size budget, evicting
+least-recently-used entries first (a hit touches the file's mtime).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+from models import CfgEdge, CfgNode, ControlFlowGraph, FunctionEntry, NodeType
+
+logger = logging.getLogger(__name__)
+
+# Bump when CFGBuilder / NodeEnricher / LabelGenerator output or the layout
+# written by cfg_to_dict() changes — every existing entry then misses.
+ENGINE_VERSION = "2"
+DEFAULT_MAX_MB = 256
+
+_SEP = "\x1f"
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+def cfg_to_dict(cfg: ControlFlowGraph) -> Dict:
+    """Flatten a labeled CFG into node / edge arrays (enriched_context is
+    dropped: it only feeds the labeler)."""
+    return {
+        "functionKey": cfg.function_key,
+        "qualifiedName": cfg.qualified_name,
+        "sourceFile": cfg.source_file,
+        "startLine": cfg.start_line,
+        "endLine": cfg.end_line,
+        "entry": cfg.entry_node_id,
+        "exits": list(cfg.exit_node_ids),
+        "nodes": [
+            [n.node_id, n.node_type.value, n.raw_code, n.start_line, n.end_line, n.label]
+            for n in cfg.nodes.values()
+        ],
+        "edges": [[e.source, e.target, e.label] for e in cfg.edges],
+    }
+
+
+def cfg_from_dict(data: Dict) -> ControlFlowGraph:
+    """Inverse of cfg_to_dict()."""
+    cfg = ControlFlowGraph(
+        function_key=data["functionKey"],
+        qualified_name=data["qualifiedName"],
+        source_file=data["sourceFile"],
+        start_line=data["startLine"],
+        end_line=data["endLine"],
+        entry_node_id=data.get("entry", ""),
+        exit_node_ids=list(data.get("exits") or []),
+    )
+    for nid, ntype, raw, start, end, label in data["nodes"]:
+        cfg.nodes[nid] = CfgNode(node_id=nid, node_type=NodeType(ntype), raw_code=raw,
+                                 start_line=start, end_line=end, label=label)
+    cfg.edges = [CfgEdge(source=s, target=t, label=lbl) for s, t, lbl in data["edges"]]
+    return cfg
+
+
+# ---------------------------------------------------------------------------
+# Keying
+# ---------------------------------------------------------------------------
+
+def settings_digest(*, max_stmts: int, max_lines: int, llm_model: str,
+                    batch_size: int, enrichment: Optional[Dict], no_llm: bool) -> str:
+    """Digest of the engine settings that change the graph or its labels."""
+    payload = {
+        "maxStmts": max_stmts,
+        "maxLines": max_lines,
+        "llmModel": "" if no_llm else (llm_model or ""),
+        "batchSize": 0 if no_llm else batch_size,
+        "enrichment": enrichment or {},
+        "noLlm": bool(no_llm),
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CfgCache:
+    """
+    Look up and store labeled CFGs for one engine configuration.
+
+    Args:
+        cache_dir:    directory holding `<key>.json` entries (created on demand)
+        settings:     settings_digest() of this run
+        fingerprints: {functionKey -> dependency fingerprint}
+                      (incremental.fingerprint.compute_fingerprints)
+    """
+
+    def __init__(self, cache_dir: str, settings: str,
+                 fingerprints: Dict[str, str]) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._settings = settings
+        self._fingerprints = fingerprints or {}
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        # entry files loaded or written by this run (never pruned at its end)
+        self.used: Set[str] = set()
+
+    @property
+    def cache_dir(self) -> str:
+        return str(self._cache_dir)
+
+    def key_for(self, entry: FunctionEntry) -> Optional[str]:
+        """Return the cache key for a function, or None when it has no
+        fingerprint (no source hash, e.g. a functions.json older than hashes.json)."""
+        fp = self._fingerprints.get(entry.key)
+        if not fp:
+            return None
+        parts = [ENGINE_VERSION, self._settings, entry.key, fp]
+        return hashlib.sha256(_SEP.join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._cache_dir / f"{key}.json"
+
+    def load(self, entry: FunctionEntry) -> Optional[ControlFlowGraph]:
+        """Return the cached labeled CFG for this function, or None."""
+        key = self.key_for(entry)
+        path = self._path(key) if key else None
+        if path is None or not path.exists():
+            self.misses += 1
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cfg = cfg_from_dict(json.load(f))
+        except Exception as exc:
+            logger.warning("CFG cache entry unreadable (%s): %s", path.name, exc)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path, None)  # LRU marker for prune()
+        except OSError:
+            pass
+        self.used.add(str(path))
+        self.hits += 1
+        return cfg
+
+    def save(self, entry: FunctionEntry, cfg: ControlFlowGraph) -> bool:
+        """Persist a labeled CFG. Best-effort: failures are logged, never raised."""
+        key = self.key_for(entry)
+        if not key:
+            return False
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cfg_to_dict(cfg), f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except Exception as exc:
+            logger.warning("CFG cache save failed for '%s': %s",
+                           entry.qualified_name, exc)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+        self.used.add(str(path))
+        self.stored += 1
+        return True
+
+
+def prune(cache_dir: str, max_bytes: int, *, keep: Iterable[str] = ()) -> int:
+    """Evict least-recently-used `.json` entries until the store is <= max_bytes.
+    Paths in `keep` (used by this run) are never evicted. Returns the number of
+    entries removed."""
+    try:
+        names = [n for n in os.listdir(cache_dir) if n.endswith(".json")]
+    except OSError:
+        return 0
+    keep_set = {os.path.abspath(p) for p in keep}
+    entries = []
+    total = 0
+    for n in names:
+        p = os.path.join(cache_dir, n)
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        total += st.st_size
+        entries.append((st.st_mtime, st.st_size, p))
+    removed = 0
+    for _mtime, size, p in sorted(entries):
+        if total <= max_bytes:
+            break
+        if os.path.abspath(p) in keep_set:
+            continue
+        try:
+            os.unlink(p)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
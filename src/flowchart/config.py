@@ -22,6 +22,17 @@ class EngineConfig:
     use_cache: bool = True
     cache_dir: str = ".flowchart_cache"
 
+    # Optional: Phase 1's AST store (core.ast_cache). When set, TUs whose
+    # serialized AST is still valid are loaded from it instead of re-parsed.
+    ast_cache_dir: Optional[str] = None
+
+    # Optional: store of labeled CFGs (cfg_cache.CfgCache). When set, a function
+    # whose source hash (hashes.json) and dependencies' hashes are unchanged reuses
+    # its cached CFG + labels instead of re-parsing and re-labeling. Ignored with
+    # use_cache=False. Pruned to cfg_cache_max_mb at the end of a run.
+    cfg_cache_dir: Optional[str] = None
+    cfg_cache_max_mb: int = 256
+
     # Statement segment thresholds per ACTION node.
     # Reduced to 3 statements so that important function calls are unlikely
     # to be buried in a large segment where the LLM may omit them from the label.
@@ -0,0 +1,268 @@
+"""
+daemon.py — a long-lived flowchart engine.
+
+Every flowchart run used to start a fresh `flowchart_engine.py` process, which
+loads libclang, rebuilds the PKB from its shards, loads project knowledge,
+builds the LLM client and re-parses every TU it touches. A CI flow that builds
+a version for every merged commit pays that start-up once per version, even
+when the impact set is a handful of functions.
+
+The daemon runs the engine in one process and serves runs over a local socket
+(multiprocessing.connection on 127.0.0.1, authenticated). It keeps a single
+EngineSession (flowchart_engine.py) warm across them. A run request carries the
+engine's command line, which already says "regenerate these fids at this commit":
+views/flowcharts.py passes the impact-set functions file and the commit's metadata.
+
+    python src/flowchart/daemon.py serve     # from the analyzer root
+    python src/flowchart/daemon.py status
+    python src/flowchart/daemon.py stop
+
+The address and auth key are published in `<analyzer root>/.flowchart_cache/daemon.json`.
+views/flowcharts.py uses the daemon when `views.flowcharts.daemon` is true. It
+starts one if none answers, and falls back to a subprocess if that fails too.
+Requests are served one at a time, because a run sets the cwd and ANALYZER_CONFIG.
+A daemon with no request for `--idle-timeout` seconds exits.
+
+Only the standard library is imported at module level, so the analyzer can
+import the client side (`ensure_daemon`, `run_engine`) without the engine.
+"""
+
+import argparse
+import json
+import logging
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("flowchart_daemon")
+
+INFO_FILE = "daemon.json"
+DEFAULT_IDLE_TIMEOUT_S = 1800
+# Environment a run is resolved against, forwarded from the requesting process.
+_FORWARDED_ENV = ("ANALYZER_CONFIG", "LIBCLANG_PATH")
+
+
+def info_path(project_root: str) -> str:
+    return os.path.join(project_root, ".flowchart_cache", INFO_FILE)
+
+
+def _read_info(project_root: str) -> Optional[Dict]:
+    try:
+        with open(info_path(project_root), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        return info if isinstance(info, dict) and info.get("address") else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_info(project_root: str, info: Dict) -> None:
+    path = info_path(project_root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)  # holds the auth key
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    os.replace(tmp, path)
+
+
+def _remove_info(project_root: str, pid: int) -> None:
+    info = _read_info(project_root)
+    if info is not None and info.get("pid") == pid:
+        try:
+            os.unlink(info_path(project_root))
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+def _request(project_root: str, message: Dict) -> Optional[Dict]:
+    """Send one message to the project's daemon; its reply, or None when none answered."""
+    info = _read_info(project_root)
+    if info is None:
+        return None
+    try:
+        conn = Client(tuple(info["address"]), authkey=bytes.fromhex(info["authkey"]))
+    except (OSError, ValueError, KeyError, AuthenticationError):
+        return None
+    try:
+        with conn:
+            conn.send(message)
+            reply = conn.recv()
+    except (OSError, EOFError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def status(project_root: str) -> Optional[Dict]:
+    return _request(project_root, {"op": "status"})
+
+
+def stop(project_root: str) -> bool:
+    return _request(project_root, {"op": "stop"}) is not None
+
+
+def ensure_daemon(project_root: str, *, timeout_s: float = 30.0) -> bool:
+    """True once a daemon answers for *project_root*, starting one if needed."""
+    if status(project_root) is not None:
+        return True
+    log_dir = os.path.dirname(info_path(project_root))
+    os.makedirs(log_dir, exist_ok=True)
+    with open(os.path.join(log_dir, "daemon.log"), "ab") as log_file:
+        kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == "nt" \
+            else {"start_new_session": True}
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve"],
+                         cwd=project_root, stdin=subprocess.DEVNULL,
+                         stdout=log_file, stderr=subprocess.STDOUT, **kwargs)
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if status(project_root) is not None:
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def run_engine(project_root: str, argv: List[str], *, cwd: str) -> Optional[int]:
+    """Run flowchart_engine with *argv* (its command line minus the interpreter and
+    script) in the project's daemon. Returns the run's exit code, or None when no
+    daemon answered or it died mid-run; the caller then runs the engine itself."""
+    reply = _request(project_root, {
+        "op": "run", "argv": list(argv), "cwd": os.path.abspath(cwd),
+        "env": {k: os.environ.get(k) for k in _FORWARDED_ENV},
+    })
+    if reply is None:
+        return None
+    return int(reply.get("rc", 1))
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+def _run(fe, session, message: Dict) -> Dict:
+    """One engine run, in the requester's cwd and environment."""
+    saved_cwd = os.getcwd()
+    saved_env = {k: os.environ.get(k) for k in _FORWARDED_ENV}
+    start = time.perf_counter()
+    try:
+        for key in _FORWARDED_ENV:
+            value = (message.get("env") or {}).get(key)
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        os.chdir(message["cwd"])
+        from core.config import app_config  # noqa: WPS433
+        app_config(refresh=True)
+        result = fe.run(fe._parse_args(list(message["argv"])), session)
+        rc = 0
+    except SystemExit as exc:
+        rc = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        result = None
+    except Exception:
+        logger.exception("run failed")
+        rc, result = 1, None
+    finally:
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    seconds = time.perf_counter() - start
+    logger.info("run %d: exit %d in %.2fs", session.runs, rc, seconds)
+    return {"ok": True, "rc": rc, "result": result, "seconds": seconds}
+
+
+def serve(project_root: str, *, host: str = "127.0.0.1", port: int = 0,
+          idle_timeout_s: float = DEFAULT_IDLE_TIMEOUT_S) -> None:
+    """Serve engine runs for *project_root* until stopped or idle."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    import flowchart_engine as fe  # noqa: WPS433
+
+    authkey = secrets.token_bytes(32)
+    session = fe.EngineSession()
+    started = time.time()
+    last_request = [time.monotonic()]
+    with Listener((host, port), authkey=authkey) as listener:
+        _write_info(project_root, {"address": list(listener.address), "authkey": authkey.hex(),
+                                   "pid": os.getpid()})
+        logger.info("flowchart daemon %d listening on %s:%s", os.getpid(), *listener.address)
+
+        def _watchdog() -> None:
+            # accept() cannot time out: an idle daemon stops itself through its own socket.
+            while True:
+                time.sleep(min(60.0, max(1.0, idle_timeout_s / 4)))
+                if time.monotonic() - last_request[0] > idle_timeout_s:
+                    logger.info("idle for %ds; stopping", idle_timeout_s)
+                    stop(project_root)
+                    return
+
+        if idle_timeout_s > 0:
+            threading.Thread(target=_watchdog, daemon=True).start()
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (OSError, AuthenticationError) as exc:
+                    logger.warning("rejected connection: %s", exc)
+                    continue
+                with conn:
+                    try:
+                        message = conn.recv()
+                    except (OSError, EOFError):
+                        continue
+                    op = message.get("op") if isinstance(message, dict) else None
+                    if op == "run":
+                        reply = _run(fe, session, message)
+                    elif op in ("status", "stop"):
+                        reply = {"ok": True, "pid": os.getpid(), "runs": session.runs,
+                                 "uptime": time.time() - started}
+                    else:
+                        reply = {"ok": False, "error": f"unknown op {op!r}"}
+                    try:
+                        conn.send(reply)
+                    except OSError:
+                        pass
+                last_request[0] = time.monotonic()
+                if op == "stop":
+                    break
+        finally:
+            _remove_info(project_root, os.getpid())
+    logger.info("flowchart daemon %d stopped after %d run(s)", os.getpid(), session.runs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Long-lived flowchart engine (see module docstring)")
+    p.add_argument("command", nargs="?", default="serve", choices=("serve", "status", "stop"))
+    p.add_argument("--project-root", default=os.getcwd(),
+                   help="Analyzer root whose .flowchart_cache holds daemon.json (default: cwd)")
+    p.add_argument("--port", type=int, default=0, help="TCP port on 127.0.0.1 (default: any free)")
+    p.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT_S,
+                   help="Exit after this many seconds without a request (0 = never)")
+    args = p.parse_args(argv)
+    root = os.path.abspath(args.project_root)
+    if args.command == "status":
+        info = status(root)
+        print(json.dumps(info) if info else "no daemon running")
+        return 0 if info else 1
+    if args.command == "stop":
+        return 0 if stop(root) else 1
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
+                        datefmt="%H:%M:%S")
+    serve(root, port=args.port, idle_timeout_s=args.idle_timeout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
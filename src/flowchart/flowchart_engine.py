@@ -11,12 +11,13 @@ Usage:
         --llm-url        http://localhost:11434/api/generate \\
         --llm-model      qwen2.5-coder:14b \\
         [--function-key  "src|file|qualified|params"]  \\
-        [--no-cache]
+        [--no-cache]  [--cfg-cache-dir .flowchart_cache/cfg]
 
 The engine:
   1. Builds / restores the Project Knowledge Base (PKB) from functions.json
   2. Groups functions by source file
-  3. For each source file, for each function:
+  3. For each source file, for each function (a function whose labeled CFG is
+     in --cfg-cache-dir skips a-f and only rebuilds its Mermaid script):
        a. Extracts source text (by line range)
        b. Parses a libclang TranslationUnit (full, with bodies)
        c. Resolves the function cursor
@@ -26,6 +27,10 @@ The engine:
        g. Builds and validates the Mermaid script
   4. Writes one JSON file per source file to --out-dir
   5. Writes a _summary.json
+
+run() takes an optional EngineSession: the flowchart daemon (daemon.py) keeps one
+across requests so the PKB, project knowledge, parsed TUs and the LLM client stay
+warm between incremental versions. A CLI run uses a fresh one.
 """
 
 import argparse
@@ -35,7 +40,7 @@ import os
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # When launched as a script, sys.path[0] is this file's directory (src/flowchart).
 # Add the analyzer's src/ directory too so we can import the shared llm_core
@@ -45,8 +50,9 @@ if _SRC_DIR not in sys.path:
     sys.path.insert(1, _SRC_DIR)
 
 from ast_engine.cfg_builder import CFGBuilder
-from ast_engine.parser import SourceExtractor, TranslationUnitParser
+from ast_engine.parser import SourceExtractor, TranslationUnitParser, parse_args_for
 from ast_engine.resolver import find_function_cursor, get_function_body
+from cfg_cache import CfgCache, prune as prune_cfg_cache, settings_digest
 from config import EngineConfig
 from enrichment.enricher import NodeEnricher
 from llm_core.client import LlmClient
@@ -93,7 +99,7 @@ def _is_header_file(path: str) -> bool:
 # CLI argument parsing
 # ---------------------------------------------------------------------------
 
-def _parse_args() -> EngineConfig:
+def _parse_args(argv: Optional[List[str]] = None) -> EngineConfig:
     p = argparse.ArgumentParser(
         description="C++ → Mermaid flowchart generator powered by libclang + LLM",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -124,6 +130,16 @@ def _parse_args() -> EngineConfig:
                    help="Rebuild PKB from scratch (ignore disk cache)")
     p.add_argument("--cache-dir", default=".flowchart_cache",
                    help="Directory for PKB cache files (default: .flowchart_cache)")
+    p.add_argument("--ast-cache-dir", default=None,
+                   help="AST store (.ast_cache); parse TUs with Phase 1's args and "
+                        "load the ASTs it saved instead of re-parsing, save the rest")
+    p.add_argument("--cfg-cache-dir", default=None,
+                   help="Store of labeled CFGs keyed by the function's and its "
+                        "dependencies' source hashes; unchanged functions skip "
+                        "parsing and the LLM")
+    p.add_argument("--cfg-cache-max-mb", type=int, default=256,
+                   help="Size budget for --cfg-cache-dir; least-recently-used "
+                        "entries are evicted after a run (default: 256)")
     p.add_argument("--llm-timeout", type=int, default=120,
                    help="LLM request timeout in seconds (default: 120)")
     p.add_argument("--llm-retries", type=int, default=2,
@@ -146,7 +162,7 @@ def _parse_args() -> EngineConfig:
     p.add_argument("--quiet", "-q", action="store_true",
                    help="Suppress info logging (warnings/errors only)")
 
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
     # Configure unified logging (stderr + daily file). Idempotent.
     try:
@@ -168,6 +184,9 @@ def _parse_args() -> EngineConfig:
         knowledge_json_path=args.knowledge_json,
         use_cache=not args.no_cache,
         cache_dir=args.cache_dir,
+        ast_cache_dir=args.ast_cache_dir,
+        cfg_cache_dir=args.cfg_cache_dir,
+        cfg_cache_max_mb=args.cfg_cache_max_mb,
         llm_timeout=args.llm_timeout,
         llm_max_retries=args.llm_retries,
         max_stmts_per_segment=args.max_stmts,
@@ -196,6 +215,7 @@ def _load_project_meta(metadata_path: str) -> ProjectMeta:
     return ProjectMeta(
         base_path=data.get("basePath", "."),
         project_name=data.get("projectName", "unknown"),
+        parse_fingerprint=data.get("parseFingerprint", ""),
     )
 
 
@@ -203,30 +223,161 @@ def _load_functions(functions_path: str) -> Dict:
     return _load_json(functions_path, "functions.json")
 
 
+def _load_ast_cache(config: EngineConfig, meta: ProjectMeta):
+    """Open Phase 1's AST store, or return None when disabled/unusable.
+
+    The keys need Phase 1's parse fingerprint (metadata.json), the per-TU
+    include closures (tu_includes.json) and the args / options Phase 1 parsed
+    with (ast_parse_args.json), both beside metadata.json.
+    """
+    if not config.ast_cache_dir:
+        return None
+    if not meta.parse_fingerprint:
+        logger.info("AST cache: metadata.json has no parseFingerprint; re-parsing TUs")
+        return None
+    inc_path = Path(config.metadata_json_path).parent / "tu_includes.json"
+    if not inc_path.exists():
+        logger.info("AST cache: %s not found; re-parsing TUs", inc_path)
+        return None
+    from core.ast_cache import AstCache, read_parse_args  # noqa: WPS433
+    parse = read_parse_args(str(inc_path.parent))
+    if parse is None:
+        logger.info("AST cache: Phase 1 recorded no parse args; re-parsing TUs")
+        return None
+    with open(inc_path, "r", encoding="utf-8") as f:
+        tu_includes = json.load(f)
+    return AstCache(config.ast_cache_dir, meta.parse_fingerprint,
+                    meta.base_path, tu_includes,
+                    parse_args=parse[0], parse_options=parse[1])
+
+
+def _load_cfg_cache(config: EngineConfig, enrichment_cfg: Dict,
+                    llm_model: str, functions_data: Dict) -> Optional[CfgCache]:
+    """Open the labeled-CFG store, or return None when disabled/unusable.
+
+    Keys need the per-entity token hashes (hashes.json) and the type / macro
+    users (edges.json), both beside metadata.json: each function is keyed by
+    its reuse fingerprint over its callees, globals, types and macros.
+    """
+    if not config.cfg_cache_dir or not config.use_cache:
+        return None
+    model_dir = Path(config.metadata_json_path).parent
+    for name in ("hashes.json", "edges.json"):
+        if not (model_dir / name).exists():
+            logger.info("CFG cache: %s not found; building every CFG", model_dir / name)
+            return None
+    from incremental.fingerprint import compute_fingerprints  # noqa: WPS433
+    with open(model_dir / "hashes.json", "r", encoding="utf-8") as f:
+        source_hashes = json.load(f)
+    with open(model_dir / "edges.json", "r", encoding="utf-8") as f:
+        edges = json.load(f)
+    settings = settings_digest(
+        max_stmts=config.max_stmts_per_segment,
+        max_lines=config.max_lines_per_segment,
+        llm_model=llm_model,
+        batch_size=config.llm_batch_size,
+        enrichment=enrichment_cfg,
+        no_llm=config.no_llm,
+    )
+    return CfgCache(config.cfg_cache_dir, settings,
+                    compute_fingerprints(source_hashes, functions_data, edges))
+
+
 # ---------------------------------------------------------------------------
-# PKB construction (with optional disk cache)
+# Warm state across runs (PKB with optional disk cache, knowledge, TUs, LLM)
 # ---------------------------------------------------------------------------
 
-def _build_pkb(functions_data: Dict, config: EngineConfig) -> ProjectKnowledgeBase:
-    pkb = ProjectKnowledgeBase()
+class EngineSession:
+    """
+    What a long-lived engine keeps between run() calls.
+
+    A CLI run uses a fresh session and loads everything as before. The daemon
+    passes one session to every run, so for the next version of a project:
+    the PKB rebuilds only the functions.json entries that changed (in memory,
+    no shard load), project knowledge is reloaded only when its file changed,
+    parsed TUs are kept across checkouts by their repo-relative path and
+    reused while their file and included headers are the same files in the
+    next checkout (the incremental engine hardlinks unchanged ones), and the
+    LLM client is built once per LLM config.
+    """
 
-    if config.use_cache:
-        functions_json_str = json.dumps(functions_data, sort_keys=True)
-        cache = PkbCache(config.cache_dir)
-        cache.invalidate_stale(functions_json_str)
-        cached = cache.load(functions_json_str)
-        if cached:
-            pkb.from_dict(cached)
-            return pkb
+    _MAX_TU_PARSERS = 4
 
-    pkb.build(functions_data)
+    def __init__(self) -> None:
+        self._pkbs: Dict[str, Tuple[ProjectKnowledgeBase, PkbCache]] = {}
+        self._knowledge: Dict[str, Tuple[Tuple[int, int], ProjectKnowledge]] = {}
+        self._tu_parsers: Dict[Tuple[str, ...], TranslationUnitParser] = {}
+        self._llm_clients: Dict[str, object] = {}
+        self.runs = 0
 
-    if config.use_cache:
-        functions_json_str = json.dumps(functions_data, sort_keys=True)
-        cache = PkbCache(config.cache_dir)
-        cache.save(functions_json_str, pkb.to_dict())
+    def pkb(self, functions_data: Dict, config: EngineConfig) -> ProjectKnowledgeBase:
+        if not config.use_cache:
+            pkb = ProjectKnowledgeBase()
+            pkb.build(functions_data)
+            return pkb
 
-    return pkb
+        # Per-function cache: unchanged functions.json entries are restored, only
+        # edited ones rebuilt, and only the shards that changed are rewritten. A
+        # PKB kept from an earlier run reuses its in-memory entries instead.
+        key = os.path.abspath(config.cache_dir)
+        if key in self._pkbs:
+            pkb, cache = self._pkbs[key]
+            pkb.build(functions_data)
+        else:
+            pkb, cache = ProjectKnowledgeBase(), PkbCache(config.cache_dir)
+            cache.gc()
+            pkb.build(functions_data, cached=cache.load())
+            self._pkbs[key] = (pkb, cache)
+        cache.save(pkb.cache_records())
+        return pkb
+
+    def project_knowledge(self, path: str) -> Optional[ProjectKnowledge]:
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return load_knowledge(path)  # logs "not found"
+        sig = (st.st_mtime_ns, st.st_size)
+        held = self._knowledge.get(key)
+        if held is not None and held[0] == sig:
+            return held[1]
+        knowledge = load_knowledge(path)
+        if knowledge is not None:
+            self._knowledge[key] = (sig, knowledge)
+        return knowledge
+
+    def tu_parser(self, config: EngineConfig, ast_cache,
+                  base_path: str) -> TranslationUnitParser:
+        # Args differ per checkout only by its path (-I<base>/...); key on them
+        # with that path factored out so the next version reuses the parser. With
+        # an AST cache, full TUs are parsed with Phase 1's args (part of the key).
+        base = os.path.abspath(base_path)
+        args = parse_args_for(config.std, config.clang_args)
+        if ast_cache is not None:
+            args = args + ["|", str(ast_cache.parse_options)] + ast_cache.parse_args
+        key = tuple(a.replace(base, "<base>") for a in args)
+        parser = self._tu_parsers.pop(key, None)
+        if parser is None:
+            parser = TranslationUnitParser(config.std, config.clang_args,
+                                           ast_cache=ast_cache, base_path=base)
+        else:
+            dropped = parser.refresh(ast_cache, base_path=base,
+                                     extra_clang_args=config.clang_args)
+            logger.info("TU cache: %d TU(s) kept from earlier runs, %d dropped (changed)",
+                        parser.cached_tus, dropped)
+        self._tu_parsers[key] = parser
+        while len(self._tu_parsers) > self._MAX_TU_PARSERS:
+            self._tu_parsers.pop(next(iter(self._tu_parsers)))
+        return parser
+
+    def llm_client(self, config: EngineConfig, llm_cfg: Optional[Dict]):
+        if config.no_llm:
+            return _NullLlmClient()
+        key = json.dumps([llm_cfg, config.llm_url, config.llm_model, config.llm_timeout,
+                          config.llm_num_ctx], sort_keys=True, default=str)
+        if key not in self._llm_clients:
+            self._llm_clients[key] = _build_llm_client(config, llm_cfg)
+        return self._llm_clients[key]
 
 
 # ---------------------------------------------------------------------------
@@ -242,6 +393,7 @@ def _process_function(
     config: EngineConfig,
     base_path: str,
     project_knowledge: Optional[ProjectKnowledge] = None,
+    cfg_cache: Optional[CfgCache] = None,
 ) -> FlowchartResult:
     """
     Process a single function end-to-end.
@@ -251,6 +403,16 @@ def _process_function(
     qn = func_entry.qualified_name
 
     try:
+        # 0. Unchanged function: rebuild the Mermaid from its cached labeled CFG
+        cached = cfg_cache.load(func_entry) if cfg_cache is not None else None
+        if cached is not None:
+            logger.debug("CFG cache hit for '%s'", qn)
+            return FlowchartResult(
+                function_key=key,
+                qualified_name=qn,
+                mermaid_script=build_mermaid(cached),
+            )
+
         # 1. Extract source text by line range
         source_code = source_extractor.extract_by_lines(
             func_entry.file, func_entry.line, func_entry.end_line
@@ -264,6 +426,8 @@ def _process_function(
         # 3. Resolve function cursor
         # Pass abs_path so the resolver can use Strategy 1 (direct position
         # lookup) and can match loc.file.name against the exact parsed path.
+        # A TU kept from an earlier checkout is looked up through tu.spelling
+        # and matched by the repo-relative file suffix instead.
         func_cursor = find_function_cursor(tu, func_entry, abs_path)
         if func_cursor is None:
             raise RuntimeError(
@@ -289,7 +453,7 @@ def _process_function(
         enricher.enrich(cfg, func_entry)
 
         # 6. Generate LLM labels (one call per function)
-        label_generator.label_cfg(cfg, func_entry, source_code, base_path)
+        fallback_count = label_generator.label_cfg(cfg, func_entry, source_code, base_path)
 
         # 7. Validate CFG
         cfg_validation = validate_cfg(cfg)
@@ -306,6 +470,8 @@ def _process_function(
         if not mermaid_validation.is_valid:
             logger.warning("Mermaid validation errors for '%s':\n%s",
                            qn, mermaid_validation)
+        elif cfg_cache is not None and (config.no_llm or not fallback_count):
+            cfg_cache.save(func_entry, cfg)
 
         return FlowchartResult(
             function_key=key,
@@ -423,6 +589,8 @@ def _configure_libclang() -> None:
         except Exception:
             os.environ["PATH"] = lib_dir + os.pathsep + os.environ.get("PATH", "")
     import clang.cindex as ci  # noqa: WPS433
+    if ci.Config.loaded:  # a daemon's later runs: already set (and locked)
+        return
     ci.Config.set_library_file(lib)
     logger.info("libclang configured: %s", lib)
 
@@ -431,7 +599,10 @@ def _configure_libclang() -> None:
 # Main orchestration
 # ---------------------------------------------------------------------------
 
-def run(config: EngineConfig) -> None:
+def run(config: EngineConfig, session: Optional[EngineSession] = None) -> Dict[str, int]:
+    """Generate the flowcharts; returns {"ok", "errors", "files"} counts."""
+    session = session or EngineSession()
+    session.runs += 1
     _configure_libclang()
     logger.info("=" * 60)
     logger.info("flowchart_engine starting")
@@ -471,18 +642,20 @@ def run(config: EngineConfig) -> None:
     # Load project knowledge (optional — built by project_scanner.py)
     project_knowledge: Optional[ProjectKnowledge] = None
     if config.knowledge_json_path:
-        project_knowledge = load_knowledge(config.knowledge_json_path)
+        project_knowledge = session.project_knowledge(config.knowledge_json_path)
         if project_knowledge is None:
             logger.warning("--knowledge-json file not loaded; continuing without it")
     else:
         logger.info("No --knowledge-json provided; running without project knowledge")
 
     # Build PKB
-    pkb = _build_pkb(functions_data, config)
+    pkb = session.pkb(functions_data, config)
 
     # Attach project knowledge to PKB for richer context packets
     if project_knowledge:
         pkb.load_project_knowledge(project_knowledge)
+    else:
+        pkb.detach_project_knowledge()
 
     # Apply function-key filter
     if config.function_key:
@@ -523,12 +696,11 @@ def run(config: EngineConfig) -> None:
 
     # Initialise shared infrastructure
     source_extractor = SourceExtractor(base_path)
-    tu_parser = TranslationUnitParser(config.std, config.clang_args)
+    ast_cache = _load_ast_cache(config, meta)
+    tu_parser = session.tu_parser(config, ast_cache, base_path)
     if config.no_llm:
         logger.info("--no-llm: skipping the LLM; emitting fallback node labels")
-        llm_client = _NullLlmClient()
-    else:
-        llm_client = _build_llm_client(config, llm_cfg_resolved)
+    llm_client = session.llm_client(config, llm_cfg_resolved)
 
     # Derive enrichment flags + authoritative max_context_tokens from the
     # resolved llm config (displayed above). When standalone without a
@@ -550,6 +722,9 @@ def run(config: EngineConfig) -> None:
         enrichment_config=enrichment_cfg,
         max_context_tokens=max_context_tokens,
     )
+    cfg_cache = _load_cfg_cache(config, enrichment_cfg,
+                                getattr(llm_client, "model", config.llm_model),
+                                functions_data)
     writer = OutputWriter(config.out_dir)
 
     # Process each source file
@@ -572,6 +747,7 @@ def run(config: EngineConfig) -> None:
                 config=config,
                 base_path=base_path,
                 project_knowledge=project_knowledge,
+                cfg_cache=cfg_cache,
             )
             fr.flowcharts.append(result)
             if result.error:
@@ -591,8 +767,17 @@ def run(config: EngineConfig) -> None:
     logger.info("=" * 60)
     logger.info("Done.  ✓ %d  ✗ %d  |  %d file(s) written",
                 total_ok, total_err, len(written))
+    if ast_cache is not None:
+        logger.info("AST cache: %d TU(s) loaded, %d re-parsed (%d saved)",
+                    ast_cache.hits, ast_cache.misses, ast_cache.saved)
+    if cfg_cache is not None:
+        evicted = prune_cfg_cache(cfg_cache.cache_dir, config.cfg_cache_max_mb * 1024 * 1024,
+                                  keep=cfg_cache.used)
+        logger.info("CFG cache: %d function(s) reused, %d built (%d stored, %d evicted)",
+                    cfg_cache.hits, cfg_cache.misses, cfg_cache.stored, evicted)
     logger.info("Output: %s", config.out_dir)
     logger.info("=" * 60)
+    return {"ok": total_ok, "errors": total_err, "files": len(written)}
 
 
 # ---------------------------------------------------------------------------
@@ -123,12 +123,15 @@ class LabelGenerator:
     def label_cfg(self, cfg: ControlFlowGraph,
                   func_entry: FunctionEntry,
                   source_code: str,
-                  base_path: str) -> None:
-        """Fill cfg.nodes[*].label for every non-sentinel node. In-place."""
+                  base_path: str) -> int:
+        """Fill cfg.nodes[*].label for every non-sentinel node. In-place.
+
+        Returns the number of nodes left with rule-based fallback labels.
+        """
         labelable = [n for n in cfg.nodes.values()
                      if n.node_type not in (NodeType.START, NodeType.END)]
         if not labelable:
-            return
+            return 0
 
         # Optional: LLM-guided simplification for large CFGs. Merges trivial
         # sequential ACTION nodes and drops boilerplate, shrinking the labeling
@@ -202,6 +205,7 @@ class LabelGenerator:
         else:
             logger.debug("'%s': all %d nodes labeled by LLM",
                          func_entry.qualified_name, len(labelable))
+        return fallback_count
 
     # ------------------------------------------------------------------
     # CFG simplification (optional pass, off by default)
@@ -330,21 +334,18 @@ class LabelGenerator:
             return False
         for i in range(len(group) - 1):
             cur, nxt = group[i], group[i + 1]
-            out_edges = [e for e in cfg.edges if e.source == cur]
+            out_edges = cfg.out_edges(cur)
             if len(out_edges) != 1 or out_edges[0].target != nxt:
                 return False
         # Interior nodes (everything except head) must have exactly one in-edge
         for nid in group[1:]:
-            in_edges = [e for e in cfg.edges if e.target == nid]
-            if len(in_edges) != 1:
+            if len(cfg.in_edges(nid)) != 1:
                 return False
         return True
 
     @staticmethod
     def _has_single_in_single_out(cfg: ControlFlowGraph, nid: str) -> bool:
-        in_edges = [e for e in cfg.edges if e.target == nid]
-        out_edges = [e for e in cfg.edges if e.source == nid]
-        return len(in_edges) == 1 and len(out_edges) == 1
+        return len(cfg.in_edges(nid)) == 1 and len(cfg.out_edges(nid)) == 1
 
     @staticmethod
     def _apply_merge(cfg: ControlFlowGraph, group: List[str]) -> None:
@@ -352,7 +353,7 @@ class LabelGenerator:
 
         Combines raw_code from every node in the group, re-parents outgoing
         edges of the tail to the head, removes the interior and tail nodes
-        from cfg.nodes, and drops now-dead edges.
+        from cfg.nodes, and drops now-dead edges. O(sum of group degrees).
         """
         head_id = group[0]
         tail_id = group[-1]
@@ -371,20 +372,14 @@ class LabelGenerator:
             head.end_line = tail.end_line
 
         # Rewire: every edge that starts at *tail* now starts at *head*
-        new_edges = []
         internal = set(group[1:])  # nodes to be deleted
-        for e in cfg.edges:
-            if e.source in internal or e.target in internal:
-                if e.source == tail_id and e.target not in internal:
-                    new_edges.append(type(e)(source=head_id, target=e.target, label=e.label))
-                # Drop everything else touching the interior
-                continue
-            new_edges.append(e)
-        cfg.edges = new_edges
+        for e in cfg.out_edges(tail_id):
+            if e.target not in internal:
+                cfg.set_edge_source(e, head_id)
 
-        # Delete interior nodes
+        # Delete interior nodes (and everything else touching them)
         for nid in internal:
-            cfg.nodes.pop(nid, None)
+            cfg.remove_node(nid)
 
         # Fix up entry / exit ids
         if cfg.entry_node_id in internal:
@@ -396,21 +391,19 @@ class LabelGenerator:
     @staticmethod
     def _apply_drop(cfg: ControlFlowGraph, nid: str) -> None:
         """Bypass *nid*: rewire its single in-edge to its single out-edge target."""
-        in_edges = [e for e in cfg.edges if e.target == nid]
-        out_edges = [e for e in cfg.edges if e.source == nid]
+        in_edges = cfg.in_edges(nid)
+        out_edges = cfg.out_edges(nid)
         if len(in_edges) != 1 or len(out_edges) != 1:
             return
         pred = in_edges[0].source
         succ = out_edges[0].target
         label = in_edges[0].label or out_edges[0].label
 
-        cfg.edges = [e for e in cfg.edges if e.source != nid and e.target != nid]
+        cfg.remove_node(nid)
         # Add a direct pred → succ edge if not already present
-        if not any(e.source == pred and e.target == succ for e in cfg.edges):
-            edge_cls = type(in_edges[0])
-            cfg.edges.append(edge_cls(source=pred, target=succ, label=label))
+        if not cfg.has_edge(pred, succ):
+            cfg.add_edge(pred, succ, label)
 
-        cfg.nodes.pop(nid, None)
         if cfg.entry_node_id == nid:
             cfg.entry_node_id = succ
         cfg.exit_node_ids = [
@@ -910,10 +903,7 @@ def _topo_sort(cfg: ControlFlowGraph) -> Tuple[List[str], Set[Tuple[str, str]]]:
           order      — node IDs in execution order (entry first)
           back_edges — set of (source, target) pairs that are back-edges
     """
-    succ: Dict[str, List[str]] = {nid: [] for nid in cfg.nodes}
-    for edge in cfg.edges:
-        if edge.source in succ:
-            succ[edge.source].append(edge.target)
+    succ: Dict[str, List[str]] = {nid: cfg.successors(nid) for nid in cfg.nodes}
 
     visited: Set[str] = set()
     in_stack: Set[str] = set()
@@ -16,7 +16,8 @@ Rules (DO NOT CHANGE):
 """
 
 import re
-from typing import Dict, List, Optional
+from collections import deque
+from typing import List, Optional
 
 from mermaid.normalizer import normalize_edge_label
 from models import CfgEdge, CfgNode, ControlFlowGraph, NodeType
@@ -123,25 +124,20 @@ def _topo_order(cfg: ControlFlowGraph) -> List[CfgNode]:
     if not cfg.nodes:
         return []
 
-    adjacency: Dict[str, List[str]] = {nid: [] for nid in cfg.nodes}
-    for edge in cfg.edges:
-        if edge.source in adjacency:
-            adjacency[edge.source].append(edge.target)
-
     visited: List[str] = []
     seen = set()
-    queue = [cfg.entry_node_id] if cfg.entry_node_id in cfg.nodes else [
+    queue = deque([cfg.entry_node_id] if cfg.entry_node_id in cfg.nodes else [
         next(iter(cfg.nodes))
-    ]
+    ])
 
     while queue:
-        nid = queue.pop(0)
+        nid = queue.popleft()
         if nid in seen:
             continue
         seen.add(nid)
         if nid in cfg.nodes:
             visited.append(nid)
-        for child in adjacency.get(nid, []):
+        for child in cfg.successors(nid):
             if child not in seen:
                 queue.append(child)
 
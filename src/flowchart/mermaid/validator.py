@@ -112,14 +112,11 @@ def _reachable(cfg: ControlFlowGraph) -> set:
     """BFS from entry node; returns set of reachable node IDs."""
     visited = set()
     queue = [cfg.entry_node_id]
-    adj = {}
-    for edge in cfg.edges:
-        adj.setdefault(edge.source, []).append(edge.target)
 
     while queue:
         nid = queue.pop()
         if nid in visited:
             continue
         visited.add(nid)
-        queue.extend(adj.get(nid, []))
+        queue.extend(cfg.successors(nid))
     return visited
@@ -21,14 +21,14 @@ class NodeType(str, Enum):
     CATCH = "CATCH"
 
 
-@dataclass
+@dataclass(slots=True)
 class CfgEdge:
     source: str
     target: str
     label: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CfgNode:
     node_id: str
     node_type: NodeType
@@ -39,17 +39,111 @@ class CfgNode:
     enriched_context: Dict = field(default_factory=dict)
 
 
-@dataclass
 class ControlFlowGraph:
-    function_key: str
-    qualified_name: str
-    source_file: str
-    start_line: int
-    end_line: int
-    nodes: Dict[str, CfgNode] = field(default_factory=dict)
-    edges: List[CfgEdge] = field(default_factory=list)
-    entry_node_id: str = ""
-    exit_node_ids: List[str] = field(default_factory=list)
+    """
+    A function's CFG: nodes by id plus directed edges, with per-node in/out
+    adjacency so neighbour queries and node removal cost O(degree), not O(E).
+
+    `edges` is a read-only view in insertion order (Mermaid edge order). Mutate
+    through add_edge / remove_edge / set_edge_source / remove_node, or assign a
+    whole new list to `edges` (re-indexes). Large switch / state-machine
+    functions produce thousands of nodes; the LLM simplification pass merges
+    and drops many of them.
+    """
+
+    __slots__ = ("function_key", "qualified_name", "source_file", "start_line",
+                 "end_line", "nodes", "entry_node_id", "exit_node_ids",
+                 "_edges", "_out", "_in", "_edge_view")
+
+    def __init__(self, function_key: str, qualified_name: str, source_file: str,
+                 start_line: int, end_line: int,
+                 nodes: Optional[Dict[str, CfgNode]] = None,
+                 edges: Optional[List[CfgEdge]] = None,
+                 entry_node_id: str = "",
+                 exit_node_ids: Optional[List[str]] = None) -> None:
+        self.function_key = function_key
+        self.qualified_name = qualified_name
+        self.source_file = source_file
+        self.start_line = start_line
+        self.end_line = end_line
+        self.nodes: Dict[str, CfgNode] = nodes if nodes is not None else {}
+        self.entry_node_id = entry_node_id
+        self.exit_node_ids: List[str] = exit_node_ids if exit_node_ids is not None else []
+        self.edges = edges or []
+
+    # -- edge storage -------------------------------------------------------
+    # Edges are keyed by id(edge) (the dicts keep them alive, so ids are unique);
+    # insertion-ordered dicts give O(1) removal while preserving edge order.
+
+    @property
+    def edges(self) -> Tuple[CfgEdge, ...]:
+        if self._edge_view is None:
+            self._edge_view = tuple(self._edges.values())
+        return self._edge_view
+
+    @edges.setter
+    def edges(self, edges: List[CfgEdge]) -> None:
+        self._edges: Dict[int, CfgEdge] = {}
+        self._out: Dict[str, Dict[int, CfgEdge]] = {}
+        self._in: Dict[str, Dict[int, CfgEdge]] = {}
+        self._edge_view: Optional[Tuple[CfgEdge, ...]] = None
+        for e in edges:
+            self._index(e)
+
+    def _index(self, e: CfgEdge) -> None:
+        k = id(e)
+        self._edges[k] = e
+        self._out.setdefault(e.source, {})[k] = e
+        self._in.setdefault(e.target, {})[k] = e
+        self._edge_view = None
+
+    def add_edge(self, source: str, target: str,
+                 label: Optional[str] = None) -> CfgEdge:
+        e = CfgEdge(source=source, target=target, label=label)
+        self._index(e)
+        return e
+
+    def remove_edge(self, e: CfgEdge) -> None:
+        k = id(e)
+        if self._edges.pop(k, None) is None:
+            return
+        self._out.get(e.source, {}).pop(k, None)
+        self._in.get(e.target, {}).pop(k, None)
+        self._edge_view = None
+
+    def set_edge_source(self, e: CfgEdge, source: str) -> None:
+        """Re-parent an edge in place (keeps its position in `edges`)."""
+        k = id(e)
+        self._out.get(e.source, {}).pop(k, None)
+        e.source = source
+        self._out.setdefault(source, {})[k] = e
+        self._edge_view = None
+
+    # -- adjacency ----------------------------------------------------------
+
+    def out_edges(self, nid: str) -> List[CfgEdge]:
+        return list(self._out.get(nid, {}).values())
+
+    def in_edges(self, nid: str) -> List[CfgEdge]:
+        return list(self._in.get(nid, {}).values())
+
+    def successors(self, nid: str) -> List[str]:
+        return [e.target for e in self._out.get(nid, {}).values()]
+
+    def has_edge(self, source: str, target: str) -> bool:
+        return any(e.target == target for e in self._out.get(source, {}).values())
+
+    def remove_node(self, nid: str) -> None:
+        """Delete a node and every edge touching it."""
+        for e in self.out_edges(nid) + self.in_edges(nid):
+            self.remove_edge(e)
+        self._out.pop(nid, None)
+        self._in.pop(nid, None)
+        self.nodes.pop(nid, None)
+
+    def __repr__(self) -> str:
+        return (f"ControlFlowGraph(function_key={self.function_key!r}, "
+                f"nodes={len(self.nodes)}, edges={len(self._edges)})")
 
 
 @dataclass
@@ -70,6 +164,7 @@ class FunctionEntry:
 class ProjectMeta:
     base_path: str
     project_name: str
+    parse_fingerprint: str = ""
 
 
 @dataclass
@@ -10,6 +10,13 @@ LLM call includes:
   3. Parameter type resolution      (enum + typedef meanings from project_knowledge)
   4. Caller context with signatures  (who calls this function and why)
   5. Global variable context         (globals this function reads/writes, with types)
+
+Context packets are built for every function of a run, so everything that does
+not depend on the function being labeled is indexed or memoized once per run:
+the project-callee adjacency (qname → callee qnames present in the knowledge),
+the rendered one-line fragment of each callee / caller, the hierarchy block of
+each file, and the source-fallback lookup of each non-project callee. The memos
+are reset whenever build() or load_project_knowledge() changes the inputs.
 """
 
 import logging
@@ -19,6 +26,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
 from models import FunctionEntry
+from pkb.cache import entry_hash
 from pkb.knowledge import FunctionKnowledge, GlobalKnowledge, ProjectKnowledge
 
 logger = logging.getLogger(__name__)
@@ -48,6 +56,30 @@ class ProjectKnowledgeBase:
         # Short-name → FunctionKnowledge (built lazily in load_project_knowledge)
         # Enables O(1) lookup in build_targeted_callee_context instead of O(n) scan.
         self._knowledge_by_short_name: Dict[str, "FunctionKnowledge"] = {}
+        # Per-function functions.json entry hash (pkb.cache.entry_hash) — lets
+        # build() reuse unchanged entries across runs / repeated builds.
+        self._entry_hashes: Dict[str, str] = {}
+        self.reused = 0
+        self.rebuilt = 0
+        self.removed = 0
+        self._reset_context_memos()
+
+    def _reset_context_memos(self) -> None:
+        """Drop every per-run context index / memo (inputs changed)."""
+        # qname → [callee qnames that are project functions], in fk.calls order
+        self._project_callees: Dict[str, List[str]] = {}
+        # qname → rendered callee line (_format_callee_entry) / caller line
+        self._callee_line_memo: Dict[str, str] = {}
+        self._caller_line_memo: Dict[str, str] = {}
+        # file → hierarchy block; callsId → source-fallback info (or None)
+        self._hierarchy_memo: Dict[str, str] = {}
+        self._source_fallback_memo: Dict[Tuple[str, str], Optional[Dict]] = {}
+
+    def detach_project_knowledge(self) -> None:
+        """Drop the attached ProjectKnowledge (a reused PKB whose next run has none)."""
+        self._knowledge = None
+        self._knowledge_by_short_name = {}
+        self._reset_context_memos()
 
     def load_project_knowledge(self, knowledge: ProjectKnowledge) -> None:
         """Attach a ProjectKnowledge (from project_scanner.py) for richer context."""
@@ -61,65 +93,74 @@ class ProjectKnowledgeBase:
             short = qname.split("::")[-1].split("(")[0].strip()
             if short and short not in self._knowledge_by_short_name:
                 self._knowledge_by_short_name[short] = fk
+        self._reset_context_memos()
+        functions = knowledge.functions
+        self._project_callees = {
+            qname: [c for c in fk.calls if c in functions]
+            for qname, fk in functions.items()
+        }
         logger.info("Project knowledge attached to PKB: %s", knowledge.stats())
 
     # ------------------------------------------------------------------
     # Construction
     # ------------------------------------------------------------------
 
-    def build(self, functions_data: Dict) -> None:
-        """Populate PKB from the parsed functions.json dict."""
+    def build(self, functions_data: Dict,
+              cached: Optional[Dict[str, Dict]] = None) -> None:
+        """
+        Populate PKB from the parsed functions.json dict.
+
+        Incremental: a function whose functions.json entry is unchanged (same
+        entry_hash) keeps the FunctionEntry already in memory, or is restored
+        from *cached* ({key -> {"hash", "record"}}, see PkbCache.load); only new
+        or edited entries are rebuilt, and functions no longer present are
+        dropped. Counts land in self.reused / self.rebuilt / self.removed.
+        """
+        cached = cached or {}
+        previous = self._functions
+        previous_hashes = self._entry_hashes
+        self._functions = {}
+        self._by_qualified_name = {}
+        self._entry_hashes = {}
+        self.reused = self.rebuilt = 0
+
         for key, data in functions_data.items():
-            location = data.get("location", {})
-            entry = FunctionEntry(
-                key=key,
-                qualified_name=data.get("qualifiedName", ""),
-                file=location.get("file", ""),
-                line=location.get("line", 0),
-                end_line=location.get("endLine", 0),
-                params=data.get("parameters", data.get("params", [])),
-                calls_ids=data.get("callsIds", []),
-                called_by_ids=data.get("calledByIds", []),
-                interface_id=data.get("interfaceId", ""),
-                description=data.get("description", ""),
-            )
+            h = entry_hash(data)
+            if key in previous and previous_hashes.get(key) == h:
+                entry = previous[key]
+                self.reused += 1
+            elif cached.get(key, {}).get("hash") == h:
+                entry = _entry_from_record(key, cached[key].get("record") or {})
+                self.reused += 1
+            else:
+                entry = _entry_from_functions_json(key, data)
+                self.rebuilt += 1
+            self._entry_hashes[key] = h
             self._functions[key] = entry
             self._by_qualified_name.setdefault(entry.qualified_name, []).append(key)
 
-        logger.info("PKB built: %d functions indexed", len(self._functions))
+        self.removed = sum(1 for k in previous if k not in self._functions)
+        self._source_fallback_memo = {}
+        self._callee_line_memo = {}
+        self._caller_line_memo = {}
+        logger.info("PKB built: %d functions indexed (%d reused, %d rebuilt)",
+                    len(self._functions), self.reused, self.rebuilt)
 
-    def to_dict(self) -> Dict:
-        """Serialize PKB for disk caching."""
+    def cache_records(self) -> Dict[str, Dict]:
+        """{key -> {"hash", "record"}} for PkbCache.save()."""
         return {
-            key: {
-                "qualifiedName": e.qualified_name,
-                "file": e.file,
-                "line": e.line,
-                "endLine": e.end_line,
-                "params": e.params,
-                "callsIds": e.calls_ids,
-                "calledByIds": e.called_by_ids,
-                "interfaceId": e.interface_id,
-                "description": e.description,
-            }
+            key: {"hash": self._entry_hashes.get(key, ""), "record": _entry_to_record(e)}
             for key, e in self._functions.items()
         }
 
+    def to_dict(self) -> Dict:
+        """Serialize PKB for disk caching."""
+        return {key: _entry_to_record(e) for key, e in self._functions.items()}
+
     def from_dict(self, data: Dict) -> None:
         """Restore PKB from a cached dict (same shape as to_dict output)."""
         for key, d in data.items():
-            entry = FunctionEntry(
-                key=key,
-                qualified_name=d.get("qualifiedName", ""),
-                file=d.get("file", ""),
-                line=d.get("line", 0),
-                end_line=d.get("endLine", 0),
-                params=d.get("params", []),
-                calls_ids=d.get("callsIds", []),
-                called_by_ids=d.get("calledByIds", []),
-                interface_id=d.get("interfaceId", ""),
-                description=d.get("description", ""),
-            )
+            entry = _entry_from_record(key, d)
             self._functions[key] = entry
             self._by_qualified_name.setdefault(entry.qualified_name, []).append(key)
         logger.info("PKB restored from cache: %d functions", len(self._functions))
@@ -301,15 +342,7 @@ class ProjectKnowledgeBase:
                 continue
             seen.add(qname)
 
-            fk = self._knowledge.functions.get(qname) if self._knowledge else None
-            if fk:
-                sig = fk.signature or qname
-                desc = fk.description or ""
-                line = f"  - {sig}" + (f"  →  {desc}" if desc else "")
-            else:
-                line = f"  - {qname}"
-
-            caller_lines.append(line)
+            caller_lines.append(self._caller_line(qname))
             if len(caller_lines) >= 5:
                 break
 
@@ -318,6 +351,20 @@ class ProjectKnowledgeBase:
 
         return "Called by (callers of this function):\n" + "\n".join(caller_lines)
 
+    def _caller_line(self, qname: str) -> str:
+        """Rendered caller line for *qname* (memoized per run)."""
+        line = self._caller_line_memo.get(qname)
+        if line is None:
+            fk = self._knowledge.functions.get(qname) if self._knowledge else None
+            if fk:
+                sig = fk.signature or qname
+                desc = fk.description or ""
+                line = f"  - {sig}" + (f"  →  {desc}" if desc else "")
+            else:
+                line = f"  - {qname}"
+            self._caller_line_memo[qname] = line
+        return line
+
     # ------------------------------------------------------------------
     # Hierarchy context builder
     # ------------------------------------------------------------------
@@ -333,6 +380,14 @@ class ProjectKnowledgeBase:
         if not self._knowledge:
             return ""
 
+        # Depends only on the function's file — memoized per file.
+        memo = self._hierarchy_memo.get(func_entry.file)
+        if memo is None:
+            memo = self._hierarchy_memo[func_entry.file] = \
+                self._render_hierarchy_context(func_entry.file)
+        return memo
+
+    def _render_hierarchy_context(self, file: str) -> str:
         lines: List[str] = []
 
         # Project summary
@@ -341,8 +396,8 @@ class ProjectKnowledgeBase:
             lines.append(f"[Project] {name}: {self._knowledge.project_summary}")
 
         # Component summary — derive component path from function's file
-        if func_entry.file and self._knowledge.component_summaries:
-            component_path = _parent_dir(func_entry.file)
+        if file and self._knowledge.component_summaries:
+            component_path = _parent_dir(file)
             component_summary = self._knowledge.component_summaries.get(component_path, "")
             if not component_summary and "/" in component_path:
                 # Try parent of parent (e.g. src/qos/detail → src/qos)
@@ -353,10 +408,10 @@ class ProjectKnowledgeBase:
                 lines.append(f"[Component] {component_path}/: {component_summary}")
 
         # File summary
-        if func_entry.file and self._knowledge.file_summaries:
-            file_summary = self._knowledge.file_summaries.get(func_entry.file, "")
+        if file and self._knowledge.file_summaries:
+            file_summary = self._knowledge.file_summaries.get(file, "")
             if file_summary:
-                file_name = func_entry.file.split("/")[-1]
+                file_name = file.split("/")[-1]
                 lines.append(f"[File] {file_name}: {file_summary}")
 
         if not lines:
@@ -390,45 +445,39 @@ class ProjectKnowledgeBase:
                 lines.append(_format_callee_entry(info))
             return "\n".join(lines)
 
-        # BFS across up to 4 levels
+        # BFS across up to 4 levels over the precomputed project-callee
+        # adjacency; each level holds rendered callee lines.
+        functions = self._knowledge.functions
         visited: Set[str] = {func_entry.qualified_name}
-        by_level: Dict[int, List[Dict]] = {}
+        by_level: Dict[int, List[str]] = {}
 
         # Level 1 seed: from functions.json callsIds
         current_qnames: List[str] = []
         for cid in func_entry.calls_ids:
             qname = _callsid_to_qname(cid)
             if qname and qname not in visited:
-                fk = self._knowledge.functions.get(qname)
-                if fk:
-                    info = _make_callee_info(qname, fk)
-                    by_level.setdefault(1, []).append(info)
+                if qname in functions:
+                    by_level.setdefault(1, []).append(self._callee_line(qname))
                     visited.add(qname)
                     current_qnames.append(qname)
                     if len(by_level.get(1, [])) >= _MAX_CALLEES_PER_LEVEL:
                         break
                 else:
                     # Callee not in project_knowledge — try source fallback for level 1
-                    fallback = _extract_callee_from_source(cid, base_path)
+                    fallback = self._source_fallback(cid, base_path)
                     if fallback:
-                        by_level.setdefault(1, []).append(fallback)
+                        by_level.setdefault(1, []).append(_format_callee_entry(fallback))
                         visited.add(qname)
 
         # Levels 2–4: follow calls stored in FunctionKnowledge.calls
+        # (pre-filtered to project functions in load_project_knowledge)
         for depth in range(2, _CALLEE_BFS_DEPTH + 1):
             next_qnames: List[str] = []
             for qname in current_qnames:
-                fk = self._knowledge.functions.get(qname)
-                if not fk:
-                    continue
-                for callee_qname in fk.calls:
+                for callee_qname in self._project_callees.get(qname, ()):
                     if callee_qname in visited:
                         continue
-                    callee_fk = self._knowledge.functions.get(callee_qname)
-                    if not callee_fk:
-                        continue  # not a project function — skip
-                    info = _make_callee_info(callee_qname, callee_fk)
-                    by_level.setdefault(depth, []).append(info)
+                    by_level.setdefault(depth, []).append(self._callee_line(callee_qname))
                     visited.add(callee_qname)
                     next_qnames.append(callee_qname)
                     if len(by_level.get(depth, [])) >= _MAX_CALLEES_PER_LEVEL:
@@ -449,13 +498,27 @@ class ProjectKnowledgeBase:
             4: "Calls at depth 4",
         }
         for depth in sorted(by_level.keys()):
-            entries = by_level[depth]
             lines.append(f"\n{depth_labels.get(depth, f'Depth {depth}')}:")
-            for info in entries:
-                lines.append(_format_callee_entry(info))
+            lines.extend(by_level[depth])
 
         return "\n".join(lines)
 
+    def _callee_line(self, qname: str) -> str:
+        """Rendered callee line for a project function (memoized per run)."""
+        line = self._callee_line_memo.get(qname)
+        if line is None:
+            line = self._callee_line_memo[qname] = _format_callee_entry(
+                _make_callee_info(qname, self._knowledge.functions[qname]))
+        return line
+
+    def _source_fallback(self, callee_id: str, base_path: str) -> Optional[Dict]:
+        """_extract_callee_from_source, memoized per run: the same non-project
+        callee is otherwise re-opened and re-scanned for every caller."""
+        k = (callee_id, base_path)
+        if k not in self._source_fallback_memo:
+            self._source_fallback_memo[k] = _extract_callee_from_source(callee_id, base_path)
+        return self._source_fallback_memo[k]
+
     def _resolve_level1_from_pkb(self, func_entry: FunctionEntry,
                                    base_path: str) -> List[Dict]:
         """Level-1 callee resolution without project knowledge (PKB only)."""
@@ -474,7 +537,7 @@ class ProjectKnowledgeBase:
                     "file": entry.file,
                 })
             else:
-                fallback = _extract_callee_from_source(cid, base_path)
+                fallback = self._source_fallback(cid, base_path)
                 if fallback:
                     result.append(fallback)
         return result
@@ -566,6 +629,54 @@ def _parent_dir(file_path: str) -> str:
     return "/".join(parts[:-1])
 
 
+def _entry_from_functions_json(key: str, data: Dict) -> FunctionEntry:
+    """Build a FunctionEntry from one functions.json entry."""
+    location = data.get("location", {})
+    return FunctionEntry(
+        key=key,
+        qualified_name=data.get("qualifiedName", ""),
+        file=location.get("file", ""),
+        line=location.get("line", 0),
+        end_line=location.get("endLine", 0),
+        params=data.get("parameters", data.get("params", [])),
+        calls_ids=data.get("callsIds", []),
+        called_by_ids=data.get("calledByIds", []),
+        interface_id=data.get("interfaceId", ""),
+        description=data.get("description", ""),
+    )
+
+
+def _entry_to_record(e: FunctionEntry) -> Dict:
+    """Cache record for one FunctionEntry (inverse of _entry_from_record)."""
+    return {
+        "qualifiedName": e.qualified_name,
+        "file": e.file,
+        "line": e.line,
+        "endLine": e.end_line,
+        "params": e.params,
+        "callsIds": e.calls_ids,
+        "calledByIds": e.called_by_ids,
+        "interfaceId": e.interface_id,
+        "description": e.description,
+    }
+
+
+def _entry_from_record(key: str, d: Dict) -> FunctionEntry:
+    """Restore a FunctionEntry from its cache record."""
+    return FunctionEntry(
+        key=key,
+        qualified_name=d.get("qualifiedName", ""),
+        file=d.get("file", ""),
+        line=d.get("line", 0),
+        end_line=d.get("endLine", 0),
+        params=d.get("params", []),
+        calls_ids=d.get("callsIds", []),
+        called_by_ids=d.get("calledByIds", []),
+        interface_id=d.get("interfaceId", ""),
+        description=d.get("description", ""),
+    )
+
+
 def _callsid_to_qname(calls_id: str) -> str:
     """
     Extract the qualified function name from a callsId string.
@@ -654,8 +765,9 @@ def _find_function_in_source(source: str, simple_name: str) -> Tuple[str, str]:
     Returns (signature_line, preceding_comment) or ("", "").
     """
     lines = source.splitlines()
+    pattern = re.compile(rf'\b{re.escape(simple_name)}\s*\(')
     for i, line in enumerate(lines):
-        if re.search(rf'\b{re.escape(simple_name)}\s*\(', line):
+        if pattern.search(line):
             sig_lines = [line.strip()]
             j = i + 1
             while j < len(lines) and "{" not in "".join(sig_lines):
@@ -3,60 +3,115 @@
 import hashlib
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict
 
 logger = logging.getLogger(__name__)
 
+# Shard directory under --cache-dir. Records are spread over up to 256 shards
+# by md5(key)[:2], so a run that changes a few functions rewrites a few shards.
+_SHARD_DIRNAME = "pkb"
+
+
+def entry_hash(data: Dict) -> str:
+    """Hash of one functions.json entry (the record a FunctionEntry is built from)."""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _shard_of(key: str) -> str:
+    return hashlib.md5(key.encode("utf-8")).hexdigest()[:2]
+
 
 class PkbCache:
     """
-    Caches PKB data keyed by a hash of functions.json content.
-    Rebuilds only when functions.json changes.
+    Per-function PKB store.
+
+    Each function's PKB record is kept together with the entry_hash() of the
+    functions.json entry it was built from, so ProjectKnowledgeBase.build() can
+    restore every unchanged function and rebuild only the edited ones (an edit to
+    a call edge changes both ends' callsIds / calledByIds, so the neighbours are
+    rebuilt too). save() rewrites only shards whose contents changed and drops
+    records of functions that no longer exist; gc() removes the legacy
+    whole-file pkb_<md5>.json snapshots, which were never evicted.
     """
 
     def __init__(self, cache_dir: str) -> None:
         self._cache_dir = Path(cache_dir)
-        self._cache_dir.mkdir(parents=True, exist_ok=True)
-
-    def _content_hash(self, content: str) -> str:
-        return hashlib.md5(content.encode("utf-8")).hexdigest()[:16]
+        self._shard_dir = self._cache_dir / _SHARD_DIRNAME
+        self._shard_dir.mkdir(parents=True, exist_ok=True)
+        self._loaded: Dict[str, Dict[str, Dict]] = {}
 
-    def _cache_path(self, content_hash: str) -> Path:
-        return self._cache_dir / f"pkb_{content_hash}.json"
+    def _shard_path(self, shard: str) -> Path:
+        return self._shard_dir / f"{shard}.json"
 
-    def load(self, functions_json_content: str) -> Optional[Dict]:
-        """Return cached PKB dict if functions.json hasn't changed, else None."""
-        h = self._content_hash(functions_json_content)
-        path = self._cache_path(h)
-        if path.exists():
+    def load(self) -> Dict[str, Dict]:
+        """Return {key -> {"hash", "record"}} for every cached function."""
+        records: Dict[str, Dict] = {}
+        self._loaded = {}
+        for path in sorted(self._shard_dir.glob("*.json")):
             try:
                 with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                logger.info("PKB loaded from cache: %s", path)
-                return data
+                    shard = json.load(f)
             except Exception as exc:
-                logger.warning("Cache load failed: %s", exc)
-        return None
-
-    def save(self, functions_json_content: str, data: Dict) -> None:
-        """Persist PKB dict to disk."""
-        h = self._content_hash(functions_json_content)
-        path = self._cache_path(h)
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            logger.info("PKB saved to cache: %s", path)
-        except Exception as exc:
-            logger.warning("Cache save failed: %s", exc)
-
-    def invalidate_stale(self, functions_json_content: str) -> None:
-        """Remove cache files that don't match the current functions.json hash."""
-        current = f"pkb_{self._content_hash(functions_json_content)}.json"
-        for f in self._cache_dir.glob("pkb_*.json"):
-            if f.name != current:
+                logger.warning("PKB shard unreadable (%s): %s", path.name, exc)
+                continue
+            self._loaded[path.stem] = shard
+            records.update(shard)
+        if records:
+            logger.info("PKB cache: %d function record(s) in %d shard(s)",
+                        len(records), len(self._loaded))
+        return records
+
+    def save(self, records: Dict[str, Dict]) -> int:
+        """Persist {key -> {"hash", "record"}}; returns the number of shards written.
+
+        Only shards whose contents differ from what load() read are rewritten;
+        shards left without any current function are deleted.
+        """
+        shards: Dict[str, Dict[str, Dict]] = {}
+        for key, rec in records.items():
+            shards.setdefault(_shard_of(key), {})[key] = rec
+
+        written = 0
+        for shard, content in shards.items():
+            if self._loaded.get(shard) == content:
+                continue
+            path = self._shard_path(shard)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False)
+                os.replace(tmp, path)
+                written += 1
+            except Exception as exc:
+                logger.warning("PKB shard save failed (%s): %s", path.name, exc)
                 try:
-                    f.unlink()
-                    logger.debug("Removed stale cache: %s", f)
-                except Exception:
+                    tmp.unlink()
+                except OSError:
                     pass
+
+        for shard in set(self._loaded) - set(shards):
+            try:
+                self._shard_path(shard).unlink()
+            except OSError:
+                pass
+
+        self._loaded = shards
+        if written:
+            logger.info("PKB cache: %d shard(s) written", written)
+        return written
+
+    def gc(self) -> int:
+        """Remove legacy whole-file pkb_*.json snapshots and stray temp files."""
+        removed = 0
+        stale = list(self._cache_dir.glob("pkb_*.json")) + list(self._shard_dir.glob("*.tmp"))
+        for f in stale:
+            try:
+                f.unlink()
+                removed += 1
+                logger.debug("Removed stale cache: %s", f)
+            except Exception:
+                pass
+        return removed
@@ -4,6 +4,18 @@ Given the git diff and the per-TU include closures captured by M4.0 (model/tu_in
 decide which translation units must be re-parsed and whether a corner case forces a full
 re-parse instead. Sound over-approximation (D7): when in doubt, parse more.
 
+The closures are also persisted inverted (model/tu_include_index.json, written by the
+parser next to tu_includes.json): {normalized file -> [TUs whose closure holds it]},
+normalized once at parse time. With it, the affected set is one lookup per changed path —
+the cost follows the diff, not the total number of include edges. A narrowed parse keeps
+the index current by patching only the re-parsed TUs' entries (update_include_index).
+
+A header ADDED is the one change a closure can't see: it may shadow an `#include` of an
+untouched TU. The baseline's include resolution (model/include_resolution.json, doc 04
+§17) lists, per TU, the in-repo paths probed before each `#include` hit; shadowed_tus
+turns an added path into the TUs it could re-route, so additions stay on the narrowed
+path. Without that record, a header add/delete still forces a full re-parse.
+
 Pure (operates on plain lists/dicts) so it is unit-testable; the engine supplies the diff
 and the baseline's closure map.
 """
@@ -12,6 +24,8 @@ from __future__ import annotations
 import os
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+from incremental.parse_includes import WILDCARD
+
 # Source files we treat as translation units (re-parsed) vs headers (only fan-out via closures).
 _TU_EXTS = (".cpp", ".cc", ".cxx", ".c", ".c++")
 _HEADER_EXTS = (".h", ".hpp", ".hh", ".hxx", ".h++", ".inc", ".ipp", ".tcc")
@@ -32,43 +46,129 @@ def _is_header(path: str) -> bool:
     return path.lower().endswith(_HEADER_EXTS)
 
 
+def _index_usable(index: Optional[Dict]) -> bool:
+    """An index is only valid for the case-folding it was built with (see _norm)."""
+    return bool(index) and index.get("caseFolded") == (os.name == "nt") \
+        and isinstance(index.get("files"), dict) and isinstance(index.get("tus"), list)
+
+
+def build_include_index(tu_includes: Dict[str, List[str]]) -> Dict:
+    """Invert the closure map: {"caseFolded": bool, "tus": [TU paths, original casing],
+    "files": {normalized file -> ascending ids into "tus"}}. Every TU is listed under its
+    own path too. Ids instead of paths keep the file ~5x smaller and quicker to load."""
+    tus = sorted(tu_includes or {})
+    files: Dict[str, List[int]] = {}
+    for i, tu in enumerate(tus):
+        for p in {_norm(p) for p in [tu, *(tu_includes[tu] or [])]}:
+            files.setdefault(p, []).append(i)
+    return {"caseFolded": os.name == "nt", "tus": tus, "files": dict(sorted(files.items()))}
+
+
+def update_include_index(index: Dict, removed: Dict[str, List[str]],
+                         added: Dict[str, List[str]]) -> Dict:
+    """Return `index` patched for re-parsed TUs: each TU in `removed` leaves the entries of
+    its OLD closure, each TU in `added` joins those of its NEW one. Costs the size of those
+    closures only; `index` itself is not modified (its untouched lists are shared)."""
+    tus = list(index.get("tus") or [])
+    files = dict(index.get("files") or {})
+    ids = {tu: i for i, tu in enumerate(tus)}
+    for tu, includes in (removed or {}).items():
+        i = ids.get(tu)
+        if i is None:
+            continue
+        for p in {_norm(p) for p in [tu, *(includes or [])]}:
+            rest = [j for j in files.get(p, ()) if j != i]
+            if rest:
+                files[p] = rest
+            else:
+                files.pop(p, None)
+    for tu, includes in (added or {}).items():
+        if tu not in ids:
+            ids[tu] = len(tus)
+            tus.append(tu)
+        i = ids[tu]
+        for p in {_norm(p) for p in [tu, *(includes or [])]}:
+            if i not in files.get(p, ()):
+                files[p] = sorted([*files.get(p, ()), i])
+    return {"caseFolded": index.get("caseFolded", os.name == "nt"), "tus": tus, "files": files}
+
+
+def index_closures(index: Dict) -> Dict[str, Set[str]]:
+    """{normalized file -> set of TU paths} — an index's content independent of its ids."""
+    tus = index["tus"]
+    return {p: {tus[i] for i in ids} for p, ids in index["files"].items()}
+
+
 def affected_tus(changed_paths: Iterable[str],
-                 tu_includes: Dict[str, List[str]]) -> Set[str]:
+                 tu_includes: Optional[Dict[str, List[str]]] = None, *,
+                 index: Optional[Dict] = None) -> Set[str]:
     """Return the set of TU paths (keys of `tu_includes`, original casing) to re-parse:
     a TU is affected if it OR any file in its include closure was changed. Newly-added
     TUs (changed `.cpp` not yet in the closure map) are included too.
 
     `changed_paths` = every path in the diff (any status). `tu_includes` = {tuPath:
-    [includedPaths]} from the baseline version."""
-    changed = {_norm(p) for p in changed_paths}
-    if not changed:
+    [includedPaths]} from the baseline version; `index` = its persisted inverted form
+    (build_include_index), used as-is when present so only the diff is normalized."""
+    changed_paths = list(changed_paths)
+    if not changed_paths:
         return set()
+    if not _index_usable(index):
+        index = build_include_index(tu_includes or {})
+    files, all_tus = index["files"], index["tus"]
     affected: Set[str] = set()
-    for tu, includes in (tu_includes or {}).items():
-        closure = {_norm(tu)}
-        closure.update(_norm(p) for p in (includes or []))
-        if closure & changed:
-            affected.add(tu)
-    # Newly-added TUs aren't in the (baseline) closure map yet — parse them too.
-    known = {_norm(tu) for tu in (tu_includes or {})}
     for p in changed_paths:
-        if _is_tu(p) and _norm(p) not in known:
+        key = _norm(p)
+        tus = [all_tus[i] for i in files.get(key, ())]
+        affected.update(tus)
+        # Newly-added TUs aren't in the (baseline) closure map yet — parse them too.
+        if _is_tu(p) and not any(_norm(tu) == key for tu in tus):
             affected.add(p.replace("\\", "/").strip("/"))
     return affected
 
 
+def _resolution_usable(resolution: Optional[Dict]) -> bool:
+    return bool(resolution) and isinstance(resolution.get("tus"), dict) \
+        and _index_usable(resolution.get("index"))
+
+
+def shadowed_tus(added_paths: Iterable[str], resolution: Optional[Dict]) -> Set[str]:
+    """TUs (original casing) that one of `added_paths` could shadow: it sits where one of
+    their `#include`s was searched before its hit — plus every TU whose resolution
+    couldn't be bounded (WILDCARD). Empty when nothing was added."""
+    added = list(added_paths)
+    if not added or not _resolution_usable(resolution):
+        return set()
+    index = resolution["index"]
+    files, tus = index["files"], index["tus"]
+    out = {tus[i] for i in files.get(WILDCARD, ())}
+    for p in added:
+        out.update(tus[i] for i in files.get(_norm(p), ()))
+    return out
+
+
 def full_reparse_reason(status_pairs: Iterable[Tuple[str, str]],
-                        tu_includes: Optional[Dict[str, List[str]]]) -> Optional[str]:
+                        tu_includes: Optional[Dict[str, List[str]]],
+                        resolution: Optional[Dict] = None) -> Optional[str]:
     """Return a human-readable reason a FULL re-parse is required (so the engine takes the
     safe path), or None when a narrowed parse is sound. Triggers (doc 04 §11.4):
       * no/empty closure map (first incremental, or a schema change);
-      * a HEADER added or deleted -> may shadow an existing #include and silently change
-        an untouched TU's closure (we can't bound the blast radius from the diff alone).
+      * a HEADER added or deleted when the baseline has no include `resolution` -> may
+        shadow an existing #include and silently change an untouched TU's closure;
+      * with it, a header added where an #include INSIDE an out-of-repo header searched
+        (shared by every TU — doc 04 §17).
+    With a resolution an added header only widens the affected set (shadowed_tus), and a
+    deleted one is covered by the closures of the TUs that included it.
     (Compiler-flag / toolchain changes are caught separately by the parse fingerprint.)"""
     if not tu_includes:
         return "no per-TU include closure map (model/tu_includes.json) for the baseline"
+    tracked = _resolution_usable(resolution)
+    external = {_norm(p) for p in (resolution or {}).get("external") or ()} if tracked else set()
     for status, path in status_pairs:
-        if status in ("A", "D") and _is_header(path):
-            verb = "added" if status == "A" else "deleted"
+        if status not in ("A", "D") or not _is_header(path):
+            continue
+        verb = "added" if status == "A" else "deleted"
+        if not tracked:
             return f"header {verb} ({path}) — include-shadowing risk; full re-parse is safe"
+        if status == "A" and (WILDCARD in external or _norm(path) in external):
+            return f"header added ({path}) — may shadow an include inside an out-of-repo header"
     return None
@@ -0,0 +1,213 @@
+"""Content-addressed artifact store for version snapshots.
+
+Capturing a version used to ``copytree`` the analyzer's whole ``model/`` and ``output/``
+into the commit dir and copy every ``.docx`` once more into ``documents/`` — but most
+artifacts (flowchart PNGs, unit diagrams, unchanged model JSON) are byte-identical between
+consecutive versions, so disk use and capture time grew with every version.
+
+Now each distinct file is stored ONCE as a blob under the workspace cache, and a version's
+tree is made of hardlinks to those blobs (a copy where the file system can't link):
+
+    workspaces/<projectId>/
+      cache/cas/<sha256[:2]>/<sha256><ext>          # one blob per distinct content
+      <commit[:16]>/
+        artifacts.json                              # {"files": {"model/x.json": "<sha256><ext>", ...}}
+        model/ output/ documents/                   # hardlinks to the blobs
+
+Readers keep opening ``<commit[:16]>/output/...`` as before; :func:`resolve` falls back to
+the manifest (the blob itself) when a captured file is missing from the tree.
+
+Blobs are written by copy, never by linking the analyzer's working files, and a version
+file is always replaced (link to a temp name + ``os.replace``), never rewritten in place —
+so no later write can change a blob shared by other versions. :meth:`ArtifactStore.gc`
+deletes the blobs no version manifest references.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+ARTIFACTS_MANIFEST = "artifacts.json"
+CAS_DIRNAME = "cas"
+
+# A blob younger than this is never collected: a concurrent capture may have stored (or
+# touched) it without having written its manifest yet.
+GC_GRACE_S = 3600
+
+_CHUNK = 1 << 20
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _tmp_name(path: str) -> str:
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def cas_dir(workspace_root: str) -> str:
+    """`workspaces/<pid>/cache/cas` — the project's blob store."""
+    return os.path.join(workspace_root, "cache", CAS_DIRNAME)
+
+
+class ArtifactStore:
+    """Blob store keyed by ``<sha256><ext>`` (the extension keeps content types guessable).
+
+    Args:
+        root: the blob directory (created on first put)
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.stored = 0      # new blobs written
+        self.reused = 0      # files whose blob already existed
+        self.linked = 0      # version files materialized as hardlinks
+        self.copied = 0      # ... as copies (no hardlink support)
+
+    def blob_path(self, blob: str) -> str:
+        return os.path.join(self.root, blob[:2], blob)
+
+    def put(self, path: str) -> str:
+        """Store the file at *path* (by copy) and return its blob name."""
+        blob = _sha256(path) + os.path.splitext(path)[1].lower()
+        dest = self.blob_path(blob)
+        if os.path.isfile(dest):
+            os.utime(dest, None)  # in use again: out of gc's grace window
+            self.reused += 1
+            return blob
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = _tmp_name(dest)
+        try:
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, dest)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self.stored += 1
+        return blob
+
+    def materialize(self, blob: str, dest: str) -> None:
+        """Make *dest* a hardlink to (or, failing that, a copy of) the blob, replacing any
+        existing file at *dest* without writing through it."""
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = _tmp_name(dest)
+        try:
+            os.link(self.blob_path(blob), tmp)
+            self.linked += 1
+        except OSError:
+            shutil.copyfile(self.blob_path(blob), tmp)
+            self.copied += 1
+        os.replace(tmp, dest)
+
+    def gc(self, referenced: Iterable[str], *, grace_s: float = GC_GRACE_S) -> int:
+        """Delete every blob not in *referenced* and older than *grace_s*. Returns the
+        number deleted."""
+        keep = set(referenced)
+        cutoff = time.time() - grace_s
+        removed = 0
+        try:
+            shards = os.listdir(self.root)
+        except OSError:
+            return 0
+        for shard in shards:
+            shard_dir = os.path.join(self.root, shard)
+            try:
+                names = os.listdir(shard_dir)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(shard_dir, name)
+                try:
+                    if name in keep or os.stat(path).st_mtime > cutoff:
+                        continue
+                    os.unlink(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def read_manifest(version_dir: str) -> Dict[str, str]:
+    """{relpath -> blob} of a captured version ({} when it predates the store)."""
+    try:
+        with open(os.path.join(version_dir, ARTIFACTS_MANIFEST), "r", encoding="utf-8") as fh:
+            return dict(json.load(fh).get("files") or {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def write_manifest(version_dir: str, files: Dict[str, str]) -> None:
+    path = os.path.join(version_dir, ARTIFACTS_MANIFEST)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"files": dict(sorted(files.items()))}, fh, indent=1)
+    os.replace(tmp, path)  # atomic
+
+
+def capture_tree(store: ArtifactStore, src_dir: str, version_dir: str, subdir: str,
+                 files: Dict[str, str]) -> None:
+    """Store every file under *src_dir* and materialize it at *version_dir*/*subdir*/...,
+    recording ``files[subdir/rel] = blob``. Files already in the version tree but not in
+    *src_dir* are left alone (capture merges, as the copytree it replaces did)."""
+    for root, _dirs, names in os.walk(src_dir):
+        for name in names:
+            src = os.path.join(root, name)
+            rel = os.path.relpath(src, src_dir).replace(os.sep, "/")
+            key = f"{subdir}/{rel}"
+            blob = store.put(src)
+            dest = os.path.join(version_dir, subdir, *rel.split("/"))
+            if files.get(key) != blob or not os.path.isfile(dest):
+                store.materialize(blob, dest)
+            files[key] = blob
+
+
+def referenced_blobs(workspace_root: str) -> set:
+    """Every blob named by a version manifest of the workspace."""
+    refs: set = set()
+    try:
+        entries = os.listdir(workspace_root)
+    except OSError:
+        return refs
+    for entry in entries:
+        refs.update(read_manifest(os.path.join(workspace_root, entry)).values())
+    return refs
+
+
+def resolve(version_dir: str, relpath: str) -> Optional[str]:
+    """Path of a captured file: the version tree's copy, else its blob via the manifest
+    (the store is ``cache/cas`` of the version dir's workspace). None when neither exists."""
+    path = os.path.join(version_dir, *relpath.split("/"))
+    if os.path.isfile(path):
+        return path
+    blob = read_manifest(version_dir).get(relpath)
+    if not blob:
+        return None
+    path = ArtifactStore(cas_dir(os.path.dirname(os.path.abspath(version_dir)))).blob_path(blob)
+    return path if os.path.isfile(path) else None
+
+
+def subdirs(version_dir: str, reldir: str) -> List[str]:
+    """Names of the directories directly under *reldir* in the version: the tree's plus
+    any the manifest records files under."""
+    names = set()
+    d = os.path.join(version_dir, *reldir.split("/"))
+    if os.path.isdir(d):
+        names.update(n for n in os.listdir(d) if os.path.isdir(os.path.join(d, n)))
+    prefix = reldir.rstrip("/") + "/"
+    for rel in read_manifest(version_dir):
+        head, sep, _rest = rel[len(prefix):].partition("/") if rel.startswith(prefix) else ("", "", "")
+        if sep:
+            names.add(head)
+    return sorted(names)
@@ -82,6 +82,17 @@ def select_baseline(repo_dir: str,
                    changed=changed, decision="incremental", warnings=warnings)
 
 
+def chained_baseline(repo_dir: str, base_version_id: str, base_commit: str,
+                     target_commit: str) -> Dict[str, Any]:
+    """The decision for a batch step (engine.generate_batch): the baseline is the version
+    the batch just produced for a parent of the target — known to be the nearest
+    ancestor, so nothing is searched. Same keys as select_baseline."""
+    changed = len(git_ops.changed_files(repo_dir, base_commit, target_commit))
+    return _result(target_commit, base_version_id, base_commit, base_version_id, base_commit,
+                   chosen_is_ancestor=True, chosen_is_nearest=True,
+                   changed=changed, decision="incremental", warnings=[])
+
+
 def _result(target, auto_vid, auto_commit, chosen_vid, chosen_commit,
             *, chosen_is_ancestor, chosen_is_nearest, changed, decision, warnings) -> Dict[str, Any]:
     return {
@@ -6,6 +6,13 @@ generated artifacts live under ``workspaces/<pid>/<commit[:16]>/``. The API serv
 engine.py) uses :func:`ensure_commit_checkout` to create it on demand — so the CLI is
 independent and can clone for itself.
 
+Per-commit checkouts come from a per-project bare mirror (``workspaces/<pid>/mirror.git``)
+when the caller passes ``mirror_dir``: the mirror is fetched incrementally (only when the
+commit is missing) and each commit gets a ``git worktree`` of it, so the history is
+downloaded and stored once instead of once per commit. A new worktree hardlinks the files
+it shares with the nearest existing worktree (same blob, same mode) and lets git write only
+the rest; ``sparse_paths`` limits it to a cone of directories.
+
 This module is the ONE shallow-clone implementation for the whole platform:
 ``api/services/git_cli.shallow_clone`` delegates here, so there is no duplicate clone
 code. Kept in ``src/`` so the engine has no dependency on ``api/`` (the higher layer
@@ -15,7 +22,7 @@ then scrubbed from ``origin`` (never persisted to disk); tokens are scrubbed fro
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
 from urllib.parse import quote, urlsplit, urlunsplit
 
 from incremental import git_ops
@@ -75,17 +82,140 @@ def shallow_clone(repo_url: str, dest_dir: str, *, ref: Optional[str] = None,
            "remote set-url")
 
 
+def ensure_mirror(mirror_dir: str, repo_url: str, commit: str, *, token: str = "") -> None:
+    """Ensure the bare mirror at ``mirror_dir`` contains ``commit``.
+
+    Created empty on first use; fetched (all branches and tags, incrementally — git only
+    transfers objects the mirror lacks) only when the commit is missing. Fetches go to the
+    credential-injected URL; the stored ``origin`` stays credential-free."""
+    if not os.path.isdir(mirror_dir):
+        if not repo_url:
+            raise GitError(f"cannot create mirror {mirror_dir!r}: no repo_url for the project "
+                           f"(onboard the project, or pass --repo-url)")
+        os.makedirs(os.path.dirname(mirror_dir) or ".", exist_ok=True)
+        _check(_run(["init", "--bare", "-q", mirror_dir]), "init --bare")
+        _check(_run(["-C", mirror_dir, "remote", "add", "origin", _clean_url(repo_url)]),
+               "remote add")
+    elif git_ops.commit_exists(mirror_dir, commit):
+        return
+    if not repo_url:
+        raise GitError(f"commit {commit!r} is not in {mirror_dir!r} and there is no repo_url "
+                       f"to fetch it from")
+    auth = _auth_url(repo_url, token, "")
+    proc = _run(["-C", mirror_dir, "fetch", "--prune", "--quiet", auth,
+                 "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"])
+    if proc.returncode != 0:
+        msg = (proc.stderr or "").strip().replace(auth, _clean_url(repo_url))
+        raise GitError(f"mirror fetch failed (exit {proc.returncode}): {msg}")
+    if not git_ops.commit_exists(mirror_dir, commit):
+        # A commit no branch or tag points at (yet): ask for it by id.
+        proc = _run(["-C", mirror_dir, "fetch", "--quiet", auth, commit])
+        if proc.returncode != 0:
+            msg = (proc.stderr or "").strip().replace(auth, _clean_url(repo_url))
+            raise GitError(f"fetch {commit} failed (exit {proc.returncode}): {msg}")
+
+
+def _worktree_heads(mirror_dir: str) -> Dict[str, str]:
+    """{worktree path -> HEAD sha} of the mirror's existing worktrees."""
+    out = _check(_run(["-C", mirror_dir, "worktree", "list", "--porcelain"]), "worktree list")
+    heads: Dict[str, str] = {}
+    path = None
+    for line in out.splitlines():
+        if line.startswith("worktree "):
+            path = line[len("worktree "):]
+        elif line.startswith("HEAD ") and path and os.path.isdir(path):
+            heads[path] = line[len("HEAD "):]
+    return heads
+
+
+def _tree_files(repo_dir: str, commit: str) -> Dict[str, Tuple[str, str]]:
+    """{path -> (mode, blob sha)} of the regular files in ``commit``'s tree."""
+    out = _check(_run(["-C", repo_dir, "ls-tree", "-r", "-z", "--full-tree", commit]), "ls-tree")
+    files: Dict[str, Tuple[str, str]] = {}
+    for rec in out.split("\0"):
+        meta, _, path = rec.partition("\t")
+        parts = meta.split()
+        if len(parts) == 3 and parts[1] == "blob" and parts[0] in ("100644", "100755"):
+            files[path] = (parts[0], parts[2])
+    return files
+
+
+def _link_unchanged(mirror_dir: str, src_dir: str, src_commit: str, dest_dir: str,
+                    commit: str, sparse_paths: Sequence[str] = ()) -> int:
+    """Hardlink into ``dest_dir`` every file ``commit`` shares with ``src_commit`` (checked
+    out in ``src_dir``). Best-effort: stops at the first link that fails (another file
+    system, no hardlink support) and returns the number of files linked.
+
+    Git replaces a file by writing a new one, never in place, so a later checkout in either
+    worktree breaks the link instead of changing the other; a source file modified since
+    its checkout fails the index refresh and is rewritten by the caller's checkout."""
+    src_files = _tree_files(mirror_dir, src_commit)
+    prefixes = tuple(p.strip("/") + "/" for p in sparse_paths)
+    linked = 0
+    for path, entry in _tree_files(mirror_dir, commit).items():
+        if src_files.get(path) != entry or (prefixes and not path.startswith(prefixes)):
+            continue
+        target = os.path.join(dest_dir, *path.split("/"))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.link(os.path.join(src_dir, *path.split("/")), target)
+        except FileNotFoundError:
+            continue  # not checked out there (sparse, or deleted by hand)
+        except OSError:
+            break
+        linked += 1
+    return linked
+
+
+def add_worktree(mirror_dir: str, commit_dir: str, commit: str, *,
+                 sparse_paths: Optional[Sequence[str]] = None, link_unchanged: bool = True) -> int:
+    """Check ``commit`` out of ``mirror_dir`` as a detached worktree at ``commit_dir``.
+
+    ``sparse_paths`` (repo-relative directories) makes it a cone-mode sparse checkout.
+    With ``link_unchanged`` the files shared with the nearest existing worktree are
+    hardlinked instead of written. Returns the number of linked files."""
+    commit_dir = os.path.abspath(commit_dir)
+    _run(["-C", mirror_dir, "worktree", "prune"])  # forget worktrees whose dir was deleted
+    heads = _worktree_heads(mirror_dir) if link_unchanged else {}
+    _check(_run(["-C", mirror_dir, "worktree", "add", "--detach", "--no-checkout", "-q",
+                 commit_dir, commit]), f"worktree add {commit}")
+    if sparse_paths:
+        _check(_run(["-C", commit_dir, "sparse-checkout", "set", "--cone", *sparse_paths]),
+               "sparse-checkout set")
+    linked = 0
+    if heads:
+        nearest = git_ops.nearest_ancestor(mirror_dir, list(heads.values()), commit)
+        src = next((p for p, h in heads.items() if h == nearest), None) if nearest else \
+            max(heads, key=lambda p: os.stat(p).st_mtime)
+        linked = _link_unchanged(mirror_dir, src, heads[src], commit_dir, commit, sparse_paths or ())
+    # Fill the index from HEAD, take the linked files as they are (the refresh hashes
+    # them) and let git write whatever is missing.
+    _check(_run(["-C", commit_dir, "read-tree", "HEAD"]), "read-tree")
+    if sparse_paths:
+        _check(_run(["-C", commit_dir, "sparse-checkout", "reapply"]), "sparse-checkout reapply")
+    _run(["-C", commit_dir, "update-index", "-q", "--refresh"])
+    _check(_run(["-C", commit_dir, "checkout", "-q", "--", "."]), f"checkout {commit}")
+    return linked
+
+
 def ensure_commit_checkout(commit_dir: str, repo_url: str, branch: str, commit: str,
-                           *, token: str = "", depth: int = _DEPTH) -> None:
+                           *, token: str = "", depth: int = _DEPTH,
+                           mirror_dir: Optional[str] = None,
+                           sparse_paths: Optional[Sequence[str]] = None) -> None:
     """Ensure ``commit_dir`` is a git checkout at ``commit``.
 
-    If ``.git`` already exists there (e.g. the API pre-cloned it for a Job), just check out
-    the commit. Otherwise shallow-clone ``branch`` (depth-50) into ``commit_dir`` via the
-    shared primitive and check out the commit. Lets the CLI run independently — it downloads
-    the commit if it isn't present."""
-    if os.path.isdir(os.path.join(commit_dir, ".git")):
+    If ``.git`` already exists there (e.g. the API pre-checked it out for a Job), just check
+    out the commit. Otherwise, with ``mirror_dir``, make sure the project's bare mirror has
+    the commit and add a worktree for it (:func:`add_worktree`); without one, shallow-clone
+    ``branch`` (depth-50) into ``commit_dir`` via the shared primitive and check out the
+    commit. Lets the CLI run independently — it downloads the commit if it isn't present."""
+    if os.path.exists(os.path.join(commit_dir, ".git")):  # a dir (clone) or a file (worktree)
         git_ops.checkout(commit_dir, commit)
         return
+    if mirror_dir:
+        ensure_mirror(mirror_dir, repo_url, commit, token=token)
+        add_worktree(mirror_dir, commit_dir, commit, sparse_paths=sparse_paths)
+        return
     if not repo_url:
         raise GitError(f"cannot clone {commit_dir!r}: no repo_url for the project "
                        f"(onboard the project, or pass --repo-url)")
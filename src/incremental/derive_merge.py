@@ -0,0 +1,144 @@
+"""Incremental Phase 2 (M5) — what a version must re-derive, and the self-check.
+
+Phase 2 (model_deriver) derives units / components / interface IDs / transitive global
+access / knowledge_base.json from the parser's model. On an incremental run nearly all
+of that equals the baseline version's:
+
+  - a unit's record depends on its own files, on the files of the functions its
+    functions call or are called by, and on its source text (includedHeaders);
+  - a component's record on its units and the headers in its source directories;
+  - an entity's interface ID on the entities of its own file (and their callers' files);
+  - a function's transitive globals on the functions it can reach.
+
+So the fresh parser-level model is compared with the baseline's parse snapshot
+(versions/<id>/parse/, the same blank skeleton — LLM fields are ignored), and
+model_deriver re-derives only the dirty part, copying the rest from the baseline's
+finished model:
+
+    functions  added / removed / any parser field changed
+    globals    added / removed / any parser field changed
+    files      files of dirty entities (both versions) + files of the callers and callees
+               of dirty functions + the git diff's changed files
+    closure    dirty functions + everything that can reach them (transitive globals)
+
+`diff_derived` is the `--verify-derive` self-check: it compares an incrementally derived
+model with a full derive, like diff_models does for the narrowed parse.
+
+Pure (plain dicts) so it is unit-testable.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Set
+
+from incremental.parse_merge import _norm
+
+
+# Filled in by Phase 2 (or carried forward from the baseline by the engine) — not parser
+# output, so a difference in them does not make an entity dirty.
+_LLM_FIELDS = frozenset(("description", "behaviourInputName", "behaviourOutputName",
+                         "comment", "phases"))
+
+# The derived model files diff_derived compares, keyed like the dicts it is given.
+_DERIVED = ("units", "components", "functions", "globalVariables")
+
+
+def file_key(path: str) -> str:
+    """A repo-relative path in the form dirty_set returns files in."""
+    return _norm(path)
+
+
+def _parse_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in rec.items() if k not in _LLM_FIELDS}
+
+
+def _changed_keys(baseline: Dict[str, dict], fresh: Dict[str, dict]) -> Set[str]:
+    return {k for k in set(baseline) | set(fresh)
+            if k not in baseline or k not in fresh
+            or _parse_record(baseline[k]) != _parse_record(fresh[k])}
+
+
+def _file(rec: Dict[str, Any]) -> str:
+    return _norm((rec.get("location") or {}).get("file", ""))
+
+
+def dirty_set(base_functions: Dict[str, dict], base_globals: Dict[str, dict],
+              functions: Dict[str, dict], globals_: Dict[str, dict],
+              changed_files: Iterable[str]) -> Dict[str, Set[str]]:
+    """The dirty {functions, globals, files, closure} of a version against its baseline's
+    parse snapshot. Files are normalized repo-relative paths (parse_merge._norm)."""
+    fids = _changed_keys(base_functions, functions)
+    gids = _changed_keys(base_globals, globals_)
+    sides = (functions, base_functions)
+    files = {_norm(p) for p in changed_files}
+    for fid in fids:
+        for side in sides:
+            rec = side.get(fid)
+            if rec is None:
+                continue
+            files.add(_file(rec))
+            for nid in list(rec.get("callsIds") or []) + list(rec.get("calledByIds") or []):
+                for nside in sides:
+                    if nid in nside:
+                        files.add(_file(nside[nid]))
+    for gid in gids:
+        for side in (globals_, base_globals):
+            if gid in side:
+                files.add(_file(side[gid]))
+    files.discard("")
+    return {"functions": fids, "globals": gids, "files": files,
+            "closure": callers_closure(functions, fids)}
+
+
+def callers_closure(functions: Dict[str, dict], seeds: Iterable[str]) -> Set[str]:
+    """*seeds* (those still in *functions*) plus every function that can reach one of them."""
+    out = {fid for fid in seeds if fid in functions}
+    stack = list(out)
+    while stack:
+        for cid in functions[stack.pop()].get("calledByIds") or []:
+            if cid in functions and cid not in out:
+                out.add(cid)
+                stack.append(cid)
+    return out
+
+
+def diff_derived(incremental: Dict[str, Any], full: Dict[str, Any], *, limit: int = 50) -> List[str]:
+    """The `--verify-derive` self-check: compare an incrementally derived model (units /
+    components / functions / globalVariables and, when present, knowledge_base) with a
+    full derive. Returns human-readable mismatch lines (empty list = identical). Unlike
+    diff_models, everything is compared exactly — including key order, which is the
+    order the model files are written in."""
+    out: List[str] = []
+
+    def add(msg: str) -> None:
+        if len(out) < limit:
+            out.append(msg)
+
+    def keyed(name: str, a: Dict[str, Any], b: Dict[str, Any]) -> None:
+        before = len(out)
+        for k in sorted(set(b) - set(a)):
+            add(f"{name}: MISSING {k}")
+        for k in sorted(set(a) - set(b)):
+            add(f"{name}: EXTRA {k}")
+        for k in a:
+            if k in b and a[k] != b[k]:
+                if isinstance(a[k], dict) and isinstance(b[k], dict):
+                    for fld in sorted(set(a[k]) | set(b[k])):
+                        if a[k].get(fld) != b[k].get(fld):
+                            add(f"{name}[{k}].{fld}: {a[k].get(fld)!r} != {b[k].get(fld)!r}")
+                else:
+                    add(f"{name}[{k}]: {a[k]!r} != {b[k]!r}")
+        if len(out) == before and list(a) != list(b):
+            add(f"{name}: same entries, different order")
+
+    for name in _DERIVED:
+        keyed(name, incremental.get(name) or {}, full.get(name) or {})
+    akb, bkb = incremental.get("knowledge_base"), full.get("knowledge_base")
+    if akb is not None or bkb is not None:
+        akb, bkb = akb or {}, bkb or {}
+        for section in sorted(set(akb) | set(bkb)):
+            av, bv = akb.get(section), bkb.get(section)
+            if isinstance(av, dict) and isinstance(bv, dict):
+                keyed(f"knowledge_base.{section}", av, bv)
+            elif av != bv:
+                add(f"knowledge_base.{section}: {av!r} != {bv!r}")
+    return out
@@ -17,6 +17,10 @@ impact analysis can't go stale. The hours->minutes win is selective LLM work:
     (descriptions/behaviour names) for the reuse set and records reuse accounting.
 Flowchart-level reuse (restrict the flowchart engine to the impact set) is M2.4.
 
+generate_batch() catches a branch up over a commit range (doc 04 §16): one
+generate_incremental per commit in topological order, each chained in memory on the
+version produced for its parent; only the tip exports DOCX unless asked.
+
 The two planning helpers are pure (unit-testable); generate_incremental does I/O.
 """
 from __future__ import annotations
@@ -39,10 +43,11 @@ from incremental import git_ops
 from incremental.stores import Workspace, VersionStore, HashStore, EdgeStore, ReuseIndex, _rmtree_force
 from incremental.clone import ensure_commit_checkout
 from incremental.project_db import get_project, list_versions, resolve_project_repo
-from incremental.baseline import select_baseline
+from incremental.baseline import chained_baseline, select_baseline
 from incremental.impact import classify, impact_set
 from incremental.fingerprint import compute_fingerprints
-from incremental.affected import affected_tus, full_reparse_reason
+from incremental.graph_index import GraphIndex, load_graph_index
+from incremental.affected import affected_tus, full_reparse_reason, shadowed_tus
 from incremental.parse_merge import merge_model, diff_models
 from incremental.report import build_report, emit_report
 from incremental.generate import (_manifest, scope_to_args, per_component_docx_args,
@@ -74,9 +79,11 @@ def plan_incremental(baseline_hashes: Dict[str, str],
                      target_hashes: Dict[str, str],
                      target_functions: Dict[str, dict],
                      target_edges: Dict[str, Any],
-                     baseline_functions: Dict[str, dict]) -> Dict[str, Any]:
+                     baseline_functions: Dict[str, dict],
+                     graph: Optional[GraphIndex] = None) -> Dict[str, Any]:
     """Pure: from the two hash snapshots + the target/baseline models, compute the
-    classification, the impact set (functions to regenerate) and the reuse set."""
+    classification, the impact set (functions to regenerate) and the reuse set.
+    `graph` is the target model's GraphIndex, when the caller already has it."""
     cls = classify(baseline_hashes, target_hashes)
     # A deleted function's callers (from the baseline) must regenerate — they can't
     # be discovered from the target model (the deleted fn isn't there).
@@ -87,7 +94,7 @@ def plan_incremental(baseline_hashes: Dict[str, str],
             deleted_callers += list(bf.get("calledByIds") or [])
     changed_seed = cls["changed"] | cls["new"]
     impact = impact_set(changed_seed, target_functions, target_edges,
-                        extra_seed_functions=deleted_callers)
+                        extra_seed_functions=deleted_callers, graph=graph)
     reused = set(target_functions) - impact
     return {"classify": cls, "impact": impact, "reused": reused,
             "deletedCallers": set(deleted_callers)}
@@ -142,16 +149,17 @@ def carry_forward_from_index(impact_keys: Iterable[str],
 
     The reuse index is content-addressed across ALL versions (D3), so this catches reuse
     the baseline carry-forward (parent->child only) cannot. `index.get(fp)` returns
-    {"versionId", "entityKey"} or None (a ReuseIndex or a plain dict both work);
+    {"versionId", "entityKey"} or None (a ReuseIndex or a plain dict both work; a
+    ReuseIndex is asked once, through get_many);
     `src_loader(version_id)` returns that version's {entityKey: entity} mapping (the
     caller should cache it). Pure given index + src_loader."""
     fields = tuple(fields)
     reused: Dict[str, str] = {}
+    impact_keys = [k for k in impact_keys if target_fps.get(k)]
+    if hasattr(index, "get_many"):
+        index = index.get_many(target_fps[k] for k in impact_keys)
     for key in impact_keys:
-        fp = target_fps.get(key)
-        if not fp:
-            continue
-        hit = index.get(fp)
+        hit = index.get(target_fps[key])
         if not hit or hit.get("versionId") == current_version_id:
             continue
         src = (src_loader(hit["versionId"]) or {}).get(hit.get("entityKey"))
@@ -196,7 +204,8 @@ def _read(model_dir: str, name: str) -> dict:
 # Parser-level artifacts captured per version under versions/<id>/parse/ (the blank
 # skeleton a narrowed parse merges against). Keys match parse_merge / snapshot.
 _PARSE_ARTIFACTS = ("functions", "globalVariables", "dataDictionary", "hashes",
-                    "edges", "tu_includes", "entity_files", "override_pairs", "metadata")
+                    "edges", "tu_includes", "tu_include_index", "entity_files", "override_pairs",
+                    "func_keys", "metadata", "graph_index", "include_resolution")
 
 
 def _load_parse_dir(d: str) -> Dict[str, Any]:
@@ -210,39 +219,74 @@ def _write_parse_artifacts(model_dir: str, merged: Dict[str, Any]) -> None:
                 json.dump(merged[n], fh, indent=2)
 
 
-def _try_narrowed_parse(vcfg_path, scope, no_llm, dd_path, repo_dir, project_root, model_dir,
-                        *, target, base_commit, base_parse_dir, project_name=None) -> bool:
-    """Narrowed parse (M4.4, doc 04 §11): re-parse ONLY the affected TUs and merge them
-    into the baseline's parser-level snapshot, so the resulting model/ is the SAME blank
-    skeleton a full parse would produce (impacted functions arrive blank -> Phase 2
-    regenerates them). Returns True if model/ now holds the merged skeleton; False to fall
-    back to a full parse (always the safe choice)."""
+def _scope_selection(scope: Dict[str, Any]) -> Dict[str, Any]:
+    """plan_runs' selection kwargs for a scope (what scope_to_args hands run.py)."""
+    stype = (scope or {}).get("type", "project")
+    names = (scope or {}).get("names") or []
+    return {
+        "selected_group": names[0] if stype == "group" and names else None,
+        "selected_layer": names[0] if stype == "layer" and names else None,
+        # run.py normalizes component names to their identifier form at collection.
+        "selected_components": [n.replace(" ", "-") for n in names] if stype == "component" else None,
+    }
+
+
+def _parse_in_process(vcfg_path, scope, dd_path, repo_dir, model_dir, tu_paths,
+                      baseline_func_keys, *, project_name=None) -> Optional[Dict[str, Any]]:
+    """Run the narrowed parse in THIS process (M4.4): load a fresh parser module with the
+    argv run.py would give Phase 1 and call its parse_only() with the baseline's func-key
+    map already in memory. The partial model comes back as a dict — no run.py/parser
+    launch, no partial model files written and read back. None on any failure (the caller
+    retries in a subprocess)."""
+    import importlib.util
+    from core.config import app_config, layer_include_dirs
+    from core.group_planner import plan_runs, selected_layer_name
     from core.logging_setup import get_logger
     log = get_logger("incremental")
-    if not os.path.isfile(os.path.join(base_parse_dir, "tu_includes.json")) \
-            or not os.path.isfile(os.path.join(base_parse_dir, "entity_files.json")):
-        log.info("narrowed parse unavailable: baseline has no parser-level snapshot — full parse")
-        return False
-    tu_includes = _read(base_parse_dir, "tu_includes.json")
-    status = git_ops.changed_files_status(repo_dir, base_commit, target)
-    reason = full_reparse_reason(status, tu_includes)
-    if reason:
-        log.info(f"narrowed parse skipped ({reason}) — full parse")
-        return False
+    selection = _scope_selection(scope)
+    if dd_path and not os.path.isabs(dd_path):
+        dd_path = os.path.join(_paths().project_root, dd_path)
+    saved_cfg, saved_argv = os.environ.get("ANALYZER_CONFIG"), sys.argv
+    os.environ["ANALYZER_CONFIG"] = os.path.abspath(vcfg_path)
+    try:
+        cfg = app_config(refresh=True)
+        plans = plan_runs(cfg, project_path=repo_dir, use_model=False, no_llm_summarize=True,
+                          filter_mode=None, data_dictionary_path=dd_path,
+                          project_name=project_name, **selection)
+        phase = next(ph for plan in plans for ph in plan.phases if ph.script == "parser.py")
+        # What run.py writes before Phase 1; the parser reads it at import.
+        os.makedirs(model_dir, exist_ok=True)
+        with open(os.path.join(model_dir, "clang_include_paths.json"), "w", encoding="utf-8") as fh:
+            json.dump(layer_include_dirs(cfg, repo_dir, selected_layer_name(cfg, **selection)), fh,
+                      indent=2)
+        script = os.path.join(_SRC, "parser.py")
+        spec = importlib.util.spec_from_file_location("_narrowed_parser", script)
+        parser = importlib.util.module_from_spec(spec)
+        sys.argv = [script, *phase.args]
+        spec.loader.exec_module(parser)  # parse state is module-global: always a fresh module
+        return parser.parse_only(tu_paths, baseline_func_keys)
+    except (Exception, SystemExit) as e:
+        log.info(f"narrowed parse: in-process parse failed ({e!r}) — retrying in a subprocess")
+        return None
+    finally:
+        sys.argv = saved_argv
+        if saved_cfg is None:
+            os.environ.pop("ANALYZER_CONFIG", None)
+        else:
+            os.environ["ANALYZER_CONFIG"] = saved_cfg
+        app_config(refresh=True)
 
-    changed = [p for _s, p in status]
-    affected = affected_tus(changed, tu_includes)
-    deleted = {p for s, p in status if s == "D"}
-    base_model = _load_parse_dir(base_parse_dir)
-    if not affected:                       # no TU changed -> merged skeleton == baseline
-        _write_parse_artifacts(model_dir, base_model)
-        log.info("narrowed parse: 0 affected TU(s) — reused the baseline skeleton")
-        return True
 
+def _parse_in_subprocess(vcfg_path, scope, no_llm, dd_path, repo_dir, project_root, model_dir,
+                         tu_paths, base_parse_dir, *, project_name=None) -> Optional[Dict[str, Any]]:
+    """The narrowed parse as `run.py --to-phase 1 --only-files`: the partial model is
+    written to model/ and read back. None if the run failed."""
+    from core.logging_setup import get_logger
+    log = get_logger("incremental")
     listfile = os.path.join(model_dir, ".affected_tus.txt")
     os.makedirs(model_dir, exist_ok=True)
     with open(listfile, "w", encoding="utf-8") as fh:
-        fh.write("\n".join(sorted(affected)) + "\n")
+        fh.write("\n".join(sorted(tu_paths)) + "\n")
     # M4.4: hand the partial parse the baseline's func-key map (via env, inherited by the
     # run.py -> parser.py subprocess) so calls into UN-parsed files still resolve to edges.
     bfk = os.path.join(base_parse_dir, "func_keys.json")
@@ -260,9 +304,57 @@ def _try_narrowed_parse(vcfg_path, scope, no_llm, dd_path, repo_dir, project_roo
             os.environ["ANALYZER_BASELINE_FUNCKEYS"] = prev_bfk
     if rc != 0:
         log.info(f"narrowed parse: partial parse failed (exit {rc}) — full parse")
-        return False
+        return None
+    return _load_parse_dir(model_dir)
 
-    partial = _load_parse_dir(model_dir)
+
+def _try_narrowed_parse(vcfg_path, scope, no_llm, dd_path, repo_dir, project_root, model_dir,
+                        *, target, base_commit, base_parse_dir, project_name=None,
+                        base_model=None) -> Optional[Dict[str, Any]]:
+    """Narrowed parse (M4.4, doc 04 §11): re-parse ONLY the affected TUs and merge them
+    into the baseline's parser-level snapshot, so the resulting model/ is the SAME blank
+    skeleton a full parse would produce (impacted functions arrive blank -> Phase 2
+    regenerates them). Returns the parser-level model now in model/ (the merged skeleton);
+    None to fall back to a full parse (always the safe choice). `base_model` is the
+    baseline snapshot when the caller still holds it (batch mode), else it is loaded."""
+    from core.logging_setup import get_logger
+    log = get_logger("incremental")
+    if base_model is None:
+        if not os.path.isfile(os.path.join(base_parse_dir, "tu_includes.json")) \
+                or not os.path.isfile(os.path.join(base_parse_dir, "entity_files.json")):
+            log.info("narrowed parse unavailable: baseline has no parser-level snapshot — full parse")
+            return None
+        # Loaded once: the gate, the affected-TU lookup (via the inverted include index — one
+        # probe per changed path) and the merge all read the same baseline snapshot.
+        base_model = _load_parse_dir(base_parse_dir)
+    tu_includes = base_model["tu_includes"]
+    status = git_ops.changed_files_status(repo_dir, base_commit, target)
+    resolution = base_model.get("include_resolution")
+    reason = full_reparse_reason(status, tu_includes, resolution)
+    if reason:
+        log.info(f"narrowed parse skipped ({reason}) — full parse")
+        return None
+
+    changed = [p for _s, p in status]
+    affected = affected_tus(changed, tu_includes, index=base_model["tu_include_index"])
+    # An added file can re-route an untouched TU's #include (doc 04 §17): re-parse those too.
+    shadowed = shadowed_tus([p for s, p in status if s == "A"], resolution) - affected
+    if shadowed:
+        log.info(f"narrowed parse: {len(shadowed)} TU(s) re-parsed for a header added on their include path")
+        affected |= shadowed
+    deleted = {p for s, p in status if s == "D"}
+    if not affected:                       # no TU changed -> merged skeleton == baseline
+        _write_parse_artifacts(model_dir, base_model)
+        log.info("narrowed parse: 0 affected TU(s) — reused the baseline skeleton")
+        return base_model
+
+    partial = _parse_in_process(vcfg_path, scope, dd_path, repo_dir, model_dir, affected,
+                                base_model["func_keys"], project_name=project_name)
+    if partial is None:
+        partial = _parse_in_subprocess(vcfg_path, scope, no_llm, dd_path, repo_dir, project_root,
+                                       model_dir, affected, base_parse_dir, project_name=project_name)
+    if partial is None:
+        return None
     # M4.6 parse-fingerprint gate: if the clang flags / std / libclang toolchain changed
     # since the baseline was parsed, the baseline skeleton was built differently and a merge
     # would be unsound — discard the partial and fall back to a full parse.
@@ -270,7 +362,7 @@ def _try_narrowed_parse(vcfg_path, scope, no_llm, dd_path, repo_dir, project_roo
     part_fp = (partial.get("metadata") or {}).get("parseFingerprint")
     if base_fp and part_fp and base_fp != part_fp:
         log.info("narrowed parse: parse fingerprint changed (clang flags / std / toolchain) — full parse")
-        return False
+        return None
     # Drop (use fresh for) the files that were actually re-parsed: the affected TUs + any
     # CHANGED header (refreshed via the including TUs) + deletions. NOT every file the
     # partial transitively saw — those were only partially parsed, so keep their baseline.
@@ -279,7 +371,7 @@ def _try_narrowed_parse(vcfg_path, scope, no_llm, dd_path, repo_dir, project_roo
     _write_parse_artifacts(model_dir, merged)
     log.info(f"narrowed parse: re-parsed {len(affected)} affected TU(s), merged into the baseline "
              f"skeleton — {len(merged.get('functions') or {})} functions total")
-    return True
+    return merged
 
 
 def generate_incremental(project_id: str, branch: str, commit: str,
@@ -292,9 +384,12 @@ def generate_incremental(project_id: str, branch: str, commit: str,
                          force: bool = False,
                          narrowed_parse: bool = False,
                          verify_parse: bool = False,
+                         verify_derive: bool = False,
                          repo_url: Optional[str] = None,
                          repo_token: Optional[str] = None,
-                         config_path: Optional[str] = None) -> Dict[str, Any]:
+                         config_path: Optional[str] = None,
+                         export_docx: bool = True,
+                         chain: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Produce an incremental version. Falls back to a FULL generation when there is
     no usable baseline (first version / no ancestor).
 
@@ -303,7 +398,15 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     back to a full parse whenever that isn't provably safe. Default off (full parse).
     `verify_parse` (M4.5) additionally runs a FULL parse, diffs it against the narrowed
     result, logs any mismatch, and then USES the full parse (source of truth) — the gate to
-    trust narrowed parse before making it the default."""
+    trust narrowed parse before making it the default.
+    Phase 2 re-derives only the units / components / interface IDs / transitive globals
+    the diff touched (M5, model_deriver); `verify_derive` additionally runs a full derive,
+    diffs the two, logs any mismatch and keeps the full one.
+    `export_docx=False` stops after Phase 3 (no documents; batch intermediates).
+    `chain` is batch mode's hand-over between steps (generate_batch): given its
+    {versionId, commit}, that version is the baseline (no selection) and its `hashes`,
+    parser-level `parse` model and `reuseIndex`, when present, are used from memory.
+    It is then rewritten in place to describe the version produced here."""
     _t0 = time.perf_counter()
     scope = scope or {"type": "project"}
     project_root = _paths().project_root
@@ -313,15 +416,20 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     # Ensure the target's per-commit checkout (clone on demand for the CLI; the API
     # pre-clones it). The repo for a commit IS its version dir workspaces/<pid>/<commit[:16]>.
     repo_dir = ws.commit_dir(commit)
-    if not repo_url and not os.path.isdir(os.path.join(repo_dir, ".git")):
+    if not repo_url and not os.path.exists(os.path.join(repo_dir, ".git")):
         repo_url, _rb, repo_token = resolve_project_repo(project_id)
-    ensure_commit_checkout(repo_dir, repo_url or "", branch, commit, token=(repo_token or ""))
+    ensure_commit_checkout(repo_dir, repo_url or "", branch, commit, token=(repo_token or ""),
+                           mirror_dir=ws.mirror_dir)
 
     target = git_ops.resolve(repo_dir, commit)
     if not target:
         raise ValueError(f"commit {commit!r} not found in repo")
 
-    decision = select_baseline(repo_dir, list_versions(project_id), target, base_version_id)
+    chained = bool(chain and chain.get("versionId"))
+    if chained:
+        decision = chained_baseline(repo_dir, chain["versionId"], chain["commit"], target)
+    else:
+        decision = select_baseline(repo_dir, list_versions(project_id), target, base_version_id)
     if decision["decision"] == "full":
         return generate_full(project_id, branch, commit, scope,
                              workspaces_root=workspaces_root, data_dict_id=data_dict_id,
@@ -331,7 +439,10 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     base_vid = decision["chosenBaseVersionId"]
     project = get_project(project_id)        # api/db/data/projects.json (no project.json)
     project_name = (project.get("name") or "").strip() or None
-    hstore, estore, ridx = HashStore(vstore), EdgeStore(vstore), ReuseIndex(ws)
+    hstore, estore = HashStore(vstore), EdgeStore(vstore)
+    ridx = (chain or {}).get("reuseIndex")
+    if ridx is None:                         # an empty index is falsy (len 0): test for None
+        ridx = ReuseIndex(ws)
     version_id = os.path.basename(repo_dir)  # the version id IS the checkout dir name (commit[:16])
     data_dict_id = data_dict_id or project.get("currentDataDictId")
 
@@ -371,13 +482,15 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     # with no `description`). M4.4: when narrowed parse is on AND provably safe, re-parse only
     # the affected TUs and MERGE into the baseline's parser-level snapshot (same skeleton,
     # far less parsing); otherwise a FULL parse. Either way model/ ends up identical.
-    used_narrowed = False
+    parse_model = None
     if narrowed_parse:
-        used_narrowed = _try_narrowed_parse(
+        parse_model = _try_narrowed_parse(
             vcfg_path, scope, no_llm, dd_path, repo_dir, project_root, model_dir,
             project_name=project_name,
             target=target, base_commit=decision["chosenBaseCommit"],
-            base_parse_dir=os.path.join(vstore.version_dir(base_vid), "parse"))
+            base_parse_dir=os.path.join(vstore.version_dir(base_vid), "parse"),
+            base_model=chain.get("parse") if chained else None)
+    used_narrowed = parse_model is not None
     if used_narrowed and verify_parse:
         # M4.5 self-check: shadow-validate the narrowed model against a FULL parse, then use
         # the full parse as the source of truth (a verify run is slow but always safe).
@@ -399,6 +512,7 @@ def generate_incremental(project_id: str, branch: str, commit: str,
         else:
             _vlog.info("--verify-parse: narrowed parse is byte-identical (set-equal) to a full parse ✓")
         # model/ now holds the FULL parse -> trusted regardless of the narrowed result.
+        parse_model = None
     elif not used_narrowed:
         rc = _run_analyzer(vcfg_path, scope, no_llm, dd_path, repo_dir, project_root,
                            extra_args=["--to-phase", "1"], project_name=project_name)
@@ -413,13 +527,16 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     target_functions = _read(model_dir, "functions.json")
     target_edges = _read(model_dir, "edges.json")
     target_globals = _read(model_dir, "globalVariables.json")
-    base_hashes = hstore.read(base_vid)
+    base_hashes = chain.get("hashes") if chained and chain.get("hashes") else hstore.read(base_vid)
     base_functions = _read(base_model_dir, "functions.json")
     base_globals = _read(base_model_dir, "globalVariables.json")
 
     # Precise impact (classify + reverse-BFS over the fresh model) drives ALL reuse:
     # function descriptions/behaviour-names/summaries (Phase 2) AND flowcharts (Phase 3).
-    plan = plan_incremental(base_hashes, target_hashes, target_functions, target_edges, base_functions)
+    # One integer-indexed graph of the fresh model serves the impact walk and fingerprints.
+    target_graph = load_graph_index(model_dir, target_functions, target_edges)
+    plan = plan_incremental(base_hashes, target_hashes, target_functions, target_edges, base_functions,
+                            target_graph)
 
     # Impacted GLOBALS = changed/new globals + globals used by impacted functions.
     cls = plan["classify"]
@@ -441,7 +558,7 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     # The reuse index is content-addressed across ALL versions, so this catches reuse the
     # baseline carry-forward (parent->child only) can't. Fingerprints are content-only, so
     # the same dict is reused to seed the index at the end (descriptions don't affect it).
-    target_fps = compute_fingerprints(target_hashes, target_functions, target_edges)
+    target_fps = compute_fingerprints(target_hashes, target_functions, target_edges, target_graph)
     _func_cache: Dict[str, dict] = {}
     _glob_cache: Dict[str, dict] = {}
 
@@ -507,12 +624,17 @@ def generate_incremental(project_id: str, branch: str, commit: str,
                    "flowchartFiles": flowchart_files,
                    "flowchartFids": flowchart_fids_regen,
                    "crossVersionFlowcharts": xver_flowcharts,
+                   # M5 — incremental derive: the git diff (its files' units/components
+                   # re-derive even with no entity change) and the self-check switch.
+                   "changedFiles": git_ops.changed_files(repo_dir, decision["chosenBaseCommit"], target),
+                   "verifyDerive": verify_derive,
                    "baselineVersionDir": vstore.version_dir(base_vid)}, fh, indent=2)
 
     # Resume derive+views+export: Phase 2 summarizer skips the carried-forward reuse
     # set; Phase 3 flowcharts restricted to impacted files (rest carried forward).
+    phases = ["--from-phase", "2"] + ([] if export_docx else ["--to-phase", "3"])
     rc = _run_analyzer(vcfg_path, scope, no_llm, dd_path, repo_dir, project_root,
-                       extra_args=["--from-phase", "2"], project_name=project_name)
+                       extra_args=phases, project_name=project_name)
     if rc != 0:
         _fail("derive+views+export", rc)
 
@@ -531,8 +653,10 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     # Content-only reuse key (recipe intentionally not folded in — approved outputs are
     # reused regardless of which model/prompt produced them). Reuse the fingerprints
     # computed for the M3.7 lookup (descriptions added since don't affect the content key).
-    for entity_key, fp in target_fps.items():
-        ridx.put(fp, version_id, entity_key)  # first version that produced a fp keeps it
+    # Pointers into version dirs deleted since are dropped first, so this version can take
+    # over their fingerprints; then the first version that produced a fp keeps it.
+    ridx.prune(vstore.exists)
+    ridx.put_many((fp, version_id, entity_key) for entity_key, fp in target_fps.items())
     ridx.save()
 
     manifest = _manifest(version_id, branch, target, scope, data_dict_id,
@@ -544,7 +668,13 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     manifest["documents"] = documents
     manifest["carriedForward"] = n_carried
     manifest["crossVersionReused"] = len(index_reused) + len(index_reused_g)
+    if not export_docx:
+        manifest["docxSkipped"] = True
     vstore.write_manifest(version_id, manifest)
+    if chain is not None:
+        chain.clear()
+        chain.update(versionId=version_id, commit=target, hashes=target_hashes,
+                     parse=parse_model, reuseIndex=ridx)
 
     # End-of-run report (M3.4): inputs + change classification + reuse accounting.
     cls = plan["classify"]
@@ -583,6 +713,77 @@ def generate_incremental(project_id: str, branch: str, commit: str,
     return manifest
 
 
+def generate_batch(project_id: str, branch: str, commit: str, since: Optional[str] = None,
+                   scope: Optional[Dict[str, Any]] = None, *,
+                   workspaces_root: Optional[str] = None,
+                   data_dict_id: Optional[str] = None,
+                   no_llm: bool = False,
+                   narrowed_parse: bool = True,
+                   verify_parse: bool = False,
+                   verify_derive: bool = False,
+                   all_docx: bool = False,
+                   repo_url: Optional[str] = None,
+                   repo_token: Optional[str] = None,
+                   config_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Catch a branch up: produce a version for every commit of `since..commit`, oldest
+    first in topological order. Returns their manifests.
+
+    One incremental run per commit, each against the version the batch produced for its
+    parent — chained, not re-selected: the baseline's hashes, parser-level model and the
+    reuse index are handed over in memory (generate_incremental's `chain`), and the next
+    narrowed parse re-parses only the TUs that one commit affected. `since` defaults to
+    the tip's auto baseline. Only the tip exports DOCX unless `all_docx`. Commits that
+    already have a complete version are kept (a failed batch re-runs from where it
+    stopped)."""
+    ws = Workspace(project_id, workspaces_root)
+    vstore = VersionStore(ws)
+    tip_dir = ws.commit_dir(commit)
+    if not repo_url and not os.path.exists(os.path.join(tip_dir, ".git")):
+        repo_url, _rb, repo_token = resolve_project_repo(project_id)
+    ensure_commit_checkout(tip_dir, repo_url or "", branch, commit, token=(repo_token or ""),
+                           mirror_dir=ws.mirror_dir)
+    tip = git_ops.resolve(tip_dir, commit)
+    if not tip:
+        raise ValueError(f"commit {commit!r} not found in repo")
+    versions = list_versions(project_id)
+    if not since:
+        since = select_baseline(tip_dir, versions, tip)["chosenBaseCommit"]
+        if not since:
+            raise ValueError(f"no complete version is an ancestor of {tip[:10]} — pass `since`")
+    base = git_ops.resolve(tip_dir, since)
+    if not base:
+        raise ValueError(f"commit {since!r} not found in repo")
+
+    # commit -> versionId of every complete version (newest wins), grown as the batch runs.
+    produced = {v["commit"]: v["versionId"] for v in reversed(versions)
+                if v.get("status") == "complete" and v.get("commit")}
+    chain: Dict[str, Any] = {}
+    manifests: List[Dict[str, Any]] = []
+    for sha, parents in git_ops.commits_between(tip_dir, base, tip):
+        done = vstore.get(sha[:16])
+        if done and done.get("status") == "complete":
+            produced[sha] = sha[:16]
+            continue
+        parent = next((p for p in parents if p in produced), None)
+        if parent is None:
+            step: Dict[str, Any] = {}                  # no produced parent: select as usual
+        elif chain.get("commit") == parent:
+            step = chain                               # the previous step: still in memory
+        else:                                          # a side line: that version, from disk
+            step = {"versionId": produced[parent], "commit": parent,
+                    "reuseIndex": chain.get("reuseIndex")}
+        m = generate_incremental(project_id, branch, sha, scope, workspaces_root=workspaces_root,
+                                 data_dict_id=data_dict_id, no_llm=no_llm,
+                                 narrowed_parse=narrowed_parse, verify_parse=verify_parse,
+                                 verify_derive=verify_derive, repo_url=repo_url,
+                                 repo_token=repo_token, config_path=config_path,
+                                 export_docx=all_docx or sha == tip, chain=step)
+        produced[sha] = m["versionId"]
+        chain = step if step.get("commit") == sha else {"versionId": m["versionId"], "commit": sha}
+        manifests.append(m)
+    return manifests
+
+
 def _parse_scope(s: str) -> Dict[str, Any]:
     if not s or s == "project":
         return {"type": "project"}
@@ -607,14 +808,34 @@ def main() -> None:
     ap.add_argument("--verify-parse", action="store_true",
                     help="M4.5: with --narrowed-parse, also run a full parse and diff it against "
                          "the narrowed result (logs mismatches; uses the full parse). Slow; for validation.")
+    ap.add_argument("--verify-derive", action="store_true",
+                    help="M5: also run a full Phase 2 derive and diff it against the incremental "
+                         "one (logs mismatches; uses the full derive). For validation.")
+    ap.add_argument("--since", default=None,
+                    help="batch mode: produce a version for every commit of <since>..<commit>, "
+                         "each chained on the previous (narrowed parse). 'auto' = the tip's baseline.")
+    ap.add_argument("--all-docx", action="store_true",
+                    help="batch mode: export DOCX for every commit, not only the tip")
     ap.add_argument("--config", default=None, help="per-project config.json to use as-is")
     ap.add_argument("--repo-url", default=None, help="clone URL (else resolved from the project record)")
     args = ap.parse_args()
+    if args.since:
+        ms = generate_batch(args.project_id, args.branch, args.commit,
+                            None if args.since == "auto" else args.since, _parse_scope(args.scope),
+                            data_dict_id=args.data_dict_id, no_llm=args.no_llm,
+                            verify_parse=args.verify_parse, verify_derive=args.verify_derive,
+                            all_docx=args.all_docx, config_path=args.config, repo_url=args.repo_url)
+        for m in ms:
+            print(f"version {m['versionId']}: commit {m['commit'][:10]}, decision={m['decision']}, "
+                  f"baseline={m.get('baselineVersionId')}, regenerated={m['regenerated']}, "
+                  f"reused={m['reused']}, documents={m.get('documents')}")
+        print(f"\n{len(ms)} version(s) produced")
+        return
     m = generate_incremental(args.project_id, args.branch, args.commit, _parse_scope(args.scope),
                              base_version_id=args.base_version_id, data_dict_id=args.data_dict_id,
                              no_llm=args.no_llm, version_id=args.version_id, force=args.force,
                              narrowed_parse=args.narrowed_parse, verify_parse=args.verify_parse,
-                             config_path=args.config, repo_url=args.repo_url)
+                             verify_derive=args.verify_derive, config_path=args.config, repo_url=args.repo_url)
     print(f"\nversion {m['versionId']} ({m['status']}): commit {m['commit'][:10]}, "
           f"decision={m['decision']}, baseline={m.get('baselineVersionId')}, "
           f"regenerated={m['regenerated']}, reused={m['reused']}, "
@@ -22,7 +22,9 @@ parsed model (functions.json / hashes.json / edges.json).
 from __future__ import annotations
 
 import hashlib
-from typing import Dict, List, Set
+from typing import Dict, List, Optional
+
+from incremental.graph_index import GraphIndex
 
 _SEP = "\x1f"
 
@@ -41,15 +43,6 @@ def parse_fingerprint(clang_args: List[str], std: str = "", toolchain: str = "")
     return hashlib.sha256(_SEP.join(parts).encode("utf-8")).hexdigest()
 
 
-def _invert_users(users: Dict[str, List[str]]) -> Dict[str, Set[str]]:
-    """{key -> [fids]}  ->  {fid -> {keys}} (forward deps of each function)."""
-    fwd: Dict[str, Set[str]] = {}
-    for key, fids in (users or {}).items():
-        for fid in fids:
-            fwd.setdefault(fid, set()).add(key)
-    return fwd
-
-
 def _fingerprint(source_hash: str, dep_hashes: List[str]) -> str:
     blob = _SEP.join([source_hash, *sorted(dep_hashes)])
     return hashlib.sha256(blob.encode("utf-8")).hexdigest()
@@ -57,32 +50,32 @@ def _fingerprint(source_hash: str, dep_hashes: List[str]) -> str:
 
 def compute_fingerprints(hashes: Dict[str, str],
                          functions: Dict[str, dict],
-                         edges: Dict[str, Dict[str, List[str]]]) -> Dict[str, str]:
+                         edges: Dict[str, Dict[str, List[str]]],
+                         graph: Optional[GraphIndex] = None) -> Dict[str, str]:
     """Return {entityKey -> fingerprint} for every entity with a reusable output
     (functions + globals).
 
     Function deps = callees (callsIds) + globals (reads/writesGlobalIds) + types &
-    macros it uses (forward-inverted from edges). Globals currently fold in only
-    their own source_hash (no deps) — refine later if needed.
+    macros it uses (edges) — the `calls` and `uses` rows of the model's GraphIndex
+    (`graph`, built here when not passed). Globals currently fold in only their own
+    source_hash (no deps) — refine later if needed.
     """
-    fid_to_types = _invert_users((edges or {}).get("typeUsers", {}))
-    fid_to_macros = _invert_users((edges or {}).get("macroUsers", {}))
+    functions = functions or {}
+    if graph is None:
+        graph = GraphIndex.build(functions, edges)
+    node_hash = [hashes.get(k) for k in graph.keys]
+    calls, uses = graph.calls, graph.uses
 
     out: Dict[str, str] = {}
 
     # Functions
-    for fid, f in (functions or {}).items():
-        sh = hashes.get(fid)
+    for i in range(graph.n_functions):
+        sh = node_hash[i]
         if not sh:
             continue
-        dep_keys: Set[str] = set()
-        dep_keys.update(f.get("callsIds") or [])
-        dep_keys.update(f.get("readsGlobalIds") or [])
-        dep_keys.update(f.get("writesGlobalIds") or [])
-        dep_keys.update(fid_to_types.get(fid, set()))
-        dep_keys.update(fid_to_macros.get(fid, set()))
-        dep_hashes = [hashes[k] for k in dep_keys if k in hashes]
-        out[fid] = _fingerprint(sh, dep_hashes)
+        deps = set(calls.indices[calls.indptr[i]:calls.indptr[i + 1]])
+        deps.update(uses.indices[uses.indptr[i]:uses.indptr[i + 1]])
+        out[graph.keys[i]] = _fingerprint(sh, [node_hash[d] for d in deps if node_hash[d] is not None])
 
     # Globals: model keys with exactly 2 pipes that aren't already functions.
     for key, sh in hashes.items():
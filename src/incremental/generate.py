@@ -11,7 +11,7 @@ Flow (full / first-version / mode:"full"):
      project's layers; write it to versions/<id>/config.json
   3. run.py --config <that> [scope flags] <repo>  -> model/ + output/ + documents
   4. capture model/output/documents + hashes.json + edges.json into versions/<id>/
-  5. compute fingerprints, seed cache/index.json (reuse pointers)
+  5. compute fingerprints, seed cache/index.sqlite (reuse pointers)
   6. write manifest.json, append versions/index.json
 
 Everything that persists goes through the D9 stores (stores.py).
@@ -45,6 +45,7 @@ from incremental.stores import Workspace, VersionStore, HashStore, EdgeStore, Re
 from incremental.clone import ensure_commit_checkout
 from incremental.project_db import get_project, resolve_project_repo
 from incremental.fingerprint import compute_fingerprints
+from incremental.graph_index import load_graph_index
 from incremental.edges import build_edges  # noqa: F401  (kept for symmetry / future use)
 
 
@@ -55,9 +56,9 @@ def _now_iso() -> str:
 # The post-Phase-1 (blank-skeleton) parser artifacts. Snapshotted per version so a future
 # narrowed parse (M4) can merge against the baseline's skeleton, not its finished model.
 _PARSE_SNAPSHOT_FILES = ("functions.json", "globalVariables.json", "dataDictionary.json",
-                         "hashes.json", "edges.json", "tu_includes.json",
+                         "hashes.json", "edges.json", "tu_includes.json", "tu_include_index.json",
                          "entity_files.json", "func_keys.json", "override_pairs.json",
-                         "metadata.json")
+                         "metadata.json", "graph_index.json", "include_resolution.json")
 
 
 def snapshot_parse_model(model_dir: str, version_dir: str) -> None:
@@ -170,9 +171,10 @@ def generate_full(
     #    workspaces/<pid>/<commit[:16]>/. The API pre-clones it for a Job; the CLI clones
     #    on demand (repo_url/token from the project record when not passed explicitly).
     repo_dir = ws.commit_dir(commit)
-    if not repo_url and not os.path.isdir(os.path.join(repo_dir, ".git")):
+    if not repo_url and not os.path.exists(os.path.join(repo_dir, ".git")):
         repo_url, _rb, repo_token = resolve_project_repo(project_id)
-    ensure_commit_checkout(repo_dir, repo_url or "", branch, commit, token=(repo_token or ""))
+    ensure_commit_checkout(repo_dir, repo_url or "", branch, commit, token=(repo_token or ""),
+                           mirror_dir=ws.mirror_dir)
     actual_commit = git_ops.current_commit(repo_dir)
     version_id = os.path.basename(repo_dir)  # the version id IS the checkout dir name (commit[:16])
 
@@ -247,9 +249,9 @@ def generate_full(
     # 5. fingerprints -> seed reuse index (content-only key; recipe is intentionally
     #    not folded in — an approved doc is reused regardless of model/prompt).
     llm = cfg.get("llm") or {}
-    fps = compute_fingerprints(hashes, functions, edges)
-    for entity_key, fp in fps.items():
-        ridx.put(fp, version_id, entity_key)  # first version that produced a fp keeps it
+    fps = compute_fingerprints(hashes, functions, edges, load_graph_index(model_dir, functions, edges))
+    ridx.prune(vstore.exists)  # drop pointers into deleted version dirs
+    ridx.put_many((fp, version_id, entity_key) for entity_key, fp in fps.items())
     ridx.save()
 
     # 6. manifest + index
@@ -11,7 +11,7 @@ from __future__ import annotations
 import os
 import shutil
 import subprocess
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Field/record separators for `git log`/`for-each-ref` parsing — control chars that
 # cannot appear in a ref name or commit subject, so splitting is unambiguous.
@@ -73,6 +73,14 @@ def rev_list_count(repo_dir: str, base: str, target: str) -> int:
                       "rev-list --count") or "0")
 
 
+def commits_between(repo_dir: str, base: str, target: str) -> List[Tuple[str, List[str]]]:
+    """The commits of `base..target`, oldest first in topological order (each after its
+    parents), with their parent ids — a batch catch-up walks them in this order."""
+    out = _check(_run(["-C", repo_dir, "rev-list", "--topo-order", "--reverse", "--parents",
+                       f"{base}..{target}"]), "rev-list --parents")
+    return [(cols[0], cols[1:]) for cols in (ln.split() for ln in out.splitlines()) if cols]
+
+
 def changed_files(repo_dir: str, base: str, target: str) -> List[str]:
     """`git diff <base>..<target> --name-only` — the *what-changed* step."""
     out = _check(_run(["-C", repo_dir, "diff", f"{base}..{target}", "--name-only"]), "diff --name-only")
@@ -0,0 +1,216 @@
+"""Integer-indexed dependency graph of a model (doc 04 §15) — model/graph_index.json.
+
+Impact analysis (impact.impact_set) and reuse fingerprints (fingerprint.compute_fingerprints)
+walk the same graph: a function's callees, callers, and the globals / types / macros it
+uses. Walked over the model dicts, every call re-inverted the global reads/writes and
+typeUsers/macroUsers and hashed string fids at every step. This module compiles that
+graph once per model:
+
+    keys       node id -> entity key; functions first (ids 0..functions-1, in
+               functions.json order), then every other key a function depends on
+    calls      function -> callees (callsIds, any node)
+    uses       function -> globals read/written + types + macros used (edges.json)
+    calledBy   function -> callers (calledByIds, functions only)
+
+each as a CSR pair (`indptr`, `indices`) of stdlib `array('i')` with deduplicated rows,
+plus `users` (key -> functions using it), the transpose of `uses`. Frontier / visited
+sets over it are bytearrays indexed by node id.
+
+Phase 1 writes it beside edges.json (parser and the narrowed-parse merge), because those
+are the only writers of the call / usage edges. A reader passes the model it loaded:
+`load_graph_index` uses the file only when its edge digest (sha256 over every
+function's key and edge rows plus the type / macro users) equals the model's, and
+otherwise builds it in memory.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+_FORMAT = 2
+
+
+class _CSR:
+    """Compressed sparse rows: row i is indices[indptr[i]:indptr[i + 1]]."""
+
+    __slots__ = ("indptr", "indices")
+
+    def __init__(self, indptr: array, indices: array):
+        self.indptr, self.indices = indptr, indices
+
+    @classmethod
+    def empty(cls) -> "_CSR":
+        return cls(array("i", [0]), array("i"))
+
+    def append(self, row: List[int]) -> None:
+        """Add the next row."""
+        self.indices.extend(row)
+        self.indptr.append(len(self.indices))
+
+    def row(self, i: int) -> array:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def transpose(self, n_cols: int) -> "_CSR":
+        counts = [0] * (n_cols + 1)
+        for j in self.indices:
+            counts[j + 1] += 1
+        for j in range(n_cols):
+            counts[j + 1] += counts[j]
+        indptr = array("i", counts)
+        fill = counts[:-1]
+        indices = array("i", bytes(4 * len(self.indices)))
+        ptr = self.indptr
+        for i in range(len(ptr) - 1):
+            for k in range(ptr[i], ptr[i + 1]):
+                j = self.indices[k]
+                indices[fill[j]] = i
+                fill[j] += 1
+        return _CSR(indptr, indices)
+
+    def to_json(self) -> Dict[str, str]:
+        return {"indptr": _pack(self.indptr), "indices": _pack(self.indices)}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, str], byteorder: str) -> "_CSR":
+        return cls(_unpack(data["indptr"], byteorder), _unpack(data["indices"], byteorder))
+
+
+def _pack(a: array) -> str:
+    return base64.b64encode(a.tobytes()).decode("ascii")
+
+
+def _unpack(text: str, byteorder: str) -> array:
+    a = array("i")
+    a.frombytes(base64.b64decode(text))
+    if byteorder != sys.byteorder:
+        a.byteswap()
+    return a
+
+
+def _edge_digest(functions: Dict[str, dict], edges: Optional[Dict[str, Any]]) -> str:
+    """sha256 over every function's key and raw callsIds / readsGlobalIds /
+    writesGlobalIds / calledByIds rows, then the typeUsers / macroUsers rows — an
+    index whose edges were re-pointed (even with the same counts) no longer matches."""
+    h = hashlib.sha256()
+    for key, f in functions.items():
+        h.update(key.encode("utf-8"))
+        for field in ("callsIds", "readsGlobalIds", "writesGlobalIds", "calledByIds"):
+            h.update(b"\x1e" + "\x1f".join(f.get(field) or ()).encode("utf-8"))
+        h.update(b"\x1d")
+    for name in ("typeUsers", "macroUsers"):
+        rows = (edges or {}).get(name) or {}
+        h.update(b"\x1c" + name.encode("utf-8"))
+        for key in sorted(rows):
+            h.update(b"\x1e" + key.encode("utf-8") + b"\x1d" + "\x1f".join(rows[key]).encode("utf-8"))
+    return h.hexdigest()
+
+
+class GraphIndex:
+    """A model's dependency graph over integer node ids (see the module docstring)."""
+
+    def __init__(self, keys: List[str], n_functions: int, calls: _CSR, uses: _CSR,
+                 called_by: _CSR, edge_digest: str, ids: Optional[Dict[str, int]] = None):
+        self.keys = keys
+        self.ids: Dict[str, int] = ids if ids is not None else {k: i for i, k in enumerate(keys)}
+        self.n_functions = n_functions
+        self.calls, self.uses, self.called_by = calls, uses, called_by
+        self.edge_digest = edge_digest
+        self._users: Optional[_CSR] = None
+
+    @property
+    def users(self) -> _CSR:
+        """node -> functions that read/write/use it (the transpose of `uses`)."""
+        if self._users is None:
+            self._users = self.uses.transpose(len(self.keys))
+        return self._users
+
+    def function_ids(self, keys: Iterable[str]) -> List[int]:
+        """Node ids of those of *keys* that are functions of the model."""
+        ids, n = self.ids, self.n_functions
+        return [i for i in (ids.get(k) for k in keys) if i is not None and i < n]
+
+    @classmethod
+    def build(cls, functions: Dict[str, dict],
+              edges: Optional[Dict[str, Dict[str, List[str]]]] = None) -> "GraphIndex":
+        keys: List[str] = list(functions)
+        ids: Dict[str, int] = {k: i for i, k in enumerate(keys)}
+        n = len(keys)
+        get = ids.get
+
+        def nodes(row: Iterable[str]) -> List[int]:
+            out = []
+            for k in row:
+                i = get(k)
+                if i is None:
+                    i = ids[k] = len(keys)
+                    keys.append(k)
+                out.append(i)
+            return out if len(set(out)) == len(out) else list(dict.fromkeys(out))
+
+        extra: Dict[int, List[str]] = {}
+        for name in ("typeUsers", "macroUsers"):
+            for key, fids in ((edges or {}).get(name) or {}).items():
+                for fid in fids:
+                    i = get(fid)
+                    if i is not None and i < n:
+                        extra.setdefault(i, []).append(key)
+
+        calls, uses, called_by = _CSR.empty(), _CSR.empty(), _CSR.empty()
+        for i, f in enumerate(functions.values()):
+            calls.append(nodes(f.get("callsIds") or ()))
+            used = (f.get("readsGlobalIds") or []) + (f.get("writesGlobalIds") or []) + extra.get(i, [])
+            uses.append(nodes(used))
+            callers = [j for j in map(get, f.get("calledByIds") or ()) if j is not None and j < n]
+            called_by.append(callers if len(set(callers)) == len(callers) else list(dict.fromkeys(callers)))
+        return cls(keys, n, calls, uses, called_by, _edge_digest(functions, edges), ids)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"format": _FORMAT, "byteorder": sys.byteorder, "functions": self.n_functions,
+                "edgeDigest": self.edge_digest, "keys": self.keys,
+                "calls": self.calls.to_json(), "uses": self.uses.to_json(),
+                "calledBy": self.called_by.to_json(), "users": self.users.to_json()}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "GraphIndex":
+        order = data["byteorder"]
+        graph = cls(list(data["keys"]), int(data["functions"]),
+                    _CSR.from_json(data["calls"], order), _CSR.from_json(data["uses"], order),
+                    _CSR.from_json(data["calledBy"], order), str(data["edgeDigest"]))
+        graph._users = _CSR.from_json(data["users"], order)
+        return graph
+
+    def matches(self, functions: Dict[str, dict], edges: Optional[Dict[str, Any]] = None) -> bool:
+        """True when this index was built from a model with *functions*' keys and
+        exactly these edges (same edge digest)."""
+        return (self.n_functions == len(functions)
+                and self.edge_digest == _edge_digest(functions, edges))
+
+
+def build_graph_index(functions: Dict[str, dict],
+                      edges: Optional[Dict[str, Dict[str, List[str]]]] = None) -> Dict[str, Any]:
+    """The model/graph_index.json payload for a model (what Phase 1 writes)."""
+    return GraphIndex.build(functions, edges).to_json()
+
+
+def load_graph_index(model_dir: str, functions: Dict[str, dict],
+                     edges: Optional[Dict[str, Dict[str, List[str]]]] = None) -> GraphIndex:
+    """The graph of *functions* + *edges*: model_dir/graph_index.json when it was built
+    from this model, otherwise built here."""
+    path = os.path.join(model_dir, "graph_index.json")
+    if os.path.isfile(path):
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("format") == _FORMAT:
+                graph = GraphIndex.from_json(data)
+                if graph.matches(functions, edges):
+                    return graph
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    return GraphIndex.build(functions, edges)
+
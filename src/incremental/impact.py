@@ -14,14 +14,16 @@ Two pure functions (operate on plain model dicts — no I/O, no libclang):
 
 Axes (doc 04 §5): calls + globals come from functions.json (`calledByIds`,
 `reads`/`writesGlobalIds`); types + macros come from edges.json (`typeUsers`,
-`macroUsers`). The recursive closure is a BFS with a visited-set (handles cycles).
+`macroUsers`). The recursive closure is a graph walk with a visited-set (handles
+cycles), over the integer-indexed graph of incremental.graph_index.
 Bias is to OVER-approximate (never stale): a changed global/type/macro pulls in all
 its users; deleted functions' baseline callers are seeded via `extra_seed_functions`.
 """
 from __future__ import annotations
 
-from collections import deque
-from typing import Any, Dict, Iterable, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
+
+from incremental.graph_index import GraphIndex
 
 
 def classify(baseline_hashes: Dict[str, str],
@@ -38,20 +40,12 @@ def classify(baseline_hashes: Dict[str, str],
     }
 
 
-def _global_users(functions: Dict[str, dict]) -> Dict[str, Set[str]]:
-    """Invert functions' global reads/writes -> {globalKey -> {fids that use it}}."""
-    gu: Dict[str, Set[str]] = {}
-    for fid, f in functions.items():
-        for g in list(f.get("readsGlobalIds") or []) + list(f.get("writesGlobalIds") or []):
-            gu.setdefault(g, set()).add(fid)
-    return gu
-
-
 def impact_set(changed_keys: Iterable[str],
                functions: Dict[str, dict],
                edges: Optional[Dict[str, Dict[str, List[str]]]] = None,
                *,
-               extra_seed_functions: Optional[Iterable[str]] = None) -> Set[str]:
+               extra_seed_functions: Optional[Iterable[str]] = None,
+               graph: Optional[GraphIndex] = None) -> Set[str]:
     """Return the set of function fids to regenerate: the changed/new functions
     themselves plus everything transitively depending on any changed entity.
 
@@ -60,37 +54,42 @@ def impact_set(changed_keys: Iterable[str],
     their users. `extra_seed_functions` lets the engine inject functions that a
     DELETED entity affected (e.g. baseline callers of a removed function), which
     can't be discovered from the target model alone.
-    """
-    edges = edges or {}
-    type_users = edges.get("typeUsers", {})
-    macro_users = edges.get("macroUsers", {})
-    global_users = _global_users(functions)
 
-    result: Set[str] = set()
-    frontier: deque = deque()
-
-    def add(fid: str) -> None:
-        if fid in functions and fid not in result:
-            result.add(fid)
-            frontier.append(fid)
+    The walk runs over the model's GraphIndex — pass `graph` when the caller already
+    has it (load_graph_index), otherwise it is built from `functions` + `edges`.
+    """
+    if graph is None:
+        graph = GraphIndex.build(functions, edges)
+    n = graph.n_functions
+    users, called_by = graph.users, graph.called_by
+    seen = bytearray(n)
+    frontier: List[int] = []
+
+    def add(i: int) -> None:
+        if not seen[i]:
+            seen[i] = 1
+            frontier.append(i)
 
     for key in changed_keys:
-        if key in functions:                       # a changed/new function regenerates
-            add(key)
+        i = graph.ids.get(key)
+        if i is None:
+            continue
+        if i < n:                                  # a changed/new function regenerates
+            add(i)
         else:                                      # global / type / macro -> its users
-            for f in global_users.get(key, ()):
-                add(f)
-            for f in type_users.get(key, ()):
-                add(f)
-            for f in macro_users.get(key, ()):
-                add(f)
+            for u in users.indices[users.indptr[i]:users.indptr[i + 1]]:
+                add(u)
 
-    for fid in (extra_seed_functions or ()):
-        add(fid)
+    for i in graph.function_ids(extra_seed_functions or ()):
+        add(i)
 
+    ptr, callers = called_by.indptr, called_by.indices
     while frontier:                                # propagate UP to callers (transitive)
-        f = frontier.popleft()
-        for caller in functions[f].get("calledByIds", ()):
-            add(caller)
-
-    return result
+        f = frontier.pop()
+        for c in callers[ptr[f]:ptr[f + 1]]:
+            if not seen[c]:
+                seen[c] = 1
+                frontier.append(c)
+
+    keys = graph.keys
+    return {keys[i] for i in range(n) if seen[i]}
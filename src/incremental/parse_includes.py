@@ -14,11 +14,26 @@ ones (system / third-party headers outside the repo can never appear in a git di
 Paths are stored **case-preserved** so the closure lines up byte-for-byte with
 `functions.json` `location.file` and `git diff` output. Case-insensitive *matching*
 (Windows) is M4.1's concern, applied uniformly at compare time — not baked in here.
+
+The closure says what a TU included, not what it *would* include if a file appeared:
+a header added in front of an `#include`'s hit on the search path shadows it. So each
+TU's include *resolution* is recorded too (doc 04 §17, model/include_resolution.json):
+for every `#include`, the in-repo paths the preprocessor probed before the one it
+resolved to. A file added at one of those paths is the only way a new header can change
+an untouched TU.
 """
 from __future__ import annotations
 
 import os
-from typing import Iterable, List, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# A TU whose resolution can't be bounded (an include not found on any known directory,
+# spelled by a macro we couldn't match to a hit): any added file may change it.
+WILDCARD = "*"
+
+_DIRECTIVE = re.compile(r'^\s*#\s*(include|include_next|import)\s*([<"])([^>"]+)[>"]')
 
 
 def to_repo_relative(abs_path: str, base_path: str) -> Optional[str]:
@@ -49,3 +64,126 @@ def build_closure(source_path: str, included_paths: Iterable[str], base_path: st
         if rel is not None and rel != src_rel:
             out.add(rel)
     return sorted(out)
+
+
+def directive_spelling(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """`(spelled, angled, include_next)` of an `#include` line, or None when it isn't a
+    literal one (`#include MACRO`)."""
+    m = _DIRECTIVE.match(line or "")
+    if not m:
+        return None
+    return m.group(3).strip(), m.group(2) == "<", m.group(1) == "include_next"
+
+
+def include_search_dirs(clang_args: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """The `(quoted, angled)` search directories clang_args give, in search order and
+    absolute: `-iquote` dirs then the angled ones for `"..."`; `-I`, `-isystem`, then
+    `-idirafter` for `<...>` (the compiler's builtin system dirs sit between the last two
+    and are out of repo anyway)."""
+    flags = {"-iquote": "quote", "-I": "I", "-isystem": "system", "-idirafter": "after"}
+    found: Dict[str, List[str]] = {k: [] for k in flags.values()}
+    args = list(clang_args or ())
+    i = 0
+    while i < len(args):
+        a = args[i]
+        for flag in sorted(flags, key=len, reverse=True):
+            if a == flag and i + 1 < len(args):
+                found[flags[flag]].append(os.path.abspath(args[i + 1]))
+                i += 1
+                break
+            if a.startswith(flag) and a != flag:
+                found[flags[flag]].append(os.path.abspath(a[len(flag):]))
+                break
+        i += 1
+    angled = list(dict.fromkeys(found["I"] + found["system"] + found["after"]))
+    return list(dict.fromkeys(found["quote"] + angled)), angled
+
+
+def _same_file(a: str, b: str) -> bool:
+    return os.path.normcase(os.path.normpath(a)) == os.path.normcase(os.path.normpath(b))
+
+
+def _under(path: str, d: str) -> bool:
+    p, d = os.path.normcase(os.path.normpath(path)), os.path.normcase(os.path.normpath(d))
+    return p.startswith(d.rstrip(os.sep) + os.sep)
+
+
+def searched_before_hit(spelled: Optional[str], angled: bool, include_next: bool,
+                        includer_dirs: List[str], quote_dirs: List[str], angled_dirs: List[str],
+                        resolved: Optional[str]) -> Optional[List[str]]:
+    """The absolute paths the preprocessor probed for one `#include` before it found
+    `resolved`: each directory of the search order joined with the spelling, up to the
+    hit. `includer_dirs` are the directories of the include stack, innermost first —
+    quoted includes try them first (GCC looks only at the innermost, MSVC at all; both
+    are covered). A hit off the known order (the compiler's builtin system dirs) or no
+    hit at all (`resolved=None`, a missing header) probed every directory.
+    `spelled=None` (a macro-spelled include) is inferred from `resolved` and the first
+    directory that holds it; None when it can't be — any path may then shadow it."""
+    order = list(dict.fromkeys(angled_dirs if angled else includer_dirs + quote_dirs))
+    if include_next:
+        # Resumes after the directory the includer was found in (wherever that is).
+        start = next((i + 1 for i, d in enumerate(order) if includer_dirs
+                      and _same_file(d, includer_dirs[0])), 0)
+        order = order[start:]
+    if spelled is None:
+        hit = next((d for d in order if resolved and _under(resolved, d)), None)
+        if hit is None:
+            return None
+        spelled = os.path.relpath(resolved, hit)
+    if os.path.isabs(spelled):
+        return []
+    probed: List[str] = []
+    for d in order:
+        cand = os.path.normpath(os.path.join(d, spelled))
+        if resolved and _same_file(cand, resolved):
+            break
+        probed.append(cand)
+    return probed
+
+
+def build_resolution(source_path: str,
+                     inclusions: Iterable[Tuple[str, Optional[Tuple[str, bool, bool]], Optional[str], int]],
+                     base_path: str, quote_dirs: List[str], angled_dirs: List[str]
+                     ) -> Tuple[List[str], Set[str]]:
+    """One TU's include resolution from libclang's inclusions — `(includer, spelling,
+    included, depth)` in inclusion order, `spelling` as directive_spelling returns it
+    (None = unknown). An include that wasn't found is passed with `included=None` and
+    `depth=0` (libclang reports those only as diagnostics).
+
+    Returns `(searched, external)`: the sorted in-repo, repo-relative paths probed before
+    the hit of an `#include` written in an in-repo file (WILDCARD when one can't be
+    bounded), and the same for `#include`s inside out-of-repo headers — kept apart
+    because they are shared by every TU and only matter in the rare case a new in-repo
+    header shadows a system one."""
+    searched: Set[str] = set()
+    external: Set[str] = set()
+    stack = [os.path.abspath(source_path)]
+    for includer, spelling, included, depth in inclusions:
+        includer = os.path.abspath(includer)
+        if 0 < depth <= len(stack) and _same_file(stack[depth - 1], includer):
+            chain = stack[:depth]
+        elif _same_file(stack[0], includer):
+            chain = stack[:1]
+        else:                              # not in inclusion order: innermost + the TU
+            chain = [stack[0], includer]
+        includer_dirs = [os.path.dirname(f) for f in reversed(chain)]
+        if included:
+            included = os.path.abspath(included)
+            stack = chain + [included]
+        spelled, angled, include_next = spelling if spelling else (None, False, False)
+        out = searched if to_repo_relative(includer, base_path) is not None else external
+        out.update(_probed_in_repo(spelled, angled, include_next, tuple(includer_dirs),
+                                   tuple(quote_dirs), tuple(angled_dirs), included or None, base_path))
+    return sorted(searched), external
+
+
+@lru_cache(maxsize=None)
+def _probed_in_repo(spelled, angled, include_next, includer_dirs, quote_dirs, angled_dirs,
+                    resolved, base_path) -> Tuple[str, ...]:
+    """searched_before_hit, kept to the in-repo paths — memoized: the same header is
+    included the same way by most TUs."""
+    probed = searched_before_hit(spelled, angled, include_next, list(includer_dirs),
+                                 list(quote_dirs), list(angled_dirs), resolved)
+    if probed is None:
+        return (WILDCARD,)
+    return tuple(rel for rel in (to_repo_relative(c, base_path) for c in probed) if rel is not None)
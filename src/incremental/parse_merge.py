@@ -12,7 +12,8 @@ entity lives in) ∪ deleted files. Then `calledByIds` is recomputed by invertin
 merged `callsIds` (after re-running the virtual-dispatch spread, D7/M3.13).
 
 Operates only on the PARSER's artifacts — functions / globalVariables / dataDictionary /
-hashes / edges / tu_includes (+ the merge-aux entity_files / override_pairs / metadata).
+hashes / edges / tu_includes + its inverted index / include_resolution (+ the merge-aux entity_files /
+override_pairs / func_keys / metadata).
 units / components / transitive-globals / descriptions are re-derived by Phase 2 from the
 merged functions.json, exactly as after a full parse.
 
@@ -23,6 +24,8 @@ from __future__ import annotations
 import os
 from typing import Any, Dict, Iterable, List, Set
 
+from incremental.affected import build_include_index, update_include_index
+from incremental.graph_index import build_graph_index
 from incremental.virtual_dispatch import spread_virtual_families
 
 
@@ -114,24 +117,45 @@ def _recompute_call_edges(functions: Dict[str, dict], override_pairs: List[list]
     spread_virtual_families(call_graph, reverse, override_pairs, valid)
 
     # write back callsIds; recompute calledByIds as the inversion of callsIds.
+    # (callers are visited in order, so a caller already appended is always the last one)
     called_by: Dict[str, List[str]] = {fid: [] for fid in functions}
     for fid in functions:
         callees = call_graph.get(fid, [])
         functions[fid]["callsIds"] = callees
         for c in callees:
-            if c in called_by and fid not in called_by[c]:
-                called_by[c].append(fid)
+            cb = called_by.get(c)
+            if cb is not None and (not cb or cb[-1] != fid):
+                cb.append(fid)
     for fid, f in functions.items():
         f["calledByIds"] = called_by[fid]
 
 
+def _merge_per_tu(base_map: Dict[str, List[str]], fresh_map: Dict[str, List[str]],
+                  base_index: Dict, drop: Set[str]):
+    """Merge a map keyed by TU path (a file) — re-parsed TUs from fresh, the rest
+    baseline — and its inverted index: patched for the re-parsed TUs only when the
+    baseline has one valid for this platform, otherwise rebuilt from the merged map."""
+    merged = {tu: v for tu, v in (base_map or {}).items() if _norm(tu) not in drop}
+    for tu, v in (fresh_map or {}).items():
+        if _norm(tu) in drop:
+            merged[tu] = v
+    merged = dict(sorted(merged.items()))
+    if base_index and base_index.get("caseFolded") == (os.name == "nt"):
+        removed = {tu: v for tu, v in (base_map or {}).items() if _norm(tu) in drop}
+        added = {tu: v for tu, v in merged.items() if _norm(tu) in drop}
+        return merged, update_include_index(base_index, removed, added)
+    return merged, build_include_index(merged)
+
+
 def merge_model(baseline: Dict[str, Any], fresh: Dict[str, Any], drop_files: Iterable[str]) -> Dict[str, Any]:
     """Merge a partial parse (`fresh`) into the baseline model and recompute reverse edges.
 
     Both dicts hold the parser artifacts keyed by name: functions, globalVariables,
-    dataDictionary, hashes, edges, tu_includes, entity_files, override_pairs, metadata.
+    dataDictionary, hashes, edges, tu_includes, tu_include_index, entity_files,
+    override_pairs, func_keys, metadata (+ include_resolution, merged only when both have it).
     `drop_files` = the files the partial parse covered (+ deleted files); baseline entities
-    in those files are replaced by `fresh`. Returns the merged model dict.
+    in those files are replaced by `fresh`. Returns the merged model dict, with the
+    merged model's graph_index.
     """
     drop = {_norm(f) for f in drop_files}
     # The authoritative key->file resolver. BASELINE wins for shared keys: an entity keeps
@@ -150,15 +174,28 @@ def merge_model(baseline: Dict[str, Any], fresh: Dict[str, Any], drop_files: Ite
                                            entity_files, drop)
     edges = _merge_edges(baseline.get("edges"), fresh.get("edges"), entity_files, drop, set(functions))
 
-    # tu_includes is keyed by TU path (a file): re-parsed TUs from fresh, the rest baseline.
-    tu_includes = {tu: inc for tu, inc in (baseline.get("tu_includes") or {}).items()
-                   if _norm(tu) not in drop}
-    for tu, inc in (fresh.get("tu_includes") or {}).items():
-        if _norm(tu) in drop:
-            tu_includes[tu] = inc
+    tu_includes, index = _merge_per_tu(baseline.get("tu_includes"), fresh.get("tu_includes"),
+                                       baseline.get("tu_include_index"), drop)
+    resolution = None
+    base_res, fresh_res = baseline.get("include_resolution"), fresh.get("include_resolution")
+    if base_res and fresh_res:
+        # Same per-TU shape as tu_includes. `external` (#includes inside out-of-repo
+        # headers) isn't per TU: kept as the union — a stale path only widens the check.
+        res_tus, res_index = _merge_per_tu(base_res.get("tus"), fresh_res.get("tus"),
+                                           base_res.get("index"), drop)
+        resolution = {"tus": res_tus,
+                      "external": sorted(set(base_res.get("external") or ())
+                                         | set(fresh_res.get("external") or ())),
+                      "index": res_index}
 
     _recompute_call_edges(functions, override_pairs)
 
+    # {mangled func-key -> fid}: the next narrowed parse resolves calls into un-parsed
+    # files through it, so it must cover the whole merged model, not just the partial.
+    func_keys = {k: fid for k, fid in (baseline.get("func_keys") or {}).items()
+                 if fid in functions and _file_of(fid, entity_files) not in drop}
+    func_keys.update((k, fid) for k, fid in (fresh.get("func_keys") or {}).items() if fid in functions)
+
     return {
         "metadata": fresh.get("metadata") or baseline.get("metadata") or {},
         "functions": functions,
@@ -166,9 +203,13 @@ def merge_model(baseline: Dict[str, Any], fresh: Dict[str, Any], drop_files: Ite
         "dataDictionary": data_dict,
         "hashes": hashes,
         "edges": edges,
-        "tu_includes": dict(sorted(tu_includes.items())),
+        "tu_includes": tu_includes,
+        "tu_include_index": index,
+        **({"include_resolution": resolution} if resolution else {}),
         "entity_files": merged_entity_files,
         "override_pairs": override_pairs,
+        "func_keys": dict(sorted(func_keys.items())),
+        "graph_index": build_graph_index(functions, edges),
     }
 
 
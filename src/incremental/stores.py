@@ -6,7 +6,8 @@ the eventual Postgres migration is a drop-in implementation of the *same methods
 ARE the interface.
 
 Scope = the incremental METADATA stores only (versions / hashes / edges / reuse
-index). The analyzer's per-version model/ + output/ + documents/ artifacts stay
+index). The reuse index is the exception to the JSON files: it is keyed lookups over
+every version ever generated, so it lives in SQLite (see ReuseIndex). The analyzer's per-version model/ + output/ + documents/ artifacts stay
 file-based (captured under versions/<id>/) until the DB-native pipeline rewrite.
 
 Layout (per project) — versions are addressed BY COMMIT: each commit's git checkout
@@ -15,22 +16,28 @@ versions/ tree). The API server (analyzer/api) owns onboarding + the per-commit
 the incremental engine clones a needed commit on demand.
 
     workspaces/<projectId>/
-      cache/index.json                              # ReuseIndex  {fingerprint -> {versionId, entityKey}}
+      cache/index.sqlite                            # ReuseIndex  {fingerprint -> {versionId, entityKey}}
+      cache/cas/<sha256[:2]>/<sha256><ext>          # artifact blobs (incremental.artifacts)
       versions.json                                 # VersionStore registry (flat)
+      mirror.git/                                   # bare mirror; every <commit[:16]>/ is a worktree of it
       <commit[:16]>/                                # versionId == commit[:16]
-        <repo checkout: source + .git>
-        manifest.json hashes.json edges.json config.json  model/ output/ documents/
+        <repo checkout: source + .git (file, for a worktree)>
+        manifest.json hashes.json edges.json config.json artifacts.json
+        model/ output/ documents/                   # hardlinks to cache/cas blobs
 """
 from __future__ import annotations
 
 import json
 import os
 import shutil
+import sqlite3
 import stat
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from core.paths import paths as _paths
+from incremental.artifacts import ArtifactStore, capture_tree, cas_dir as _cas_dir, referenced_blobs
+from incremental.artifacts import read_manifest as read_artifacts, write_manifest as write_artifacts
 
 
 def default_workspaces_root() -> str:
@@ -89,6 +96,17 @@ class Workspace:
     def cache_dir(self) -> str:
         return os.path.join(self.root, "cache")
 
+    @property
+    def cas_dir(self) -> str:
+        """Content-addressed artifact blobs cache/cas/ (incremental.artifacts)."""
+        return _cas_dir(self.root)
+
+    @property
+    def mirror_dir(self) -> str:
+        """Bare mirror workspaces/<pid>/mirror.git — fetched incrementally; the per-commit
+        checkouts are worktrees of it (incremental.clone.ensure_commit_checkout)."""
+        return os.path.join(self.root, "mirror.git")
+
     def datadict_path(self, data_dict_id: str) -> str:
         return os.path.join(self.root, "datadict", f"{data_dict_id}.csv")
 
@@ -121,21 +139,34 @@ class VersionStore:
         return d
 
     def capture_artifacts(self, version_id: str, *, model_dir: str, output_dir: str) -> List[str]:
-        """Copy the analyzer's model/ + output/ into the version, and collect every
-        .docx into documents/. Returns the list of captured document filenames."""
+        """Capture the analyzer's model/ + output/ into the version, and collect every
+        .docx into documents/. Returns the list of captured document filenames.
+
+        Files go through the project's content-addressed store (incremental.artifacts):
+        each distinct file is stored once under cache/cas/ and the version's tree is
+        hardlinked to it, recorded in <version>/artifacts.json. Blobs no version references
+        any more are collected afterwards."""
         d = self.version_dir(version_id)
+        store = ArtifactStore(self.ws.cas_dir)
+        files = read_artifacts(d)
         if os.path.isdir(model_dir):
-            shutil.copytree(model_dir, os.path.join(d, "model"), dirs_exist_ok=True)
+            capture_tree(store, model_dir, d, "model", files)
         if os.path.isdir(output_dir):
-            shutil.copytree(output_dir, os.path.join(d, "output"), dirs_exist_ok=True)
-        docs_dir = os.path.join(d, "documents")
-        os.makedirs(docs_dir, exist_ok=True)
+            capture_tree(store, output_dir, d, "output", files)
+        os.makedirs(os.path.join(d, "documents"), exist_ok=True)
         captured: List[str] = []
-        for root, _, files in os.walk(os.path.join(d, "output")):
-            for f in files:
+        for root, _, names in os.walk(os.path.join(d, "output")):
+            for f in names:
                 if f.lower().endswith(".docx"):
-                    shutil.copyfile(os.path.join(root, f), os.path.join(docs_dir, f))
+                    src = os.path.join(root, f)
+                    rel = os.path.relpath(src, d).replace(os.sep, "/")
+                    blob = files.get(rel) or store.put(src)  # pre-store versions: not in the manifest
+                    files[rel] = blob
+                    files[f"documents/{f}"] = blob
+                    store.materialize(blob, os.path.join(d, "documents", f))
                     captured.append(f)
+        write_artifacts(d, files)
+        store.gc(referenced_blobs(self.ws.root))
         return sorted(captured)
 
     def write_config(self, version_id: str, config: Dict[str, Any]) -> None:
@@ -182,27 +213,82 @@ class EdgeStore:
 class ReuseIndex:
     """Cross-version content-addressed pointer index (doc 04 §3, D3):
     {fingerprint -> {versionId, entityKey}}. Output content is never duplicated —
-    the index only records *where* a fingerprint's output already lives."""
+    the index only records *where* a fingerprint's output already lives.
+
+    Kept in SQLite (cache/index.sqlite, WAL journal) rather than one JSON document: a
+    lookup or an insert touches only its own rows instead of loading and rewriting the
+    whole map, parallel jobs read while one of them writes, and a writer waits for the
+    lock rather than failing. Writes become visible to others on save(). A legacy
+    cache/index.json is imported when the database is first created."""
+
+    _CHUNK = 500  # bound parameters per IN (...) query — under SQLite's default limit
 
     def __init__(self, workspace: Workspace):
         self.ws = workspace
-        self._path = os.path.join(self.ws.cache_dir, "index.json")
-        self._index: Dict[str, Dict[str, str]] = _read_json(self._path, {})
+        self._path = os.path.join(self.ws.cache_dir, "index.sqlite")
+        os.makedirs(self.ws.cache_dir, exist_ok=True)
+        created = not os.path.isfile(self._path)
+        self._db = sqlite3.connect(self._path, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS reuse ("
+                         "fingerprint TEXT PRIMARY KEY, version_id TEXT NOT NULL, "
+                         "entity_key TEXT NOT NULL) WITHOUT ROWID")
+        self._db.execute("CREATE INDEX IF NOT EXISTS reuse_version ON reuse (version_id)")
+        self._db.commit()
+        if created:
+            legacy = _read_json(os.path.join(self.ws.cache_dir, "index.json"), {})
+            self.put_many((fp, hit["versionId"], hit["entityKey"]) for fp, hit in legacy.items())
+            self.save()
 
     def get(self, fingerprint: str) -> Optional[Dict[str, str]]:
-        return self._index.get(fingerprint)
+        row = self._db.execute("SELECT version_id, entity_key FROM reuse WHERE fingerprint = ?",
+                               (fingerprint,)).fetchone()
+        return {"versionId": row[0], "entityKey": row[1]} if row else None
+
+    def get_many(self, fingerprints: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """{fingerprint -> {versionId, entityKey}} for those of *fingerprints* indexed."""
+        fps = list(dict.fromkeys(fingerprints))
+        out: Dict[str, Dict[str, str]] = {}
+        for i in range(0, len(fps), self._CHUNK):
+            chunk = fps[i:i + self._CHUNK]
+            rows = self._db.execute(
+                "SELECT fingerprint, version_id, entity_key FROM reuse WHERE fingerprint IN "
+                f"({','.join('?' * len(chunk))})", chunk)
+            for fp, vid, key in rows:
+                out[fp] = {"versionId": vid, "entityKey": key}
+        return out
 
     def put(self, fingerprint: str, version_id: str, entity_key: str, *, overwrite: bool = False) -> bool:
         """Record a pointer. By default the first version that produced a fingerprint
         keeps it (a later identical fingerprint reuses, doesn't re-point). Returns
         True if a new entry was added."""
-        if not overwrite and fingerprint in self._index:
-            return False
-        self._index[fingerprint] = {"versionId": version_id, "entityKey": entity_key}
-        return True
+        return self.put_many([(fingerprint, version_id, entity_key)], overwrite=overwrite) == 1
+
+    def put_many(self, entries: Iterable[Tuple[str, str, str]], *, overwrite: bool = False) -> int:
+        """put() for many (fingerprint, versionId, entityKey) triples in one statement.
+        Returns the number of entries added (or re-pointed, with *overwrite*)."""
+        verb = "INSERT OR REPLACE" if overwrite else "INSERT OR IGNORE"
+        before = self._db.total_changes
+        self._db.executemany(f"{verb} INTO reuse (fingerprint, version_id, entity_key) "
+                             "VALUES (?, ?, ?)", entries)
+        return self._db.total_changes - before
+
+    def prune(self, is_live: Callable[[str], bool]) -> int:
+        """Retention: drop the pointers into versions *is_live* rejects (deleted version
+        dirs), so their fingerprints can be re-seeded by the next version producing them.
+        Returns the number of pointers dropped."""
+        dead = [vid for (vid,) in self._db.execute("SELECT DISTINCT version_id FROM reuse")
+                if not is_live(vid)]
+        before = self._db.total_changes
+        self._db.executemany("DELETE FROM reuse WHERE version_id = ?", [(vid,) for vid in dead])
+        return self._db.total_changes - before
 
     def save(self) -> None:
-        _write_json(self._path, self._index)
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
 
     def __len__(self) -> int:
-        return len(self._index)
+        return self._db.execute("SELECT COUNT(*) FROM reuse").fetchone()[0]
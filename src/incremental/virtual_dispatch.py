@@ -67,6 +67,10 @@ def spread_virtual_families(call_graph: Dict[str, List[str]],
     fkeys = set(function_keys)
     edges_added = 0
     families_spread = 0
+    # Set mirrors of the lists we append to: a family member's caller list can be long,
+    # and testing membership on the list made the spread quadratic in it.
+    callees_of: Dict[str, set] = {}
+    callers_of: Dict[str, set] = {}
     for members in families.values():
         members_in = sorted(m for m in members if m in fkeys)
         if len(members_in) < 2:            # nothing to spread to (lone/external family)
@@ -77,11 +81,19 @@ def spread_virtual_families(call_graph: Dict[str, List[str]],
             callers.update(reverse_call_graph.get(m, []) or [])
         for caller in callers:
             cg = call_graph.setdefault(caller, [])
+            cs = callees_of.get(caller)
+            if cs is None:
+                cs = callees_of[caller] = set(cg)
             for m in members_in:
-                if m not in cg:
+                if m not in cs:
                     cg.append(m)
+                    cs.add(m)
                     edges_added += 1
                 rg = reverse_call_graph.setdefault(m, [])
-                if caller not in rg:
+                rs = callers_of.get(m)
+                if rs is None:
+                    rs = callers_of[m] = set(rg)
+                if caller not in rs:
                     rg.append(caller)
+                    rs.add(caller)
     return edges_added, families_spread
@@ -31,9 +31,10 @@ def _load_model():
 
 def _read_incremental_plan() -> dict | None:
     """Incremental mode (M3): the engine writes model/incremental_plan.json before
-    Phase 2 with {impactFids, impactedGlobals, impactedFiles, baselineVersionDir}.
-    When present, Phase 2 restricts LLM enrichment to the impact set and carries the
-    rest forward. Absent -> full enrichment (unchanged behaviour)."""
+    Phase 2 with {impactFids, impactedGlobals, impactedFiles, changedFiles, verifyDerive,
+    baselineVersionDir}. When present, Phase 2 restricts LLM enrichment to the impact set
+    and carries the rest forward, and re-derives only what changedFiles touched (M5).
+    Absent -> full derive and enrichment (unchanged behaviour)."""
     p = os.path.join(MODEL_DIR, "incremental_plan.json")
     if not os.path.isfile(p):
         return None
@@ -182,40 +183,58 @@ def _read_local_includes(fp: str, base_path: str, defined_macros: set = None) ->
     return result
 
 
-def _build_units_components(base_path: str, functions_data: dict, global_variables_data: dict):
+def _rel_path(fp: str, base_path: str) -> str:
+    try:
+        return os.path.relpath(fp, base_path).replace("\\", "/")
+    except ValueError:
+        return fp.replace("\\", "/")
+
+
+def _build_units_components(base_path: str, functions_data: dict, global_variables_data: dict,
+                            reuse: dict = None):
+    """Units (one per source/header file name in a component) and components.
+
+    Incremental (M5): with *reuse* (see _load_derive_reuse), only units and components
+    touched by the dirty files are derived; the rest are the baseline's records."""
     defined_macros = _defined_macros_from_config()
-    all_files = set()
-    for f in functions_data.values():
+    func_ids_by_file: dict = {}
+    var_ids_by_file: dict = {}
+    for fid, f in functions_data.items():
         fp = _file_path(f, base_path)
         if fp:
-            all_files.add(fp)
-    for g in global_variables_data.values():
+            func_ids_by_file.setdefault(fp, []).append(fid)
+    for vid, g in global_variables_data.items():
         fp = _file_path(g, base_path)
         if fp:
-            all_files.add(fp)
+            var_ids_by_file.setdefault(fp, []).append(vid)
+    all_files = set(func_ids_by_file) | set(var_ids_by_file)
 
-    unit_by_file = {}
-    for fp in sorted(all_files):
-        try:
-            rel = os.path.relpath(fp, base_path).replace("\\", "/")
-        except ValueError:
-            rel = fp.replace("\\", "/")
-        unit_by_file[fp] = make_unit_key(rel)
+    rel_by_file = {fp: _rel_path(fp, base_path) for fp in all_files}
+    unit_by_file = {fp: make_unit_key(rel) for fp, rel in rel_by_file.items()}
+
+    dirty_units = dirty_dirs = None
+    if reuse is not None:
+        from incremental.derive_merge import file_key
+        base_units = reuse["baseline"]["units"]
+        dirty_units = {make_unit_key(rel) for rel in reuse["files"]}
+        dirty_units |= {u for fp, u in unit_by_file.items()
+                        if u not in base_units or file_key(rel_by_file[fp]) in reuse["files"]}
+        dirty_dirs = {os.path.dirname(norm_path(rel, base_path)) for rel in reuse["files"]}
 
     units_data = {}
     for fp in sorted(all_files):
         base = os.path.basename(fp)
         if not base.lower().endswith((".cpp", ".cc", ".cxx", ".h", ".hpp")):
             continue
-        try:
-            rel = os.path.relpath(fp, base_path).replace("\\", "/")
-        except ValueError:
-            rel = fp.replace("\\", "/")
+        rel = rel_by_file[fp]
         unit_key = unit_by_file[fp]
+        if dirty_units is not None and unit_key not in dirty_units:
+            units_data.setdefault(unit_key, base_units[unit_key])
+            continue
         path_no_ext = path_from_unit_rel(rel)
-        func_ids = sorted([fid for fid, f in functions_data.items() if _file_path(f, base_path) == fp],
+        func_ids = sorted(func_ids_by_file.get(fp, []),
                          key=lambda x: functions_data[x].get("location", {}).get("line", 0))
-        var_ids = sorted([vid for vid, g in global_variables_data.items() if _file_path(g, base_path) == fp],
+        var_ids = sorted(var_ids_by_file.get(fp, []),
                         key=lambda x: (global_variables_data[x].get("location") or {}).get("line", 0))
 
         caller_units = set()
@@ -254,7 +273,11 @@ def _build_units_components(base_path: str, functions_data: dict, global_variabl
                 "includedHeaders": included_headers,
             }
 
-    component_names = sorted({u.split(KEY_SEP)[0] for u in units_data if KEY_SEP in u})
+    units_by_component: dict = {}
+    for u in units_data:
+        if KEY_SEP in u:
+            units_by_component.setdefault(u.split(KEY_SEP)[0], []).append(u)
+    component_names = sorted(units_by_component)
 
     # Collect directories that belong to each component (from source file locations).
     component_source_dirs: dict = {}
@@ -262,16 +285,21 @@ def _build_units_components(base_path: str, functions_data: dict, global_variabl
         base = os.path.basename(fp)
         if not base.lower().endswith((".cpp", ".cc", ".cxx")):
             continue
-        try:
-            rel = os.path.relpath(fp, base_path).replace("\\", "/")
-        except ValueError:
-            rel = fp.replace("\\", "/")
-        m = make_unit_key(rel).split(KEY_SEP)[0]
+        m = unit_by_file[fp].split(KEY_SEP)[0]
         component_source_dirs.setdefault(m, set()).add(os.path.dirname(fp))
 
+    dirty_components = None
+    if reuse is not None:
+        base_components = reuse["baseline"]["components"]
+        dirty_components = {u.split(KEY_SEP)[0] for u in dirty_units}
+        dirty_components |= {m for m in component_names if m not in base_components}
+        dirty_components |= {m for m, dirs in component_source_dirs.items() if dirs & dirty_dirs}
+
     # Scan those directories for header files to build an authoritative list.
     component_header_files: dict = {}
     for m, dirs in component_source_dirs.items():
+        if dirty_components is not None and m not in dirty_components:
+            continue
         headers = set()
         for d in dirs:
             try:
@@ -287,21 +315,17 @@ def _build_units_components(base_path: str, functions_data: dict, global_variabl
                 pass
         component_header_files[m] = sorted(headers)
 
-    from core.model_io import write_model_file, UNITS, COMPONENTS
-
     components_data = {
-        m: {
-            "units":       [u for u in units_data if u.split(KEY_SEP)[0] == m],
+        m: base_components[m] if dirty_components is not None and m not in dirty_components else {
+            "units":       units_by_component[m],
             "headerFiles": component_header_files.get(m, []),
         }
         for m in component_names
     }
-
-    write_model_file(UNITS, units_data)
-    write_model_file(COMPONENTS, components_data)
-    print(f"  model/units.json ({len(units_data)})")
-    print(f"  model/components.json ({len(components_data)})")
-    return units_data, unit_by_file
+    if reuse is not None:
+        print(f"  incremental: derived {len(dirty_units & set(units_data))}/{len(units_data)} unit(s), "
+              f"{len(dirty_components & set(components_data))}/{len(components_data)} component(s)")
+    return units_data, components_data, unit_by_file
 
 
 def _has_external_caller(f: dict, functions_data: dict, base_path: str) -> bool:
@@ -319,20 +343,23 @@ def _fn_is_private(f: dict, functions_data: dict, base_path: str) -> bool:
     return not _has_external_caller(f, functions_data, base_path)
 
 
-def _build_interface_index(base_path: str, functions_data: dict, global_variables_data: dict):
+def _build_interface_index(base_path: str, functions_data: dict, global_variables_data: dict,
+                           only_files: set = None):
+    """Per-file interface indices (public entities first, then private, each by line).
+    only_files (incremental, M5): index just the entities of those files."""
     public_fns_by_file = {}
     private_fns_by_file = {}
     public_glbs_by_file = {}
     private_glbs_by_file = {}
     for fid, f in functions_data.items():
         fp = _file_path(f, base_path)
-        if not fp:
+        if not fp or (only_files is not None and fp not in only_files):
             continue
         bucket = private_fns_by_file if _fn_is_private(f, functions_data, base_path) else public_fns_by_file
         bucket.setdefault(fp, []).append((fid, f))
     for vid, g in global_variables_data.items():
         fp = _file_path(g, base_path)
-        if not fp:
+        if not fp or (only_files is not None and fp not in only_files):
             continue
         bucket = private_glbs_by_file if (g.get("visibility") or "").lower() == "private" else public_glbs_by_file
         bucket.setdefault(fp, []).append((vid, g))
@@ -360,8 +387,24 @@ def _id_seg_layer(s: str) -> str:
     return re.sub(r'[^A-Z0-9]', '', (s or '').upper())
 
 
-def _enrich_interfaces(base_path: str, project_name: str, functions_data: dict, global_variables_data: dict, idx_by_id: dict, config: dict = None):
+def _enrich_interfaces(base_path: str, project_name: str, functions_data: dict, global_variables_data: dict, idx_by_id: dict, config: dict = None,
+                       only_files: set = None, reuse: dict = None):
+    """Set interfaceId (and visibility "private" for functions nobody outside their file calls).
+
+    Incremental (M5): entities outside only_files keep the baseline's interfaceId and
+    visibility (reuse["baseline"]) — their file and their callers' files are unchanged."""
+    base_functions = reuse["baseline"]["functions"] if reuse is not None else {}
+    base_globals = reuse["baseline"]["globalVariables"] if reuse is not None else {}
     for fid, f in functions_data.items():
+        raw_params = f.get("parameters", f.get("params", []))
+        params = [{"name": p.get("name", ""), "type": p.get("type", "")} for p in raw_params]
+        bf = base_functions.get(fid) if only_files is not None else None
+        if bf is not None and "interfaceId" in bf and _file_path(f, base_path) not in only_files:
+            if bf.get("visibility") == "private":
+                f["visibility"] = "private"
+            f["interfaceId"] = bf["interfaceId"]
+            f["parameters"] = params
+            continue
         loc = f.get("location") or {}
         fp = loc.get("file", "")
         try:
@@ -381,11 +424,13 @@ def _enrich_interfaces(base_path: str, project_name: str, functions_data: dict,
         else:
             prefix = "IF"
         interface_id = f"{prefix}_{layer_code}_{group_code}_{unit_name_code}_{idx_code}" if group_code else f"{prefix}_{layer_code}_{unit_name_code}_{idx_code}"
-        raw_params = f.get("parameters", f.get("params", []))
-        params = [{"name": p.get("name", ""), "type": p.get("type", "")} for p in raw_params]
         f["interfaceId"] = interface_id
         f["parameters"] = params
     for vid, g in global_variables_data.items():
+        bg = base_globals.get(vid) if only_files is not None else None
+        if bg is not None and "interfaceId" in bg and _file_path(g, base_path) not in only_files:
+            g["interfaceId"] = bg["interfaceId"]
+            continue
         loc = g.get("location") or {}
         fp = loc.get("file", "")
         try:
@@ -477,31 +522,88 @@ def _readable_label(name: str) -> str:
     return name[:1].upper() + name[1:] if name else ""
 
 
-def _propagate_global_access(functions_data: dict):
-    """Propagate global reads/writes along call graph so outers see inner globals."""
+def _strongly_connected(graph: dict) -> list:
+    """Strongly connected components of *graph* ({node: [successor, ...]}; successors
+    outside it are ignored), successors' components first (Tarjan, iterative)."""
+    index: dict = {}
+    low: dict = {}
+    on_stack = set()
+    stack = []
+    out = []
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, succs = work[-1]
+            for succ in succs:
+                if succ not in graph:
+                    continue
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph[succ])))
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    scc = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == node:
+                            break
+                    out.append(scc)
+    return out
+
+
+def _propagate_global_access(functions_data: dict, reuse: dict = None):
+    """Propagate global reads/writes along call graph so outers see inner globals.
+
+    Incremental (M5): with *reuse*, only the functions in reuse["closure"] (those that can
+    reach a changed function) are propagated; every other function keeps the baseline's
+    transitive sets, which also seed its callers in the closure."""
+    closure = reuse["closure"] if reuse is not None else None
+    base_functions = reuse["baseline"]["functions"] if reuse is not None else {}
     # Build adjacency and initial direct sets
     calls_map = {}
     reads_map = {}
     writes_map = {}
     for fid, f in functions_data.items():
+        if closure is not None and fid not in closure:
+            bf = base_functions.get(fid) or {}
+            reads_map[fid] = set(bf.get("readsGlobalIdsTransitive") or [])
+            writes_map[fid] = set(bf.get("writesGlobalIdsTransitive") or [])
+            continue
         calls_map[fid] = list(f.get("callsIds") or [])
         reads_map[fid] = set(f.get("readsGlobalIds") or [])
         writes_map[fid] = set(f.get("writesGlobalIds") or [])
 
-    # Fixed-point propagation: repeatedly add callee globals to caller
-    changed = True
-    while changed:
-        changed = False
-        for fid, callees in calls_map.items():
-            for cid in callees:
-                if cid not in reads_map or cid not in writes_map:
-                    continue
-                before_r = len(reads_map[fid])
-                before_w = len(writes_map[fid])
-                reads_map[fid] |= reads_map[cid]
-                writes_map[fid] |= writes_map[cid]
-                if len(reads_map[fid]) != before_r or len(writes_map[fid]) != before_w:
-                    changed = True
+    # Every function in a call cycle ends up with the cycle's union, so propagate per
+    # strongly connected component, callees first: each function is visited once.
+    for scc in _strongly_connected(calls_map):
+        reads = set()
+        writes = set()
+        for fid in scc:
+            reads |= reads_map[fid]
+            writes |= writes_map[fid]
+            for cid in calls_map[fid]:
+                if cid in reads_map and cid in writes_map:
+                    reads |= reads_map[cid]
+                    writes |= writes_map[cid]
+        for fid in scc:
+            reads_map[fid] = reads
+            writes_map[fid] = writes
 
     # Store transitive sets back into functions_data
     for fid, f in functions_data.items():
@@ -798,23 +900,61 @@ def _run_hierarchy_summarizer(
     }
 
 
-def _generate_knowledge_base(
+def _kb_reusable_fids(functions_data: dict, reuse: dict) -> set:
+    """Functions whose knowledge-base entry is the baseline's: same final record, no
+    changed neighbour or global (whose name the entry spells out), and a qualified
+    name no other function shares in either version (the entry is keyed by it)."""
+    from collections import Counter
+    base_functions = reuse["baseline"]["functions"]
+    base_kb = reuse["baseline"]["knowledge_base"].get("functions") or {}
+    names = Counter(f.get("qualifiedName", "") for f in functions_data.values())
+    names.update(f.get("qualifiedName", "") for f in base_functions.values())
+    touched = set(reuse["functions"])
+    for fid in reuse["functions"]:
+        for side in (functions_data, base_functions):
+            rec = side.get(fid) or {}
+            touched.update(rec.get("callsIds") or [])
+            touched.update(rec.get("calledByIds") or [])
+    dirty_globals = reuse["globals"]
+    out = set()
+    for fid, f in functions_data.items():
+        qn = f.get("qualifiedName", "")
+        if fid in touched or names[qn] != 2 or qn not in base_kb or f != base_functions.get(fid):
+            continue
+        if dirty_globals and not dirty_globals.isdisjoint(
+                (f.get("readsGlobalIdsTransitive") or f.get("readsGlobalIds") or [])
+                + (f.get("writesGlobalIdsTransitive") or f.get("writesGlobalIds") or [])):
+            continue
+        out.add(fid)
+    return out
+
+
+def _build_knowledge_base(
     base_path: str,
     project_name: str,
     functions_data: dict,
     global_variables_data: dict,
     data_dict: dict,
     summaries: dict,
-) -> None:
-    """Write model/knowledge_base.json in the format expected by Flowchart's pkb/builder.py."""
+    reuse: dict = None,
+) -> dict:
+    """knowledge_base.json in the format expected by Flowchart's pkb/builder.py.
+
+    Incremental (M5): function entries _kb_reusable_fids allows are copied from the
+    baseline's knowledge base; the other sections are rebuilt (each is one pass)."""
     # Build fid → qualifiedName mapping for reverse lookups
     fid_to_qn = {fid: f.get("qualifiedName", "") for fid, f in functions_data.items()}
+    reusable = _kb_reusable_fids(functions_data, reuse) if reuse is not None else set()
+    base_kb_functions = (reuse["baseline"]["knowledge_base"].get("functions") or {}) if reuse is not None else {}
 
     functions_kb: dict = {}
     for fid, fentry in functions_data.items():
         qn = fentry.get("qualifiedName", "")
         if not qn:
             continue
+        if fid in reusable:
+            functions_kb[qn] = base_kb_functions[qn]
+            continue
         calls_qnames = [
             functions_data[c].get("qualifiedName", c)
             for c in (fentry.get("callsIds") or [])
@@ -907,25 +1047,25 @@ def _generate_knowledge_base(
                 }
 
     # Build globals section: each global with its type, value, and access context.
-    # Resolve read_by / written_by by scanning functions for global references.
+    # Resolve read_by / written_by in one pass over the functions' (transitive) global
+    # references, in function order.
+    read_by_gid: dict = {}
+    written_by_gid: dict = {}
+    for f2 in functions_data.values():
+        f2_qn = f2.get("qualifiedName", "")
+        if not f2_qn:
+            continue
+        for gid in set(f2.get("readsGlobalIdsTransitive") or f2.get("readsGlobalIds") or []):
+            read_by_gid.setdefault(gid, []).append(f2_qn)
+        for gid in set(f2.get("writesGlobalIdsTransitive") or f2.get("writesGlobalIds") or []):
+            written_by_gid.setdefault(gid, []).append(f2_qn)
     globals_kb: dict = {}
     for gid, gentry in global_variables_data.items():
         gqn = gentry.get("qualifiedName", "")
         if not gqn:
             continue
-        # Find which functions read/write this global (transitive)
-        read_by = []
-        written_by = []
-        for fid2, f2 in functions_data.items():
-            f2_qn = f2.get("qualifiedName", "")
-            if not f2_qn:
-                continue
-            reads = set(f2.get("readsGlobalIdsTransitive") or f2.get("readsGlobalIds") or [])
-            writes = set(f2.get("writesGlobalIdsTransitive") or f2.get("writesGlobalIds") or [])
-            if gid in reads:
-                read_by.append(f2_qn)
-            if gid in writes:
-                written_by.append(f2_qn)
+        read_by = read_by_gid.get(gid, [])
+        written_by = written_by_gid.get(gid, [])
         raw_value = (gentry.get("value") or "").split(";")[0].strip()
         globals_kb[gqn] = {
             "qualifiedName": gqn,
@@ -950,16 +1090,109 @@ def _generate_knowledge_base(
         "structs": structs_kb,
         "globals": globals_kb,
     }
+    if reuse is not None:
+        print(f"  incremental: {len(functions_kb) - len(reusable)}/{len(functions_kb)} "
+              f"knowledge-base function entries rebuilt")
+    return kb
+
+
+def _generate_knowledge_base(kb: dict) -> None:
+    """Write model/knowledge_base.json."""
     from core.model_io import write_model_file, KNOWLEDGE_BASE
     write_model_file(KNOWLEDGE_BASE, kb, ensure_ascii=False)
     print(
-        f"  model/knowledge_base.json (functions={len(functions_kb)}, "
-        f"enums={len(enums_kb)}, macros={len(macros_kb)}, "
-        f"typedefs={len(typedefs_kb)}, structs={len(structs_kb)}, "
-        f"globals={len(globals_kb)})"
+        f"  model/knowledge_base.json (functions={len(kb['functions'])}, "
+        f"enums={len(kb['enums'])}, macros={len(kb['macros'])}, "
+        f"typedefs={len(kb['typedefs'])}, structs={len(kb['structs'])}, "
+        f"globals={len(kb['globals'])})"
     )
 
 
+def _derive_inputs(config: dict, project_name: str) -> dict:
+    """The configuration the derivations read (model/derive_inputs.json)."""
+    return {
+        "definedMacros": sorted(_defined_macros_from_config()),
+        "components": config.get("components") or config.get("modules") or {},
+        "layers": config.get("layers") or {},
+        "projectName": project_name,
+    }
+
+
+def _load_derive_reuse(plan: dict | None, base_path: str, project_name: str, functions_data: dict,
+                       global_variables_data: dict, config: dict) -> dict | None:
+    """Incremental Phase 2 (M5): the baseline's finished model plus the dirty set
+    (incremental.derive_merge.dirty_set) of this version against the baseline's parse
+    snapshot. Returns None — derive everything — when there is no plan or changed-file
+    list, a baseline artifact is missing, or the baseline was derived under other inputs."""
+    if not plan or plan.get("changedFiles") is None or not plan.get("baselineVersionDir"):
+        return None
+    from incremental.artifacts import resolve
+    from incremental.derive_merge import dirty_set
+    vdir = plan["baselineVersionDir"]
+
+    def _load(rel: str):
+        path = resolve(vdir, rel)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    baseline = {name: _load(f"model/{name}.json") for name in (
+        "functions", "globalVariables", "units", "components", "knowledge_base", "derive_inputs")}
+    snapshot = {name: _load(f"parse/{name}.json") for name in ("functions", "globalVariables")}
+    missing = sorted(n for n, v in list(baseline.items()) + list(snapshot.items()) if v is None)
+    why = None
+    if missing:
+        why = f"baseline has no {', '.join(missing)}"
+    elif baseline["derive_inputs"] != _derive_inputs(config, project_name):
+        why = "baseline was derived under a different configuration"
+    elif set(baseline["functions"]) != set(snapshot["functions"]) or \
+            set(baseline["globalVariables"]) != set(snapshot["globalVariables"]):
+        why = "baseline model does not match its parse snapshot"
+    if why:
+        print(f"  incremental: full derive ({why})")
+        return None
+    reuse = dirty_set(snapshot["functions"], snapshot["globalVariables"],
+                      functions_data, global_variables_data, plan["changedFiles"])
+    reuse["baseline"] = baseline
+    print(f"  incremental: {len(reuse['functions'])} function(s), {len(reuse['globals'])} global(s), "
+          f"{len(reuse['files'])} file(s) changed; propagating globals for {len(reuse['closure'])}")
+    return reuse
+
+
+def _derive(base_path: str, project_name: str, functions_data: dict, global_variables_data: dict,
+            config: dict, reuse: dict = None) -> dict:
+    """Units / components / interface IDs / transitive global access (mutates the
+    entities). Returns the derived model for writing (and for the --verify-derive diff)."""
+    units_data, components_data, _unit_by_file = _build_units_components(
+        base_path, functions_data, global_variables_data, reuse)
+    only_files = None
+    if reuse is not None:
+        from incremental.derive_merge import file_key
+        files = {_file_path(e, base_path) for e in list(functions_data.values()) + list(global_variables_data.values())}
+        only_files = {fp for fp in files if file_key(_rel_path(fp, base_path)) in reuse["files"]}
+    idx_by_id = _build_interface_index(base_path, functions_data, global_variables_data, only_files)
+    _enrich_interfaces(base_path, project_name, functions_data, global_variables_data, idx_by_id, config,
+                       only_files=only_files, reuse=reuse)
+    # Propagate global access along call graph so outers inherit inner globals
+    _propagate_global_access(functions_data, reuse)
+    return {"units": units_data, "components": components_data,
+            "functions": functions_data, "globalVariables": global_variables_data}
+
+
+def _report_derive_diff(mism: list, what: str) -> None:
+    if mism:
+        print(f"  --verify-derive: incremental {what} DIFFERS from a full derive "
+              f"({len(mism)} mismatch(es)); using the full derive:")
+        for m in mism[:20]:
+            print(f"      {m}")
+    else:
+        print(f"  --verify-derive: incremental {what} is identical to a full derive")
+
+
 def main():
     llm_summarize = "--llm-summarize" in sys.argv
 
@@ -978,14 +1211,30 @@ def main():
     # Load dataDictionary for knowledge_base.json generation
     data_dict = read_model_file(DATA_DICTIONARY, required=False, default={})
 
-    units_data, unit_by_file = _build_units_components(base_path, functions_data, global_variables_data)
-    idx_by_id = _build_interface_index(base_path, functions_data, global_variables_data)
-    _enrich_interfaces(base_path, project_name, functions_data, global_variables_data, idx_by_id, config)
-    # Propagate global access along call graph so outers inherit inner globals
-    _propagate_global_access(functions_data)
+    # Incremental mode (M5): re-derive only what the diff touched and copy the rest from
+    # the baseline's model. --verify-derive runs a full derive too, diffs, and keeps it.
+    _plan = _read_incremental_plan()
+    reuse = _load_derive_reuse(_plan, base_path, project_name, functions_data,
+                               global_variables_data, config)
+    verify = reuse is not None and bool(_plan.get("verifyDerive"))
+    if verify:
+        import copy
+        from incremental.derive_merge import diff_derived
+        incremental = _derive(base_path, project_name, copy.deepcopy(functions_data),
+                              copy.deepcopy(global_variables_data), config, reuse)
+        derived = _derive(base_path, project_name, functions_data, global_variables_data, config)
+        _report_derive_diff(diff_derived(incremental, derived), "units/components/interfaces")
+    else:
+        derived = _derive(base_path, project_name, functions_data, global_variables_data, config, reuse)
+    from core.model_io import write_model_file, UNITS, COMPONENTS, DERIVE_INPUTS
+    write_model_file(UNITS, derived["units"])
+    write_model_file(COMPONENTS, derived["components"])
+    write_model_file(DERIVE_INPUTS, _derive_inputs(config, project_name))
+    print(f"  model/units.json ({len(derived['units'])})")
+    print(f"  model/components.json ({len(derived['components'])})")
+
     # Incremental mode (M3.2): restrict LLM enrichment to the impact set; the engine
     # has already carried forward baseline outputs for the reuse set.
-    _plan = _read_incremental_plan()
     only_fids = set(_plan.get("impactFids") or []) if _plan else None
     only_globals = set(_plan.get("impactedGlobals") or []) if _plan else None
     if _plan is not None:
@@ -1028,7 +1277,15 @@ def main():
     print(f"  model/globalVariables.json ({len(global_variables_data)})")
 
     # Always generate knowledge_base.json (Flowchart engine reads this)
-    _generate_knowledge_base(base_path, project_name, functions_data, global_variables_data, data_dict, summaries)
+    kb = _build_knowledge_base(base_path, project_name, functions_data, global_variables_data,
+                               data_dict, summaries, None if verify else reuse)
+    if verify:
+        from incremental.derive_merge import diff_derived
+        incremental_kb = _build_knowledge_base(base_path, project_name, functions_data,
+                                               global_variables_data, data_dict, summaries, reuse)
+        _report_derive_diff(diff_derived({"knowledge_base": incremental_kb}, {"knowledge_base": kb}),
+                            "knowledge base")
+    _generate_knowledge_base(kb)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,9 @@
-"""Parse C++ source -> model/."""
+"""Parse C++ source -> model/.
+
+Run as a script (Phase 1, `python parser.py <project_path> [flags]`) it parses every
+project TU and writes the model files. The incremental engine's narrowed parse instead
+loads this module with the same argv and calls :func:`parse_only`, which parses just the
+affected TUs and returns the partial model as a dict (nothing is written)."""
 import csv
 import ctypes
 import os
@@ -19,7 +24,10 @@ from core.config import (
 )
 from incremental.hashing import hash_cursor, hash_macro_text
 from incremental.edges import build_edges
-from incremental.parse_includes import build_closure, to_repo_relative
+from incremental.graph_index import build_graph_index
+from incremental.parse_includes import (build_closure, build_resolution, directive_spelling,
+                                        include_search_dirs, to_repo_relative)
+from incremental.affected import build_include_index
 from incremental.virtual_dispatch import spread_virtual_families
 
 _p = _paths()
@@ -76,7 +84,7 @@ _config = _app_config()
 _clang = _config.get("clang") or {}
 _llvm = _clang.get("llvmLibPath") or _config.get("llvmLibPath")
 _clang_inc = _clang.get("clangIncludePath") or _config.get("clangIncludePath")
-if _llvm and os.path.isfile(_llvm):
+if _llvm and os.path.isfile(_llvm) and not cindex.Config.loaded:  # once per process
     # Windows can fail to load libclang when dependent DLLs (e.g. from LLVM)
     # are not on the DLL search path. Ensure the LLVM bin folder is discoverable.
     _llvm_bin_dir = os.path.dirname(_llvm)
@@ -337,6 +345,11 @@ entity_hashes = {}
 # Incremental (M4.0): per-TU include closure {tuRelPath -> [in-repo included rel paths]},
 # captured during the first parse pass; written to model/tu_includes.json.
 tu_includes = {}
+# ... and how each of its #includes resolved: {tuRelPath -> [in-repo paths probed before
+# a hit]} + the same for #includes inside out-of-repo headers (shared by all TUs).
+# Written to model/include_resolution.json (doc 04 §17).
+include_resolution = {}
+include_resolution_external = set()
 # Incremental (M1.2b): slim type/macro usage index, written to model/edges.json.
 # Collected by func_key (internal) during visit_usage; remapped to model fids in main().
 type_users = defaultdict(set)      # type qn        -> set(func_key) that reference it
@@ -1139,16 +1152,67 @@ def _capture_tu_includes(tu, path):
         src_rel = to_repo_relative(path, MODULE_BASE_PATH)
         if src_rel is not None:
             tu_includes[src_rel] = build_closure(path, inc_paths, MODULE_BASE_PATH)
+            _capture_include_resolution(tu, path, src_rel)
     except Exception as e:  # pragma: no cover - defensive
         print(f"include-closure capture failed for {path}: {e}")
 
 
+_MISSING_INCLUDE = re.compile(r"'(.+)' file not found")
+
+
+def _directive_at(file_name, line):
+    lines = _get_source_lines(file_name)
+    return directive_spelling(lines[line - 1]) if 0 < line <= len(lines) else None
+
+
+def _capture_include_resolution(tu, path, src_rel):
+    """Doc 04 §17: record where each of this TU's #includes was searched before it
+    resolved, so a later narrowed parse can tell which TUs a newly added header could
+    shadow. Includes that weren't found come from the diagnostics."""
+    inclusions = []
+    for fi in tu.get_includes():
+        includer = getattr(fi.source, "name", None)
+        included = getattr(fi.include, "name", None)
+        if includer and included:
+            inclusions.append((includer, _directive_at(includer, fi.location.line), included, fi.depth))
+    for d in tu.diagnostics:
+        m = _MISSING_INCLUDE.search(d.spelling or "")
+        loc_file = getattr(d.location.file, "name", None)
+        if m and loc_file:
+            spelling = _directive_at(loc_file, d.location.line) or (m.group(1), False, False)
+            inclusions.append((loc_file, spelling, None, 0))
+    quote_dirs, angled_dirs = include_search_dirs(CLANG_ARGS)
+    searched, external = build_resolution(path, inclusions, MODULE_BASE_PATH, quote_dirs, angled_dirs)
+    include_resolution[src_rel] = searched
+    include_resolution_external.update(external)
+
+
+# Optional AST store (clang.astCache): parse_file serializes each TU so the flowchart
+# engine can load it instead of re-parsing the same file in Phase 3. Set up in main().
+_ast_cache = None
+# The options of parse_file's parse — recorded with CLANG_ARGS for the engine, which
+# parses with both whenever the AST store is on (core.ast_cache.write_parse_args).
+_PARSE_OPTIONS = cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+
+
+def _parse_fingerprint():
+    """Hash of the clang args + libclang toolchain (metadata.json `parseFingerprint`)."""
+    from incremental.fingerprint import parse_fingerprint
+    try:
+        _toolchain = cindex.conf.get_filename() or ""
+    except Exception:
+        _toolchain = ""
+    return parse_fingerprint(CLANG_ARGS, std="", toolchain=str(_toolchain))
+
+
 def parse_file(path):
     try:
-        tu = index.parse(path, args=CLANG_ARGS, options=cindex.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD)
+        tu = index.parse(path, args=CLANG_ARGS, options=_PARSE_OPTIONS)
         for d in tu.diagnostics:
             print(d)
         _capture_tu_includes(tu, path)  # incremental (M4.0): per-TU include closure
+        if _ast_cache is not None:
+            _ast_cache.save(tu, path)  # keyed by the closure captured just above
         visit_definitions(tu.cursor)
         visit_type_definitions(tu.cursor)
         visit_usage(tu.cursor)  # incremental (M1.2b): type/macro usage on the same TU
@@ -1316,17 +1380,20 @@ def _collect_source_files():
     return files
 
 
-def _restrict_to_only_files(source_files):
-    """Narrowed parse (M4.3): keep only the TUs listed in --only-files (repo-relative,
-    one per line). Matched against the collected absolute paths (case-insensitive)."""
-    try:
-        with open(_only_files_path, "r", encoding="utf-8") as fh:
-            wanted = {
-                os.path.normcase(os.path.abspath(os.path.join(MODULE_BASE_PATH, ln.strip())))
-                for ln in fh if ln.strip()
-            }
-    except OSError:
-        return source_files
+def _restrict_to_only_files(source_files, tu_paths=None):
+    """Narrowed parse (M4.3): keep only the listed TUs (repo-relative) — `tu_paths`, or
+    the lines of --only-files. Matched against the collected absolute paths
+    (case-insensitive)."""
+    if tu_paths is None:
+        try:
+            with open(_only_files_path, "r", encoding="utf-8") as fh:
+                tu_paths = fh.read().splitlines()
+        except OSError:
+            return source_files
+    wanted = {
+        os.path.normcase(os.path.abspath(os.path.join(MODULE_BASE_PATH, ln.strip())))
+        for ln in tu_paths if ln.strip()
+    }
     return [p for p in source_files if os.path.normcase(os.path.abspath(p)) in wanted]
 
 
@@ -1491,28 +1558,19 @@ def _merge_external_data_dictionary(path: str) -> None:
     print(f"  data dictionary: merged {merged} entries from {os.path.basename(path)}")
 
 
-def main():
+def _parse_sources(source_files, plog):
+    """The three parse passes over `source_files` (definitions, calls, global access)."""
     from core.progress import ProgressReporter
-    from core.logging_setup import get_logger
-    plog = get_logger("parser")
-    source_files = _collect_source_files()
-    if _only_files_path:
-        # Narrowed parse (M4.3): restrict to the listed TUs (repo-relative, one per line).
-        source_files = _restrict_to_only_files(source_files)
-        plog.info(f"narrowed parse: {len(source_files)} affected TU(s) (--only-files)")
-        # M4.4: load the baseline's func-key map so cross-TU calls (to functions defined in
-        # files we did NOT re-parse) still produce call edges.
-        _bfk = os.environ.get("ANALYZER_BASELINE_FUNCKEYS")
-        if _bfk and os.path.isfile(_bfk):
-            try:
-                with open(_bfk, "r", encoding="utf-8") as _f:
-                    _baseline_func_keys.update(json.load(_f))
-                plog.info(f"narrowed parse: loaded {len(_baseline_func_keys)} baseline func-keys "
-                          f"for cross-TU call resolution")
-            except (OSError, ValueError):
-                pass
     total = len(source_files)
 
+    global _ast_cache
+    if _clang.get("astCache"):
+        from core.ast_cache import AstCache, default_cache_dir, write_parse_args
+        _ast_cache = AstCache(default_cache_dir(PROJECT_ROOT), _parse_fingerprint(),
+                              MODULE_BASE_PATH, tu_includes,
+                              parse_args=CLANG_ARGS, parse_options=_PARSE_OPTIONS)
+        write_parse_args(os.path.join(PROJECT_ROOT, "model"), CLANG_ARGS, _PARSE_OPTIONS)
+
     p1 = ProgressReporter("parser:parse", total=total, logger=plog)
     p1.start(f"parsing {total} files")
     for path in source_files:
@@ -1534,30 +1592,23 @@ def main():
         parse_global_access(path)
     p3.done()
 
-    metadata = build_metadata()
-    model_dir = os.path.join(PROJECT_ROOT, "model")
-    os.makedirs(model_dir, exist_ok=True)
 
-    base_path = metadata["basePath"]
+def _build_model():
+    """Assemble the parser's model files from the parse state: {model name -> data}, in
+    write order (names are the core.model_io constants)."""
+    from core.model_io import (METADATA, FUNCTIONS, GLOBALS, DATA_DICTIONARY, HASHES, EDGES,
+                               TU_INCLUDES, TU_INCLUDE_INDEX, ENTITY_FILES, FUNC_KEYS,
+                               OVERRIDE_PAIRS, GRAPH_INDEX, INCLUDE_RESOLUTION)
+    metadata = build_metadata()
     meta_header = {
-        "basePath": base_path,
+        "basePath": metadata["basePath"],
         "projectName": metadata["projectName"],
         "generatedAt": metadata["generatedAt"],
         "version": metadata["version"],
     }
     # M4.6: a parse fingerprint over the clang args/std + libclang lib — the narrowed-parse
     # gate compares it to the baseline's and forces a full re-parse on any flag/toolchain change.
-    from incremental.fingerprint import parse_fingerprint
-    try:
-        _toolchain = cindex.conf.get_filename() or ""
-    except Exception:
-        _toolchain = ""
-    meta_header["parseFingerprint"] = parse_fingerprint(CLANG_ARGS, std="", toolchain=str(_toolchain))
-    from core.model_io import (write_model_file, METADATA, FUNCTIONS, GLOBALS, DATA_DICTIONARY,
-                               HASHES, EDGES, TU_INCLUDES, ENTITY_FILES, FUNC_KEYS, OVERRIDE_PAIRS)
-    write_model_file(METADATA, meta_header)
-    write_model_file(FUNCTIONS, metadata["functions"])
-    write_model_file(GLOBALS, metadata["globalVariables"])
+    meta_header["parseFingerprint"] = _parse_fingerprint()
     # Add primitives (name as key)
     for name, info in PRIMITIVES.items():
         data_dictionary[name] = {"kind": "primitive", "range": info["range"]}
@@ -1566,37 +1617,97 @@ def main():
     # Merge user-supplied data dictionary CSV (external entries win on conflict).
     if _data_dict_path:
         _merge_external_data_dictionary(_data_dict_path)
-    write_model_file(DATA_DICTIONARY, data_dictionary)
+    edges = build_edges(type_users, function_tokens, _type_keys, _macro_keys, _func_key_to_fid)
+    return {
+        METADATA: meta_header,
+        FUNCTIONS: metadata["functions"],
+        GLOBALS: metadata["globalVariables"],
+        DATA_DICTIONARY: data_dictionary,
+        # Incremental (M1.2): entity hash snapshot for change detection.
+        # Functions/globals were keyed in build_metadata; types/macros above.
+        HASHES: entity_hashes,
+        # Incremental (M1.2b): slim type/macro usage index -> model/edges.json.
+        # Reverse maps {typeKey/macroKey -> [model fids that use it]}. Calls/globals are
+        # NOT here (they live in functions.json); M2's impact BFS reads those from there.
+        EDGES: edges,
+        # Incremental: calls / uses / calledBy over integer ids -> model/graph_index.json,
+        # compiled once here for the engine's impact walk and reuse fingerprints.
+        GRAPH_INDEX: build_graph_index(metadata["functions"], edges),
+        # Incremental (M4.0): per-TU include closure -> model/tu_includes.json. The
+        # narrowed-parse engine (M4) intersects this with the git diff to find affected TUs.
+        TU_INCLUDES: {k: tu_includes[k] for k in sorted(tu_includes)},
+        # ... and inverted ({file -> TUs}), normalized once here so an incremental run's
+        # affected-TU lookup is one probe per changed path.
+        TU_INCLUDE_INDEX: build_include_index(tu_includes),
+        # Incremental (doc 04 §17): per-TU include resolution (+ its inverted index) —
+        # which TUs a header ADDED at a probed path could shadow.
+        INCLUDE_RESOLUTION: {
+            "tus": {k: include_resolution[k] for k in sorted(include_resolution)},
+            "external": sorted(include_resolution_external),
+            "index": build_include_index(include_resolution),
+        },
+        # Incremental (M4.3): per-entity defining file -> model/entity_files.json. Lets the
+        # narrowed-parse merge resolve each entity's file (types/hashes have no inline location).
+        ENTITY_FILES: {k: entity_files[k] for k in sorted(entity_files)},
+        # Incremental (M4.4): {mangled-func-key -> fid} -> model/func_keys.json. A future
+        # narrowed parse loads the baseline's map to resolve calls into UN-parsed files.
+        FUNC_KEYS: {k: _func_key_to_fid[k] for k in sorted(_func_key_to_fid)},
+        # Incremental (M4.6): fid-level override->base pairs -> model/override_pairs.json, for
+        # the narrowed-parse virtual-dispatch re-spread across affected + un-parsed files.
+        OVERRIDE_PAIRS: sorted(_override_pairs_fid),
+    }
 
-    # Incremental (M1.2): entity hash snapshot for change detection.
-    # Functions/globals were keyed in build_metadata; types/macros above.
-    write_model_file(HASHES, entity_hashes)
 
-    # Incremental (M1.2b): slim type/macro usage index -> model/edges.json.
-    # Reverse maps {typeKey/macroKey -> [model fids that use it]}. Calls/globals are
-    # NOT here (they live in functions.json); M2's impact BFS reads those from there.
-    edges = build_edges(type_users, function_tokens, _type_keys, _macro_keys, _func_key_to_fid)
-    write_model_file(EDGES, edges)
+def parse_only(tu_paths, baseline_func_keys=None):
+    """Library entry point for the narrowed parse (M4.4): parse only `tu_paths`
+    (repo-relative TUs) and return the partial model — {model name -> data}, the same
+    artifacts main() writes — without writing model/.
 
-    # Incremental (M4.0): per-TU include closure -> model/tu_includes.json. The
-    # narrowed-parse engine (M4) intersects this with the git diff to find affected TUs.
-    write_model_file(TU_INCLUDES, {k: tu_includes[k] for k in sorted(tu_includes)})
+    `baseline_func_keys` ({mangled-func-key -> fid} of the baseline version) lets calls
+    into functions defined in files NOT re-parsed still resolve to call edges. Parse
+    state is module-global, so each call needs a freshly loaded module."""
+    from core.logging_setup import get_logger
+    plog = get_logger("parser")
+    source_files = _restrict_to_only_files(_collect_source_files(), list(tu_paths))
+    _baseline_func_keys.update(baseline_func_keys or {})
+    plog.info(f"narrowed parse: {len(source_files)} affected TU(s), "
+              f"{len(_baseline_func_keys)} baseline func-keys (in-process)")
+    _parse_sources(source_files, plog)
+    return _build_model()
 
-    # Incremental (M4.3): per-entity defining file -> model/entity_files.json. Lets the
-    # narrowed-parse merge resolve each entity's file (types/hashes have no inline location).
-    write_model_file(ENTITY_FILES, {k: entity_files[k] for k in sorted(entity_files)})
 
-    # Incremental (M4.4): {mangled-func-key -> fid} -> model/func_keys.json. A future
-    # narrowed parse loads the baseline's map to resolve calls into UN-parsed files.
-    write_model_file(FUNC_KEYS, {k: _func_key_to_fid[k] for k in sorted(_func_key_to_fid)})
+def main():
+    from core.logging_setup import get_logger
+    plog = get_logger("parser")
+    source_files = _collect_source_files()
+    if _only_files_path:
+        # Narrowed parse (M4.3): restrict to the listed TUs (repo-relative, one per line).
+        source_files = _restrict_to_only_files(source_files)
+        plog.info(f"narrowed parse: {len(source_files)} affected TU(s) (--only-files)")
+        # M4.4: load the baseline's func-key map so cross-TU calls (to functions defined in
+        # files we did NOT re-parse) still produce call edges.
+        _bfk = os.environ.get("ANALYZER_BASELINE_FUNCKEYS")
+        if _bfk and os.path.isfile(_bfk):
+            try:
+                with open(_bfk, "r", encoding="utf-8") as _f:
+                    _baseline_func_keys.update(json.load(_f))
+                plog.info(f"narrowed parse: loaded {len(_baseline_func_keys)} baseline func-keys "
+                          f"for cross-TU call resolution")
+            except (OSError, ValueError):
+                pass
+
+    _parse_sources(source_files, plog)
+    model = _build_model()
 
-    # Incremental (M4.6): fid-level override->base pairs -> model/override_pairs.json, for
-    # the narrowed-parse virtual-dispatch re-spread across affected + un-parsed files.
-    write_model_file(OVERRIDE_PAIRS, sorted(_override_pairs_fid))
+    from core.model_io import (write_model_file, FUNCTIONS, GLOBALS, EDGES)
+    os.makedirs(os.path.join(PROJECT_ROOT, "model"), exist_ok=True)
+    for name, data in model.items():
+        write_model_file(name, data)
 
-    n_funcs = len(metadata["functions"])
-    n_vars = len(metadata["globalVariables"])
+    n_funcs = len(model[FUNCTIONS])
+    n_vars = len(model[GLOBALS])
     n_types = len(data_dictionary)
+    edges = model[EDGES]
     print("  model/metadata.json")
     print(f"  model/functions.json ({n_funcs})")
     print(f"  model/globalVariables.json ({n_vars})")
@@ -1611,6 +1722,15 @@ def main():
     print(f"  model/edges.json ({len(edges['typeUsers'])} types used, {len(edges['macroUsers'])} macros used)")
     _n_inc = sum(len(v) for v in tu_includes.values())
     print(f"  model/tu_includes.json ({len(tu_includes)} TUs, {_n_inc} in-repo include edges)")
+    _n_probe = sum(len(v) for v in include_resolution.values())
+    print(f"  model/include_resolution.json ({_n_probe} shadowable include paths, "
+          f"{len(include_resolution_external)} via out-of-repo headers)")
+    if _ast_cache is not None:
+        from core.ast_cache import DEFAULT_MAX_MB, prune
+        _max_mb = int(_clang.get("astCacheMaxMB") or DEFAULT_MAX_MB)
+        _evicted = prune(_ast_cache.cache_dir, _max_mb * 1024 * 1024)
+        print(f"  .ast_cache ({_ast_cache.saved} AST(s) written"
+              + (f", {_evicted} evicted" if _evicted else "") + ")")
 
 
 if __name__ == "__main__":
@@ -124,26 +124,72 @@ def render_mermaid_cached(project_root: str, mermaid: str, png_path: str, *,
     """Render `mermaid` to png_path, reusing a content-addressed PNG cache so an identical
     diagram is only ever rendered once. Returns True iff png_path exists afterward. Any
     cache error degrades gracefully to a direct render (never breaks a build)."""
+    return _render_mermaid_cached(project_root, mermaid, png_path, scale=scale,
+                                  puppeteer=puppeteer, timeout=timeout)[0]
+
+
+def _render_mermaid_cached(project_root: str, mermaid: str, png_path: str, *,
+                           scale=None, puppeteer: bool = True, timeout: int = 90):
+    """render_mermaid_cached() that also reports whether the PNG came from the cache.
+    Returns (ok, hit)."""
     import shutil
+    import threading
     cache_dir = os.path.join(project_root, _MMDC_CACHE_DIR)
     cache_png = os.path.join(cache_dir, mermaid_cache_key(mermaid, scale=scale, puppeteer=puppeteer) + ".png")
     os.makedirs(os.path.dirname(png_path) or ".", exist_ok=True)
     if os.path.isfile(cache_png):                     # hit -> copy out, no mmdc
         try:
             shutil.copyfile(cache_png, png_path)
-            return True
+            return True, True
         except OSError:
             pass                                       # fall through to a real render
     ok = _run_mmdc(project_root, mermaid, png_path, scale=scale, puppeteer=puppeteer, timeout=timeout)
     if ok:                                             # populate the cache (best-effort, atomic)
         try:
             os.makedirs(cache_dir, exist_ok=True)
-            tmp = cache_png + ".tmp"
+            tmp = "%s.%d.%d.tmp" % (cache_png, os.getpid(), threading.get_ident())
             shutil.copyfile(png_path, tmp)
             os.replace(tmp, cache_png)
         except OSError:
             pass
-    return ok
+    return ok, False
+
+
+def render_mermaid_many(project_root: str, jobs, *, scale=None, puppeteer: bool = True,
+                        timeout: int = 90, workers: int = 4, on_done=None):
+    """Render a batch of (mermaid, png_path) jobs through the PNG cache, `workers` mmdc
+    processes at a time. Jobs with identical Mermaid text are rendered once and the
+    others copied from the cache. on_done(index, ok) is called as each job finishes.
+    Returns (oks, hits): one bool per job, and how many PNGs came from the cache."""
+    from concurrent.futures import ThreadPoolExecutor
+    jobs = list(jobs)
+    oks = [False] * len(jobs)
+    hits = 0
+    by_key: dict = {}
+    for i, (mermaid, _png) in enumerate(jobs):
+        by_key.setdefault(mermaid_cache_key(mermaid, scale=scale, puppeteer=puppeteer), []).append(i)
+
+    def _render_group(indices):
+        group_hits = 0
+        for i in indices:                              # first renders, the rest hit the cache
+            mermaid, png_path = jobs[i]
+            ok, hit = _render_mermaid_cached(project_root, mermaid, png_path, scale=scale,
+                                             puppeteer=puppeteer, timeout=timeout)
+            oks[i] = ok
+            group_hits += int(ok and hit)
+            if on_done is not None:
+                on_done(i, ok)
+        return group_hits
+
+    groups = list(by_key.values())
+    if workers <= 1 or len(groups) <= 1:
+        for g in groups:
+            hits += _render_group(g)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            for n in pool.map(_render_group, groups):
+                hits += n
+    return oks, hits
 
 
 def safe_filename(s: str) -> str:
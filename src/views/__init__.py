@@ -1,13 +1,15 @@
 """View builders: model -> output. Each view reads the model and produces its output."""
-from utils import timed
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-from .registry import VIEW_REGISTRY
+from utils import log, timed
 
+from .registry import VIEW_DEPENDENCIES, VIEW_REGISTRY
 
-def run_views(model, output_dir, model_dir, config):
-    """Run all enabled views. model = {functions, globalVariables, units, modules, dataDictionary}."""
-    views_cfg = (config or {}).get("views", {})
-    for view_name, run_fn in VIEW_REGISTRY.items():
+
+def _enabled_views(views_cfg):
+    names = []
+    for view_name in VIEW_REGISTRY:
         default = view_name == "interfaceTables"
         val = views_cfg.get(view_name)
         if view_name not in views_cfg:
@@ -15,12 +17,83 @@ def run_views(model, output_dir, model_dir, config):
         else:
             enabled = False if val is False else True
         if enabled:
+            names.append(view_name)
+    return names
+
+
+def run_views(model, output_dir, model_dir, config):
+    """Run all enabled views. model = {functions, globalVariables, units, modules, dataDictionary}.
+
+    Views only read the model and each writes its own output, so they run
+    concurrently on a thread pool (views.parallelWorkers, default 4; 1 runs them
+    one after another in registry order). Most view time is spent waiting on the
+    flowchart engine and mmdc subprocesses, which threads overlap well. A view
+    registered with after=(...) starts once those views have finished. The first
+    view error stops new views from starting and is re-raised once running ones end.
+    """
+    views_cfg = (config or {}).get("views", {})
+    names = _enabled_views(views_cfg)
+    workers = max(1, int(views_cfg.get("parallelWorkers", 4) or 1))
+    timings = {}
+
+    def _run_one(view_name):
+        t0 = time.perf_counter()
+        try:
             with timed(view_name):
-                run_fn(model, output_dir, model_dir, config)
+                VIEW_REGISTRY[view_name](model, output_dir, model_dir, config)
+        finally:
+            timings[view_name] = time.perf_counter() - t0
+
+    t_start = time.perf_counter()
+    if workers == 1 or len(names) <= 1:
+        for view_name in names:
+            _run_one(view_name)
+    else:
+        _run_scheduled(names, _run_one, workers)
+    if len(names) > 1:
+        _log_summary(names, timings, time.perf_counter() - t_start)
+
+
+def _run_scheduled(names, run_one, workers):
+    """Start each view as soon as its enabled dependencies have finished."""
+    deps = {n: [d for d in VIEW_DEPENDENCIES.get(n, ()) if d in names] for n in names}
+    pending = list(names)
+    done, running = set(), {}
+    error = None
+    with ThreadPoolExecutor(max_workers=min(workers, len(names)),
+                            thread_name_prefix="view") as pool:
+        while pending or running:
+            if error is None:
+                for view_name in [n for n in pending if all(d in done for d in deps[n])]:
+                    pending.remove(view_name)
+                    running[pool.submit(run_one, view_name)] = view_name
+            if not running:
+                if pending and error is None:
+                    raise RuntimeError("views: dependency cycle among %s" % ", ".join(pending))
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                view_name = running.pop(fut)
+                exc = fut.exception()
+                if exc is not None:
+                    log("%s failed: %s" % (view_name, exc), component="views", err=True)
+                    error = error or exc
+                done.add(view_name)
+    if error is not None:
+        raise error
+
+
+def _log_summary(names, timings, wall):
+    width = max(len(n) for n in names)
+    log("view timings (wall %.2fs, sum %.2fs):" % (wall, sum(timings.values())), component="views")
+    for view_name in names:
+        t = timings.get(view_name)
+        log("  %-*s %s" % (width, view_name, "%8.2fs" % t if t is not None else "     n/a"),
+            component="views")
 
 
 # Import view modules so they register themselves
 from . import interface_tables  # noqa: F401
 from . import behaviour_diagram  # noqa: F401
 from . import unit_diagrams  # noqa: F401
-from . import flowcharts  # noqa: F401
\ No newline at end of file
+from . import flowcharts  # noqa: F401
@@ -3,20 +3,20 @@
 Creates behaviour diagrams when current unit gets called by external units.
 The generator returns one .mmd per external caller (current_key__caller_key.mmd).
 We render each to PNG and build docx rows with pngPath for the exporter.
+PNGs go through the shared .mmdc_cache (utils.render_mermaid_many), so diagrams
+unchanged since the last run are copied instead of re-rendered.
 """
 
 import json
 import os
-import subprocess
 import sys
-from utils import os_type
 # behaviour_diagram_generator lives in project root
 _proj = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 if _proj not in sys.path:
     sys.path.insert(0, _proj)
 
 from .registry import register
-from utils import log, mmdc_path, KEY_SEP
+from utils import log, render_mermaid_many, KEY_SEP
 from behaviour_diagram_generator import SequenceDiagramGenerator
 
 
@@ -42,16 +42,15 @@ def run(model, output_dir, model_dir, config):
     functions_path = os.path.join(model_dir, "functions.json")
     components_path = os.path.join(model_dir, "components.json")
     units_path = os.path.join(model_dir, "units.json")
-    gen = SequenceDiagramGenerator(components_path, units_path, functions_path)
+    # Hand the generator the model already in memory: it would otherwise re-read
+    # functions.json for every function (O(N * file size) for the whole view).
+    gen = SequenceDiagramGenerator(components_path, units_path, functions_path,
+                                   functions_data=functions_data)
 
-    render_png = True
-    mmdc = mmdc_path(project_root)
-    puppeteer = os.path.join(project_root, "config", "puppeteer-config.json")
-    if not os.path.isabs(puppeteer):
-        puppeteer = os.path.join(project_root, puppeteer)
-    run_cmd_base = [mmdc, "--scale", "2"]
-    if os.path.isfile(puppeteer):
-        run_cmd_base.extend(["-p", puppeteer])
+    beh_cfg = beh_val if isinstance(beh_val, dict) else {}
+    render_png = beh_cfg.get("renderPng", True)
+    render_workers = max(1, int(beh_cfg.get("renderWorkers", 4)))
+    render_jobs = []  # (docx row, mmd_path, png_path), rendered after generation
 
     docx_rows = {}  # component -> unit -> [ {externalUnitFunction, pngPath} ]
     # Only generate diagrams for functions within the selected group (if any),
@@ -115,38 +114,55 @@ def run(model, output_dir, model_dir, config):
             func_qualified = fid_parts[2] if len(fid_parts) >= 3 else ""
             current_function_name = func_qualified.split("::")[-1] if "::" in func_qualified else func_qualified
 
-            png_path = None
-            if render_png and os.path.isfile(mmd_path):
-                png_base = os.path.splitext(os.path.basename(mmd_path))[0]
-                png = os.path.join(out_dir, f"{png_base}.png")
-                run_cmd = run_cmd_base + ["-i", mmd_path, "-o", png, "-s", "2"]
-                try:
-                    if os_type == "Windows":
-                        r2 = subprocess.run(run_cmd, capture_output=True, text=True, timeout=60, check=False, shell=True)
-                    else:
-                        r2 = subprocess.run(run_cmd, capture_output=True, text=True, timeout=60, check=False)
-                    if r2.returncode == 0 and os.path.isfile(png):
-                        png_path = png
-                    elif r2.returncode != 0 and idx == 0:
-                        msg = (r2.stderr or r2.stdout or f"exit {r2.returncode}").strip()
-                        log("mmdc failed: %s" % msg, component="behaviourDiagram", err=True)
-                except FileNotFoundError:
-                    if idx == 0:
-                        log("mmdc not found. Run: npm install", component="behaviourDiagram", err=True)
-                except subprocess.TimeoutExpired:
-                    if idx == 0:
-                        log("mmdc timed out", component="behaviourDiagram", err=True)
-
-            docx_rows.setdefault(component_name, {}).setdefault(current_unit, []).append({
+            row = {
                 "currentFunctionName": current_function_name,
                 "externalUnitFunction": external_unit_external_function,
-                "pngPath": png_path,
+                "pngPath": None,
                 "behaviorDescription": behaviour_descriptions[idx] if idx < len(behaviour_descriptions) else [],
-            })
+            }
+            if render_png and os.path.isfile(mmd_path):
+                png_base = os.path.splitext(os.path.basename(mmd_path))[0]
+                render_jobs.append((row, mmd_path, os.path.join(out_dir, f"{png_base}.png")))
+
+            docx_rows.setdefault(component_name, {}).setdefault(current_unit, []).append(row)
             count += 1
 
+    progress.done(summary="output/behaviour_diagrams/ (%d diagrams)" % count)
+
+    if render_jobs:
+        _render_pngs(project_root, render_jobs, render_workers)
+
     out_path = os.path.join(out_dir, "_behaviour_pngs.json")
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump({"_docxRows": docx_rows}, f, indent=2)
 
-    progress.done(summary="output/behaviour_diagrams/ (%d diagrams)" % count)
+
+def _render_pngs(project_root, render_jobs, workers):
+    """Render every (row, mmd_path, png_path) job through the PNG cache and set
+    row["pngPath"] for the ones that succeeded."""
+    from core.progress import ProgressReporter
+    from core.logging_setup import get_logger
+
+    jobs = []
+    for _row, mmd_path, png in render_jobs:
+        with open(mmd_path, "r", encoding="utf-8") as f:
+            jobs.append((f.read(), png))
+
+    progress = ProgressReporter("behaviourDiagram:PNG", total=len(jobs),
+                                logger=get_logger("behaviourDiagram"))
+    progress.start()
+    oks, hits = render_mermaid_many(
+        project_root, jobs, scale=2, timeout=60, workers=workers,
+        on_done=lambda i, ok: progress.step(label=os.path.basename(jobs[i][1])),
+    )
+    failed = 0
+    for (row, _mmd, png), ok in zip(render_jobs, oks):
+        if ok:
+            row["pngPath"] = png
+        else:
+            failed += 1
+    if failed:
+        log("mmdc failed for %d of %d behaviour diagram(s); is mermaid-cli installed (npm install)?"
+            % (failed, len(jobs)), component="behaviourDiagram", err=True)
+    progress.done(summary="%d PNGs rendered, %d from cache%s"
+                  % (len(jobs), hits, (" (%d failed)" % failed) if failed else ""))
@@ -183,7 +183,10 @@ def _apply_incremental_plan(functions_arg_path, model_dir_abs, out_dir):
         fpath = ((funcs.get(fid) or {}).get("location") or {}).get("file")
         return os.path.splitext(os.path.basename(fpath))[0] if fpath else None
 
-    out_path = os.path.join(model_dir_abs, "functions_incremental.json")
+    # functions.json -> functions_incremental.json; functions_<group>.json ->
+    # functions_<group>_incremental.json, so concurrent groups never share it.
+    out_stem = os.path.splitext(os.path.basename(functions_arg_path))[0]
+    out_path = os.path.join(model_dir_abs, f"{out_stem}_incremental.json")
 
     fids = plan.get("flowchartFids")
 
@@ -894,6 +897,11 @@ def run(model, output_dir, model_dir, config):
     # pass only those functions to the generator.
     functions_arg_path = functions_path
 
+    # Per-group suffix for the scratch files this view writes into model/:
+    # groups may run concurrently (run.py --parallel-groups) against one model dir.
+    orig_comps = sorted((config or {}).get("_analyzerAllowedComponents") or [])
+    scratch_key = safe_filename(group_name or "_".join(orig_comps)) if allowed_components else ""
+
     if allowed_components and os.path.isfile(functions_path):
         try:
             with open(functions_path, "r", encoding="utf-8") as f:
@@ -909,17 +917,9 @@ def run(model, output_dir, model_dir, config):
                     in allowed_components
                 }
 
-                orig_comps = sorted(
-                    (config or {}).get("_analyzerAllowedComponents") or []
-                )
-
-                filename_key = (
-                    group_name or "_".join(orig_comps)
-                )
-
                 group_functions_path = os.path.join(
                     model_dir_abs,
-                    f"functions_{safe_filename(filename_key)}.json",
+                    f"functions_{scratch_key}.json",
                 )
 
                 with open(
@@ -983,6 +983,21 @@ def run(model, output_dir, model_dir, config):
     if os.path.isfile(kb_path):
         cmd.extend(["--knowledge-json", kb_path])
 
+    # clang.astCache: reuse the ASTs Phase 1 serialized instead of re-parsing
+    # every TU (the engine validates each one against the current sources).
+    if clang_cfg.get("astCache"):
+        from core.ast_cache import default_cache_dir
+        cmd.extend(["--ast-cache-dir", default_cache_dir(project_root)])
+
+    # views.flowcharts.cfgCache (default on): reuse the labeled CFG of every
+    # function whose source hash is unchanged - no TU parse, no LLM call.
+    fc_cfg = val if isinstance(val, dict) else {}
+    if fc_cfg.get("cfgCache", True):
+        cmd.extend(["--cfg-cache-dir",
+                    os.path.join(project_root, ".flowchart_cache", "cfg")])
+        if fc_cfg.get("cfgCacheMaxMB"):
+            cmd.extend(["--cfg-cache-max-mb", str(int(fc_cfg["cfgCacheMaxMB"]))])
+
     # M-D: when the analyzer disables LLM (--no-llm sets llm.descriptions=False),
     # tell the flowchart engine to skip the LLM too (fallback node labels)
     # for an LLM-free pipeline.
@@ -996,7 +1011,11 @@ def run(model, output_dir, model_dir, config):
     non_empty_clang_args = [str(a) for a in clang_args if a]
 
     if non_empty_clang_args:
-        args_file = os.path.join(model_dir_abs, ".flowcharts_clang_args.txt")
+        args_file = os.path.join(
+            model_dir_abs,
+            f".flowcharts_clang_args_{scratch_key}.txt" if scratch_key
+            else ".flowcharts_clang_args.txt",
+        )
 
         with open(args_file, "w", encoding="utf-8") as f:
             for a in non_empty_clang_args:
@@ -1009,32 +1028,47 @@ def run(model, output_dir, model_dir, config):
         component="flowcharts",
     )
 
-    try:
-        if os_type == "Windows":
-            r = subprocess.run(
-                cmd,
-                cwd=project_root,
-                check=False,
-                shell=True,
-            )
-        else:
-            r = subprocess.run(
-                cmd,
-                cwd=project_root,
-                check=False,
-            )
+    # views.flowcharts.daemon: hand the run to the long-lived engine
+    # (src/flowchart/daemon.py, started on first use), which keeps the PKB,
+    # project knowledge, parsed TUs and the LLM client warm across versions.
+    returncode = None
+    if fc_cfg.get("daemon") and script.endswith("flowchart_engine.py"):
+        from flowchart.daemon import ensure_daemon, run_engine
+        if ensure_daemon(project_root):
+            returncode = run_engine(project_root, cmd[2:], cwd=project_root)
+        if returncode is None:
+            log("flowchart daemon unavailable; running the generator directly",
+                component="flowcharts")
+
+    if returncode is None:
+        try:
+            if os_type == "Windows":
+                r = subprocess.run(
+                    cmd,
+                    cwd=project_root,
+                    check=False,
+                    shell=True,
+                )
+            else:
+                r = subprocess.run(
+                    cmd,
+                    cwd=project_root,
+                    check=False,
+                )
 
-    except subprocess.TimeoutExpired:
-        log("generator timed out", component="flowcharts", err=True)
-        return
+        except subprocess.TimeoutExpired:
+            log("generator timed out", component="flowcharts", err=True)
+            return
 
-    except OSError as e:
-        log("generator failed: %s" % e, component="flowcharts", err=True)
-        return
+        except OSError as e:
+            log("generator failed: %s" % e, component="flowcharts", err=True)
+            return
+
+        returncode = r.returncode
 
-    if r.returncode != 0:
+    if returncode != 0:
         log(
-            "generator exited with code %s" % r.returncode,
+            "generator exited with code %s" % returncode,
             component="flowcharts",
             err=True,
         )
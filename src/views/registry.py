@@ -1,9 +1,12 @@
 """View registry: name -> run(model, output_dir, model_dir, config)."""
 VIEW_REGISTRY = {}
+# name -> names of views whose output it reads; the scheduler starts it after them.
+VIEW_DEPENDENCIES = {}
 
 
-def register(name):
+def register(name, *, after=()):
     def decorator(fn):
         VIEW_REGISTRY[name] = fn
+        VIEW_DEPENDENCIES[name] = tuple(after)
         return fn
     return decorator
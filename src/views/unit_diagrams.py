@@ -89,6 +89,79 @@ def _escape_label(text):
     return t
 
 
+class _UnitIndex:
+    """Per-run lookups shared by every unit diagram, so each diagram costs time
+    proportional to its own edges instead of a scan of all units:
+
+    - part id -> unit key (the first unit in units_data order, as Mermaid node ids
+      of colliding keys are indistinguishable anyway)
+    - component -> part ids of its units (the "internal" set of a diagram)
+
+    edges() walks only the unit's own functions' callsIds / calledByIds.
+    """
+
+    def __init__(self, units_data, functions_data, fid_to_unit):
+        self.functions_data = functions_data
+        self.fid_to_unit = fid_to_unit
+        self.part_to_unit = {}
+        self.component_parts = {}
+        for uk in units_data:
+            pid = _unit_part_id(uk)
+            self.part_to_unit.setdefault(pid, uk)
+            component = uk.split(KEY_SEP)[0] if KEY_SEP in uk else ""
+            self.component_parts.setdefault(component, set()).add(pid)
+        self._allowed_parts = {}
+
+    def internal_parts(self, component, allowed_components=None):
+        """Part ids drawn inside the module box: units of `component`, or of any
+        allowed component when the run is restricted to a group."""
+        if not allowed_components:
+            return self.component_parts.get(component, set())
+        key = frozenset(allowed_components)
+        parts = self._allowed_parts.get(key)
+        if parts is None:
+            parts = set()
+            for comp, pids in self.component_parts.items():
+                if comp.lower() in allowed_components:
+                    parts |= pids
+            self._allowed_parts[key] = parts
+        return parts
+
+    def edges(self, unit_key, unit_info):
+        """Interface edges incident to unit_key: {(from pid, to pid): set(interfaceId)}."""
+        functions_data, fid_to_unit = self.functions_data, self.fid_to_unit
+        this_id = _unit_part_id(unit_key)
+        edges = {}
+        for fid in unit_info.get("functionIds", []):
+            if fid not in functions_data:
+                continue
+            f = functions_data[fid]
+            for callee_fid in f.get("callsIds", []) or []:
+                callee_unit = fid_to_unit.get(callee_fid)
+                if not callee_unit or callee_unit == unit_key:
+                    continue
+                callee_f = functions_data.get(callee_fid, {})
+                iface = callee_f.get("interfaceId", "")
+                if iface:
+                    key = (this_id, _unit_part_id(callee_unit))
+                    edges.setdefault(key, set()).add(iface)
+
+        for fid in unit_info.get("functionIds", []):
+            if fid not in functions_data:
+                continue
+            f = functions_data[fid]
+            iface = f.get("interfaceId", "")
+            if not iface:
+                continue
+            for caller_fid in f.get("calledByIds", []) or []:
+                caller_unit = fid_to_unit.get(caller_fid)
+                if not caller_unit or caller_unit == unit_key:
+                    continue
+                key = (_unit_part_id(caller_unit), this_id)
+                edges.setdefault(key, set()).add(iface)
+        return edges
+
+
 def _build_unit_diagram(
     unit_key,
     unit_info,
@@ -98,56 +171,24 @@ def _build_unit_diagram(
     unit_names,
     *,
     allowed_components: set | None = None,
+    index: _UnitIndex | None = None,
 ):
     """Build Mermaid flowchart for one unit: one box per unit, edges labeled with interfaceIds.
-    If allowed_components is provided, "internal" means: units whose module is in allowed_components."""
+    If allowed_components is provided, "internal" means: units whose module is in allowed_components.
+    Pass the run's _UnitIndex as `index` when building many diagrams (built here otherwise)."""
     if not (unit_info.get("fileName") or "").endswith(".cpp"):
         return None
+    if index is None:
+        index = _UnitIndex(units_data, functions_data, fid_to_unit)
 
     this_id = _unit_part_id(unit_key)
     this_component = unit_key.split(KEY_SEP)[0] if KEY_SEP in unit_key else ""
 
-    edges = {}
-    for fid in unit_info.get("functionIds", []):
-        if fid not in functions_data:
-            continue
-        f = functions_data[fid]
-        for callee_fid in f.get("callsIds", []) or []:
-            callee_unit = fid_to_unit.get(callee_fid)
-            if not callee_unit or callee_unit == unit_key:
-                continue
-            callee_f = functions_data.get(callee_fid, {})
-            iface = callee_f.get("interfaceId", "")
-            if iface:
-                key = (this_id, _unit_part_id(callee_unit))
-                edges.setdefault(key, set()).add(iface)
-
-    for fid in unit_info.get("functionIds", []):
-        if fid not in functions_data:
-            continue
-        f = functions_data[fid]
-        iface = f.get("interfaceId", "")
-        if not iface:
-            continue
-        for caller_fid in f.get("calledByIds", []) or []:
-            caller_unit = fid_to_unit.get(caller_fid)
-            if not caller_unit or caller_unit == unit_key:
-                continue
-            key = (_unit_part_id(caller_unit), this_id)
-            edges.setdefault(key, set()).add(iface)
+    edges = index.edges(unit_key, unit_info)
 
     caller_ids = {fr for (fr, to) in edges if to == this_id}
     callee_ids = {to for (fr, to) in edges if fr == this_id}
-    internal_set = set()
-    for uk in units_data:
-        pid = _unit_part_id(uk)
-        uk_component = uk.split(KEY_SEP)[0] if KEY_SEP in uk else ""
-        if allowed_components:
-            if uk_component.lower() in allowed_components:
-                internal_set.add(pid)
-        else:
-            if uk_component == this_component:
-                internal_set.add(pid)
+    internal_set = index.internal_parts(this_component, allowed_components)
     internal_callers = sorted(caller_ids & internal_set)
     external_callers = sorted(caller_ids - internal_set)
     internal_callees = sorted((callee_ids - caller_ids) & internal_set)
@@ -158,15 +199,15 @@ def _build_unit_diagram(
     pad = "   "
 
     def _node_line(pid):
-        for uk in units_data:
-            if _unit_part_id(uk) == pid:
-                raw = unit_names.get(uk, uk) if pid == this_id else uk.replace(KEY_SEP, "/").replace("-", " ")
-                box_label = (raw or "?").replace("]", "'").replace("[", "'")
-                if pid == this_id:
-                    extra = "<br/>".join([f"{pad} " for _ in range(n_extra_lines)])
-                    box_label = f"{pad}{box_label}{pad}<br/>{extra}"
-                return f'  {pid}["{box_label}"]'
-        return ""
+        uk = index.part_to_unit.get(pid)
+        if uk is None:
+            return ""
+        raw = unit_names.get(uk, uk) if pid == this_id else uk.replace(KEY_SEP, "/").replace("-", " ")
+        box_label = (raw or "?").replace("]", "'").replace("[", "'")
+        if pid == this_id:
+            extra = "<br/>".join([f"{pad} " for _ in range(n_extra_lines)])
+            box_label = f"{pad}{box_label}{pad}<br/>{extra}"
+        return f'  {pid}["{box_label}"]'
 
     lines = [
         "%%{init: {'flowchart': {'splines': 'ortho'}}}%%",
@@ -279,6 +320,7 @@ def run(model, output_dir, model_dir, config):
     total = len(units_to_render)
     progress = ProgressReporter("unitDiagrams", total=total, logger=get_logger("unitDiagrams"))
     progress.start()
+    index = _UnitIndex(units_data, functions_data, fid_to_unit)
     for i, unit_key in enumerate(units_to_render, 1):
         progress.step(label=unit_key)
         unit_info = units_data[unit_key]
@@ -290,6 +332,7 @@ def run(model, output_dir, model_dir, config):
             fid_to_unit,
             unit_names,
             allowed_components=allowed_components or None,
+            index=index,
         )
         if not mermaid:
             continue
@@ -0,0 +1,154 @@
+"""Unit tests for src/core/ast_cache.py — Phase 1 AST reuse in the flowchart engine.
+
+An AST may only be reused when the TU, every in-repo header it includes, the parse
+fingerprint and the exact parse args / options are all unchanged; anything else must
+miss (and the engine re-parses). The engine parses with the args / options Phase 1
+recorded, so what Phase 1 saved is what it loads."""
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from core.ast_cache import AstCache, prune, read_parse_args, write_parse_args  # noqa: E402
+
+
+class _FakeTu:
+    def __init__(self, payload=b"AST"):
+        self.payload = payload
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.payload)
+
+
+def _project(tmp_path):
+    base = tmp_path / "repo"
+    (base / "src").mkdir(parents=True)
+    (base / "src" / "a.cpp").write_text('#include "a.h"\nint f() { return 1; }\n')
+    (base / "src" / "a.h").write_text("int f();\n")
+    return base, {"src/a.cpp": ["src/a.h"]}
+
+
+ARGS, OPTS = ["-std=c++14", "-x", "c++"], 3
+
+
+def _cache(tmp_path, base, inc, fp="fp1", args=ARGS, opts=OPTS):
+    return AstCache(str(tmp_path / "cache"), fp, str(base), inc, parse_args=args,
+                    parse_options=opts)
+
+
+def test_save_then_lookup_hits(tmp_path):
+    base, inc = _project(tmp_path)
+    tu_path = str(base / "src" / "a.cpp")
+    assert _cache(tmp_path, base, inc).save(_FakeTu(), tu_path) is True
+    reader = _cache(tmp_path, base, inc)
+    hit = reader.lookup(tu_path)
+    assert hit and open(hit, "rb").read() == b"AST"
+    assert (reader.hits, reader.misses) == (1, 0)
+
+
+def test_header_edit_invalidates(tmp_path):
+    base, inc = _project(tmp_path)
+    tu_path = str(base / "src" / "a.cpp")
+    _cache(tmp_path, base, inc).save(_FakeTu(), tu_path)
+    (base / "src" / "a.h").write_text("int f(); int g();\n")
+    assert _cache(tmp_path, base, inc).lookup(tu_path) is None
+
+
+def test_source_edit_and_fingerprint_change_invalidate(tmp_path):
+    base, inc = _project(tmp_path)
+    tu_path = str(base / "src" / "a.cpp")
+    _cache(tmp_path, base, inc).save(_FakeTu(), tu_path)
+    assert _cache(tmp_path, base, inc, fp="fp2").lookup(tu_path) is None
+    (base / "src" / "a.cpp").write_text("int f() { return 2; }\n")
+    assert _cache(tmp_path, base, inc).lookup(tu_path) is None
+
+
+def test_other_args_options_or_checkout_miss(tmp_path):
+    base, inc = _project(tmp_path)
+    tu_path = str(base / "src" / "a.cpp")
+    _cache(tmp_path, base, inc).save(_FakeTu(), tu_path)
+    assert _cache(tmp_path, base, inc, args=["-std=c++14"]).lookup(tu_path) is None
+    assert _cache(tmp_path, base, inc, args=ARGS + ["-Iother"]).lookup(tu_path) is None
+    assert _cache(tmp_path, base, inc, opts=OPTS | 4).lookup(tu_path) is None
+    other = tmp_path / "other"
+    (other / "src").mkdir(parents=True)
+    for name in ("a.cpp", "a.h"):
+        (other / "src" / name).write_bytes((base / "src" / name).read_bytes())
+    assert _cache(tmp_path, other, inc).lookup(str(other / "src" / "a.cpp")) is None
+
+
+def test_parse_args_round_trip(tmp_path):
+    model = str(tmp_path / "model")
+    assert read_parse_args(model) is None
+    write_parse_args(model, ARGS, OPTS)
+    assert read_parse_args(model) == (ARGS, OPTS)
+
+
+def test_unknown_tu_or_no_fingerprint_is_disabled(tmp_path):
+    base, inc = _project(tmp_path)
+    tu_path = str(base / "src" / "a.cpp")
+    assert _cache(tmp_path, base, {}).save(_FakeTu(), tu_path) is False     # no closure recorded
+    assert _cache(tmp_path, base, inc, fp="").save(_FakeTu(), tu_path) is False
+    assert _cache(tmp_path, base, inc).key_for(str(tmp_path / "elsewhere.cpp")) is None
+
+
+def test_failed_save_leaves_nothing(tmp_path):
+    base, inc = _project(tmp_path)
+
+    class _Broken:
+        def save(self, path):
+            raise RuntimeError("TranslationUnitSaveError")
+
+    c = _cache(tmp_path, base, inc)
+    assert c.save(_Broken(), str(base / "src" / "a.cpp")) is False
+    assert not os.path.isdir(c.cache_dir) or not os.listdir(c.cache_dir)
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    d = tmp_path / "cache"
+    d.mkdir()
+    for i, name in enumerate(("old", "mid", "new")):
+        p = d / f"{name}.ast"
+        p.write_bytes(b"x" * 100)
+        os.utime(p, (1000 + i, 1000 + i))
+    assert prune(str(d), 150) == 2
+    assert sorted(os.listdir(d)) == ["new.ast"]
+    assert prune(str(d), 150) == 0
+
+
+def test_engine_parser_loads_saved_ast(tmp_path):
+    """Round trip through real libclang: the flowchart engine's TranslationUnitParser
+    loads the AST Phase 1 saved (it parses with Phase 1's args / options), bodies
+    intact, and saves the TUs Phase 1 did not parse under the same key."""
+    ci = pytest.importorskip("clang.cindex")
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "flowchart"))
+    from ast_engine.parser import TranslationUnitParser
+    base, inc = _project(tmp_path)
+    (base / "src" / "b.cpp").write_text("int g() { return 2; }\n")
+    inc["src/b.cpp"] = []
+    tu_path = str(base / "src" / "a.cpp")
+    try:
+        index = ci.Index.create()
+    except Exception as exc:  # libclang shared library not loadable here
+        pytest.skip(f"libclang unavailable: {exc}")
+    args, opts = ["-std=c++14", f"-I{base}"], ci.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+    phase1 = _cache(tmp_path, base, inc, args=args, opts=opts)
+    assert phase1.save(index.parse(tu_path, args=args, options=opts), tu_path)
+
+    cache = _cache(tmp_path, base, inc, args=args, opts=opts)
+    tp = TranslationUnitParser("c++14", [], ast_cache=cache)
+    loaded = tp.get_tu_full(tu_path)
+    tp.get_tu_full(str(base / "src" / "b.cpp"))               # not parsed by Phase 1
+    assert (cache.hits, cache.misses, cache.saved) == (1, 1, 1)
+    fns = [c for c in loaded.cursor.walk_preorder()
+           if c.kind == ci.CursorKind.FUNCTION_DECL and c.is_definition()]
+    assert [f.spelling for f in fns] == ["f"]
+    again = _cache(tmp_path, base, inc, args=args, opts=opts)
+    TranslationUnitParser("c++14", [], ast_cache=again).get_tu_full(str(base / "src" / "b.cpp"))
+    assert (again.hits, again.misses) == (1, 0)
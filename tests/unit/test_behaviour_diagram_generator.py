@@ -0,0 +1,64 @@
+"""Unit tests for behaviour_diagram_generator.SequenceDiagramGenerator.
+
+The functions model is read once per generator (or taken from functions_data),
+and only callers from a different component produce a diagram."""
+import builtins
+import json
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, PROJECT_ROOT)
+
+from behaviour_diagram_generator import SequenceDiagramGenerator  # noqa: E402
+
+_FUNCTIONS = {
+    "App|core|App::run|": {"calledByIds": ["Main|entry|main|", "App|core|App::init|"]},
+    "App|core|App::init|": {"calledByIds": ["App|core|App::run|"]},
+    "Lib|math|add|int,int": {"calledByIds": ["App|core|App::run|", "Main|entry|main|"]},
+    "Main|entry|main|": {"calledByIds": []},
+}
+
+
+def _gen(tmp_path, **kw):
+    fpath = tmp_path / "functions.json"
+    fpath.write_text(json.dumps(_FUNCTIONS))
+    return SequenceDiagramGenerator(str(tmp_path / "components.json"),
+                                    str(tmp_path / "units.json"), str(fpath), **kw)
+
+
+def _names(paths):
+    return sorted(os.path.basename(p) for p in paths)
+
+
+def test_only_external_callers_get_a_diagram(tmp_path):
+    gen = _gen(tmp_path)
+    out = str(tmp_path / "out")
+    assert _names(gen.generate_all_diagrams("App|core|App::run|", out)) == [
+        "App_core_App__run___Main_entry_main_.mmd"]
+    assert gen.generate_all_diagrams("App|core|App::init|", out) == []
+    assert gen.external_callers("Lib|math|add|int,int") == [
+        "App|core|App::run|", "Main|entry|main|"]
+    assert gen.generate_all_diagrams("Nope|x|y|", out) == []
+
+
+def test_functions_json_read_once(tmp_path, monkeypatch):
+    gen = _gen(tmp_path)
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda p, *a, **k: (
+        opened.append(p) if str(p).endswith("functions.json") else None) or real_open(p, *a, **k))
+    for fid in _FUNCTIONS:
+        gen.generate_all_diagrams(fid, str(tmp_path / "out"))
+    assert len(opened) == 1
+
+
+def test_in_memory_model_skips_the_file(tmp_path):
+    gen = _gen(tmp_path, functions_data=_FUNCTIONS)
+    os.remove(gen.functions_path)
+    assert len(gen.generate_all_diagrams("Lib|math|add|int,int", str(tmp_path / "out"))) == 2
@@ -0,0 +1,197 @@
+"""Unit tests for the indexed ControlFlowGraph (src/flowchart/models.py) and the
+O(degree) merge / drop passes of LabelGenerator._simplify_cfg.
+
+Includes a benchmark on a synthetic 5,000-statement switch function:
+
+    python -m pytest tests/unit/test_cfg_model.py -m slow -s
+
+compares the indexed passes against the previous list-scanning implementation
+(kept below as the reference) and checks both produce the same Mermaid."""
+import json
+import os
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "flowchart"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from llm.generator import LabelGenerator  # noqa: E402
+from mermaid.builder import build_mermaid  # noqa: E402
+from models import (CfgEdge, CfgNode, ControlFlowGraph, FunctionEntry,  # noqa: E402
+                    NodeType)
+
+_ENTRY = FunctionEntry(key="k", qualified_name="Fsm::step", file="fsm.cpp",
+                       line=1, end_line=9999)
+
+
+def _node(nid, t=NodeType.ACTION, raw=""):
+    return CfgNode(node_id=nid, node_type=t, raw_code=raw or nid, start_line=1, end_line=1)
+
+
+def _graph(node_ids, edges):
+    nodes = {n: _node(n, NodeType.START if n == "S" else
+                      NodeType.END if n == "E" else NodeType.ACTION) for n in node_ids}
+    return ControlFlowGraph("k", "Fsm::step", "fsm.cpp", 1, 9, nodes=nodes,
+                            edges=[CfgEdge(*e) for e in edges],
+                            entry_node_id="S", exit_node_ids=["E"])
+
+
+# ---------------------------------------------------------------------------
+# Adjacency index
+# ---------------------------------------------------------------------------
+
+def test_slots_and_read_only_edge_view():
+    cfg = _graph(["S", "A", "E"], [("S", "A"), ("A", "E")])
+    with pytest.raises(AttributeError):
+        _node("X").extra = 1
+    with pytest.raises(AttributeError):
+        cfg.edges.append(CfgEdge("A", "S"))  # mutations go through the graph
+    assert [(e.source, e.target) for e in cfg.edges] == [("S", "A"), ("A", "E")]
+
+
+def test_adjacency_tracks_mutations_and_keeps_order():
+    cfg = _graph(["S", "A", "B", "E"], [("S", "A"), ("A", "B"), ("A", "E", "x"), ("B", "E")])
+    assert cfg.successors("A") == ["B", "E"]
+    assert [e.source for e in cfg.in_edges("E")] == ["A", "B"]
+
+    ab = cfg.out_edges("A")[0]
+    cfg.set_edge_source(ab, "S")
+    assert [(e.source, e.target) for e in cfg.edges][1] == ("S", "B")  # position kept
+    assert cfg.successors("S") == ["A", "B"] and cfg.successors("A") == ["E"]
+
+    cfg.remove_edge(ab)
+    cfg.remove_edge(ab)  # idempotent
+    assert not cfg.has_edge("S", "B") and cfg.in_edges("B") == []
+    cfg.add_edge("B", "B")
+    cfg.remove_node("B")  # self-loop + out-edge both go
+    assert "B" not in cfg.nodes
+    assert [(e.source, e.target) for e in cfg.edges] == [("S", "A"), ("A", "E")]
+
+
+def test_merge_and_drop_rewire():
+    cfg = _graph(["S", "A", "B", "C", "D", "E"],
+                 [("S", "A"), ("A", "B"), ("B", "C"), ("C", "D"), ("D", "E"), ("C", "A", "loop")])
+    LabelGenerator._apply_merge(cfg, ["A", "B", "C"])
+    assert set(cfg.nodes) == {"S", "A", "D", "E"}
+    assert cfg.nodes["A"].raw_code == "A; B; C"
+    assert [(e.source, e.target, e.label) for e in cfg.edges] == [
+        ("S", "A", None), ("A", "D", None), ("D", "E", None), ("A", "A", "loop")]
+
+    LabelGenerator._apply_drop(cfg, "D")
+    assert "D" not in cfg.nodes
+    assert cfg.successors("A") == ["A", "E"]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic state machine: one switch, N cases of 4 statements + break
+# ---------------------------------------------------------------------------
+
+def _switch_graph(statements):
+    cases = statements // 4
+    nodes = {"S": _node("S", NodeType.START), "SW": _node("SW", NodeType.SWITCH_HEAD),
+             "E": _node("E", NodeType.END)}
+    edges = [CfgEdge("S", "SW")]
+    merge, drop = [], []
+    for i in range(cases):
+        c, a, b, x, d, br = (f"C{i}", f"A{i}", f"B{i}", f"X{i}", f"D{i}", f"K{i}")
+        nodes[c] = _node(c, NodeType.CASE, f"case {i}:")
+        for nid in (a, b, x, d):
+            nodes[nid] = _node(nid, raw=f"s_{nid} = {i};")
+        nodes[br] = _node(br, NodeType.BREAK, "break;")
+        edges += [CfgEdge("SW", c, f"case {i}"), CfgEdge(c, a), CfgEdge(a, b),
+                  CfgEdge(b, x), CfgEdge(x, d), CfgEdge(d, br), CfgEdge(br, "E")]
+        merge.append([a, b])
+        drop.append(d)
+    cfg = ControlFlowGraph("k", "Fsm::step", "fsm.cpp", 1, 9999, nodes=nodes,
+                           edges=edges, entry_node_id="S", exit_node_ids=["E"])
+    return cfg, {"merge": merge, "drop": drop}
+
+
+class _PlanClient:
+    def __init__(self, plan):
+        self._raw = json.dumps(plan)
+
+    def generate(self, system="", user="", *args, **kwargs):
+        return self._raw
+
+
+def _simplify(cfg, plan):
+    LabelGenerator(client=_PlanClient(plan), pkb=None)._simplify_cfg(cfg, _ENTRY)
+
+
+def test_simplify_5000_statement_switch():
+    cfg, plan = _switch_graph(5000)
+    _simplify(cfg, plan)
+    assert "B0" not in cfg.nodes and "D0" not in cfg.nodes
+    assert cfg.successors("A0") == ["X0"] and cfg.successors("X0") == ["K0"]
+    assert len(cfg.nodes) == 3 + 1250 * 4
+    assert len(cfg.edges) == 1 + 1250 * 5
+
+
+# ---------------------------------------------------------------------------
+# Benchmark vs the previous list-scanning passes (opt-in: -m slow)
+# ---------------------------------------------------------------------------
+
+def _legacy_simplify(nodes, edges, plan):
+    """The pre-index merge/drop: every query scans the whole edge list."""
+    for group in plan["merge"]:
+        if any(len([e for e in edges if e.source == cur]) != 1
+               for cur in group[:-1]):
+            continue
+        if any(len([e for e in edges if e.target == nid]) != 1 for nid in group[1:]):
+            continue
+        head_id, tail_id, internal = group[0], group[-1], set(group[1:])
+        combined = nodes[head_id].raw_code
+        for nid in group[1:]:
+            combined = (combined + "; " + nodes[nid].raw_code.strip()).strip("; ")
+        nodes[head_id].raw_code = combined[:400]
+        new_edges = []
+        for e in edges:
+            if e.source in internal or e.target in internal:
+                if e.source == tail_id and e.target not in internal:
+                    new_edges.append(CfgEdge(head_id, e.target, e.label))
+                continue
+            new_edges.append(e)
+        edges = new_edges
+        for nid in internal:
+            nodes.pop(nid, None)
+    for nid in plan["drop"]:
+        ins = [e for e in edges if e.target == nid]
+        outs = [e for e in edges if e.source == nid]
+        if len(ins) != 1 or len(outs) != 1:
+            continue
+        pred, succ = ins[0].source, outs[0].target
+        label = ins[0].label or outs[0].label
+        edges = [e for e in edges if e.source != nid and e.target != nid]
+        if not any(e.source == pred and e.target == succ for e in edges):
+            edges.append(CfgEdge(pred, succ, label))
+        nodes.pop(nid, None)
+    return nodes, edges
+
+
+@pytest.mark.slow
+def test_benchmark_indexed_vs_list_scan(request):
+    if "slow" not in (request.config.getoption("-m") or ""):
+        pytest.skip("benchmark: opt in with -m slow")
+
+    cfg, plan = _switch_graph(5000)
+    t0 = time.perf_counter()
+    nodes, edges = _legacy_simplify(dict(cfg.nodes), list(cfg.edges), plan)
+    legacy_s = time.perf_counter() - t0
+    legacy = ControlFlowGraph("k", "Fsm::step", "fsm.cpp", 1, 9999, nodes=nodes,
+                              edges=edges, entry_node_id="S", exit_node_ids=["E"])
+
+    cfg, plan = _switch_graph(5000)
+    t0 = time.perf_counter()
+    _simplify(cfg, plan)
+    indexed_s = time.perf_counter() - t0
+
+    print(f"\n5,000-statement switch: list-scan {legacy_s:.2f}s, "
+          f"indexed {indexed_s:.3f}s ({legacy_s / indexed_s:.0f}x)")
+    assert build_mermaid(cfg) == build_mermaid(legacy)
+    assert indexed_s < legacy_s
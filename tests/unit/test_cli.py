@@ -111,3 +111,10 @@ class TestRunPyCli:
         assert "Unknown --selected-group 'DoesNotExist'" in output
         for expected in ("Sample", "Full", "Support", "Access", "Diag"):
             assert expected in output
+
+    def test_invalid_parallel_groups_rejected(self):
+        result = _run_cli("--parallel-groups", "0", PROJECT_ROOT)
+        output = _output(result)
+
+        assert result.returncode == 1
+        assert "--parallel-groups must be a positive integer" in output
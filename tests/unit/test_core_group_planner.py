@@ -80,3 +80,12 @@ class TestPlanRuns:
     def test_filter_mode_forwarded_to_views(self):
         plans = _run({}, filter_mode="public")
         assert "--filter-mode" in plans[0].phases[2].args
+
+    def test_group_plans_depend_on_build_plan(self):
+        plans = _run(_groups("Alpha", "Beta"))
+        assert plans[0].depends_on == []
+        assert [p.depends_on for p in plans[1:]] == [[plans[0].label]] * 2
+
+    def test_group_plans_independent_without_build_plan(self):
+        plans = _run(_groups("Alpha", "Beta"), from_phase=3)
+        assert all(p.depends_on == [] for p in plans)
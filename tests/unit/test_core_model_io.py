@@ -90,3 +90,30 @@ class TestWriteModelFile:
             write_model_file(FUNCTIONS, {"a": 1}, atomic=True)
             assert read_model_file(FUNCTIONS) == {"a": 1}
         assert not any(f.endswith(".tmp") for f in os.listdir(fake.model_dir))
+
+
+class TestInProcessCache:
+    @pytest.fixture(autouse=True)
+    def _cache(self):
+        import core.model_io as mio
+        mio.enable_model_cache()
+        yield
+        mio.enable_model_cache(False)
+
+    def test_unchanged_file_parsed_once(self, tmp_path):
+        _write(tmp_path, FUNCTIONS, {"f": {"line": 1}})
+        with patch("core.model_io.paths", return_value=_fake_paths(tmp_path)), \
+                patch("core.model_io.json.load", wraps=json.load) as loads:
+            first = read_model_file(FUNCTIONS)
+            assert read_model_file(FUNCTIONS) is first
+            assert load_model(FUNCTIONS)[FUNCTIONS] is first
+        assert loads.call_count == 1
+
+    def test_write_and_external_change_invalidate(self, tmp_path):
+        with patch("core.model_io.paths", return_value=_fake_paths(tmp_path)):
+            write_model_file(FUNCTIONS, {"v": 1})
+            assert read_model_file(FUNCTIONS) == {"v": 1}
+            write_model_file(FUNCTIONS, {"v": 2})
+            assert read_model_file(FUNCTIONS) == {"v": 2}
+            _write(tmp_path, FUNCTIONS, {"v": 333})          # another process rewrote it
+            assert read_model_file(FUNCTIONS) == {"v": 333}
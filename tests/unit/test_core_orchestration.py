@@ -0,0 +1,98 @@
+"""Unit tests for src/core/orchestration.py — PhaseRunner.run_plans scheduling.
+
+Phases are tiny Python scripts written to tmp_path (Phase.command joins an absolute
+script path as-is), so these exercise the real subprocess path."""
+import os
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from core.group_planner import RunPlan  # noqa: E402
+from core.orchestration import Phase, PhaseRunner  # noqa: E402
+
+
+def _script(tmp_path, name, body):
+    path = tmp_path / f"{name}.py"
+    path.write_text("import sys, time\n" + body + "\n")
+    return str(path)
+
+
+def _stamp(tmp_path, name, seconds=0.0, code=0):
+    """Phase that records start/end times into <name>.log and exits with `code`."""
+    log = tmp_path / f"{name}.log"
+    return Phase(name, _script(tmp_path, name, (
+        f"open({str(log)!r}, 'a').write('start %f\\n' % time.time())\n"
+        f"print('hello from {name}', flush=True)\n"
+        f"time.sleep({seconds})\n"
+        f"open({str(log)!r}, 'a').write('end %f\\n' % time.time())\n"
+        f"sys.exit({code})")))
+
+
+def _times(tmp_path, name):
+    path = tmp_path / f"{name}.log"
+    if not path.exists():
+        return {}
+    return {k: float(v) for k, v in (ln.split() for ln in path.read_text().splitlines())}
+
+
+def _plans(tmp_path, group_seconds=0.6, fail=None):
+    build = RunPlan("Build model", [_stamp(tmp_path, "build")])
+    groups = [RunPlan(f"Group: {g}", [_stamp(tmp_path, g, 0.0 if g == fail else group_seconds,
+                                              3 if g == fail else 0)],
+                      depends_on=["Build model"])
+              for g in ("A", "B", "C")]
+    return [build] + groups
+
+
+def test_groups_run_concurrently_after_build(tmp_path, capfd):
+    t0 = time.perf_counter()
+    PhaseRunner(project_root=str(tmp_path)).run_plans(_plans(tmp_path), parallel=3)
+    assert time.perf_counter() - t0 < 3 * 0.6
+    build_end = _times(tmp_path, "build")["end"]
+    assert all(_times(tmp_path, g)["start"] >= build_end for g in "ABC")
+    out = capfd.readouterr().out
+    assert "[Group: B] hello from B" in out
+
+
+def test_sequential_mode_keeps_order(tmp_path):
+    PhaseRunner(project_root=str(tmp_path)).run_plans(_plans(tmp_path, 0.0), parallel=1)
+    starts = [_times(tmp_path, g)["start"] for g in ("build", "A", "B", "C")]
+    assert starts == sorted(starts)
+
+
+def test_first_failure_stops_the_rest(tmp_path):
+    plans = _plans(tmp_path, group_seconds=1.0, fail="A")
+    plans[2].phases.append(_stamp(tmp_path, "B2"))            # B's second phase
+    plans[3].phases[0] = _stamp(tmp_path, "C", seconds=30)     # long-running sibling
+    t0 = time.perf_counter()
+    with pytest.raises(SystemExit) as exc:
+        PhaseRunner(project_root=str(tmp_path)).run_plans(plans, parallel=3)
+    assert exc.value.code == 3
+    assert time.perf_counter() - t0 < 10                      # C was terminated
+    assert "end" not in _times(tmp_path, "C")
+    assert _times(tmp_path, "B2") == {}                       # no new phase after the failure
+
+
+def test_in_process_phases_share_the_interpreter(tmp_path):
+    marker = tmp_path / "seen.txt"
+    first = Phase("first", _script(tmp_path, "first", (
+        "import os\n"
+        "os.environ['_ORCH_TEST_PID'] = str(os.getpid())\n"
+        f"open({str(marker)!r}, 'w').write(' '.join(sys.argv[1:]) + '|' + os.getcwd())")),
+        ["--flag", "x"])
+    failing = Phase("failing", _script(tmp_path, "failing", "sys.exit(4)"))
+    runner = PhaseRunner(project_root=str(tmp_path), in_process=True)
+    argv_before = list(sys.argv)
+    runner.run([first])
+    assert os.environ.pop("_ORCH_TEST_PID") == str(os.getpid())
+    assert marker.read_text() == f"--flag x|{tmp_path}"
+    assert sys.argv == argv_before
+    with pytest.raises(SystemExit) as exc:
+        runner.run([first, failing])
+    assert exc.value.code == 4
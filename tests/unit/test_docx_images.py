@@ -0,0 +1,68 @@
+"""Unit tests for src/docx_images.py — PNGs downsampled to their embed size.
+
+A picture wider than docx.imageDpi x its embed width is resampled once per distinct
+source and setting into the cache directory; anything smaller, or any failure,
+embeds the source unchanged."""
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+Image = pytest.importorskip("PIL.Image")
+from docx_images import ImageStage  # noqa: E402
+
+
+def _diagram(path, width, height):
+    """Flat-colour boxes on white, like an mmdc render."""
+    img = Image.new("RGB", (width, height), "white")
+    for k in range(0, height - 40, 120):
+        img.paste((135, 206, 235), (40, k + 20, width - 40, k + 80))
+    img.save(path)
+    return str(path)
+
+
+def test_wide_png_is_downsampled_once(tmp_path):
+    src = _diagram(tmp_path / "fc.png", 1600, 2400)
+    stage = ImageStage(cache_dir=str(tmp_path / "cache"), dpi=200)
+    out = stage.prepare(src, 4.0)
+    assert os.path.dirname(out) == str(tmp_path / "cache")
+    with Image.open(out) as img:
+        assert img.size == (800, 1200)
+        assert round(img.info["dpi"][0]) == 200
+    assert os.path.getsize(out) < os.path.getsize(src)
+    mtime = os.stat(out).st_mtime_ns
+    assert stage.prepare(src, 4.0) == out and os.stat(out).st_mtime_ns >= mtime
+    # Another embed width or setting is another derived image.
+    assert stage.prepare(src, 6.0) not in (out, src)
+
+
+def test_small_png_disabled_stage_and_bad_input_embed_source(tmp_path):
+    src = _diagram(tmp_path / "small.png", 600, 300)
+    assert ImageStage(cache_dir=str(tmp_path / "cache"), dpi=200).prepare(src, 4.0) == src
+    big = _diagram(tmp_path / "big.png", 1600, 300)
+    assert ImageStage(cache_dir=str(tmp_path / "cache"), dpi=0).prepare(big, 4.0) == big
+    (tmp_path / "broken.png").write_bytes(b"not a png")
+    stage = ImageStage(cache_dir=str(tmp_path / "cache"), dpi=200)
+    assert stage.prepare(str(tmp_path / "broken.png"), 4.0) == str(tmp_path / "broken.png")
+    assert stage.prepare(str(tmp_path / "missing.png"), 4.0) == str(tmp_path / "missing.png")
+    assert not os.path.isdir(tmp_path / "cache")
+
+
+def test_palette_conversion(tmp_path):
+    src = _diagram(tmp_path / "fc.png", 1600, 800)
+    out = ImageStage(cache_dir=str(tmp_path / "cache"), dpi=200, palette=True).prepare(src, 4.0)
+    with Image.open(out) as img:
+        assert img.mode == "P" and img.size == (800, 400)
+
+
+def test_from_config():
+    stage = ImageStage.from_config({"docx": {"imageDpi": "150", "imagePalette": True}}, "/c")
+    assert (stage.dpi, stage.palette, stage.cache_dir) == (150, True, "/c")
+    assert ImageStage.from_config({}, "/c").dpi == 200
+    assert ImageStage.from_config({"docx": {"imageDpi": "high"}}, "/c").dpi == 200
+    assert ImageStage.from_config({"docx": {"imageDpi": 0}}, "/c").dpi == 0
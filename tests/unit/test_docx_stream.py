@@ -0,0 +1,279 @@
+"""Unit tests for section-at-a-time DOCX export (src/docx_stream.py, docx_exporter.export_docx).
+
+Each component section is built in its own Document (in worker processes with
+docx.sectionWorkers > 1), spooled to disk and merged in order into the final
+package with its images copied from their source files; the result must read
+back like the single-Document export. With docx.sectionCache a re-export reuses
+the spooled sections whose inputs are unchanged (src/core/section_cache.py).
+
+Includes a memory benchmark on a synthetic group with 5,000 flowchart PNGs:
+
+    python -m pytest tests/unit/test_docx_stream.py -m slow -s
+"""
+import json
+import os
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+docx = pytest.importorskip("docx")
+import docx_exporter  # noqa: E402
+from docx_stream import SECTION_MARKER  # noqa: E402
+
+
+def _png(path, seed, side=32):
+    """Write a valid greyscale PNG of noise (incompressible, ~side*side bytes)."""
+    rng = (seed * 2654435761) & 0xFFFFFFFF
+    rows = bytearray()
+    for _ in range(side):
+        rows.append(0)
+        for _ in range(side):
+            rng = (rng * 1103515245 + 12345) & 0xFFFFFFFF
+            rows.append(rng >> 24)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", side, side, 8, 0, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(bytes(rows), 0)) + chunk(b"IEND", b""))
+
+
+def _group(root, components=3, units=2, functions=2, side=32, shared_png=False):
+    """Synthetic group: interface tables, model and one flowchart PNG per function."""
+    out = root / "output" / "G"
+    fc_dir = out / "flowcharts"
+    fc_dir.mkdir(parents=True)
+    (root / "model").mkdir()
+    tables, funcs = {}, {}
+    n = 0
+    for c in range(components):
+        for u in range(units):
+            unit_key = f"Comp{c}|unit{u}"
+            prefix = f"Comp{c}_unit{u}"
+            entries, flows = [], []
+            for k in range(functions):
+                name = f"fn{k}"
+                fid = f"{unit_key}|{name}|"
+                funcs[fid] = {"qualifiedName": name, "callsIds": []}
+                entries.append({"name": name, "type": "Function", "functionId": fid,
+                                "description": f"{name} of {unit_key}"})
+                flows.append({"name": name, "flowchart": f"flowchart TD\n  A{n} --> B{n}"})
+                png = fc_dir / f"{prefix}_{name}.png"
+                if shared_png and n:
+                    png.write_bytes((fc_dir / "Comp0_unit0_fn0.png").read_bytes())
+                else:
+                    _png(str(png), n, side)
+                n += 1
+            tables[unit_key] = {"name": f"unit{u}", "entries": entries}
+            (fc_dir / f"{prefix}.json").write_text(json.dumps(flows))
+    (out / "interface_tables.json").write_text(json.dumps(tables))
+    (root / "model" / "functions.json").write_text(json.dumps(funcs))
+    return str(out / "interface_tables.json")
+
+
+def _export(root, json_path, **docx_cfg):
+    docx_cfg.setdefault("sectionCache", False)
+    cfg = {"views": {"flowcharts": True, "componentStaticDiagram": False}, "docx": docx_cfg}
+    out = str(root / "sdd.docx")
+    with patch("core.model_io.paths", return_value=SimpleNamespace(model_dir=str(root / "model"))), \
+            patch("core.config.app_config", return_value=cfg), \
+            patch.object(docx_exporter, "MODEL_DIR", str(root / "model")), \
+            patch.object(docx_exporter, "SECTION_CACHE_DIR", str(root / ".docx_cache")):
+        ok, path = docx_exporter.export_docx(json_path, out)
+    assert ok and path == out
+    return out
+
+
+def _headings(path):
+    return [p.text for p in docx.Document(path).paragraphs if p.style.name.startswith("Heading")]
+
+
+def test_streamed_export_reads_back_like_single_document(tmp_path):
+    json_path = _group(tmp_path)
+    streamed = _export(tmp_path, json_path)
+    os.rename(streamed, str(tmp_path / "streamed.docx"))
+    single = _export(tmp_path, json_path, streamSections=False)
+
+    assert _headings(str(tmp_path / "streamed.docx")) == _headings(single)
+    assert "2 Comp0" in _headings(single) and "4.1.2.4 unit1-fn1" in _headings(single)
+    d = docx.Document(str(tmp_path / "streamed.docx"))
+    assert len(d.inline_shapes) == len(docx.Document(single).inline_shapes)
+    assert SECTION_MARKER not in "\n".join(p.text for p in d.paragraphs)
+    assert not [n for n in os.listdir(tmp_path) if n.startswith(".sections_") or n.endswith(".part")]
+
+
+def test_parallel_sections_merge_in_order(tmp_path):
+    json_path = _group(tmp_path, components=5)
+    serial = _export(tmp_path, json_path, sectionWorkers=1)
+    os.rename(serial, str(tmp_path / "serial.docx"))
+    parallel = _export(tmp_path, json_path, sectionWorkers=3)
+
+    heads = _headings(parallel)
+    assert heads == _headings(str(tmp_path / "serial.docx"))
+    assert [h for h in heads if h[:2] in {f"{n} " for n in range(2, 7)}] == [
+        f"{n + 2} Comp{n}" for n in range(5)]
+    with zipfile.ZipFile(parallel) as z, zipfile.ZipFile(str(tmp_path / "serial.docx")) as ref:
+        assert z.read("word/document.xml") == ref.read("word/document.xml")
+        assert z.read("word/styles.xml") == ref.read("word/styles.xml")
+        assert z.read("word/numbering.xml") == ref.read("word/numbering.xml")
+
+
+def test_section_workers_config():
+    assert docx_exporter._section_workers({"docx": {"sectionWorkers": 8}}, 3) == 3
+    assert docx_exporter._section_workers({"docx": {"sectionWorkers": 0}}, 3) == 1
+    assert docx_exporter._section_workers({}, 100) == (os.cpu_count() or 1)
+
+
+def test_identical_images_share_one_part_and_ids_stay_unique(tmp_path):
+    json_path = _group(tmp_path, components=2, shared_png=True)
+    out = _export(tmp_path, json_path)
+    with zipfile.ZipFile(out) as z:
+        media = [n for n in z.namelist() if n.startswith("word/media/sdd")]
+        xml = z.read("word/document.xml").decode()
+        rels = z.read("word/_rels/document.xml.rels").decode()
+    # 8 flowcharts in 2 sections, all byte-identical: one media part, as in a single Document.
+    assert len(media) == 1
+    ids = [i.split('"')[0] for i in xml.split('<wp:docPr id="')[1:]]
+    assert len(ids) == len(set(ids)) == 2 + 8  # cover images + flowcharts
+    for rid in set(s.split('"')[0] for s in xml.split('r:embed="')[1:]):
+        assert f'Id="{rid}"' in rels
+
+
+def test_failing_section_does_not_lose_the_document(tmp_path):
+    json_path = _group(tmp_path)
+    real = docx_exporter._add_interface_table
+
+    def _boom(doc, interfaces, font_small):
+        if interfaces and interfaces[0]["functionId"].startswith("Comp1|"):
+            raise RuntimeError("bad table")
+        return real(doc, interfaces, font_small)
+
+    with patch.object(docx_exporter, "_add_interface_table", _boom):
+        out = _export(tmp_path, json_path)
+    heads = _headings(out)
+    assert "2.1 Static Design" in heads and "4.1 Static Design" in heads
+    assert "3 Comp1" in heads and "3.1 Static Design" not in heads
+    assert "[Section could not be generated: bad table]" in [p.text for p in docx.Document(out).paragraphs]
+
+
+def _rebuilt(root, json_path, **docx_cfg):
+    """Export with the section cache on; return the components whose section was built."""
+    built = []
+    real = docx_exporter._spool_component_section
+
+    def _spy(ctx, sec_num, component_name, spool_dir):
+        built.append(component_name)
+        return real(ctx, sec_num, component_name, spool_dir)
+
+    with patch.object(docx_exporter, "_spool_component_section", _spy):
+        _export(root, json_path, sectionCache=True, sectionWorkers=1, **docx_cfg)
+    return built
+
+
+def _document_xml(path):
+    with zipfile.ZipFile(path) as z:
+        return z.read("word/document.xml")
+
+
+def test_reexport_rebuilds_only_changed_sections(tmp_path):
+    json_path = _group(tmp_path)
+    assert _rebuilt(tmp_path, json_path) == ["Comp0", "Comp1", "Comp2"]
+    first = _document_xml(str(tmp_path / "sdd.docx"))
+    assert _rebuilt(tmp_path, json_path) == []
+    assert _document_xml(str(tmp_path / "sdd.docx")) == first
+
+    # A re-rendered flowchart with new content invalidates only its component.
+    _png(str(tmp_path / "output" / "G" / "flowcharts" / "Comp1_unit0_fn1.png"), 99)
+    assert _rebuilt(tmp_path, json_path) == ["Comp1"]
+    # ... as does an edited interface row.
+    tables = json.loads(open(json_path).read())
+    tables["Comp2|unit1"]["entries"][0]["description"] = "reworded"
+    with open(json_path, "w") as f:
+        json.dump(tables, f)
+    assert _rebuilt(tmp_path, json_path) == ["Comp2"]
+    cached = _document_xml(str(tmp_path / "sdd.docx"))
+    assert b"reworded" in cached
+    assert cached == _document_xml(_export(tmp_path, json_path))
+
+
+def test_config_change_and_failed_sections_miss(tmp_path):
+    json_path = _group(tmp_path, components=2)
+    real = docx_exporter._add_interface_table
+
+    def _boom(doc, interfaces, font_small):
+        if interfaces and interfaces[0]["functionId"].startswith("Comp1|"):
+            raise RuntimeError("bad table")
+        return real(doc, interfaces, font_small)
+
+    with patch.object(docx_exporter, "_add_interface_table", _boom):
+        assert _rebuilt(tmp_path, json_path) == ["Comp0", "Comp1"]
+    assert _rebuilt(tmp_path, json_path) == ["Comp1"]
+    assert _rebuilt(tmp_path, json_path, copyrightText="(c) 2026") == ["Comp0", "Comp1"]
+
+
+def test_embedded_pngs_downsampled_to_image_dpi(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from docx_images import size_report
+    json_path = _group(tmp_path, components=1, units=1, functions=2, side=1000)
+    full = size_report(_export(tmp_path, json_path, imageDpi=0))
+    out = _export(tmp_path, json_path)  # default: 200 DPI, flowcharts embedded 4" wide
+    small = size_report(out)
+    assert full["media"] == small["media"] == 2 + 2  # cover images + flowcharts
+    assert small["media_bytes"] < full["media_bytes"] / 1.4
+    with zipfile.ZipFile(out) as z:
+        flowcharts = [n for n in z.namelist() if n.startswith("word/media/sdd")]
+        assert len(flowcharts) == 2
+        for name in flowcharts:
+            with Image.open(z.open(name)) as img:
+                assert img.size == (800, 800)
+    assert len(docx.Document(out).inline_shapes) == 2 + 2
+
+
+# ---------------------------------------------------------------------------
+# Memory benchmark (opt-in: -m slow)
+# ---------------------------------------------------------------------------
+
+def _rss(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+@pytest.mark.slow
+def test_benchmark_peak_memory_5000_images(tmp_path, request):
+    if "slow" not in (request.config.getoption("-m") or ""):
+        pytest.skip("benchmark: opt in with -m slow")
+    if not os.path.exists("/proc/self/clear_refs"):
+        pytest.skip("benchmark reads the peak RSS from /proc (Linux)")
+
+    # 50 components x 10 units x 10 functions, one 128x128 noise PNG (~16 KB) each.
+    # Peak RSS rather than tracemalloc: python-docx's lxml trees live outside the
+    # Python allocator. Writing 5 to clear_refs resets the high-water mark.
+    json_path = _group(tmp_path, components=50, units=10, functions=10, side=128)
+    results = {}
+    for label, cfg in (("streamed", {}), ("single Document", {"streamSections": False})):
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        base = _rss("VmRSS")
+        t0 = time.perf_counter()
+        out = _export(tmp_path, json_path, **cfg)
+        results[label] = (_rss("VmHWM") - base, time.perf_counter() - t0, os.path.getsize(out))
+        os.remove(out)
+    for label, (peak, elapsed, size) in results.items():
+        print(f"\n5,000 images, {label}: peak RSS +{peak / 2**20:.0f} MiB, {elapsed:.0f}s, "
+              f"docx {size / 2**20:.0f} MiB")
+    assert results["streamed"][0] < results["single Document"][0] / 2
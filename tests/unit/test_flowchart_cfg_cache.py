@@ -0,0 +1,162 @@
+"""Unit tests for src/flowchart/cfg_cache.py — labeled-CFG reuse in the flowchart engine.
+
+A cached CFG may only be reused while the function's token hash, the hashes of its
+callees, globals, types and macros and the engine settings are all unchanged; a hit
+must skip parsing and the LLM and still produce the identical Mermaid script."""
+import json
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "flowchart"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from cfg_cache import CfgCache, cfg_from_dict, cfg_to_dict, prune, settings_digest  # noqa: E402
+from mermaid.builder import build_mermaid  # noqa: E402
+from models import (CfgEdge, CfgNode, ControlFlowGraph, FunctionEntry,  # noqa: E402
+                    NodeType)
+
+_KEY = "App|main|App::run|int"
+_CALLEE = "App|util|App::helper|"
+
+
+def _entry(calls=(_CALLEE,)):
+    return FunctionEntry(key=_KEY, qualified_name="App::run", file="src/main.cpp",
+                         line=10, end_line=20, calls_ids=list(calls))
+
+
+def _cfg():
+    cfg = ControlFlowGraph(function_key=_KEY, qualified_name="App::run",
+                           source_file="src/main.cpp", start_line=10, end_line=20,
+                           entry_node_id="START", exit_node_ids=["END"])
+    for nid, t, raw, label in (
+        ("START", NodeType.START, "", "Start: run"),
+        ("N1", NodeType.DECISION, "if (x > 0)", "Is x positive?"),
+        ("N2", NodeType.ACTION, "helper(x);", "Call helper | with x"),
+        ("END", NodeType.END, "", "End"),
+    ):
+        cfg.nodes[nid] = CfgNode(node_id=nid, node_type=t, raw_code=raw,
+                                 start_line=11, end_line=11, label=label,
+                                 enriched_context={"function_calls": ["helper"]})
+    cfg.edges = [CfgEdge("START", "N1"), CfgEdge("N1", "N2", "Yes"),
+                 CfgEdge("N1", "END", "No"), CfgEdge("N2", "END")]
+    return cfg
+
+
+def _settings(**over):
+    kw = dict(max_stmts=3, max_lines=10, llm_model="m", batch_size=4,
+              enrichment={"cfgSimplification": False}, no_llm=False)
+    kw.update(over)
+    return settings_digest(**kw)
+
+
+def _cache(tmp_path, fingerprints=None, settings=None):
+    fingerprints = {_KEY: "fp-run"} if fingerprints is None else fingerprints
+    return CfgCache(str(tmp_path / "cfg"), settings or _settings(), fingerprints)
+
+
+def test_roundtrip_preserves_mermaid():
+    cfg = _cfg()
+    assert build_mermaid(cfg_from_dict(cfg_to_dict(cfg))) == build_mermaid(cfg)
+
+
+def test_save_then_load_hits(tmp_path):
+    assert _cache(tmp_path).save(_entry(), _cfg()) is True
+    reader = _cache(tmp_path)
+    cached = reader.load(_entry())
+    assert cached is not None and build_mermaid(cached) == build_mermaid(_cfg())
+    assert (reader.hits, reader.misses) == (1, 0)
+
+
+def test_fingerprint_or_settings_change_misses(tmp_path):
+    _cache(tmp_path).save(_entry(), _cfg())
+    assert _cache(tmp_path, {_KEY: "fp-run2"}).load(_entry()) is None
+    assert _cache(tmp_path, settings=_settings(llm_model="other")).load(_entry()) is None
+    assert _cache(tmp_path, settings=_settings(no_llm=True)).load(_entry()) is None
+
+
+def test_dependency_edit_changes_the_key(tmp_path):
+    """The engine keys by the reuse fingerprint: editing a callee, a global it reads,
+    or a type / macro it uses (hashes.json + edges.json) must miss."""
+    pytest.importorskip("clang.cindex")
+    import flowchart_engine as fe
+    from config import EngineConfig
+
+    model = tmp_path / "model"
+    model.mkdir()
+    functions = {_KEY: {"callsIds": [_CALLEE], "readsGlobalIds": ["App|main|g"]}}
+    edges = {"typeUsers": {"App|T": [_KEY]}, "macroUsers": {"RETURN_IF@inc/m.h": [_KEY]}}
+    hashes = {_KEY: "h-run", _CALLEE: "h-helper", "App|main|g": "h-g", "App|T": "h-t",
+              "RETURN_IF@inc/m.h": "h-m"}
+    config = EngineConfig("f.json", str(model / "metadata.json"), str(tmp_path),
+                          cfg_cache_dir=str(tmp_path / "cfg"))
+
+    def key(**edit):
+        (model / "hashes.json").write_text(json.dumps({**hashes, **edit}))
+        (model / "edges.json").write_text(json.dumps(edges))
+        return fe._load_cfg_cache(config, {}, "m", functions).key_for(_entry())
+
+    base = key()
+    assert base is not None and base == key()
+    for dep in (_KEY, _CALLEE, "App|main|g", "App|T", "RETURN_IF@inc/m.h"):
+        assert key(**{dep: "edited"}) != base, dep
+
+
+def test_no_source_hash_is_never_cached(tmp_path):
+    c = _cache(tmp_path, fingerprints={})
+    assert c.key_for(_entry()) is None
+    assert c.save(_entry(), _cfg()) is False
+    assert c.load(_entry()) is None and c.misses == 1
+
+
+def test_unreadable_entry_misses(tmp_path):
+    c = _cache(tmp_path)
+    c.save(_entry(), _cfg())
+    path = tmp_path / "cfg" / f"{c.key_for(_entry())}.json"
+    path.write_text("{not json")
+    assert c.load(_entry()) is None and c.misses == 1
+
+
+def test_prune_evicts_least_recently_used_but_keeps_used(tmp_path):
+    d = tmp_path / "cfg"
+    d.mkdir()
+    for i, name in enumerate(("old", "mid", "new")):
+        p = d / f"{name}.json"
+        p.write_bytes(b"x" * 100)
+        os.utime(p, (1000 + i, 1000 + i))
+    assert prune(str(d), 150, keep=[str(d / "old.json")]) == 2
+    assert sorted(os.listdir(d)) == ["old.json"]
+    assert prune(str(d), 150) == 0
+
+
+def test_load_and_save_record_used_entries(tmp_path):
+    c = _cache(tmp_path)
+    c.save(_entry(), _cfg())
+    reader = _cache(tmp_path)
+    reader.load(_entry())
+    assert c.used == reader.used == {str(tmp_path / "cfg" / f"{c.key_for(_entry())}.json")}
+
+
+def test_engine_hit_skips_parse_and_llm(tmp_path):
+    """_process_function on a cache hit must not touch the TU parser or the LLM."""
+    pytest.importorskip("clang.cindex")
+    import flowchart_engine as fe
+    from config import EngineConfig
+
+    cache = _cache(tmp_path)
+    cache.save(_entry(), _cfg())
+
+    class _Boom:
+        def __getattr__(self, name):
+            raise AssertionError(f"unexpected call: {name}")
+
+    res = fe._process_function(
+        func_entry=_entry(), pkb=_Boom(), source_extractor=_Boom(), tu_parser=_Boom(),
+        label_generator=_Boom(), config=EngineConfig("f.json", "m.json", str(tmp_path)),
+        base_path=str(tmp_path), cfg_cache=cache)
+    assert res.error is None
+    assert res.mermaid_script == build_mermaid(_cfg())
@@ -0,0 +1,165 @@
+"""Unit tests for src/flowchart/daemon.py — the long-lived flowchart engine.
+
+A run served by the daemon must write exactly what a one-shot engine run writes,
+the session must carry across runs, and a TU kept warm from an earlier run must
+be re-parsed once its file or an included header changes on disk — or, in the
+next checkout, once they are no longer the same (hardlinked) files."""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "flowchart"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+ci = pytest.importorskip("clang.cindex")
+
+from flowchart.daemon import info_path, run_engine, serve, status, stop  # noqa: E402
+
+
+def _project(tmp_path):
+    base = tmp_path / "repo"
+    (base / "src").mkdir(parents=True)
+    (base / "src" / "a.h").write_text("#define LIMIT 3\n")
+    (base / "src" / "a.cpp").write_text(
+        '#include "a.h"\nint f(int x) {\n  if (x > LIMIT) {\n    return 1;\n  }\n  return 0;\n}\n')
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "metadata.json").write_text(json.dumps({"basePath": str(base), "projectName": "p"}))
+    (model / "functions.json").write_text(json.dumps({"A|a|f|int": {
+        "qualifiedName": "f", "location": {"file": "src/a.cpp", "line": 2, "endLine": 7},
+        "returnType": "int", "parameters": [{"name": "x", "type": "int"}],
+        "callsIds": [], "calledByIds": []}}))
+    return base, model
+
+
+def _argv(model, out_dir):
+    return ["--interface-json", str(model / "functions.json"),
+            "--metaData-json", str(model / "metadata.json"),
+            "--out-dir", str(out_dir), "--no-llm", "--no-cache", "-q"]
+
+
+def _outputs(out_dir):
+    return {name: json.loads((out_dir / name).read_text())
+            for name in sorted(os.listdir(out_dir)) if name != "_summary.json"}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    root = str(tmp_path / "root")
+    thread = threading.Thread(target=serve, args=(root,), kwargs={"idle_timeout_s": 0},
+                              daemon=True)
+    thread.start()
+    for _ in range(100):
+        if status(root) is not None:
+            break
+        time.sleep(0.05)
+    yield root
+    stop(root)
+    thread.join(timeout=10)
+
+
+def test_daemon_run_matches_one_shot_run(tmp_path, daemon):
+    import flowchart_engine as fe
+    _base, model = _project(tmp_path)
+    try:
+        fe.run(fe._parse_args(_argv(model, tmp_path / "cli")))
+    except Exception as exc:  # libclang shared library not loadable here
+        pytest.skip(f"libclang unavailable: {exc}")
+    assert run_engine(daemon, _argv(model, tmp_path / "d1"), cwd=str(tmp_path)) == 0
+    assert run_engine(daemon, _argv(model, tmp_path / "d2"), cwd=str(tmp_path)) == 0
+    assert _outputs(tmp_path / "d1") == _outputs(tmp_path / "cli") != {}
+    assert _outputs(tmp_path / "d2") == _outputs(tmp_path / "cli")
+    assert status(daemon)["runs"] == 2
+    # A failing run reports its exit code and leaves the daemon serving.
+    assert run_engine(daemon, ["--out-dir", str(tmp_path / "x")], cwd=str(tmp_path)) == 2
+    assert status(daemon)["runs"] == 2
+
+
+def test_stopped_daemon_is_not_used(tmp_path, daemon):
+    stop(daemon)
+    for _ in range(100):
+        if not os.path.exists(info_path(daemon)):
+            break
+        time.sleep(0.05)
+    assert status(daemon) is None
+    assert run_engine(daemon, [], cwd=str(tmp_path)) is None  # caller falls back
+
+
+def test_tu_parser_refresh_drops_changed_tus(tmp_path):
+    from ast_engine.parser import TranslationUnitParser
+    base, _model = _project(tmp_path)
+    try:
+        parser = TranslationUnitParser("c++14", [f"-I{base}"])
+    except Exception as exc:  # libclang shared library not loadable here
+        pytest.skip(f"libclang unavailable: {exc}")
+    tu_path = str(base / "src" / "a.cpp")
+    tu = parser.get_tu_full(tu_path)
+    assert parser.refresh() == 0
+    assert parser.get_tu_full(tu_path) is tu                 # kept warm
+    header = base / "src" / "a.h"
+    header.write_text("#define LIMIT 42\n")
+    os.utime(header, ns=(time.time_ns() + 10**9,) * 2)
+    assert parser.refresh() == 1
+    assert parser.get_tu_full(tu_path) is not tu             # re-parsed
+    assert parser.refresh(max_tus=0) == 1 and parser.cached_tus == 0
+
+
+def _next_checkout(tmp_path, base, changed=()):
+    """A second worktree of *base*: files hardlinked, except *changed* (rewritten)."""
+    nxt = tmp_path / "next"
+    (nxt / "src").mkdir(parents=True)
+    for name in ("a.h", "a.cpp"):
+        if name in changed:
+            (nxt / "src" / name).write_text((base / "src" / name).read_text() + "\n")
+        else:
+            os.link(base / "src" / name, nxt / "src" / name)
+    return nxt
+
+
+def test_tu_parser_reuses_tus_in_next_checkout(tmp_path):
+    from ast_engine.resolver import find_function_cursor
+    from config import EngineConfig
+    from flowchart.flowchart_engine import EngineSession
+    from models import FunctionEntry
+    base, _model = _project(tmp_path)
+    nxt = _next_checkout(tmp_path, base)
+    session = EngineSession()
+    config = EngineConfig("f.json", "m.json", "out", clang_args=[f"-I{base}/src"])
+    first = session.tu_parser(config, None, str(base))
+    tu = first.get_tu_full(str(base / "src" / "a.cpp"))
+    config_next = EngineConfig("f.json", "m.json", "out", clang_args=[f"-I{nxt}/src"])
+    parser = session.tu_parser(config_next, None, str(nxt))
+    assert parser is first and parser.cached_tus == 1
+    abs_path = str(nxt / "src" / "a.cpp")
+    assert parser.get_tu_full(abs_path) is tu                # unchanged: reused
+    entry = FunctionEntry(key="A|a|f|int", qualified_name="f", file="src/a.cpp",
+                          line=2, end_line=7)
+    assert find_function_cursor(tu, entry, abs_path) is not None
+
+
+def test_tu_parser_drops_tus_changed_in_next_checkout(tmp_path):
+    from ast_engine.parser import TranslationUnitParser
+    base, _model = _project(tmp_path)
+    nxt = _next_checkout(tmp_path, base, changed=("a.h",))
+    parser = TranslationUnitParser("c++14", [], base_path=str(base))
+    tu = parser.get_tu_full(str(base / "src" / "a.cpp"))
+    assert parser.refresh(base_path=str(nxt)) == 1           # included header differs
+    assert parser.get_tu_full(str(nxt / "src" / "a.cpp")) is not tu
+
+
+def test_tu_parser_bounds_tus_during_a_run(tmp_path):
+    from ast_engine.parser import TranslationUnitParser
+    base, _model = _project(tmp_path)
+    (base / "src" / "b.cpp").write_text("int g() { return 2; }\n")
+    parser = TranslationUnitParser("c++14", [], base_path=str(base), max_tus=1)
+    parser.get_tu_full(str(base / "src" / "a.cpp"))
+    tu_b = parser.get_tu_full(str(base / "src" / "b.cpp"))
+    assert parser.cached_tus == 1
+    assert parser.get_tu_full(str(base / "src" / "b.cpp")) is tu_b
@@ -9,7 +9,8 @@ pytestmark = pytest.mark.unit
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
-from incremental.affected import affected_tus, full_reparse_reason
+from incremental.affected import (affected_tus, build_include_index, full_reparse_reason,
+                                  index_closures, shadowed_tus, update_include_index)
 from incremental.fingerprint import parse_fingerprint
 
 # Closure map: Main.cpp includes Utils.h + Helper.h; Utils.cpp includes Utils.h; Lone.cpp none.
@@ -44,6 +45,93 @@ class TestAffectedTUs:
             "Layer1/App/Main.cpp", "Layer1/Math/Utils.cpp"}
 
 
+class TestIncludeIndex:
+    def test_index_lookup_matches_closure_scan(self):
+        index = build_include_index(TU_INCLUDES)
+        assert index_closures(index)["Layer1/Math/Utils.h"] == {"Layer1/App/Main.cpp", "Layer1/Math/Utils.cpp"}
+        for changed in (["Layer1/Math/Utils.h"], ["Layer1/App/Lone.cpp"], ["Layer1/New/New.cpp"],
+                        ["Layer1/Outer/Helper.h", "Layer1/Other/Thing.h"]):
+            assert affected_tus(changed, index=index) == affected_tus(changed, TU_INCLUDES)
+
+    def test_index_for_other_case_folding_is_rebuilt(self):
+        index = build_include_index(TU_INCLUDES)
+        index["caseFolded"] = not index["caseFolded"]
+        index["files"] = {}
+        assert affected_tus(["Layer1/Math/Utils.cpp"], TU_INCLUDES, index=index) == {
+            "Layer1/Math/Utils.cpp"}
+
+    def test_update_moves_a_tu_to_its_new_closure(self):
+        index = update_include_index(build_include_index(TU_INCLUDES),
+                                     {"Layer1/App/Main.cpp": TU_INCLUDES["Layer1/App/Main.cpp"]},
+                                     {"Layer1/App/Main.cpp": ["Layer1/App/Lone.h"],
+                                      "Layer1/New/New.cpp": ["Layer1/Math/Utils.h"]})
+        updated = dict(TU_INCLUDES, **{"Layer1/App/Main.cpp": ["Layer1/App/Lone.h"],
+                                       "Layer1/New/New.cpp": ["Layer1/Math/Utils.h"]})
+        assert index_closures(index) == index_closures(build_include_index(updated))
+        assert "Layer1/Outer/Helper.h" not in index["files"]
+
+
+@pytest.mark.slow
+def test_benchmark_index_vs_closure_scan(request):
+    """10k TUs x 500-header closures: closure scan vs inverted-index lookup for a small diff."""
+    if "slow" not in (request.config.getoption("-m") or ""):
+        pytest.skip("benchmark: opt in with -m slow")
+    import json
+    import random
+    import time
+    from incremental.affected import _norm
+
+    rng = random.Random(0)
+    headers = [f"Layer{i % 7}/Comp{i % 41}/inc/H{i}.h" for i in range(4000)]
+    tu_includes = {f"Layer{t % 7}/Comp{t % 41}/src/T{t}.cpp": rng.sample(headers, 500)
+                   for t in range(10_000)}
+    changed = rng.sample(headers, 3) + ["Layer1/Comp1/src/T1.cpp"]
+
+    def scan():  # the pre-index algorithm: normalize every closure on every call
+        c = {_norm(p) for p in changed}
+        return {tu for tu, inc in tu_includes.items() if ({_norm(tu)} | {_norm(p) for p in inc}) & c}
+
+    t0 = time.perf_counter()
+    expected = scan()
+    t_scan = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    index = build_include_index(tu_includes)
+    t_build = time.perf_counter() - t0
+    blob = json.dumps(index)
+    t0 = time.perf_counter()
+    loaded = json.loads(blob)
+    t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    got = affected_tus(changed, index=loaded)
+    t_lookup = time.perf_counter() - t0
+    print(f"\nclosure scan {t_scan:.2f}s | index build (parse time) {t_build:.2f}s, "
+          f"load {t_load:.2f}s, lookup {t_lookup * 1000:.2f}ms — {len(got)} affected TUs")
+    assert got == expected
+    assert t_lookup < t_scan / 100
+
+
+# Include resolution: Main.cpp's "Helper.h" was probed in Layer1/App before its hit; Lone.cpp
+# has an include that can't be bounded; an out-of-repo header probed Layer1/App/stdio.h.
+_RES_TUS = {"Layer1/App/Main.cpp": ["Layer1/App/Helper.h"], "Layer1/Math/Utils.cpp": [],
+            "Layer1/App/Lone.cpp": ["*"]}
+RESOLUTION = {"tus": _RES_TUS, "external": ["Layer1/App/stdio.h"],
+              "index": build_include_index(_RES_TUS)}
+
+
+class TestShadowedTUs:
+    def test_added_header_on_a_probed_path_shadows_its_tus(self):
+        assert shadowed_tus(["Layer1/App/Helper.h"], RESOLUTION) == {"Layer1/App/Main.cpp",
+                                                                     "Layer1/App/Lone.cpp"}
+
+    def test_unprobed_header_only_hits_unbounded_tus(self):
+        assert shadowed_tus(["Layer1/Math/New.h"], RESOLUTION) == {"Layer1/App/Lone.cpp"}
+
+    def test_nothing_added_or_no_resolution(self):
+        assert shadowed_tus([], RESOLUTION) == set()
+        assert shadowed_tus(["Layer1/App/Helper.h"], None) == set()
+        assert shadowed_tus(["Layer1/App/Helper.h"], {}) == set()
+
+
 class TestFullReparseReason:
     def test_no_closure_map_forces_full(self):
         assert full_reparse_reason([("M", "x.cpp")], {}) is not None
@@ -57,6 +145,14 @@ class TestFullReparseReason:
         r = full_reparse_reason([("D", "Layer1/Math/Old.h")], TU_INCLUDES)
         assert r and "deleted" in r
 
+    def test_header_add_delete_is_fine_with_a_resolution(self):
+        status = [("A", "Layer1/Math/New.h"), ("D", "Layer1/Math/Old.h")]
+        assert full_reparse_reason(status, TU_INCLUDES, RESOLUTION) is None
+
+    def test_header_shadowing_an_out_of_repo_include_forces_full(self):
+        r = full_reparse_reason([("A", "Layer1/App/stdio.h")], TU_INCLUDES, RESOLUTION)
+        assert r and "out-of-repo" in r
+
     def test_cpp_add_delete_is_fine(self):
         # adding/removing a .cpp is handled by the affected set, not a full re-parse
         assert full_reparse_reason([("A", "x.cpp"), ("D", "y.cpp"), ("M", "z.h")], TU_INCLUDES) is None
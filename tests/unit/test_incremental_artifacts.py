@@ -0,0 +1,109 @@
+"""Unit tests for src/incremental/artifacts.py — content-addressed version artifacts.
+
+Version trees are hardlinks to shared blobs, so a capture must never write through an
+existing version file, readers must resolve files through the manifest, and gc must
+only collect blobs no version references."""
+import os
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from incremental.artifacts import (ArtifactStore, capture_tree, cas_dir, read_manifest,  # noqa: E402
+                                   referenced_blobs, resolve, subdirs, write_manifest)
+
+
+def _capture(ws_root, src, vid):
+    store = ArtifactStore(cas_dir(str(ws_root)))
+    vdir = os.path.join(str(ws_root), vid)
+    os.makedirs(vdir, exist_ok=True)
+    files = read_manifest(vdir)
+    capture_tree(store, str(src), vdir, "output", files)
+    write_manifest(vdir, files)
+    return store, vdir
+
+
+def test_recapture_replaces_instead_of_writing_through(tmp_path):
+    src = tmp_path / "out" / "G"
+    src.mkdir(parents=True)
+    (src / "a.json").write_text("old")
+    _capture(tmp_path / "ws", tmp_path / "out", "v1")
+    _, v2 = _capture(tmp_path / "ws", tmp_path / "out", "v2")
+    (src / "a.json").write_text("new")  # the analyzer rewrites its output in place
+    _capture(tmp_path / "ws", tmp_path / "out", "v2")
+    assert open(os.path.join(tmp_path, "ws", "v1", "output", "G", "a.json")).read() == "old"
+    assert open(os.path.join(v2, "output", "G", "a.json")).read() == "new"
+
+
+def test_resolve_falls_back_to_the_blob(tmp_path):
+    src = tmp_path / "out" / "G"
+    src.mkdir(parents=True)
+    (src / "fc.png").write_bytes(b"PNG")
+    store, vdir = _capture(tmp_path / "ws", tmp_path / "out", "v1")
+    assert resolve(vdir, "output/G/fc.png") == os.path.join(vdir, "output", "G", "fc.png")
+    os.remove(os.path.join(vdir, "output", "G", "fc.png"))
+    os.rmdir(os.path.join(vdir, "output", "G"))
+    blob = resolve(vdir, "output/G/fc.png")
+    assert blob.startswith(store.root) and blob.endswith(".png")
+    assert open(blob, "rb").read() == b"PNG"
+    assert subdirs(vdir, "output") == ["G"]
+    assert resolve(vdir, "output/G/missing.png") is None
+
+
+def test_gc_keeps_referenced_and_recent_blobs(tmp_path):
+    src = tmp_path / "out"
+    src.mkdir()
+    (src / "a.txt").write_text("a")
+    store, v1 = _capture(tmp_path / "ws", src, "v1")
+    (src / "a.txt").write_text("b")
+    _capture(tmp_path / "ws", src, "v2")
+    os.remove(os.path.join(v1, "artifacts.json"))  # v1 deleted: its blob is unreferenced
+    refs = referenced_blobs(str(tmp_path / "ws"))
+    assert len(refs) == 1
+    assert store.gc(refs) == 0  # still within the grace window
+    assert store.gc(refs, grace_s=-1) == 1
+    assert resolve(os.path.join(tmp_path, "ws", "v2"), "output/a.txt")
+
+
+def _disk_usage(root):
+    """Bytes on disk, each inode counted once (hardlinks are shared)."""
+    seen, total = set(), 0
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            st = os.lstat(os.path.join(dirpath, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_blocks * 512
+    return total
+
+
+@pytest.mark.slow
+def test_benchmark_twenty_versions(tmp_path, request):
+    """Capture time and disk usage over 20 versions where 2% of the files change each time."""
+    if "slow" not in (request.config.getoption("-m") or ""):
+        pytest.skip("benchmark: opt in with -m slow")
+    import shutil
+    src = tmp_path / "out"
+    for i in range(500):
+        (src / f"G{i % 5}").mkdir(parents=True, exist_ok=True)
+        (src / f"G{i % 5}" / f"fc_{i}.png").write_bytes(os.urandom(40_000))
+    results = {}
+    for label in ("copytree", "cas"):
+        root = tmp_path / label
+        start = time.perf_counter()
+        for v in range(20):
+            for i in range(v * 10, v * 10 + 10):
+                (src / f"G{i % 5}" / f"fc_{i % 500}.png").write_bytes(os.urandom(40_000))
+            if label == "copytree":
+                shutil.copytree(src, root / f"v{v}" / "output", dirs_exist_ok=True)
+            else:
+                _capture(root, src, f"v{v}")
+        results[label] = (time.perf_counter() - start, _disk_usage(root))
+    for label, (secs, size) in results.items():
+        print(f"{label}: {secs:.2f}s, {size / 2 ** 20:.1f} MiB for 20 versions")
+    assert results["cas"][1] < results["copytree"][1] / 5
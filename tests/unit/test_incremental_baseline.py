@@ -13,7 +13,7 @@ pytestmark = pytest.mark.unit
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
-from incremental.baseline import select_baseline
+from incremental.baseline import chained_baseline, select_baseline
 
 
 def _g(repo, *args):
@@ -86,3 +86,11 @@ class TestOverride:
         r = select_baseline(repo["dir"], versions, repo["C3"], override_version_id="v3")
         assert r["chosenBaseVersionId"] == "v2"  # auto (v3 not complete)
         assert any("not complete" in w for w in r["warnings"])
+
+
+class TestChained:
+    def test_chained_step_is_incremental_on_the_given_version(self, repo):
+        r = chained_baseline(repo["dir"], "vB", repo["C2"], repo["C3"])
+        assert r["chosenBaseVersionId"] == "vB" and r["chosenBaseCommit"] == repo["C2"]
+        assert r["decision"] == "incremental" and r["changedFiles"] == 1
+        assert r.keys() == select_baseline(repo["dir"], repo["versions"], repo["C3"]).keys()
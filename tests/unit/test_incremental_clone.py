@@ -0,0 +1,149 @@
+"""Unit tests for src/incremental/clone.py — per-commit checkouts as worktrees of a bare mirror.
+
+Uses a local bare repo as the remote (file:// URL). A worktree checkout must hold exactly
+what a shallow clone of the same commit holds; files unchanged since an existing worktree
+are hardlinked from it, never shared once either side changes them."""
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+if shutil.which("git") is None:
+    pytest.skip("git not installed", allow_module_level=True)
+
+from incremental import git_ops  # noqa: E402
+from incremental.clone import add_worktree, ensure_commit_checkout, ensure_mirror  # noqa: E402
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True,
+                          text=True).stdout.strip()
+
+
+def _commit(work, files, message):
+    for rel, text in files.items():
+        path = work / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    _git(work, "add", "-A")
+    _git(work, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", message)
+    return _git(work, "rev-parse", "HEAD")
+
+
+def _remote(tmp_path, n_commits=3, n_files=6):
+    """Bare repo with `n_commits` commits; commit k edits one file of Comp1/."""
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init", "-q", "-b", "main")
+    files = {f"Comp{c}/u{i}.cpp": f"int f{c}_{i}() {{ return {i}; }}\n"
+             for c in (1, 2) for i in range(n_files)}
+    commits = [_commit(work, files, "c0")]
+    for k in range(1, n_commits):
+        commits.append(_commit(work, {f"Comp1/u{k % n_files}.cpp": f"int g() {{ return {k}; }}\n"},
+                               f"c{k}"))
+    bare = tmp_path / "remote.git"
+    _git(tmp_path, "clone", "-q", "--bare", str(work), str(bare))
+    return f"file://{bare}", commits
+
+
+def _tree(root):
+    out = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        for name in filenames:
+            if name == ".git":
+                continue
+            path = os.path.join(dirpath, name)
+            out[os.path.relpath(path, root)] = open(path, "rb").read()
+    return out
+
+
+def test_worktree_checkout_matches_shallow_clone(tmp_path):
+    url, commits = _remote(tmp_path)
+    ws = tmp_path / "ws"
+    ensure_commit_checkout(str(ws / "clone"), url, "main", commits[1])
+    ensure_commit_checkout(str(ws / "wt"), url, "main", commits[1], mirror_dir=str(ws / "mirror.git"))
+    assert _tree(ws / "wt") == _tree(ws / "clone")
+    assert git_ops.current_commit(str(ws / "wt")) == commits[1]
+    assert _git(ws / "wt", "status", "--porcelain") == ""
+    # Re-running on an existing worktree (its .git is a file) only checks out.
+    ensure_commit_checkout(str(ws / "wt"), "", "main", commits[2], mirror_dir=str(ws / "mirror.git"))
+    assert git_ops.current_commit(str(ws / "wt")) == commits[2]
+
+
+def test_unchanged_files_are_hardlinked(tmp_path):
+    url, commits = _remote(tmp_path)
+    mirror = str(tmp_path / "mirror.git")
+    ensure_mirror(mirror, url, commits[1])
+    assert add_worktree(mirror, str(tmp_path / "a"), commits[1]) == 0
+    linked = add_worktree(mirror, str(tmp_path / "b"), commits[2])
+    assert linked == 11  # 12 files, Comp1/u2.cpp differs
+    same = os.stat(tmp_path / "a" / "Comp2" / "u0.cpp"), os.stat(tmp_path / "b" / "Comp2" / "u0.cpp")
+    assert same[0].st_ino == same[1].st_ino
+    changed = tmp_path / "b" / "Comp1" / "u2.cpp"
+    assert changed.read_text() == "int g() { return 2; }\n"
+    assert os.stat(changed).st_nlink == 1
+    assert _git(tmp_path / "b", "status", "--porcelain") == ""
+    # A checkout in one worktree replaces the file and breaks the link.
+    _git(tmp_path / "a", "checkout", "-q", commits[0])
+    assert (tmp_path / "b" / "Comp1" / "u1.cpp").read_text() == "int g() { return 1; }\n"
+
+
+def test_sparse_checkout_only_writes_layer_paths(tmp_path):
+    url, commits = _remote(tmp_path)
+    mirror = str(tmp_path / "mirror.git")
+    ensure_mirror(mirror, url, commits[2])
+    add_worktree(mirror, str(tmp_path / "full"), commits[1])
+    add_worktree(mirror, str(tmp_path / "sparse"), commits[2], sparse_paths=["Comp2"])
+    assert sorted(_tree(tmp_path / "sparse")) == sorted(f"Comp2/u{i}.cpp" for i in range(6))
+    assert _git(tmp_path / "sparse", "status", "--porcelain") == ""
+
+
+def test_mirror_fetches_only_missing_commits(tmp_path):
+    url, commits = _remote(tmp_path)
+    mirror = str(tmp_path / "mirror.git")
+    ensure_mirror(mirror, url, commits[0])
+    assert git_ops.commit_exists(mirror, commits[2])
+    # An unknown commit triggers a fetch from the remote, which fails loudly.
+    with pytest.raises(git_ops.GitError):
+        ensure_mirror(mirror, url, "0" * 40)
+    shutil.rmtree(tmp_path / "remote.git")
+    ensure_mirror(mirror, url, commits[1])  # present: no network needed
+
+
+def _disk_usage(root):
+    """Bytes on disk, each inode counted once (hardlinks are shared)."""
+    seen, total = set(), 0
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            st = os.lstat(os.path.join(dirpath, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_blocks * 512
+    return total
+
+
+@pytest.mark.slow
+def test_benchmark_twenty_consecutive_commits(tmp_path, request):
+    """Time-to-checkout and disk usage: shallow clone per commit vs mirror + worktrees."""
+    if "slow" not in (request.config.getoption("-m") or ""):
+        pytest.skip("benchmark: opt in with -m slow")
+    url, commits = _remote(tmp_path, n_commits=20, n_files=400)
+    results = {}
+    for label, mirror in (("shallow clone", None), ("mirror+worktree", str(tmp_path / "m" / "mirror.git"))):
+        base = tmp_path / ("c" if mirror is None else "m")
+        start = time.perf_counter()
+        for commit in commits:
+            ensure_commit_checkout(str(base / commit[:16]), url, "main", commit, mirror_dir=mirror)
+        results[label] = (time.perf_counter() - start, _disk_usage(base))
+    for label, (secs, size) in results.items():
+        print(f"{label}: {secs:.2f}s, {size / 2 ** 20:.1f} MiB for {len(commits)} commits")
+    assert results["mirror+worktree"][1] < results["shallow clone"][1]
@@ -0,0 +1,143 @@
+"""Unit tests for the incremental Phase 2 derive (M5): incremental.derive_merge + the
+`reuse` paths of model_deriver.
+
+An incremental derive must write exactly what a full derive writes — same records, same
+key order — while copying untouched units / components / entries from the baseline."""
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+import utils  # noqa: E402
+import model_deriver  # noqa: E402
+from incremental.derive_merge import callers_closure, diff_derived, dirty_set  # noqa: E402
+
+CONFIG = {"layers": {"L": {"path": "L", "groups": {"G": {"A": "A", "B": "B", "C": "C"}}}}}
+
+
+def _fn(file, line, calls=(), called_by=(), reads=(), **extra):
+    qn = extra.pop("qn", None)
+    return {"qualifiedName": qn, "location": {"file": file, "line": line}, "returnType": "int",
+            "params": [{"name": "x", "type": "int"}], "callsIds": list(calls),
+            "calledByIds": list(called_by), "readsGlobalIds": list(reads), "writesGlobalIds": [],
+            "description": "", **extra}
+
+
+def _model():
+    functions = {
+        "A|a|f|int": _fn("L/A/a.cpp", 1, calls=["A|a|g|int"], called_by=["B|b|h|int"], qn="f"),
+        "A|a|g|int": _fn("L/A/a.cpp", 5, called_by=["A|a|f|int"], reads=["A|a|G1"], qn="g"),
+        "B|b|h|int": _fn("L/B/b.cpp", 1, calls=["A|a|f|int"], qn="h"),
+        "C|c|k|int": _fn("L/C/c.cpp", 1, qn="k"),
+    }
+    globals_ = {"A|a|G1": {"qualifiedName": "G1", "location": {"file": "L/A/a.cpp", "line": 9},
+                           "type": "int", "visibility": "public"}}
+    return {"functions": functions, "globalVariables": globals_}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for rel, text in (("L/A/a.cpp", '#include "a.h"\n'), ("L/A/a.h", ""),
+                      ("L/B/b.cpp", '#include "../A/a.h"\n'), ("L/C/c.cpp", "")):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    saved = utils._CONFIG_CACHE
+    utils.init_component_mapping(CONFIG)
+    yield str(tmp_path)
+    utils.init_component_mapping(saved)
+
+
+def _derive(base_path, model, reuse=None):
+    functions, globals_ = copy.deepcopy(model["functions"]), copy.deepcopy(model["globalVariables"])
+    out = model_deriver._derive(base_path, "P", functions, globals_, CONFIG, reuse)
+    for f in functions.values():
+        f.pop("params", None)
+    out["knowledge_base"] = model_deriver._build_knowledge_base(
+        base_path, "P", functions, globals_, {}, {}, reuse)
+    return out
+
+
+def _reuse(snapshot, baseline, model, changed_files):
+    reuse = dirty_set(snapshot["functions"], snapshot["globalVariables"],
+                      model["functions"], model["globalVariables"], changed_files)
+    reuse["baseline"] = baseline
+    return reuse
+
+
+def test_llm_fields_do_not_make_an_entity_dirty():
+    before = _model()
+    after = copy.deepcopy(before)
+    after["functions"]["C|c|k|int"]["description"] = "carried forward"
+    d = dirty_set(before["functions"], before["globalVariables"],
+                  after["functions"], after["globalVariables"], [])
+    assert d == {"functions": set(), "globals": set(), "files": set(), "closure": set()}
+
+
+def test_dirty_files_cover_neighbours_and_the_diff():
+    before = _model()
+    after = copy.deepcopy(before)
+    after["functions"]["A|a|g|int"]["readsGlobalIds"] = []
+    d = dirty_set(before["functions"], before["globalVariables"],
+                  after["functions"], after["globalVariables"], ["L/A/new.h"])
+    assert d["functions"] == {"A|a|g|int"}
+    assert d["files"] == {"L/A/a.cpp", "L/A/new.h"}
+    assert d["closure"] == {"A|a|g|int", "A|a|f|int", "B|b|h|int"}  # everything reaching g
+    assert callers_closure(after["functions"], ["C|c|k|int", "gone"]) == {"C|c|k|int"}
+
+
+def test_incremental_derive_matches_full_derive(repo):
+    snapshot = _model()
+    baseline = _derive(repo, snapshot)
+
+    model = copy.deepcopy(snapshot)
+    model["functions"]["B|b|h2|int"] = _fn("L/B/b.cpp", 4, calls=["A|a|g|int"], qn="h2")
+    model["functions"]["A|a|g|int"]["calledByIds"].append("B|b|h2|int")
+    model["globalVariables"]["A|a|G1"]["visibility"] = "private"
+    open(os.path.join(repo, "L", "A", "b2.h"), "w").close()  # a header added to A's directory
+
+    full = _derive(repo, model)
+    incremental = _derive(repo, model, _reuse(snapshot, baseline, model, ["L/A/b2.h"]))
+    assert diff_derived(incremental, full) == []
+    assert all(json.dumps(incremental[k]) == json.dumps(full[k]) for k in full)
+    assert full["components"]["A"]["headerFiles"] == ["L/A/a.h", "L/A/b2.h"]
+    # Untouched records are the baseline's own objects, not re-derived copies.
+    assert incremental["units"]["C|c"] is baseline["units"]["C|c"]
+    assert incremental["components"]["C"] is baseline["components"]["C"]
+    assert incremental["knowledge_base"]["functions"]["k"] is baseline["knowledge_base"]["functions"]["k"]
+
+
+def test_removed_function_and_moved_global(repo):
+    snapshot = _model()
+    baseline = _derive(repo, snapshot)
+
+    model = copy.deepcopy(snapshot)
+    del model["functions"]["B|b|h|int"]
+    model["functions"]["A|a|f|int"]["calledByIds"] = []
+    model["globalVariables"]["A|a|G1"]["location"]["line"] = 2
+
+    full = _derive(repo, model)
+    incremental = _derive(repo, model, _reuse(snapshot, baseline, model, ["L/B/b.cpp", "L/A/a.cpp"]))
+    assert diff_derived(incremental, full) == []
+    assert full["functions"]["A|a|f|int"]["visibility"] == "private"  # no outside caller left
+    assert all(json.dumps(incremental[k]) == json.dumps(full[k]) for k in full)
+
+
+def test_diff_derived_reports_mismatches():
+    a = {"units": {"A|a": {"functionIds": ["f"]}, "B|b": {}}}
+    b = {"units": {"B|b": {}, "A|a": {"functionIds": ["f", "g"]}, "C|c": {}}}
+    d = diff_derived(a, b)
+    assert "units: MISSING C|c" in d
+    assert any(line.startswith("units[A|a].functionIds") for line in d)
+    assert diff_derived({"units": {"a": 1, "b": 2}}, {"units": {"b": 2, "a": 1}}) == [
+        "units: same entries, different order"]
+    assert diff_derived({"knowledge_base": {"project_name": "P"}},
+                        {"knowledge_base": {"project_name": "Q"}}) == [
+        "knowledge_base.project_name: 'P' != 'Q'"]
@@ -1,6 +1,10 @@
 """Unit tests for the pure helpers in src/incremental/engine.py (M2.3)."""
+import json
 import os
+import subprocess
 import sys
+from types import SimpleNamespace
+
 import pytest
 
 pytestmark = pytest.mark.unit
@@ -8,6 +12,7 @@ pytestmark = pytest.mark.unit
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
+from incremental import engine
 from incremental.engine import plan_incremental, carry_forward_descriptions, carry_forward_globals
 
 
@@ -91,3 +96,123 @@ class TestCarryForwardGlobals:
     def test_missing_entries_skipped(self):
         assert carry_forward_globals({"x"}, {}, {"x": {"description": "d"}}) == 0
         assert carry_forward_globals({"x"}, {"x": {"description": ""}}, {}) == 0
+
+
+class TestGenerateBatch:
+    def test_walks_the_range_chaining_each_step_on_its_parent(self, tmp_path, monkeypatch):
+        src = str(tmp_path / "src")
+        subprocess.run(["git", "init", "-q", src], check=True)
+        commits = []
+        for i in range(4):
+            with open(os.path.join(src, "f.txt"), "w") as fh:
+                fh.write(str(i))
+            for args in (["add", "."], ["-c", "user.email=t@t", "-c", "user.name=t",
+                                        "-c", "commit.gpgsign=false", "commit", "-q", "-m", f"c{i}"]):
+                subprocess.run(["git", "-C", src, *args], check=True, capture_output=True)
+            commits.append(subprocess.run(["git", "-C", src, "rev-parse", "HEAD"], capture_output=True,
+                                          text=True).stdout.strip())
+        c0, c1, c2, c3 = commits
+
+        def checkout(dest, *_a, **_k):
+            if not os.path.isdir(os.path.join(dest, ".git")):
+                subprocess.run(["git", "clone", "-q", src, dest], check=True)
+
+        os.makedirs(tmp_path / "ws" / "p")
+        calls = []
+
+        def fake_generate(project_id, branch, commit, scope=None, *, chain, export_docx, **_k):
+            calls.append((commit, dict(chain), export_docx))
+            if chain.get("versionId"):                 # incremental: hands its result on
+                chain.clear()
+                chain.update(versionId=commit[:16], commit=commit, hashes={})
+            return {"versionId": commit[:16], "commit": commit}
+
+        monkeypatch.setattr(engine, "ensure_commit_checkout", checkout)
+        monkeypatch.setattr(engine, "list_versions",
+                            lambda pid: [{"versionId": "v0", "commit": c0, "status": "complete"}])
+        monkeypatch.setattr(engine, "generate_incremental", fake_generate)
+        ms = engine.generate_batch("p", "main", c3, workspaces_root=str(tmp_path / "ws"))
+
+        assert [m["commit"] for m in ms] == [c1, c2, c3]
+        assert [(c, ch.get("versionId"), d) for c, ch, d in calls] == [
+            (c1, "v0", False), (c2, c1[:16], False), (c3, c2[:16], True)]
+        assert "hashes" in calls[1][1]                 # the in-memory chain, not a reselect
+
+    def test_chained_step_narrows_on_the_in_memory_model(self, tmp_path, monkeypatch):
+        # One real generate_incremental step handed a chain: the narrowed parse merges
+        # into chain["parse"], chain["hashes"] replaces the stored baseline hashes, the
+        # chain's reuse index is used, and the step stops at Phase 3 without DOCX.
+        src = str(tmp_path / "src")
+        subprocess.run(["git", "init", "-q", src], check=True)
+        commits = []
+        for body in ("int fa() { return 1; }\n", "int fa() { return 2; }\n"):
+            with open(os.path.join(src, "a.cpp"), "w") as fh:
+                fh.write(body)
+            with open(os.path.join(src, "b.cpp"), "w") as fh:
+                fh.write("int fb() { return 0; }\n")
+            for args in (["add", "."], ["-c", "user.email=t@t", "-c", "user.name=t",
+                                        "-c", "commit.gpgsign=false", "commit", "-q", "-m", body]):
+                subprocess.run(["git", "-C", src, *args], check=True, capture_output=True)
+            commits.append(subprocess.run(["git", "-C", src, "rev-parse", "HEAD"], capture_output=True,
+                                          text=True).stdout.strip())
+        c0, c1 = commits
+        fa, fb = "A|a|fa|int", "B|b|fb|int"
+
+        def fn(file, calls=()):
+            return {"location": {"file": file}, "callsIds": list(calls), "calledByIds": []}
+
+        base_model = {
+            "functions": {fa: fn("a.cpp"), fb: fn("b.cpp", [fa])},
+            "hashes": {fa: "1", fb: "1"},
+            "entity_files": {fa: "a.cpp", fb: "b.cpp"},
+            "tu_includes": {"a.cpp": [], "b.cpp": []}, "tu_include_index": {},
+            "func_keys": {"_Z2fav": fa, "_Z2fbv": fb}, "edges": {}, "metadata": {},
+        }
+        partial = {"functions": {fa: fn("a.cpp")}, "hashes": {fa: "2"},
+                   "entity_files": {fa: "a.cpp"}, "tu_includes": {"a.cpp": []},
+                   "func_keys": {"_Z2fav": fa}, "metadata": {}}
+        parsed, runs = [], []
+
+        def parse_in_process(_cfg, _scope, _dd, _repo, model_dir, tu_paths, func_keys, **_k):
+            os.makedirs(model_dir, exist_ok=True)          # as the real in-process parse does
+            parsed.append((set(tu_paths), func_keys))
+            return partial
+
+        def run_analyzer(*_a, extra_args=None, **_k):
+            runs.append(list(extra_args or []))
+            return 0
+
+        def checkout(dest, *_a, **_k):
+            if not os.path.isdir(os.path.join(dest, ".git")):
+                subprocess.run(["git", "clone", "-q", src, dest], check=True)
+
+        def stored_hashes(*_a):
+            raise AssertionError("chained step read the baseline hashes from disk")
+
+        ws_root, project_root = tmp_path / "ws", tmp_path / "root"
+        os.makedirs(ws_root / "p")
+        os.makedirs(project_root)
+        (ws_root / "p" / "config.json").write_text(json.dumps({"llm": {}}))
+        monkeypatch.setattr(engine, "_paths", lambda: SimpleNamespace(project_root=str(project_root)))
+        monkeypatch.setattr(engine, "ensure_commit_checkout", checkout)
+        monkeypatch.setattr(engine, "get_project", lambda pid: {"name": "p"})
+        monkeypatch.setattr(engine, "_parse_in_process", parse_in_process)
+        monkeypatch.setattr(engine, "_run_analyzer", run_analyzer)
+        monkeypatch.setattr(engine, "emit_report", lambda *_a, **_k: None)
+        monkeypatch.setattr(engine.HashStore, "read", stored_hashes)
+
+        ridx = engine.ReuseIndex(engine.Workspace("p", str(ws_root)))
+        chain = {"versionId": "v0", "commit": c0, "hashes": dict(base_model["hashes"]),
+                 "parse": base_model, "reuseIndex": ridx}
+        manifest = engine.generate_incremental("p", "main", c1, workspaces_root=str(ws_root),
+                                               narrowed_parse=True, export_docx=False, chain=chain)
+
+        assert parsed == [({"a.cpp"}, base_model["func_keys"])]   # only the changed TU
+        assert runs == [["--from-phase", "2", "--to-phase", "3"]]  # no full parse, no DOCX
+        assert manifest["docxSkipped"] and manifest["baselineVersionId"] == "v0"
+        assert manifest["regenerated"] == 2                         # fa + its caller fb
+        assert chain["versionId"] == c1[:16] and chain["commit"] == c1
+        assert chain["hashes"] == {fa: "2", fb: "1"}
+        assert chain["parse"]["hashes"] == {fa: "2", fb: "1"}       # the merged model
+        assert chain["parse"]["functions"][fa]["calledByIds"] == [fb]
+        assert chain["reuseIndex"] is ridx
@@ -80,3 +80,8 @@ class TestDiffAndResolve:
     def test_merge_base(self, repo):
         # fork point of feat (F1) and the main line (C3) is C1
         assert git_ops.merge_base(repo["dir"], repo["F1"], repo["C3"]) == repo["C1"]
+
+    def test_commits_between_oldest_first_with_parents(self, repo):
+        steps = git_ops.commits_between(repo["dir"], repo["C1"], repo["C3"])
+        assert steps == [(repo["C2"], [repo["C1"]]), (repo["C3"], [repo["C2"]])]
+        assert git_ops.commits_between(repo["dir"], repo["C3"], repo["C3"]) == []
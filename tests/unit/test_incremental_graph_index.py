@@ -0,0 +1,147 @@
+"""Unit tests for src/incremental/graph_index.py — the integer-indexed model graph.
+
+Impact and fingerprints computed over a GraphIndex (built, or loaded from
+model/graph_index.json) must equal the ones computed over the model dicts, and a
+graph_index.json that no longer matches the model must not be used."""
+import json
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from incremental.fingerprint import compute_fingerprints  # noqa: E402
+from incremental.graph_index import GraphIndex, build_graph_index, load_graph_index  # noqa: E402
+from incremental.impact import impact_set  # noqa: E402
+
+# a -> b -> c (b twice), c reads G, d uses type T; x is called but not a model function.
+FUNCTIONS = {
+    "K|U|a|": {"callsIds": ["K|U|b|", "K|U|b|", "ext|x|y|"], "calledByIds": []},
+    "K|U|b|": {"callsIds": ["K|U|c|"], "calledByIds": ["K|U|a|", "gone|a|b|"]},
+    "K|U|c|": {"callsIds": [], "calledByIds": ["K|U|b|"], "readsGlobalIds": ["K|U|G"]},
+    "K|U|d|": {"callsIds": [], "calledByIds": []},
+}
+EDGES = {"typeUsers": {"T": ["K|U|d|", "not|a|fn|"]}, "macroUsers": {}}
+HASHES = {"K|U|a|": "1", "K|U|b|": "2", "K|U|c|": "3", "K|U|d|": "4", "K|U|G": "5", "T": "6",
+          "ext|x|y|": "7"}
+
+
+def _row(csr, i):
+    return list(csr.row(i))
+
+
+def test_rows_are_deduplicated_and_callers_are_functions():
+    g = GraphIndex.build(FUNCTIONS, EDGES)
+    ids = g.ids
+    assert g.keys[:4] == list(FUNCTIONS) and g.n_functions == 4
+    assert _row(g.calls, ids["K|U|a|"]) == [ids["K|U|b|"], ids["ext|x|y|"]]
+    assert _row(g.called_by, ids["K|U|b|"]) == [ids["K|U|a|"]]          # gone|a|b| dropped
+    assert _row(g.uses, ids["K|U|d|"]) == [ids["T"]]
+    assert _row(g.users, ids["K|U|G"]) == [ids["K|U|c|"]]
+
+
+def test_impact_and_fingerprints_match_with_a_loaded_graph(tmp_path):
+    with open(tmp_path / "graph_index.json", "w") as fh:
+        json.dump(build_graph_index(FUNCTIONS, EDGES), fh)
+    g = load_graph_index(str(tmp_path), FUNCTIONS, EDGES)
+    assert g.matches(FUNCTIONS, EDGES)
+    for changed in (["K|U|G"], ["T"], ["K|U|b|"], ["nope"]):
+        assert impact_set(changed, FUNCTIONS, EDGES, graph=g) == impact_set(changed, FUNCTIONS, EDGES)
+    assert impact_set(["K|U|G"], FUNCTIONS, EDGES, graph=g) == {"K|U|a|", "K|U|b|", "K|U|c|"}
+    assert compute_fingerprints(HASHES, FUNCTIONS, EDGES, g) == compute_fingerprints(HASHES, FUNCTIONS, EDGES)
+
+
+def test_stale_graph_file_is_rebuilt(tmp_path):
+    with open(tmp_path / "graph_index.json", "w") as fh:
+        json.dump(build_graph_index(FUNCTIONS, EDGES), fh)
+    changed = {k: dict(v) for k, v in FUNCTIONS.items()}
+    changed["K|U|d|"]["callsIds"] = ["K|U|a|"]
+    changed["K|U|a|"]["calledByIds"] = ["K|U|d|"]
+    g = load_graph_index(str(tmp_path), changed, EDGES)
+    assert _row(g.calls, g.ids["K|U|d|"]) == [g.ids["K|U|a|"]]
+    assert impact_set(["K|U|c|"], changed, EDGES, graph=g) == {"K|U|a|", "K|U|b|", "K|U|c|", "K|U|d|"}
+    assert not GraphIndex.build(FUNCTIONS, EDGES).matches(changed, EDGES)
+    assert load_graph_index(str(tmp_path / "missing"), FUNCTIONS, EDGES).n_functions == 4
+
+
+def test_repointed_edges_with_same_counts_are_rebuilt(tmp_path):
+    with open(tmp_path / "graph_index.json", "w") as fh:
+        json.dump(build_graph_index(FUNCTIONS, EDGES), fh)
+    built = GraphIndex.build(FUNCTIONS, EDGES)
+    moved = {k: dict(v) for k, v in FUNCTIONS.items()}
+    moved["K|U|b|"]["callsIds"] = ["K|U|d|"]                        # same count, other callee
+    moved["K|U|d|"]["calledByIds"], moved["K|U|c|"]["calledByIds"] = ["K|U|b|"], []
+    assert not built.matches(moved, EDGES)
+    g = load_graph_index(str(tmp_path), moved, EDGES)
+    assert impact_set(["K|U|d|"], moved, EDGES, graph=g) == {"K|U|a|", "K|U|b|", "K|U|d|"}
+    retyped = {"typeUsers": {"T": ["K|U|c|", "not|a|fn|"]}, "macroUsers": {}}
+    assert not built.matches(FUNCTIONS, retyped)
+    g = load_graph_index(str(tmp_path), FUNCTIONS, retyped)
+    assert _row(g.uses, g.ids["K|U|c|"]) == [g.ids["K|U|G"], g.ids["T"]]
+
+
+@pytest.mark.slow
+def test_benchmark_graph_walk_vs_dict_walk(request):
+    """500k functions: impact over the model dicts vs over a loaded graph_index.json."""
+    if "slow" not in (request.config.getoption("-m") or ""):
+        pytest.skip("benchmark: opt in with -m slow")
+    import random
+    import tempfile
+    import time
+    from collections import deque
+
+    rng = random.Random(0)
+    n = 500_000
+    fids = [f"C{i % 300}|u{i % 5000}|fn{i}|int" for i in range(n)]
+    globals_ = [f"C{i % 300}|u{i % 5000}|g{i}" for i in range(n // 10)]
+    functions = {f: {"callsIds": [fids[max(0, i - rng.randint(1, 50))] for _ in range(rng.randint(0, 4))],
+                     "readsGlobalIds": rng.sample(globals_, rng.randint(0, 2)),
+                     "writesGlobalIds": [], "calledByIds": []} for i, f in enumerate(fids)}
+    for f in fids:
+        for c in dict.fromkeys(functions[f]["callsIds"]):
+            functions[c]["calledByIds"].append(f)
+    edges = {"typeUsers": {f"T{i}": rng.sample(fids, 4) for i in range(n // 20)}, "macroUsers": {}}
+    changed = rng.sample(fids[-1000:], 5) + rng.sample(globals_, 2) + ["T1"]
+
+    def dict_walk():  # the pre-index algorithm: invert the model, BFS over string fids
+        users = {}
+        for fid, f in functions.items():
+            for g in f["readsGlobalIds"] + f["writesGlobalIds"]:
+                users.setdefault(g, set()).add(fid)
+        for key, fs in edges["typeUsers"].items():
+            users.setdefault(key, set()).update(fs)
+        out, queue = set(), deque()
+        for key in changed:
+            for fid in ([key] if key in functions else users.get(key, ())):
+                if fid in functions and fid not in out:
+                    out.add(fid)
+                    queue.append(fid)
+        while queue:
+            for c in functions[queue.popleft()]["calledByIds"]:
+                if c not in out:
+                    out.add(c)
+                    queue.append(c)
+        return out
+
+    t0 = time.perf_counter()
+    expected = dict_walk()
+    t_dict = time.perf_counter() - t0
+    d = tempfile.mkdtemp()
+    t0 = time.perf_counter()
+    with open(os.path.join(d, "graph_index.json"), "w") as fh:
+        json.dump(build_graph_index(functions, edges), fh)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    graph = load_graph_index(d, functions, edges)
+    t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    got = impact_set(changed, functions, edges, graph=graph)
+    t_walk = time.perf_counter() - t0
+    print(f"\ndict walk {t_dict:.2f}s | graph build+write (parse time) {t_build:.2f}s, "
+          f"load {t_load:.2f}s, walk {t_walk:.2f}s — {len(got)} impacted")
+    assert got == expected
+    assert t_walk < t_dict
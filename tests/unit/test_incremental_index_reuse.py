@@ -13,6 +13,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from incremental.engine import carry_forward_from_index
+from incremental.stores import ReuseIndex, Workspace
 
 _FIELDS = ("description", "behaviourInputName", "behaviourOutputName")
 
@@ -82,3 +83,14 @@ class TestCarryForwardFromIndex:
         reused = carry_forward_from_index(["C|U|g"], {"C|U|g": "fp_g"}, target, index, "v5",
                                           _src_loader(src), ("description",))
         assert reused == {"C|U|g": "v2"} and target["C|U|g"]["description"] == "global-desc"
+
+    def test_reuse_index_is_looked_up_in_one_batch(self, tmp_path):
+        (tmp_path / "proj").mkdir()
+        ridx = ReuseIndex(Workspace("proj", str(tmp_path)))
+        ridx.put_many([("fp_a", "v1", "C|U|a|"), ("fp_b", "v3", "C|U|b|")])
+        ridx.get = None                                        # per-key lookups are not used
+        target = {"C|U|a|": {}, "C|U|b|": {}}
+        src = {"v1": {"C|U|a|": {"description": "from-v1"}}}
+        reused = carry_forward_from_index(["C|U|a|", "C|U|b|"], {"C|U|a|": "fp_a", "C|U|b|": "fp_b"},
+                                          target, ridx, "v3", _src_loader(src), _FIELDS)
+        assert reused == {"C|U|a|": "v1"} and target["C|U|a|"]["description"] == "from-v1"
@@ -12,7 +12,8 @@ pytestmark = pytest.mark.unit
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
-from incremental.parse_includes import to_repo_relative, build_closure
+from incremental.parse_includes import (WILDCARD, build_closure, build_resolution, directive_spelling,
+                                        include_search_dirs, to_repo_relative)
 
 BASE = os.path.abspath(os.path.join("repo", "root"))
 
@@ -65,3 +66,64 @@ class TestBuildClosure:
 
     def test_empty_includes(self):
         assert build_closure(_abs("a", "Foo.cpp"), [], BASE) == []
+
+
+class TestDirectiveSpelling:
+    def test_quoted_angled_and_include_next(self):
+        assert directive_spelling('#include "a/b.h"  // x') == ("a/b.h", False, False)
+        assert directive_spelling("  #  include <vector>") == ("vector", True, False)
+        assert directive_spelling("#include_next <stdio.h>") == ("stdio.h", True, True)
+
+    def test_macro_spelled_or_not_a_directive(self):
+        assert directive_spelling("#include HEADER") is None
+        assert directive_spelling("int x;") is None
+
+
+class TestIncludeSearchDirs:
+    def test_order_and_both_spellings(self):
+        quote, angled = include_search_dirs(["-std=c++14", "-I" + _abs("inc"), "-iquote", _abs("q"),
+                                             "-isystem", _abs("sys"), "-DX", "-I", _abs("inc2")])
+        assert angled == [_abs("inc"), _abs("inc2"), _abs("sys")]
+        assert quote == [_abs("q")] + angled
+
+
+class TestBuildResolution:
+    QUOTE, ANGLED = [_abs("inc"), _abs("L")], [_abs("inc"), _abs("L")]
+    SYS = os.path.abspath(os.path.join("usr", "include"))
+
+    def _resolve(self, inclusions):
+        return build_resolution(_abs("L", "A", "a.cpp"), inclusions, BASE, self.QUOTE, self.ANGLED)
+
+    def test_quoted_hit_in_the_includer_dir_probes_nothing(self):
+        searched, external = self._resolve([(_abs("L", "A", "a.cpp"), ("a.h", False, False),
+                                             _abs("L", "A", "a.h"), 1)])
+        assert searched == [] and external == set()
+
+    def test_angled_hit_lists_the_earlier_dirs(self):
+        searched, _ = self._resolve([(_abs("L", "A", "a.cpp"), ("B/b.h", True, False),
+                                      _abs("L", "B", "b.h"), 1)])
+        assert searched == ["inc/B/b.h"]
+
+    def test_nested_quoted_include_probes_the_include_stack(self):
+        searched, _ = self._resolve([
+            (_abs("L", "A", "a.cpp"), ("../B/b.h", False, False), _abs("L", "B", "b.h"), 1),
+            (_abs("L", "B", "b.h"), ("c.h", False, False), _abs("L", "c.h"), 2)])
+        assert searched == ["L/A/c.h", "L/B/c.h", "inc/c.h"]
+
+    def test_missing_include_probes_every_dir(self):
+        searched, _ = self._resolve([(_abs("L", "A", "a.cpp"), ("gone.h", False, False), None, 0)])
+        assert searched == ["L/A/gone.h", "L/gone.h", "inc/gone.h"]
+
+    def test_system_hit_and_out_of_repo_includers(self):
+        searched, external = self._resolve([
+            (_abs("L", "A", "a.cpp"), ("stdio.h", True, False), os.path.join(self.SYS, "stdio.h"), 1),
+            (os.path.join(self.SYS, "stdio.h"), ("bits/t.h", True, False),
+             os.path.join(self.SYS, "bits", "t.h"), 2)])
+        assert searched == ["L/stdio.h", "inc/stdio.h"]
+        assert external == {"L/bits/t.h", "inc/bits/t.h"}
+
+    def test_macro_spelled_include(self):
+        searched, _ = self._resolve([(_abs("L", "A", "a.cpp"), None, _abs("L", "m.h"), 1)])
+        assert searched == ["L/A/m.h", "inc/m.h"]            # inferred as "m.h" from its hit
+        searched, _ = self._resolve([(_abs("L", "A", "a.cpp"), None, os.path.join(self.SYS, "m.h"), 1)])
+        assert searched == [WILDCARD]
@@ -10,6 +10,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from incremental.parse_merge import merge_model, diff_models
+from incremental.affected import build_include_index, index_closures
 
 
 def _fn(file, callsIds=None, h="h"):
@@ -103,6 +104,44 @@ class TestMergeModel:
         m = merge_model(baseline, fresh, drop_files={"A.cpp"})
         assert m["tu_includes"] == {"A.cpp": ["X.h", "Z.h"], "B.cpp": ["Y.h"]}
 
+    def test_include_index_patched_for_reparsed_tus(self):
+        # The baseline's inverted index is patched for the dropped TUs only; the result
+        # equals an index built from scratch over the merged closures.
+        base_inc = {"A.cpp": ["X.h"], "B.cpp": ["X.h", "Y.h"]}
+        baseline = _model({}, tu_includes=base_inc)
+        baseline["tu_include_index"] = build_include_index(base_inc)
+        fresh = _model({}, tu_includes={"A.cpp": ["Z.h"]})
+        m = merge_model(baseline, fresh, drop_files={"A.cpp"})
+        assert index_closures(m["tu_include_index"]) == index_closures(build_include_index(m["tu_includes"]))
+        assert index_closures(m["tu_include_index"])["X.h"] == {"B.cpp"}
+        assert index_closures(baseline["tu_include_index"])["X.h"] == {"A.cpp", "B.cpp"}  # not mutated
+
+    def test_include_resolution_merged_by_tu(self):
+        base_res = {"tus": {"A.cpp": ["L/x.h"], "B.cpp": ["L/y.h"]}, "external": ["L/s.h"]}
+        base_res["index"] = build_include_index(base_res["tus"])
+        baseline = _model({})
+        baseline["include_resolution"] = base_res
+        fresh = _model({})
+        fresh["include_resolution"] = {"tus": {"A.cpp": []}, "external": ["L/t.h"],
+                                       "index": build_include_index({"A.cpp": []})}
+        m = merge_model(baseline, fresh, drop_files={"A.cpp"})
+        res = m["include_resolution"]
+        assert res["tus"] == {"A.cpp": [], "B.cpp": ["L/y.h"]}
+        assert res["external"] == ["L/s.h", "L/t.h"]
+        assert index_closures(res["index"]) == index_closures(build_include_index(res["tus"]))
+        assert "include_resolution" not in merge_model(_model({}), fresh, drop_files={"A.cpp"})
+
+    def test_func_keys_cover_the_merged_model(self):
+        # The partial parse only knows the re-parsed TUs' keys; the merged map keeps the
+        # baseline's for every surviving function so the next narrowed parse can use it.
+        baseline = _model({"A|U|f|": _fn("A.cpp"), "B|U|g|": _fn("B.cpp"), "A|U|old|": _fn("A.cpp")},
+                          entity_files={"A|U|f|": "A.cpp", "B|U|g|": "B.cpp", "A|U|old|": "A.cpp"})
+        baseline["func_keys"] = {"c:@F@f#": "A|U|f|", "c:@F@g#": "B|U|g|", "c:@F@old#": "A|U|old|"}
+        fresh = _model({"A|U|f|": _fn("A.cpp")}, entity_files={"A|U|f|": "A.cpp"})
+        fresh["func_keys"] = {"c:@F@f#": "A|U|f|"}
+        m = merge_model(baseline, fresh, drop_files={"A.cpp"})
+        assert m["func_keys"] == {"c:@F@f#": "A|U|f|", "c:@F@g#": "B|U|g|"}
+
 
 class TestDiffModels:
     """M4.5 --verify-parse self-check: diff a narrowed model against a full one."""
@@ -71,6 +71,28 @@ class TestVersionStore:
         assert os.path.isfile(os.path.join(vd, "model", "functions.json"))
         assert os.path.isfile(os.path.join(vd, "documents", "software_detailed_design_G.docx"))
 
+    def test_capture_shares_unchanged_artifacts_between_versions(self, tmp_path):
+        # Each distinct file is stored once (cache/cas) and hardlinked into every version;
+        # artifacts.json records what the version captured.
+        ws = _make_ws(tmp_path)
+        vs = VersionStore(ws)
+        out = tmp_path / "output" / "G"; out.mkdir(parents=True)
+        (out / "fc.png").write_bytes(b"PNG" * 100)
+        (out / "interface_tables.json").write_text('{"v": 1}')
+        for vid in ("v1", "v2"):
+            vs.create_dir(vid)
+            vs.capture_artifacts(vid, model_dir=str(tmp_path / "model"), output_dir=str(tmp_path / "output"))
+            (out / "interface_tables.json").write_text('{"v": 2}')
+        png = [os.stat(os.path.join(vs.version_dir(v), "output", "G", "fc.png")) for v in ("v1", "v2")]
+        assert png[0].st_ino == png[1].st_ino
+        itf = [open(os.path.join(vs.version_dir(v), "output", "G", "interface_tables.json")).read()
+               for v in ("v1", "v2")]
+        assert itf == ['{"v": 1}', '{"v": 2}']
+        with open(os.path.join(vs.version_dir("v2"), "artifacts.json")) as fh:
+            files = json.load(fh)["files"]
+        assert sorted(files) == ["output/G/fc.png", "output/G/interface_tables.json"]
+        assert sum(len(b) for _r, _d, b in os.walk(ws.cas_dir)) == 3
+
 
 class TestHashEdgeStore:
     def test_hash_and_edge_roundtrip(self, tmp_path):
@@ -104,3 +126,45 @@ class TestReuseIndex:
         ri.put("fp", "v1", "k")
         assert ri.put("fp", "v9", "k", overwrite=True) is True
         assert ri.get("fp")["versionId"] == "v9"
+
+    def test_get_many_put_many(self, tmp_path):
+        ri = ReuseIndex(_make_ws(tmp_path))
+        assert ri.put_many([("fp1", "v1", "a"), ("fp2", "v1", "b"), ("fp1", "v2", "a")]) == 2
+        hits = ri.get_many(["fp1", "fp2", "fp3", "fp1"])
+        assert hits == {"fp1": {"versionId": "v1", "entityKey": "a"},
+                        "fp2": {"versionId": "v1", "entityKey": "b"}}
+        many = [(f"fp{i}", "v3", "k") for i in range(1200)]    # spans several IN (...) chunks
+        ri.put_many(many, overwrite=True)
+        assert len(ri.get_many(fp for fp, _, _ in many)) == 1200
+
+    def test_prune_drops_pointers_to_deleted_versions(self, tmp_path):
+        ws = _make_ws(tmp_path)
+        vs = VersionStore(ws)
+        vs.create_dir("v1")
+        ri = ReuseIndex(ws)
+        ri.put_many([("fp1", "v1", "a"), ("fp2", "gone", "b"), ("fp3", "gone", "c")])
+        assert ri.prune(vs.exists) == 2
+        assert ri.put("fp2", "v1", "b") is True                # re-seedable once dropped
+        assert len(ri) == 2
+
+    def test_uncommitted_writes_and_concurrent_reader(self, tmp_path):
+        ws = _make_ws(tmp_path)
+        writer = ReuseIndex(ws)
+        writer.put("fp1", "v1", "a")
+        writer.save()
+        writer.put("fp2", "v1", "b")                           # not yet saved
+        reader = ReuseIndex(ws)                                # another job, same workspace
+        assert reader.get("fp1") is not None and reader.get("fp2") is None
+        writer.save()
+        assert reader.get("fp2") == {"versionId": "v1", "entityKey": "b"}
+        writer.close()
+        reader.close()
+
+    def test_legacy_json_index_is_imported(self, tmp_path):
+        ws = _make_ws(tmp_path)
+        os.makedirs(ws.cache_dir)
+        with open(os.path.join(ws.cache_dir, "index.json"), "w") as fh:
+            json.dump({"fp1": {"versionId": "v1", "entityKey": "a"}}, fh)
+        assert ReuseIndex(ws).get("fp1") == {"versionId": "v1", "entityKey": "a"}
+        os.remove(os.path.join(ws.cache_dir, "index.json"))
+        assert len(ReuseIndex(ws)) == 1                        # imported once, kept
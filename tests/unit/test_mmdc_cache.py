@@ -50,3 +50,27 @@ def test_failed_render_not_cached(tmp_path, monkeypatch):
     assert utils.render_mermaid_cached(proj, "graph TD; A-->B", os.path.join(proj, "x.png")) is False
     cache = os.path.join(proj, ".mmdc_cache")
     assert not os.path.isdir(cache) or not os.listdir(cache)   # nothing cached on failure
+
+
+def test_batch_dedupes_and_counts_hits(tmp_path, monkeypatch):
+    rendered = []
+
+    def fake_run(project_root, mermaid, png_path, *, scale=None, puppeteer=True, timeout=90):
+        rendered.append(mermaid)
+        with open(png_path, "wb") as f:
+            f.write(b"PNG:" + mermaid.encode())
+        return mermaid != "bad"
+
+    monkeypatch.setattr(utils, "_run_mmdc", fake_run)
+    proj = str(tmp_path)
+    utils.render_mermaid_cached(proj, "seq A", os.path.join(proj, "warm.png"), scale=2)
+    rendered.clear()
+
+    jobs = [(m, os.path.join(proj, "out", f"{i}.png"))
+            for i, m in enumerate(["seq A", "seq B", "seq B", "bad", "seq C"])]
+    done = []
+    oks, hits = utils.render_mermaid_many(proj, jobs, scale=2, workers=3,
+                                          on_done=lambda i, ok: done.append(i))
+    assert oks == [True, True, True, False, True]
+    assert sorted(rendered) == ["bad", "seq B", "seq C"]   # warm "seq A" hits; "seq B" rendered once
+    assert hits == 2 and sorted(done) == [0, 1, 2, 3, 4]
@@ -146,6 +146,21 @@ class TestPropagateGlobalAccess:
         _propagate_global_access(fns)
         assert "g1" in fns["f1"]["readsGlobalIdsTransitive"]
 
+    def test_call_cycle_shares_its_globals(self):
+        """f0 → f1 ⇄ f2; each of the cycle sees both globals, the caller too, the callee only its own."""
+        fns = {
+            "f0": self._make_func(calls=["f1"]),
+            "f1": self._make_func(calls=["f2", "f3"], reads=["g1"]),
+            "f2": self._make_func(calls=["f1"], writes=["g2"]),
+            "f3": self._make_func(reads=["g3"]),
+        }
+        _propagate_global_access(fns)
+        assert fns["f0"]["readsGlobalIdsTransitive"] == ["g1", "g3"]
+        assert fns["f2"]["readsGlobalIdsTransitive"] == ["g1", "g3"]
+        assert fns["f1"]["writesGlobalIdsTransitive"] == ["g2"]
+        assert fns["f3"]["readsGlobalIdsTransitive"] == ["g3"]
+        assert "writesGlobalIdsTransitive" not in fns["f3"]
+
 
 # ---------------------------------------------------------------------------
 # _enrich_behaviour_names
@@ -0,0 +1,72 @@
+"""Unit tests for parser.parse_only — the in-process narrowed parse (M4.4).
+
+Parsing a subset of TUs against the baseline's func-key map must yield the same
+forward call edges as a full parse, and nothing may be written to model/."""
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+pytest.importorskip("clang.cindex")
+
+from core.config import app_config  # noqa: E402
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    base = tmp_path / "repo"
+    (base / "L" / "A").mkdir(parents=True)
+    (base / "L" / "A" / "a.cpp").write_text("int g();\nint f() { return g() + 1; }\n")
+    (base / "L" / "A" / "b.cpp").write_text("int g() { return 2; }\n")
+    cfg = tmp_path / "config.json"
+    cfg.write_text(json.dumps({"layers": {"L": {"path": "L", "groups": {"G": {"A": "A"}}}}}))
+    monkeypatch.setenv("ANALYZER_CONFIG", str(cfg))
+    app_config(refresh=True)
+    yield base
+    monkeypatch.delenv("ANALYZER_CONFIG")
+    app_config(refresh=True)
+
+
+def _parse_only(base, monkeypatch, tu_paths, func_keys=None):
+    """parse_only() on a freshly loaded parser module (its parse state is module-global)."""
+    script = os.path.join(PROJECT_ROOT, "src", "parser.py")
+    spec = importlib.util.spec_from_file_location("_parser_under_test", script)
+    mod = importlib.util.module_from_spec(spec)
+    monkeypatch.setattr(sys, "argv", [script, str(base)])
+    try:
+        spec.loader.exec_module(mod)
+    except Exception as exc:  # libclang shared library not loadable here
+        pytest.skip(f"libclang unavailable: {exc}")
+    return mod.parse_only(tu_paths, func_keys)
+
+
+def _fid(model, name):
+    return next(fid for fid, f in model["functions"].items() if f["qualifiedName"] == name)
+
+
+def _model_files():
+    d = os.path.join(PROJECT_ROOT, "model")
+    return set(os.listdir(d)) if os.path.isdir(d) else set()
+
+
+def test_partial_parse_resolves_calls_through_baseline_keys(project, monkeypatch):
+    model_files = _model_files()
+    full = _parse_only(project, monkeypatch, ["L/A/a.cpp", "L/A/b.cpp"])
+    f, g = _fid(full, "f"), _fid(full, "g")
+    assert full["functions"][f]["callsIds"] == [g]
+
+    alone = _parse_only(project, monkeypatch, ["L/A/a.cpp"])
+    assert alone["functions"][f]["callsIds"] == []      # g is in a file not re-parsed
+
+    partial = _parse_only(project, monkeypatch, ["L/A/a.cpp"], full["func_keys"])
+    assert set(partial["functions"]) == {f}
+    assert partial["functions"][f]["callsIds"] == [g]
+    assert partial["metadata"]["parseFingerprint"] == full["metadata"]["parseFingerprint"]
+    assert _model_files() == model_files                # nothing written
@@ -0,0 +1,88 @@
+"""Unit tests for src/flowchart/pkb/cache.py — per-function PKB reuse.
+
+An edit to one functions.json entry must rebuild only that entry (and the
+neighbours whose callsIds / calledByIds changed with it), rewrite only the
+shards that changed, and drop records of functions that no longer exist."""
+import copy
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "flowchart"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from pkb.builder import ProjectKnowledgeBase  # noqa: E402
+from pkb.cache import PkbCache  # noqa: E402
+
+
+def _functions(n=40):
+    data = {}
+    for i in range(n):
+        data[f"App|u{i}|f{i}|"] = {
+            "qualifiedName": f"App::f{i}",
+            "location": {"file": f"src/u{i}.cpp", "line": 1, "endLine": 5},
+            "parameters": [{"name": "x", "type": "int"}],
+            "callsIds": [f"App|u{i + 1}|f{i + 1}|"] if i + 1 < n else [],
+            "calledByIds": [f"App|u{i - 1}|f{i - 1}|"] if i else [],
+        }
+    return data
+
+
+def _run(cache_dir, data):
+    cache = PkbCache(str(cache_dir))
+    pkb = ProjectKnowledgeBase()
+    pkb.build(data, cached=cache.load())
+    written = cache.save(pkb.cache_records())
+    return pkb, written
+
+
+def test_unchanged_run_reuses_everything_and_writes_nothing(tmp_path):
+    data = _functions()
+    pkb1, written1 = _run(tmp_path, data)
+    assert (pkb1.reused, pkb1.rebuilt) == (0, 40) and written1 > 0
+    pkb2, written2 = _run(tmp_path, data)
+    assert (pkb2.reused, pkb2.rebuilt, written2) == (40, 0, 0)
+    assert pkb2.to_dict() == pkb1.to_dict()
+
+
+def test_edit_rebuilds_only_changed_entries_and_shards(tmp_path):
+    data = _functions()
+    _run(tmp_path, data)
+    edited = copy.deepcopy(data)
+    edited["App|u3|f3|"]["description"] = "now documented"
+    pkb, written = _run(tmp_path, edited)
+    assert (pkb.reused, pkb.rebuilt, written) == (39, 1, 1)
+    assert pkb.get("App|u3|f3|").description == "now documented"
+
+
+def test_removed_functions_are_collected(tmp_path):
+    data = _functions()
+    _run(tmp_path, data)
+    smaller = {k: v for k, v in data.items() if not k.startswith("App|u1")}  # u1, u10..u19
+    pkb, _ = _run(tmp_path, smaller)
+    assert len(PkbCache(str(tmp_path)).load()) == len(smaller) == len(pkb.all_keys())
+    assert pkb.get_by_qualified_name("App::f10") is None
+
+
+def test_in_memory_rebuild_keeps_unchanged_entries():
+    data = _functions(5)
+    pkb = ProjectKnowledgeBase()
+    pkb.build(data)
+    before = pkb.get("App|u2|f2|")
+    data["App|u4|f4|"]["description"] = "x"
+    del data["App|u0|f0|"]
+    pkb.build(data)
+    assert pkb.get("App|u2|f2|") is before
+    assert (pkb.reused, pkb.rebuilt, pkb.removed) == (3, 1, 1)
+
+
+def test_gc_removes_legacy_snapshots(tmp_path):
+    (tmp_path / "pkb_0123456789abcdef.json").write_text("{}")
+    cache = PkbCache(str(tmp_path))
+    (tmp_path / "pkb" / "ab.json.99.tmp").write_text("")
+    assert cache.gc() == 2
+    assert sorted(os.listdir(tmp_path)) == ["pkb"]
@@ -0,0 +1,85 @@
+"""Unit tests for ProjectKnowledgeBase context packets (src/flowchart/pkb/builder.py).
+
+The caller / callee / hierarchy fragments are indexed and memoized once per run;
+packets must be unchanged by that, and the memos must follow new inputs."""
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src", "flowchart"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+import pkb.builder as pkb_builder  # noqa: E402
+from pkb.builder import ProjectKnowledgeBase  # noqa: E402
+from pkb.knowledge import FunctionKnowledge, ProjectKnowledge  # noqa: E402
+
+
+def _fid(q):
+    return f"App|core|{q}|"
+
+
+def _pkb(descriptions=None):
+    calls = {"App::a": ["App::b", "App::c"], "App::b": ["App::d"], "App::c": ["App::d"],
+             "App::d": [], "App::e": []}
+    descriptions = descriptions or {}
+    data = {
+        _fid(q): {"qualifiedName": q, "location": {"file": "core/core.cpp", "line": 1, "endLine": 3},
+                  "callsIds": [_fid(c) for c in cs] + (["Ext|lib|ext_helper|"] if q == "App::a" else []),
+                  "calledByIds": [_fid(p) for p, pcs in calls.items() if q in pcs]}
+        for q, cs in calls.items()
+    }
+    kn = ProjectKnowledge(project_name="App", project_summary="demo app",
+                          component_summaries={"core": "core logic"})
+    for q, cs in calls.items():
+        kn.functions[q] = FunctionKnowledge(qualified_name=q, signature=f"void {q}()",
+                                            file="core/core.cpp", line=1, calls=cs,
+                                            description=descriptions.get(q, f"{q} does work"))
+    pkb = ProjectKnowledgeBase()
+    pkb.build(data)
+    pkb.load_project_knowledge(kn)
+    return pkb
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    (tmp_path / "Ext").mkdir()
+    (tmp_path / "Ext" / "lib.cpp").write_text("// Helper outside the project\nint ext_helper(int x)\n{\n}\n")
+    return str(tmp_path)
+
+
+def test_packet_has_levels_callers_and_hierarchy(base_path):
+    pkb = _pkb()
+    packet = pkb.build_context_packet(pkb.get(_fid("App::b")), base_path)
+    assert "[Project] App: demo app" in packet and "[Component] core/: core logic" in packet
+    assert "Called by (callers of this function):\n  - void App::a()  →  App::a does work" in packet
+    assert "Direct calls:\n  - void App::d()  →  App::d does work" in packet
+
+    packet = pkb.build_context_packet(pkb.get(_fid("App::a")), base_path)
+    direct = packet.split("Direct calls:")[1].split("\n\n")[0]
+    assert "void App::b()" in direct and "void App::c()" in direct
+    assert "int ext_helper(int x)  →  Helper outside the project" in direct
+    assert "Calls made by direct callees (depth 2):\n  - void App::d()" in packet
+
+
+def test_source_fallback_scanned_once_per_run(base_path, monkeypatch):
+    calls = []
+    real = pkb_builder._extract_callee_from_source
+    monkeypatch.setattr(pkb_builder, "_extract_callee_from_source",
+                        lambda cid, bp: calls.append(cid) or real(cid, bp))
+    pkb = _pkb()
+    for _ in range(3):
+        pkb.build_context_packet(pkb.get(_fid("App::a")), base_path)
+    assert calls == ["Ext|lib|ext_helper|"]
+
+
+def test_memos_follow_new_knowledge(base_path):
+    pkb = _pkb()
+    entry = pkb.get(_fid("App::a"))
+    assert "App::b does work" in pkb.build_context_packet(entry, base_path)
+    pkb.load_project_knowledge(_pkb({"App::b": "validates input"})._knowledge)
+    packet = pkb.build_context_packet(entry, base_path)
+    assert "validates input" in packet and "App::b does work" not in packet
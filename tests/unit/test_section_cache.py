@@ -0,0 +1,65 @@
+"""Unit tests for src/core/section_cache.py — spooled DOCX sections reused across exports.
+
+An entry is only served whole (XML and picture references) and while every picture
+it references is still on disk; anything else must miss (and the section is rebuilt)."""
+import os
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from core.section_cache import SectionCache, prune  # noqa: E402
+
+
+def _section(tmp_path, name="2.xml", body=b"<w:p/>"):
+    png = tmp_path / "fc.png"
+    png.write_bytes(b"PNG")
+    xml = tmp_path / name
+    xml.write_bytes(body)
+    return str(xml), [(str(png), "png", "image/png", "sha")]
+
+
+def test_save_then_lookup_hits(tmp_path):
+    cache = SectionCache(str(tmp_path / "cache"))
+    xml, images = _section(tmp_path)
+    assert cache.lookup("k") is None and cache.misses == 1
+    assert cache.save("k", xml, images)
+    os.remove(xml)  # the spool dir goes away after the export
+    cached_xml, cached_images = cache.lookup("k")
+    assert open(cached_xml, "rb").read() == b"<w:p/>" and cached_images == images
+    assert (cache.hits, cache.saved) == (1, 1)
+    assert sorted(os.listdir(tmp_path / "cache")) == ["k.json", "k.xml"]
+
+
+def test_missing_picture_or_xml_misses(tmp_path):
+    cache = SectionCache(str(tmp_path / "cache"))
+    xml, images = _section(tmp_path)
+    cache.save("a", xml, images)
+    cache.save("b", xml, images)
+    os.remove(tmp_path / "cache" / "b.xml")
+    assert cache.lookup("b") is None
+    os.remove(images[0][0])
+    assert cache.lookup("a") is None
+    assert cache.hits == 0
+
+
+def test_failed_save_leaves_nothing(tmp_path):
+    cache = SectionCache(str(tmp_path / "cache"))
+    assert not cache.save("k", str(tmp_path / "gone.xml"), [])
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = SectionCache(str(tmp_path / "cache"))
+    xml, images = _section(tmp_path, body=b"x" * 1000)
+    for n, key in enumerate(("old", "mid", "new")):
+        cache.save(key, xml, images)
+        os.utime(tmp_path / "cache" / f"{key}.json", (n * 100, n * 100))
+    entry = sum(os.path.getsize(tmp_path / "cache" / f"new{ext}") for ext in (".xml", ".json"))
+    assert prune(str(tmp_path / "cache"), 2 * entry, keep=["old"]) == 1
+    assert sorted(os.listdir(tmp_path / "cache")) == ["new.json", "new.xml", "old.json", "old.xml"]
+    assert prune(str(tmp_path / "cache"), 10 ** 9) == 0
@@ -325,3 +325,92 @@ class TestBuildUnitDiagram:
         )
         assert result is not None
         assert "Mod" in result  # component subgraph label
+
+
+# ---------------------------------------------------------------------------
+# _UnitIndex (shared across all diagrams of a run)
+# ---------------------------------------------------------------------------
+
+class TestUnitIndex:
+    def _model(self):
+        units_data = {
+            "App|core": {"name": "core", "fileName": "core.cpp", "functionIds": ["a"]},
+            "App|io": {"name": "io", "fileName": "io.cpp", "functionIds": ["b"]},
+            "Lib|math": {"name": "math", "fileName": "math.cpp", "functionIds": ["c"]},
+        }
+        functions_data = {
+            "a": {"callsIds": ["b", "c"], "calledByIds": [], "interfaceId": "IF_A"},
+            "b": {"callsIds": [], "calledByIds": ["a"], "interfaceId": "IF_B"},
+            "c": {"callsIds": [], "calledByIds": ["a"], "interfaceId": "IF_C"},
+        }
+        fid_to_unit = _fid_to_unit(units_data)
+        names = {uk: u["name"] for uk, u in units_data.items()}
+        return units_data, functions_data, fid_to_unit, names
+
+    # Diagram bodies (after the init/classDef header, blank lines dropped) as the
+    # per-call scan over units_data rendered them before _UnitIndex existed.
+    _EXPECTED = {
+        (None, "App|core"): [
+            'subgraph internal_mod["App"]', "direction TB",
+            "style internal_mod fill:#ffffcc,stroke:#d4d400,stroke-width:2px",
+            'App_core["   core   <br/>    <br/>    "]', 'App_io["App/io"]',
+            "App_core -->|IF_B| App_io", "class App_core mainUnit", "class App_io internal",
+            "end", 'Lib_math["Lib/math"]', "App_core -->|IF_C| Lib_math"],
+        (None, "App|io"): [
+            'subgraph internal_mod["App"]', "direction TB",
+            "style internal_mod fill:#ffffcc,stroke:#d4d400,stroke-width:2px",
+            'App_core["App/core"]', 'App_io["   io   <br/>    <br/>    "]',
+            "App_core -->|IF_B| App_io", "class App_io mainUnit", "class App_core internal",
+            "end"],
+        (None, "Lib|math"): [
+            'App_core["App/core"]', 'subgraph internal_mod["Lib"]', "direction TB",
+            "style internal_mod fill:#ffffcc,stroke:#d4d400,stroke-width:2px",
+            'Lib_math["   math   <br/>    <br/>    "]', "class Lib_math mainUnit", "end",
+            "App_core -->|IF_C| Lib_math"],
+        ("app+lib", "App|core"): [
+            'subgraph internal_mod["App"]', "direction TB",
+            "style internal_mod fill:#ffffcc,stroke:#d4d400,stroke-width:2px",
+            'App_core["   core   <br/>    <br/>    "]', 'App_io["App/io"]', 'Lib_math["Lib/math"]',
+            "App_core -->|IF_B| App_io", "App_core -->|IF_C| Lib_math",
+            "class App_core mainUnit", "class App_io,Lib_math internal", "end"],
+        ("app+lib", "App|io"): [
+            'subgraph internal_mod["App"]', "direction TB",
+            "style internal_mod fill:#ffffcc,stroke:#d4d400,stroke-width:2px",
+            'App_core["App/core"]', 'App_io["   io   <br/>    <br/>    "]',
+            "App_core -->|IF_B| App_io", "class App_io mainUnit", "class App_core internal",
+            "end"],
+        ("app+lib", "Lib|math"): [
+            'subgraph internal_mod["Lib"]', "direction TB",
+            "style internal_mod fill:#ffffcc,stroke:#d4d400,stroke-width:2px",
+            'App_core["App/core"]', 'Lib_math["   math   <br/>    <br/>    "]',
+            "App_core -->|IF_C| Lib_math", "class Lib_math mainUnit", "class App_core internal",
+            "end"],
+    }
+
+    @staticmethod
+    def _body(diagram):
+        return [ln.strip() for ln in diagram.splitlines()[4:] if ln.strip()]
+
+    def test_diagrams_match_the_per_call_scan_output(self):
+        units_data, functions_data, fid_to_unit, names = self._model()
+        index = _mod._UnitIndex(units_data, functions_data, fid_to_unit)
+        for label, allowed in ((None, None), ("app+lib", {"app", "lib"})):
+            for uk, info in units_data.items():
+                expected = self._EXPECTED[(label, uk)]
+                shared = _build_unit_diagram(uk, info, units_data, functions_data, fid_to_unit,
+                                             names, allowed_components=allowed, index=index)
+                alone = _build_unit_diagram(uk, info, units_data, functions_data, fid_to_unit,
+                                            names, allowed_components=allowed)
+                assert self._body(shared) == expected, (label, uk)
+                assert self._body(alone) == expected, (label, uk)
+
+    def test_internal_parts_and_edges(self):
+        units_data, functions_data, fid_to_unit, names = self._model()
+        index = _mod._UnitIndex(units_data, functions_data, fid_to_unit)
+        assert index.internal_parts("App") == {"App_core", "App_io"}
+        assert index.internal_parts("App", {"app", "lib"}) == {"App_core", "App_io", "Lib_math"}
+        assert index.edges("App|core", units_data["App|core"]) == {
+            ("App_core", "App_io"): {"IF_B"}, ("App_core", "Lib_math"): {"IF_C"}}
+        result = _build_unit_diagram("App|core", units_data["App|core"], units_data, functions_data,
+                                     fid_to_unit, names, index=index)
+        assert "App_core -->|IF_B| App_io" in result and "App_core -->|IF_C| Lib_math" in result
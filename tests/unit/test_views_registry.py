@@ -116,3 +116,78 @@ class TestResolveScript:
     def test_relative_path_joined_to_project_root(self):
         result = self._resolve_script("/project", "scripts/gen.py")
         assert result == os.path.join("/project", "scripts/gen.py")
+
+
+# ---------------------------------------------------------------------------
+# views/__init__.py — run_views scheduler
+# ---------------------------------------------------------------------------
+
+def _load_views_package():
+    """Load src/views as a private package so the scheduler runs against test views."""
+    import importlib.util
+    name = "_sched_views"
+    spec = importlib.util.spec_from_file_location(
+        name,
+        os.path.join(PROJECT_ROOT, "src", "views", "__init__.py"),
+        submodule_search_locations=[os.path.join(PROJECT_ROOT, "src", "views")],
+    )
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class TestRunViewsScheduler:
+    def setup_method(self):
+        self.views = _load_views_package()
+        self.views.VIEW_REGISTRY.clear()
+        self.views.VIEW_DEPENDENCIES.clear()
+        self.events = []
+
+    def _view(self, name, seconds=0.0, after=(), fail=False):
+        import time
+
+        def run(model, output_dir, model_dir, config):
+            self.events.append(("start", name))
+            time.sleep(seconds)
+            if fail:
+                raise ValueError(name)
+            self.events.append(("end", name))
+
+        self.views.VIEW_REGISTRY[name] = run
+        self.views.VIEW_DEPENDENCIES[name] = tuple(after)
+
+    def _run(self, **views_cfg):
+        cfg = {"views": {n: True for n in self.views.VIEW_REGISTRY}}
+        cfg["views"].update(views_cfg)
+        self.views.run_views({}, "out", "model", cfg)
+
+    def test_independent_views_overlap(self):
+        import time
+        for n in ("a", "b", "c"):
+            self._view(n, seconds=0.3)
+        t0 = time.perf_counter()
+        self._run()
+        assert time.perf_counter() - t0 < 0.8
+        assert {e for e in self.events if e[0] == "end"} == {("end", "a"), ("end", "b"), ("end", "c")}
+
+    def test_dependency_starts_after_its_views(self):
+        self._view("a", seconds=0.2)
+        self._view("b", after=("a", "disabled"))
+        self._view("c", seconds=0.05)
+        self._run(disabled=False)
+        assert self.events.index(("start", "b")) > self.events.index(("end", "a"))
+
+    def test_single_worker_keeps_registry_order(self):
+        for n in ("a", "b", "c"):
+            self._view(n)
+        self._run(parallelWorkers=1)
+        assert [n for kind, n in self.events if kind == "start"] == ["a", "b", "c"]
+
+    def test_failure_is_raised_and_dependents_skipped(self):
+        self._view("a", fail=True)
+        self._view("b", after=("a",))
+        self._view("c", seconds=0.1)
+        with pytest.raises(ValueError):
+            self._run()
+        assert ("start", "b") not in self.events and ("end", "c") in self.events